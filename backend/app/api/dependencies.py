@@ -0,0 +1,63 @@
+"""
+API Dependencies
+Lazily created services shared by the route modules
+
+Route modules used to construct their services (and import pandas, yfinance
+and friends) at import time, which made every cold start pay for all of them
+before the first request. Each provider here imports its service module and
+creates the instance on first call, then keeps returning the same one. Routes
+take them with `Depends(...)`; background helpers may call them directly.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_data_fetcher():
+    """Paylaşılan DataFetcher (önbellek zaten sınıf düzeyinde ortak)"""
+    from app.services.data_fetcher import DataFetcher
+    return DataFetcher()
+
+
+@lru_cache(maxsize=None)
+def get_technical_analysis():
+    from app.services.technical_analysis import TechnicalAnalysis
+    return TechnicalAnalysis()
+
+
+@lru_cache(maxsize=None)
+def get_alert_manager():
+    from app.services.alert_manager import AlertManager
+    return AlertManager()
+
+
+@lru_cache(maxsize=None)
+def get_strategy_tester():
+    from app.services.strategy_tester import StrategyTester
+    return StrategyTester()
+
+
+@lru_cache(maxsize=None)
+def get_stock_screener():
+    from app.services.stock_screener import StockScreener
+    return StockScreener()
+
+
+@lru_cache(maxsize=None)
+def get_hybrid_generator():
+    from app.services.hybrid_strategy import HybridSignalGenerator
+    return HybridSignalGenerator()
+
+
+def get_stock_scheduler():
+    from app.services.stock_scheduler import stock_scheduler
+    return stock_scheduler
+
+
+def get_market_data_service():
+    from app.services.market_data import market_data_service
+    return market_data_service
+
+
+def get_quote_board():
+    from app.services.quote_board import quote_board
+    return quote_board
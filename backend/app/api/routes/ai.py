@@ -2,7 +2,10 @@
 AI Assistant API Routes
 AI Trading Asistan endpointleri
 """
+import asyncio
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from app.services.ai_assistant import get_ai_assistant
@@ -55,6 +58,36 @@ async def chat_with_ai(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"AI yanıt hatası: {str(e)}")
 
 
+@router.post("/chat/stream")
+async def stream_chat_with_ai(request: ChatRequest):
+    """
+    AI asistan ile sohbet - yanıt Server-Sent Events olarak akar
+    
+    Her parça `{"type": "delta", "content": ...}` olayı olarak gönderilir,
+    akış tam mesajı taşıyan `{"type": "done", "response": {...}}` ile biter.
+    """
+    assistant = get_ai_assistant()
+    
+    async def event_stream():
+        try:
+            async for text in assistant.stream_chat(request.user_id, request.message, request.context):
+                yield f"data: {json.dumps({'type': 'delta', 'content': text}, ensure_ascii=False)}\n\n"
+            
+            history = await asyncio.to_thread(assistant.get_conversation_history, request.user_id, 1)
+            done = {"type": "done", "response": history[-1] if history else None}
+            yield f"data: {json.dumps(done, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            error = {"type": "error", "detail": f"AI yanıt hatası: {str(e)}"}
+            yield f"data: {json.dumps(error, ensure_ascii=False)}\n\n"
+    
+    # Content-Encoding: identity -> GZipMiddleware parçaları tamponlamadan geçirir
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Content-Encoding": "identity"}
+    )
+
+
 @router.post("/portfolio-analysis")
 async def analyze_portfolio(request: PortfolioAnalysisRequest):
     """Portföy analizi yap"""
@@ -142,7 +175,7 @@ async def get_quick_actions():
 async def get_chat_history(user_id: str, limit: int = 20):
     """Sohbet geçmişini getir"""
     assistant = get_ai_assistant()
-    history = assistant.get_conversation_history(user_id, limit)
+    history = await asyncio.to_thread(assistant.get_conversation_history, user_id, limit)
     
     return {
         "success": True,
@@ -155,7 +188,7 @@ async def get_chat_history(user_id: str, limit: int = 20):
 async def clear_chat_history(user_id: str):
     """Sohbet geçmişini temizle"""
     assistant = get_ai_assistant()
-    assistant.clear_conversation(user_id)
+    await asyncio.to_thread(assistant.clear_conversation, user_id)
     
     return {
         "success": True,
@@ -2,19 +2,15 @@
 Alert API Endpoints
 Trading alert yönetimi
 """
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
-from app.services.alert_manager import AlertManager
-from app.services.data_fetcher import DataFetcher
+from app.api.dependencies import get_alert_manager, get_data_fetcher, get_quote_board
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
 
-# Initialize services
-alert_manager = AlertManager()
-data_fetcher = DataFetcher()
-
 
 class AlertCreate(BaseModel):
     type: str  # 'price', 'score', 'signal', 'position'
@@ -44,7 +40,7 @@ class AlertCreate(BaseModel):
 
 
 @router.post("/create")
-async def create_alert(alert: AlertCreate):
+async def create_alert(alert: AlertCreate, alert_manager=Depends(get_alert_manager)):
     """
     Yeni alert oluştur
     
@@ -74,7 +70,7 @@ async def create_alert(alert: AlertCreate):
 
 
 @router.get("/active")
-async def get_active_alerts():
+async def get_active_alerts(alert_manager=Depends(get_alert_manager)):
     """Aktif alertleri getir"""
     try:
         alerts = alert_manager.get_active_alerts()
@@ -91,7 +87,11 @@ async def get_active_alerts():
 
 
 @router.get("/check")
-async def check_alerts():
+async def check_alerts(
+    alert_manager=Depends(get_alert_manager),
+    data_fetcher=Depends(get_data_fetcher),
+    quote_board=Depends(get_quote_board)
+):
     """
     Tüm alertleri kontrol et ve tetiklenen alertleri döndür
     
@@ -110,16 +110,23 @@ async def check_alerts():
                 "triggered_alerts": []
             }
         
-        # Maksimum 3 ticker kontrol et (Vercel 10s timeout)
-        unique_tickers = list(set(alert['ticker'] for alert in active_alerts))[:3]
+        unique_tickers = list(set(alert['ticker'] for alert in active_alerts))
         
-        # Tüm hisseler için güncel veriyi topla
-        market_data = {}
+        # Fiyatlar fiyat panosundan (bellekten) okunur; bayat pano yenilenirken event loop bloklanmaz
+        loop = asyncio.get_running_loop()
+        if quote_board.is_stale():
+            await loop.run_in_executor(None, quote_board.ensure_fresh)
+        quotes = quote_board.snapshot(unique_tickers)
+        market_data = {
+            ticker: {'price': quote['price'], 'score': 0, 'recommendation': ''}
+            for ticker, quote in quotes.items()
+        }
         
-        for ticker in unique_tickers:
+        # Panoda olmayan hisseler tek tek çekilir - maksimum 3 (Vercel 10s timeout)
+        for ticker in [t for t in unique_tickers if t not in quotes][:3]:
             try:
                 # Sadece fiyat verisini al (hızlı)
-                current_price = data_fetcher.get_current_price(ticker)
+                current_price = await loop.run_in_executor(None, data_fetcher.get_current_price, ticker)
                 
                 market_data[ticker] = {
                     'price': current_price or 0,
@@ -149,7 +156,7 @@ async def check_alerts():
 
 
 @router.delete("/{alert_id}")
-async def delete_alert(alert_id: str):
+async def delete_alert(alert_id: str, alert_manager=Depends(get_alert_manager)):
     """Alert sil"""
     try:
         success = alert_manager.delete_alert(alert_id)
@@ -170,7 +177,11 @@ async def delete_alert(alert_id: str):
 
 
 @router.put("/{alert_id}/toggle")
-async def toggle_alert(alert_id: str, active: Optional[bool] = None):
+async def toggle_alert(
+    alert_id: str,
+    active: Optional[bool] = None,
+    alert_manager=Depends(get_alert_manager)
+):
     """Alert'i aktif/pasif yap. If active is not provided, toggles current state."""
     try:
         if active is None:
@@ -203,7 +214,8 @@ async def toggle_alert(alert_id: str, active: Optional[bool] = None):
 async def get_notification_history(
     limit: int = Query(50, ge=1, le=200),
     unread_only: bool = False,
-    page: int = Query(1, ge=1)
+    page: int = Query(1, ge=1),
+    alert_manager=Depends(get_alert_manager)
 ):
     """Bildirim geçmişini getir (paginated)"""
     try:
@@ -231,7 +243,7 @@ async def get_notification_history(
 
 
 @router.put("/notifications/{alert_id}/read")
-async def mark_notification_read(alert_id: str):
+async def mark_notification_read(alert_id: str, alert_manager=Depends(get_alert_manager)):
     """Bildirimi okundu olarak işaretle"""
     try:
         success = alert_manager.mark_notification_read(alert_id)
@@ -252,7 +264,7 @@ async def mark_notification_read(alert_id: str):
 
 
 @router.put("/notifications/read-all")
-async def mark_all_read():
+async def mark_all_read(alert_manager=Depends(get_alert_manager)):
     """Tüm bildirimleri okundu işaretle"""
     try:
         count = alert_manager.mark_all_read()
@@ -269,7 +281,10 @@ async def mark_all_read():
 
 
 @router.delete("/history/clear")
-async def clear_notification_history(days: Optional[int] = None):
+async def clear_notification_history(
+    days: Optional[int] = None,
+    alert_manager=Depends(get_alert_manager)
+):
     """Bildirim geçmişini temizle"""
     try:
         count = alert_manager.clear_history(days=days)
@@ -286,7 +301,7 @@ async def clear_notification_history(days: Optional[int] = None):
 
 
 @router.get("/statistics")
-async def get_alert_statistics():
+async def get_alert_statistics(alert_manager=Depends(get_alert_manager)):
     """Bildirim istatistiklerini getir"""
     try:
         stats = alert_manager.get_statistics()
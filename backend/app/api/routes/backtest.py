@@ -1,22 +1,20 @@
 """
 Strategy Backtest API Endpoints
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
-from app.services.strategy_tester import StrategyTester
+from app.api.dependencies import get_strategy_tester
 from app.utils.logger import logger
 from datetime import datetime, timedelta
 
 router = APIRouter(prefix="/backtest", tags=["strategy-backtest"])
 
-# Initialize tester
-tester = StrategyTester()
-
 
 @router.get("/daily-strategy")
 async def test_daily_strategy(
     days: int = Query(180, description="Number of days to backtest (default 6 months)"),
-    min_score: int = Query(75, description="Minimum score threshold (75+ for excellent setups)")
+    min_score: int = Query(75, description="Minimum score threshold (75+ for excellent setups)"),
+    tester=Depends(get_strategy_tester)
 ):
     """
     Test daily trading strategy for last N days
@@ -44,7 +42,7 @@ async def test_daily_strategy(
 
 
 @router.get("/quick-test")
-async def quick_strategy_test():
+async def quick_strategy_test(tester=Depends(get_strategy_tester)):
     """
     Quick backtest for last 30 days
     
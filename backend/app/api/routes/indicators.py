@@ -1,25 +1,34 @@
 """
 Advanced Technical Indicators API Endpoints
 """
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
-from app.services.data_fetcher import DataFetcher
-from app.services.technical_analysis import TechnicalAnalysis, TrendChannelIndicator
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, Optional
+from app.api.dependencies import get_data_fetcher, get_technical_analysis
+from app.services.features import feature_store
 from app.utils.logger import logger
-import pandas as pd
+import math
 
 router = APIRouter(prefix="/indicators", tags=["indicators"])
 
-# Initialize services
-data_fetcher = DataFetcher()
-tech_analysis = TechnicalAnalysis()
+# TechnicalAnalysis.calculate_bollinger_bands defaults (the cached "bollinger" indicator)
+BB_DEFAULT_PERIOD = 20
+BB_DEFAULT_STD = 2.0
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    """NaN / eksik değer -> None"""
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
 
 
 @router.get("/{ticker}/ichimoku")
 async def get_ichimoku(
     ticker: str,
     interval: str = Query("5m", description="Data interval (1m, 5m, 15m, 1h, 1d)"),
-    period: str = Query("1d", description="Data period (1d, 5d, 1mo, 3mo, 1y)")
+    period: str = Query("1d", description="Data period (1d, 5d, 1mo, 3mo, 1y)"),
+    data_fetcher=Depends(get_data_fetcher)
 ):
     """
     Get Ichimoku Cloud indicator data
@@ -45,20 +54,25 @@ async def get_ichimoku(
         if df.empty:
             raise HTTPException(status_code=404, detail="No data available")
         
-        # Calculate Ichimoku
-        df_ichimoku = tech_analysis.calculate_ichimoku(df)
+        # Calculate Ichimoku (cached per bar, nothing else evaluated)
+        df_ichimoku = feature_store.frame(ticker, interval, period, df, ["ichimoku"], copy=False)
         
         # Convert to JSON-friendly format
-        data = []
-        for idx, row in df_ichimoku.iterrows():
-            data.append({
+        lines = df_ichimoku[[
+            'ichimoku_tenkan', 'ichimoku_kijun', 'ichimoku_senkou_a', 'ichimoku_senkou_b', 'ichimoku_chikou'
+        ]]
+        data = [
+            {
                 "timestamp": str(idx),
-                "tenkan": float(row.get('ichimoku_tenkan', 0)) if not pd.isna(row.get('ichimoku_tenkan')) else None,
-                "kijun": float(row.get('ichimoku_kijun', 0)) if not pd.isna(row.get('ichimoku_kijun')) else None,
-                "senkou_a": float(row.get('ichimoku_senkou_a', 0)) if not pd.isna(row.get('ichimoku_senkou_a')) else None,
-                "senkou_b": float(row.get('ichimoku_senkou_b', 0)) if not pd.isna(row.get('ichimoku_senkou_b')) else None,
-                "chikou": float(row.get('ichimoku_chikou', 0)) if not pd.isna(row.get('ichimoku_chikou')) else None,
-            })
+                "tenkan": _optional_float(tenkan),
+                "kijun": _optional_float(kijun),
+                "senkou_a": _optional_float(senkou_a),
+                "senkou_b": _optional_float(senkou_b),
+                "chikou": _optional_float(chikou),
+            }
+            for idx, (tenkan, kijun, senkou_a, senkou_b, chikou)
+            in zip(lines.index, lines.itertuples(index=False, name=None))
+        ]
         
         return {
             "ticker": ticker,
@@ -80,7 +94,9 @@ async def get_fibonacci(
     ticker: str,
     interval: str = Query("5m", description="Data interval"),
     period: str = Query("1d", description="Data period"),
-    lookback: int = Query(100, description="Lookback period for swing high/low detection")
+    lookback: int = Query(100, description="Lookback period for swing high/low detection"),
+    data_fetcher=Depends(get_data_fetcher),
+    tech_analysis=Depends(get_technical_analysis)
 ):
     """
     Get Fibonacci Retracement levels
@@ -140,8 +156,10 @@ async def get_bollinger_bands(
     ticker: str,
     interval: str = Query("5m", description="Data interval"),
     period: str = Query("1d", description="Data period"),
-    bb_period: int = Query(20, description="Bollinger Bands period"),
-    std_dev: float = Query(2.0, description="Standard deviation multiplier")
+    bb_period: int = Query(BB_DEFAULT_PERIOD, description="Bollinger Bands period"),
+    std_dev: float = Query(BB_DEFAULT_STD, description="Standard deviation multiplier"),
+    data_fetcher=Depends(get_data_fetcher),
+    tech_analysis=Depends(get_technical_analysis)
 ):
     """
     Get Bollinger Bands indicator data
@@ -169,18 +187,23 @@ async def get_bollinger_bands(
         if df.empty:
             raise HTTPException(status_code=404, detail="No data available")
         
-        # Calculate Bollinger Bands
-        df_bb = tech_analysis.calculate_bollinger_bands(df, period=bb_period, std=std_dev)
+        # Calculate Bollinger Bands (default parameters come from the per-bar feature cache)
+        if bb_period == BB_DEFAULT_PERIOD and std_dev == BB_DEFAULT_STD:
+            df_bb = feature_store.frame(ticker, interval, period, df, ["bollinger"], copy=False)
+        else:
+            df_bb = tech_analysis.calculate_bollinger_bands(df, period=bb_period, std=std_dev)
         
         # Convert to JSON-friendly format
-        data = []
-        for idx, row in df_bb.iterrows():
-            data.append({
+        bands = df_bb[['bb_upper', 'bb_middle', 'bb_lower']]
+        data = [
+            {
                 "timestamp": str(idx),
-                "bb_upper": float(row.get('bb_upper', 0)) if not pd.isna(row.get('bb_upper')) else None,
-                "bb_middle": float(row.get('bb_middle', 0)) if not pd.isna(row.get('bb_middle')) else None,
-                "bb_lower": float(row.get('bb_lower', 0)) if not pd.isna(row.get('bb_lower')) else None,
-            })
+                "bb_upper": _optional_float(upper),
+                "bb_middle": _optional_float(middle),
+                "bb_lower": _optional_float(lower),
+            }
+            for idx, (upper, middle, lower) in zip(bands.index, bands.itertuples(index=False, name=None))
+        ]
         
         return {
             "ticker": ticker,
@@ -204,7 +227,8 @@ async def get_trend_channel(
     ticker: str,
     interval: str = Query("1d", description="Data interval (5m, 15m, 1h, 1d)"),
     period: str = Query("3mo", description="Data period (1mo, 3mo, 6mo, 1y)"),
-    channel_period: int = Query(20, description="Channel calculation period")
+    channel_period: int = Query(20, description="Channel calculation period"),
+    data_fetcher=Depends(get_data_fetcher)
 ):
     """
     Get Trend Channel indicator with trading signals
@@ -240,6 +264,7 @@ async def get_trend_channel(
             )
         
         # Calculate Trend Channel
+        from app.services.technical_analysis import TrendChannelIndicator
         channel_indicator = TrendChannelIndicator(df, channel_period)
         analysis = channel_indicator.get_full_analysis()
         
@@ -275,7 +300,8 @@ async def get_trend_channel(
 @router.post("/trend-channel/analyze")
 async def analyze_trend_channel(
     symbol: str = Query(..., description="Stock symbol (e.g., THYAO.IS)"),
-    period: int = Query(20, description="Channel period")
+    period: int = Query(20, description="Channel period"),
+    data_fetcher=Depends(get_data_fetcher)
 ):
     """
     Quick trend channel analysis for a stock
@@ -291,6 +317,7 @@ async def analyze_trend_channel(
             raise HTTPException(status_code=404, detail="Insufficient data")
         
         # Analyze
+        from app.services.technical_analysis import TrendChannelIndicator
         indicator = TrendChannelIndicator(df, period)
         result = indicator.generate_signal()
         
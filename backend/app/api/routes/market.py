@@ -1,13 +1,13 @@
 """
 Market Data Routes - Piyasa Verileri Endpoint'leri
 """
-from fastapi import APIRouter, HTTPException
-from app.services.market_data import market_data_service
+from fastapi import APIRouter, Depends, HTTPException
+from app.api.dependencies import get_market_data_service
 
 router = APIRouter()
 
 @router.get("/market/all")
-async def get_all_market_data():
+async def get_all_market_data(market_data_service=Depends(get_market_data_service)):
     """
     Tüm piyasa verilerini getir
     - BIST100, BIST30
@@ -21,7 +21,7 @@ async def get_all_market_data():
     return result
 
 @router.get("/market/forex")
-async def get_forex_data():
+async def get_forex_data(market_data_service=Depends(get_market_data_service)):
     """Döviz kurları (USD/TRY, EUR/TRY)"""
     result = await market_data_service.get_forex_data()
     if not result["success"]:
@@ -29,7 +29,7 @@ async def get_forex_data():
     return result
 
 @router.get("/market/commodities")
-async def get_commodities_data():
+async def get_commodities_data(market_data_service=Depends(get_market_data_service)):
     """Emtia verileri (Altın, Bitcoin)"""
     result = await market_data_service.get_commodities_data()
     if not result["success"]:
@@ -37,7 +37,7 @@ async def get_commodities_data():
     return result
 
 @router.get("/market/global")
-async def get_global_indices():
+async def get_global_indices(market_data_service=Depends(get_market_data_service)):
     """Küresel endeksler (S&P500, NASDAQ)"""
     result = await market_data_service.get_global_indices_data()
     if not result["success"]:
@@ -64,8 +64,8 @@ async def finance_news():
         if not news.get("turkey") and not news.get("world"):
             logger.warning("No finance news fetched, returning demo data")
             return DEMO_FINANCE_NEWS
-        news["type"] = "finance"
-        return news
+        # Snapshot is shared with /economy - don't mutate it
+        return {**news, "type": "finance"}
     except Exception as e:
         logger.error(f"Error fetching finance news: {e}")
         return DEMO_FINANCE_NEWS
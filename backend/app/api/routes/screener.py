@@ -2,22 +2,50 @@
 Stock Screener API Endpoints
 Daily trading picks ve signals
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional
-from app.services.stock_screener import StockScreener
+import asyncio
+import json
+from app.api.dependencies import get_stock_screener
 from app.utils.logger import logger
 from datetime import datetime
 
 router = APIRouter(prefix="/screener", tags=["screener"])
 
-# Initialize screener
-screener = StockScreener()
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _stream_scan(screener, interval: str, period: str, ndjson: bool) -> StreamingResponse:
+    """screener.stream_screen as Server-Sent Events, or NDJSON (one event per line)"""
+    def encode(event: dict) -> str:
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        return f"{line}\n" if ndjson else f"data: {line}\n\n"
+
+    async def generate():
+        try:
+            async for event in screener.stream_screen(interval, period, publish=True):
+                yield encode(event)
+        except Exception as e:
+            logger.error(f"Error streaming scan: {e}")
+            yield encode({"type": "error", "detail": str(e)})
+
+    return StreamingResponse(
+        generate(),
+        media_type=NDJSON_MEDIA_TYPE if ndjson else "text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "Content-Encoding": "identity",
+        }
+    )
 
 
 @router.get("/daily-picks")
 async def get_daily_picks(
     top_n: int = Query(10, description="Number of top stocks to return"),
-    min_score: int = Query(75, description="Minimum momentum score threshold (75+ for excellent setups)")
+    min_score: int = Query(75, description="Minimum momentum score threshold (75+ for excellent setups)"),
+    screener=Depends(get_stock_screener)
 ):
     """
     Get top daily stock picks based on momentum score
@@ -28,7 +56,10 @@ async def get_daily_picks(
     try:
         logger.info(f"API request: Get daily picks (top {top_n}, min_score {min_score})")
         
-        picks = screener.get_top_picks(n=top_n, min_score=min_score)
+        # screen() waits on the table lock and fetches - keep it off the event loop
+        picks = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: screener.get_top_picks(n=top_n, min_score=min_score)
+        )
         
         return {
             "date": datetime.now().strftime("%Y-%m-%d"),
@@ -46,7 +77,8 @@ async def get_daily_picks(
 async def get_stock_signal(
     ticker: str,
     interval: str = Query("5m", description="Data interval"),
-    period: str = Query("1d", description="Data period")
+    period: str = Query("1d", description="Data period"),
+    screener=Depends(get_stock_screener)
 ):
     """
     Get real-time entry/exit signal for a specific stock
@@ -78,25 +110,44 @@ async def get_stock_signal(
 
 @router.get("/scan")
 async def scan_all_stocks(
+    request: Request,
     interval: str = Query("5m", description="Data interval"),
-    period: str = Query("1d", description="Data period")
+    period: str = Query("1d", description="Data period"),
+    stream: bool = Query(False, description="Stream each ticker as soon as it is scored"),
+    screener=Depends(get_stock_screener)
 ):
     """
     Scan all BIST30 stocks and return scores
     
     Returns:
-        All stocks with momentum scores (sorted by score)
+        Stocks that pass the pre-filters (bar count, liquidity, EMA21 > EMA50)
+        with momentum scores (sorted by score), plus per-stage survivor
+        counts and timings under "pipeline"
+    
+    stream=true: Server-Sent Events (NDJSON with Accept: application/x-ndjson);
+        one {"type": "result"} event per ticker as it completes, then a closing
+        {"type": "ranking"} event with total_stocks, stocks and pipeline.
+        Rescored tickers and the ranking are also pushed to the WebSocket
+        'screener' channel.
     """
+    if stream:
+        logger.info("API request: Scan all stocks (stream)")
+        ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+        return _stream_scan(screener, interval, period, ndjson)
+    
     try:
         logger.info("API request: Scan all stocks")
         
-        results = screener.screen_all_stocks(interval, period)
+        results, pipeline = await asyncio.get_running_loop().run_in_executor(
+            None, screener.screen, interval, period
+        )
         
         return {
             "date": datetime.now().strftime("%Y-%m-%d"),
             "market_time": datetime.now().strftime("%H:%M"),
             "total_stocks": len(results),
-            "stocks": results
+            "stocks": results,
+            "pipeline": pipeline
         }
     
     except Exception as e:
@@ -106,7 +157,8 @@ async def scan_all_stocks(
 
 @router.get("/top-movers")
 async def get_top_movers(
-    top_n: int = Query(5, description="Kaç hisse gösterilecek")
+    top_n: int = Query(5, description="Kaç hisse gösterilecek"),
+    screener=Depends(get_stock_screener)
 ):
     """
     🔥 EN ÇOK HAREKET EDEN HİSSELER - BIST30 Günlük
@@ -120,7 +172,10 @@ async def get_top_movers(
     try:
         logger.info(f"API request: Top movers (top {top_n})")
         
-        result = screener.get_top_movers(top_n=top_n)
+        # Bayat fiyat panosu yenilenirken (veya yenileme kilidi beklenirken) event loop bloklanmaz
+        result = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: screener.get_top_movers(top_n=top_n)
+        )
         
         return result
     
@@ -132,7 +187,8 @@ async def get_top_movers(
 @router.get("/morning-picks")
 async def get_morning_picks(
     capital: float = Query(10000, description="Toplam yatırım sermayesi (TL) - Sadece referans"),
-    max_picks: int = Query(5, description="Önerilecek maksimum hisse sayısı")
+    max_picks: int = Query(5, description="Önerilecek maksimum hisse sayısı"),
+    screener=Depends(get_stock_screener)
 ):
     """
     🌅 SABAH 5 HİSSE - Günlük İşlem Stratejisi v2
@@ -159,7 +215,9 @@ async def get_morning_picks(
     try:
         logger.info(f"API request: Morning picks v2 (max: {max_picks})")
         
-        result = screener.get_morning_picks(capital=capital, max_picks=max_picks)
+        result = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: screener.get_morning_picks(capital=capital, max_picks=max_picks)
+        )
         
         return result
     
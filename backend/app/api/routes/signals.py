@@ -3,38 +3,27 @@ Signal generation API endpoints - V2+V3 HYBRID STRATEGY INTEGRATED
 Günde 1 kez çalışır, max 5 sinyal, sektör çeşitlendirmesi aktif
 Her gün 18:30'da otomatik tarama yapılır ve sonuçlar kaydedilir
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from datetime import datetime, date
 from typing import List, Optional
-from app.services.data_fetcher import DataFetcher
-from app.services.technical_analysis import TechnicalAnalysis
-from app.services.signal_generator import SignalGenerator
-from app.services.hybrid_strategy import HybridSignalGenerator, HybridRiskManagement
-from app.services.stock_scheduler import stock_scheduler
+from app.api.dependencies import (
+    get_data_fetcher, get_technical_analysis, get_hybrid_generator, get_stock_scheduler
+)
+from app.constants import DAILY_PICKS_CACHE_TTL, DAILY_PICKS_TICKERS, daily_picks_cache_key
+from app.services.cache_service import cache_service
+from app.services.features import feature_store
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/signals", tags=["signals"])
 
-# Initialize services
-data_fetcher = DataFetcher()
-tech_analysis = TechnicalAnalysis()
-
-# V2+V3 Hybrid Generator (günde 1 kez çalışır)
-hybrid_generator = HybridSignalGenerator()
+# V2+V3 Hybrid Generator (günde 1 kez çalışır) -> get_hybrid_generator()
 
 # BIST30 for daily picks
-BIST30 = [
-    "AKBNK.IS", "AKSEN.IS", "ARCLK.IS", "ASELS.IS", "BIMAS.IS",
-    "EKGYO.IS", "ENKAI.IS", "EREGL.IS", "FROTO.IS", "GARAN.IS",
-    "GUBRF.IS", "HEKTS.IS", "ISCTR.IS", "KCHOL.IS", "KRDMD.IS",
-    "ODAS.IS", "PETKM.IS", "PGSUS.IS", "SAHOL.IS", "SASA.IS",
-    "SISE.IS", "TAVHL.IS", "TCELL.IS", "THYAO.IS", "TKFEN.IS",
-    "TOASO.IS", "TUPRS.IS", "YKBNK.IS"
-]
+BIST30 = DAILY_PICKS_TICKERS
 
 
 @router.get("/market-status")
-async def get_market_status():
+async def get_market_status(hybrid_generator=Depends(get_hybrid_generator)):
     """
     Get current market trading status with V2+V3 Hybrid info
     """
@@ -66,7 +55,7 @@ async def get_market_status():
 
 
 @router.get("/scheduler-status")
-async def get_scheduler_status():
+async def get_scheduler_status(stock_scheduler=Depends(get_stock_scheduler)):
     """
     Get stock scheduler status
     Shows when the daily scan runs (18:30) and last results
@@ -90,7 +79,7 @@ async def get_scheduler_status():
 
 
 @router.get("/saved-picks")
-async def get_saved_daily_picks():
+async def get_saved_daily_picks(stock_scheduler=Depends(get_stock_scheduler)):
     """
     🎯 Kaydedilmiş günlük önerileri döndür
     
@@ -123,7 +112,8 @@ async def get_saved_daily_picks():
 
 @router.get("/picks-history")
 async def get_picks_history(
-    days: int = Query(7, description="Son kaç gün (max 30)")
+    days: int = Query(7, description="Son kaç gün (max 30)"),
+    stock_scheduler=Depends(get_stock_scheduler)
 ):
     """
     Son N günün öneri geçmişini döndür
@@ -144,7 +134,7 @@ async def get_picks_history(
 
 
 @router.post("/run-scan-now")
-async def run_scan_now():
+async def run_scan_now(stock_scheduler=Depends(get_stock_scheduler)):
     """
     Manuel olarak taramayı şimdi çalıştır (test amaçlı)
     """
@@ -163,18 +153,15 @@ async def run_scan_now():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# V2+V3 Hybrid cache - günde 1 kez çalışır
-daily_picks_cache = {
-    "date": None,
-    "data": None
-}
+# V2+V3 Hybrid cache - günde 1 kez çalışır (cache_service, daily_picks_cache_key)
 
 @router.get("/daily-picks")
 async def get_daily_picks(
     strategy: str = Query("hybrid", description="Strategy type (hybrid recommended)"),
     max_picks: int = Query(5, description="Maximum number of picks"),
     min_rr: float = Query(2.0, description="Minimum R/R ratio"),
-    force_refresh: bool = Query(False, description="Force refresh (bypass cache)")
+    force_refresh: bool = Query(False, description="Force refresh (bypass cache)"),
+    hybrid_generator=Depends(get_hybrid_generator)
 ):
     """
     🎯 V2+V3 HYBRID DAILY PICKS
@@ -190,109 +177,26 @@ async def get_daily_picks(
     """
     try:
         today = date.today().isoformat()
+        cache_key = daily_picks_cache_key(max_picks)
         
         # Cache kontrolü - günde 1 kez
-        if not force_refresh and daily_picks_cache["date"] == today and daily_picks_cache["data"]:
-            logger.info("✅ Returning cached V2+V3 Hybrid daily picks")
-            return daily_picks_cache["data"]
+        if not force_refresh:
+            cached = cache_service.get(cache_key)
+            if cached:
+                logger.info("✅ Returning cached V2+V3 Hybrid daily picks")
+                return cached
 
         logger.info(f"🚀 Generating V2+V3 Hybrid daily picks (Date: {today})")
         
-        # Market filter kontrolü (esnek mod - uyarı ver ama engelleme)
-        market_ok, market_msg = hybrid_generator.check_market_filter()
-        market_warnings = []
-        
-        if not market_ok:
-            market_warnings.append(f"⚠️ {market_msg} - DİKKATLİ OLUN!")
-            market_warnings.append("🔴 BIST100 düşüş trendinde - pozisyon boyutunu %50 azaltın")
-            logger.warning(f"Market filter failed but continuing: {market_msg}")
-        
-        # V2+V3 Hybrid tarama (market durumundan bağımsız)
-        result = hybrid_generator.scan_all_stocks(
-            tickers=BIST30,
-            period='3mo',
-            apply_booster=True,
-            force_run=True
-        )
-        
-        # Sinyalleri formatla
-        picks = []
-        for signal in result.get('signals', [])[:max_picks]:
-            entry = signal.get('entry_price', 0)
-            stop = signal.get('stop_loss', 0)
-            tp1 = signal.get('take_profit_1', 0)
-            tp2 = signal.get('take_profit_2', 0)
-            
-            risk_pct = abs((entry - stop) / entry * 100) if entry > 0 else 0
-            reward_pct_1 = abs((tp1 - entry) / entry * 100) if entry > 0 else 0
-            reward_pct_2 = abs((tp2 - entry) / entry * 100) if entry > 0 else 0
-            
-            picks.append({
-                "ticker": signal.get('ticker', ''),
-                "signal": "BUY",
-                "strength": signal.get('strength', 0),
-                "confidence": signal.get('confidence', 0),
-                "entry_price": round(entry, 2),
-                "stop_loss": round(stop, 2),
-                "take_profit": round(tp1, 2),  # TP1 (legacy)
-                "take_profit_1": round(tp1, 2),
-                "take_profit_2": round(tp2, 2),
-                "risk_reward_ratio": signal.get('risk_reward_1', 2.5),
-                "risk_reward_2": signal.get('risk_reward_2', 4.0),
-                "sector": hybrid_generator.SECTOR_MAP.get(
-                    signal.get('ticker', '').replace('.IS', ''), 'Diğer'
-                ),
-                "reasons": signal.get('reasons', []),
-                "exit_strategy": signal.get('exit_strategy', {
-                    "tp1_action": "TP1'de %50 pozisyon kapat",
-                    "tp1_new_stop": "Break-even'a çek",
-                    "tp2_action": "TP2'de kalan %50 kapat"
-                }),
-                "partial_exit_pct": 0.5,
-                "risk_pct": round(risk_pct, 2),
-                "reward_pct": round(reward_pct_1, 2),
-                "reward_pct_2": round(reward_pct_2, 2)
-            })
-        
-        response_data = {
-            "status": "success",
-            "timestamp": datetime.now().isoformat(),
-            "market_status": {
-                "phase": "hybrid_v2_v3_active" if market_ok else "hybrid_v2_v3_caution",
-                "message": market_msg,
-                "tradeable": market_ok,
-                "market_trend": "YUKSELIS" if market_ok else "DUSUS"
-            },
-            "strategy": "hybrid_v2_v3",
-            "total_scanned": result.get('summary', {}).get('total_scanned', len(BIST30)),
-            "signals_found": len(picks),
-            "found": len(picks),
-            "picks": picks,
-            "warnings": market_warnings,
-            "strategy_info": {
-                "name": "V2+V3 Hybrid",
-                "min_score": 75,
-                "max_picks_per_day": 5,
-                "max_per_sector": 1,
-                "partial_exit": "50% at TP1, 50% at TP2",
-                "tp1_rr": "1:2.5",
-                "tp2_rr": "1:4.0",
-                "expected_wr": "62-70%",
-                "expected_pf": "2.5+",
-                "market_filter_passed": market_ok,
-                "win_rate": "62-70%",
-                "profit_factor": "2.5+"
-            },
-            "sectors_used": result.get('summary', {}).get('sectors_used', {}),
-            "market_trend": "YUKSELIS" if market_ok else "DUSUS"
-        }
+        # Lazy: hybrid_strategy pulls in pandas/numpy - keep it off the app import path
+        from app.services.hybrid_strategy import build_daily_picks
+        picks_data = build_daily_picks(hybrid_generator, max_picks=max_picks)
         
-        # Cache güncelle
-        daily_picks_cache["date"] = today
-        daily_picks_cache["data"] = response_data
+        # Cache güncelle (paylaşılan önbellek - açılış öncesi ısınma da buraya yazar)
+        cache_service.set(cache_key, picks_data, ttl=DAILY_PICKS_CACHE_TTL)
         
-        logger.info(f"✅ V2+V3 Hybrid: {len(picks)} picks generated")
-        return response_data
+        logger.info(f"✅ V2+V3 Hybrid: {picks_data['found']} picks generated")
+        return picks_data
     
     except Exception as e:
         logger.error(f"Error generating daily picks: {e}")
@@ -388,7 +292,9 @@ async def get_signals(
     ticker: str,
     strategy: str = Query("moderate", description="Strategy type: conservative, moderate, aggressive"),
     interval: str = Query("1d", description="Data interval"),
-    period: str = Query("3mo", description="Data period")
+    period: str = Query("3mo", description="Data period"),
+    data_fetcher=Depends(get_data_fetcher),
+    tech_analysis=Depends(get_technical_analysis)
 ):
     """
     Generate trading signals for a stock
@@ -419,11 +325,12 @@ async def get_signals(
         if df.empty or len(df) < 20:
             raise HTTPException(status_code=404, detail="Insufficient data for signal generation")
         
-        # Calculate indicators
-        df_with_indicators = tech_analysis.calculate_all_indicators(df)
+        # Calculate indicators (shared per-bar feature frame)
+        df_with_indicators = feature_store.frame(ticker, interval, period, df)
         latest_indicators = tech_analysis.get_latest_indicators(df_with_indicators)
         
         # Generate signal
+        from app.services.signal_generator import SignalGenerator
         signal_gen = SignalGenerator(strategy_type=strategy if strategy != "hybrid" else "moderate")
         signal = signal_gen.generate_signal(df_with_indicators, latest_indicators)
         
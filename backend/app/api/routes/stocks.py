@@ -1,10 +1,10 @@
 """
 Stock data API endpoints
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
-from app.services.data_fetcher import DataFetcher
-from app.services.technical_analysis import TechnicalAnalysis
+from app.api.dependencies import get_data_fetcher, get_technical_analysis
+from app.services.features import feature_store
 from app.utils.logger import logger
 import os
 
@@ -108,16 +108,13 @@ async def debug_yfinance():
     
     return result
 
-# Initialize services
-data_fetcher = DataFetcher()
-tech_analysis = TechnicalAnalysis()
-
 
 @router.get("/{ticker}/data")
 async def get_stock_data(
     ticker: str,
     interval: str = Query("1h", description="Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)"),
-    period: str = Query("1mo", description="Data period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)")
+    period: str = Query("1mo", description="Data period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)"),
+    data_fetcher=Depends(get_data_fetcher)
 ):
     """
     Get stock price data
@@ -174,7 +171,9 @@ async def get_stock_data(
 async def get_indicators(
     ticker: str,
     interval: str = Query("1h", description="Data interval"),
-    period: str = Query("1mo", description="Data period")
+    period: str = Query("1mo", description="Data period"),
+    data_fetcher=Depends(get_data_fetcher),
+    tech_analysis=Depends(get_technical_analysis)
 ):
     """
     Get technical indicators for a stock
@@ -196,8 +195,8 @@ async def get_indicators(
         if df.empty:
             raise HTTPException(status_code=404, detail="No data available")
         
-        # Calculate indicators
-        df_with_indicators = tech_analysis.calculate_all_indicators(df)
+        # Calculate indicators (shared per-bar feature frame)
+        df_with_indicators = feature_store.frame(ticker, interval, period, df)
         latest_indicators = tech_analysis.get_latest_indicators(df_with_indicators)
         
         # Get support/resistance
@@ -226,7 +225,7 @@ async def get_indicators(
 
 
 @router.get("/{ticker}/info")
-async def get_stock_info(ticker: str):
+async def get_stock_info(ticker: str, data_fetcher=Depends(get_data_fetcher)):
     """
     Get stock information
     
@@ -254,7 +253,7 @@ async def get_stock_info(ticker: str):
 
 
 @router.get("/{ticker}/current-price")
-async def get_current_price(ticker: str):
+async def get_current_price(ticker: str, data_fetcher=Depends(get_data_fetcher)):
     """
     Get current price for a stock
     
@@ -6,18 +6,14 @@ import asyncio
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, Depends
 from typing import Optional, List
 from app.services.websocket_manager import ws_manager, ChannelType, WebSocketMessage
-from app.services.data_fetcher import DataFetcher
-from app.services.technical_analysis import TechnicalAnalysis
-from app.services.signal_generator import SignalGenerator
+from app.services.signal_hub import signal_hub
+from app.services.features import LATEST_INDICATORS, feature_store
+from app.api.dependencies import get_data_fetcher, get_technical_analysis
 from app.api.routes.auth import get_current_user_required
 from app.utils.logger import logger
 
 router = APIRouter()
 
-# Initialize services
-data_fetcher = DataFetcher()
-tech_analysis = TechnicalAnalysis()
-
 
 @router.websocket("/ws/stream")
 async def websocket_stream(
@@ -133,6 +129,8 @@ async def price_update_loop(websocket: WebSocket, ticker: str, interval: float =
         ticker: Stock ticker
         interval: Update interval in seconds
     """
+    data_fetcher = get_data_fetcher()
+    tech_analysis = get_technical_analysis()
     consecutive_errors = 0
     max_errors = 5
     
@@ -154,7 +152,7 @@ async def price_update_loop(websocket: WebSocket, ticker: str, interval: float =
                 consecutive_errors = 0
                 
                 # Calculate indicators
-                df_with_indicators = tech_analysis.calculate_all_indicators(df)
+                df_with_indicators = feature_store.frame(ticker, "1m", "1d", df, LATEST_INDICATORS)
                 latest_indicators = tech_analysis.get_latest_indicators(df_with_indicators)
                 
                 # Get latest price
@@ -199,7 +197,9 @@ async def price_update_loop(websocket: WebSocket, ticker: str, interval: float =
 async def websocket_signals(websocket: WebSocket, ticker: str):
     """
     WebSocket endpoint for real-time trading signals
-    Sends signal updates every 5 seconds
+    
+    Viewers of a ticker share one producer (see signal_hub): the current
+    signal is sent on connect, updates only when the signal changes.
     """
     connected = await ws_manager.connect(
         websocket=websocket,
@@ -210,48 +210,19 @@ async def websocket_signals(websocket: WebSocket, ticker: str):
     if not connected:
         return
     
-    signal_generator = SignalGenerator(strategy_type="moderate")
-    last_signal = None
-    
     try:
+        await signal_hub.subscribe(websocket, ticker)
+        
+        # Updates are pushed by the producer; just wait for the client to leave
         while True:
-            try:
-                # Fetch data and generate signal
-                df = data_fetcher.fetch_realtime_data(ticker, interval="5m", period="1d")
-                
-                if not df.empty:
-                    df_with_indicators = tech_analysis.calculate_all_indicators(df)
-                    latest_indicators = tech_analysis.get_latest_indicators(df_with_indicators)
-                    signal = signal_generator.generate_signal(df_with_indicators, latest_indicators)
-                    
-                    # Check if signal changed
-                    current_signal = signal.get("signal") if signal else None
-                    
-                    if signal and current_signal != last_signal:
-                        last_signal = current_signal
-                        
-                        # Broadcast signal
-                        await ws_manager.broadcast_signal(ticker, {
-                            "signal": signal.get("signal"),
-                            "strength": signal.get("strength"),
-                            "confidence": signal.get("confidence"),
-                            "entry_price": signal.get("entry_price"),
-                            "stop_loss": signal.get("stop_loss"),
-                            "take_profit": signal.get("take_profit"),
-                            "reasons": signal.get("reasons", [])
-                        })
-                
-                await asyncio.sleep(5)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Signal update error for {ticker}: {e}")
-                await asyncio.sleep(5)
+            await websocket.receive_text()
     
     except WebSocketDisconnect:
         pass
+    except Exception as e:
+        logger.error(f"Signal WebSocket error for {ticker}: {e}")
     finally:
+        signal_hub.unsubscribe(websocket, ticker)
         ws_manager.disconnect(websocket)
 
 
@@ -320,4 +291,4 @@ async def broadcast_notification(
 @router.get("/ws/stats")
 async def get_websocket_stats():
     """Get WebSocket connection statistics"""
-    return ws_manager.get_stats()
+    return {**ws_manager.get_stats(), "signal_producers": signal_hub.get_stats()}
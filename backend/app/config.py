@@ -47,6 +47,18 @@ class Settings(BaseSettings):
     # Caching
     cache_ttl_realtime: int = 60
     cache_ttl_historical: int = 3600
+    # BIST data: keep until the next open when the market is closed, bar-aligned TTLs in session
+    session_cache_ttl_enabled: bool = True
+    
+    # Market data - derive 5m/15m/1h and shorter daily periods from one base feed per ticker
+    data_resampling_enabled: bool = True
+    # Market data source: "yfinance" (live) or "replay" (recorded bars from replay_data_dir)
+    market_data_provider: str = "yfinance"
+    replay_data_dir: str = "data/replay"
+    replay_speed: float = 0.0  # 0 = frozen at end of recording, N = N recorded seconds per second
+    
+    # Metrics - hot path timers and per-route latency on /metrics (Prometheus format)
+    metrics_enabled: bool = True
     
     # Notifications
     email_enabled: bool = False
@@ -59,6 +71,15 @@ class Settings(BaseSettings):
     
     # AI/LLM
     anthropic_api_key: str = ""
+    anthropic_base_url: str = ""  # override for proxies / local stub servers
+    ai_model: str = "claude-3-haiku-20240307"
+    ai_max_concurrency: int = 8  # concurrent LLM calls per worker
+    ai_timeout_seconds: float = 30.0  # whole completion, including queueing
+    ai_response_cache_size: int = 512  # (response, ticker) slots, refreshed on every new bar
+    ai_history_max_messages: int = 50  # per-user ring buffer
+    ai_history_max_users: int = 1000  # users kept in memory, the rest reload from the DB
+    ai_history_persist: bool = True  # store AI conversations in the database
+    ai_history_refresh_seconds: float = 2.0  # how long a resident history is trusted before re-checking the DB
     openai_api_key: str = ""
     
     # Monitoring
@@ -70,6 +91,7 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = 120
     rate_limit_per_hour: int = 3000
     rate_limit_burst: int = 30
+    rate_limit_backend: str = "memory"  # "redis" shares limits across workers (uses redis_url)
     
     # Security - Set via environment variable in production (Render auto-generates)
     secret_key: str = os.getenv("SECRET_KEY", "dev-only-insecure-key-change-in-production")
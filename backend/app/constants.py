@@ -2,6 +2,8 @@
 Central configuration for BIST stock tickers and constants.
 All modules should import from here to avoid duplication.
 """
+from datetime import date
+from typing import Optional
 
 # BIST 30 Index Constituents (updated periodically)
 BIST30_TICKERS = [
@@ -41,6 +43,24 @@ CACHE_TTL = {
     'signals': 180,           # 3 minutes
 }
 
+# Daily picks (signals/daily-picks ve açılış öncesi ısınma) - burada tutulur ki
+# route'lar hybrid_strategy'yi (pandas/numpy) import etmeden cache'e bakabilsin
+DAILY_PICKS_TICKERS = [
+    "AKBNK.IS", "AKSEN.IS", "ARCLK.IS", "ASELS.IS", "BIMAS.IS",
+    "EKGYO.IS", "ENKAI.IS", "EREGL.IS", "FROTO.IS", "GARAN.IS",
+    "GUBRF.IS", "HEKTS.IS", "ISCTR.IS", "KCHOL.IS", "KRDMD.IS",
+    "ODAS.IS", "PETKM.IS", "PGSUS.IS", "SAHOL.IS", "SASA.IS",
+    "SISE.IS", "TAVHL.IS", "TCELL.IS", "THYAO.IS", "TKFEN.IS",
+    "TOASO.IS", "TUPRS.IS", "YKBNK.IS"
+]
+DAILY_PICKS_CACHE_TTL = 24 * 3600  # key carries the date
+
+
+def daily_picks_cache_key(max_picks: int, day: Optional[date] = None) -> str:
+    """Shared cache key of the daily picks payload (one per day and pick count)"""
+    return f"daily_picks:{(day or date.today()).isoformat()}:{max_picks}"
+
+
 # Market hours (Istanbul timezone, UTC+3)
 MARKET_OPEN_HOUR = 10   # 10:00
 MARKET_CLOSE_HOUR = 18  # 18:00
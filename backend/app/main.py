@@ -5,21 +5,25 @@ Trading Bot API Server
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from app.config import settings
 from app.api.routes import stocks, signals, backtest, indicators, screener, alerts, news, chat, ipo, ai, market
 from app.api.routes import auth, portfolio
 from app.api.routes import websocket as ws_routes
 from app.middleware.rate_limiter import RateLimitMiddleware
+from app.middleware.metrics import MetricsMiddleware
 from app.models.base import init_db
-from app.services.data_fetcher import DataFetcher
-from app.services.technical_analysis import TechnicalAnalysis
+from app.api.dependencies import get_data_fetcher, get_technical_analysis
 from app.services.ipo_service import ipo_service
 from app.services.ipo_scheduler import setup_ipo_scheduler, start_ipo_scheduler, stop_ipo_scheduler
-from app.services.stock_scheduler import setup_stock_scheduler, start_stock_scheduler, stop_stock_scheduler, stock_scheduler
+from app.services.news_service import start_news_refresher, stop_news_refresher
+from app.services.quote_board import start_quote_board, stop_quote_board
+from app.services.stock_scheduler import setup_stock_scheduler, start_stock_scheduler, stop_stock_scheduler
 from app.services.websocket_manager import ws_manager
+from app.services.features import LATEST_INDICATORS, feature_store
 from app.services.cache_service import cache_service
+from app.services.metrics import metrics, get_metrics_summary
 from app.utils.logger import logger
 from datetime import datetime, timezone
 import asyncio
@@ -108,9 +112,14 @@ app.add_middleware(
     requests_per_minute=settings.rate_limit_per_minute,
     requests_per_hour=settings.rate_limit_per_hour,
     burst_limit=settings.rate_limit_burst,
-    enabled=settings.rate_limit_enabled
+    enabled=settings.rate_limit_enabled,
+    backend=settings.rate_limit_backend
 )
 
+# Per-route latency histograms (outermost, so rate-limited requests are measured too)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers - primary /api prefix (current mobile app uses this)
 app.include_router(auth.router, prefix="/api")  # Auth routes first
 app.include_router(portfolio.router, prefix="/api")  # Portfolio routes
@@ -144,10 +153,6 @@ app.include_router(market.router, prefix="/api/v1")
 # Include WebSocket routes
 app.include_router(ws_routes.router, tags=["WebSocket"])
 
-# Initialize services
-data_fetcher = DataFetcher()
-tech_analysis = TechnicalAnalysis()
-
 
 # IPO Auto-update callback
 async def ipo_update_callback():
@@ -232,6 +237,13 @@ async def stock_scan_callback():
         raise
 
 
+# Pre-market warm-up callback - açılış öncesi ısınma
+async def premarket_warmup_callback():
+    """Sabah çıktılarını açılıştan önce hazırla (scheduler tarafından çağrılır - 09:15)"""
+    from app.services.warmup import run_premarket_warmup
+    return await asyncio.get_running_loop().run_in_executor(None, run_premarket_warmup)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup"""
@@ -262,11 +274,23 @@ async def startup_event():
     
     # Stock Scheduler'ı başlat (18:30 günlük tarama)
     try:
-        setup_stock_scheduler(stock_scan_callback)
+        setup_stock_scheduler(stock_scan_callback, premarket_warmup_callback)
         start_stock_scheduler()
-        logger.info("📊 Stock Scheduler started - Daily scan at 18:30")
+        logger.info("📊 Stock Scheduler started - Daily scan at 18:30, warm-up at 09:15")
     except Exception as e:
         logger.error(f"Failed to start Stock Scheduler: {e}")
+    
+    # Haber snapshot'larını arka planda sıcak tut
+    try:
+        start_news_refresher()
+    except Exception as e:
+        logger.error(f"Failed to start news refresher: {e}")
+    
+    # Fiyat panosu: hareketliler, piyasa özeti ve alarmlar bellekten okur
+    try:
+        start_quote_board()
+    except Exception as e:
+        logger.error(f"Failed to start quote board: {e}")
 
 
 @app.on_event("shutdown")
@@ -287,6 +311,24 @@ async def shutdown_event():
         logger.info("📊 Stock Scheduler stopped")
     except Exception as e:
         logger.error(f"Error stopping Stock Scheduler: {e}")
+    
+    try:
+        await stop_news_refresher()
+        logger.info("News refresher stopped")
+    except Exception as e:
+        logger.error(f"Error stopping news refresher: {e}")
+    
+    try:
+        await stop_quote_board()
+        logger.info("Quote board refresher stopped")
+    except Exception as e:
+        logger.error(f"Error stopping quote board: {e}")
+    
+    try:
+        from app.services.signal_hub import signal_hub
+        await signal_hub.stop()
+    except Exception as e:
+        logger.error(f"Error stopping signal producers: {e}")
 
 
 @app.get("/")
@@ -314,15 +356,24 @@ async def health_check():
         "version": "1.1.0",
         "database": "connected" if db_healthy else "disconnected",
         "cache": cache_stats,
+        "cache_hit_ratios": get_metrics_summary(),
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (404 when METRICS_ENABLED=false)"""
+    if not metrics.enabled:
+        return JSONResponse(status_code=404, content={"detail": "Metrics disabled"})
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/api/market-status")
 async def get_market_status():
     """Get market status"""
     try:
-        status = data_fetcher.get_market_status()
+        status = get_data_fetcher().get_market_status()
         return status
     except Exception as e:
         logger.error(f"Error getting market status: {e}")
@@ -377,6 +428,8 @@ async def websocket_endpoint(websocket: WebSocket, ticker: str):
         ticker: Stock ticker symbol
     """
     await manager.connect(websocket, ticker)
+    data_fetcher = get_data_fetcher()
+    tech_analysis = get_technical_analysis()
     
     # Validate ticker first
     if not data_fetcher.validate_ticker(ticker):
@@ -399,7 +452,7 @@ async def websocket_endpoint(websocket: WebSocket, ticker: str):
                     consecutive_errors = 0
                     
                     # Calculate indicators
-                    df_with_indicators = tech_analysis.calculate_all_indicators(df)
+                    df_with_indicators = feature_store.frame(ticker, "1m", "1d", df, LATEST_INDICATORS)
                     latest_indicators = tech_analysis.get_latest_indicators(df_with_indicators)
                     
                     # Get latest price data
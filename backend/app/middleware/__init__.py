@@ -1,10 +1,12 @@
 # Middleware package
 from app.middleware.rate_limiter import RateLimitMiddleware, RouteRateLimiter, api_limiter, auth_limiter, heavy_limiter
+from app.middleware.metrics import MetricsMiddleware
 
 __all__ = [
     "RateLimitMiddleware",
     "RouteRateLimiter", 
     "api_limiter",
     "auth_limiter",
-    "heavy_limiter"
+    "heavy_limiter",
+    "MetricsMiddleware"
 ]
@@ -0,0 +1,47 @@
+"""
+Request Metrics Middleware
+Per-route latency histograms for /metrics
+"""
+import time
+
+from app.services.metrics import HTTP_REQUEST_SECONDS, metrics
+
+
+class MetricsMiddleware:
+    """
+    Records request latency labelled by method, route template and status
+
+    Plain ASGI middleware (no BaseHTTPMiddleware request wrapping) so the
+    per-request overhead stays at two clock reads and one histogram update.
+    Routes are labelled by template ("/api/stocks/{ticker}/data"), not the
+    raw path, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app, exclude_paths: tuple = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not metrics.enabled or scope.get("path") in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope.get("method", ""),
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            )
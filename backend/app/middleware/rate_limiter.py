@@ -1,26 +1,226 @@
 """
 Rate Limiting Middleware for FastAPI
 Prevents API abuse with configurable limits
+
+Uses sliding window counters: per client and window only the current and
+previous window counts are kept, and the request rate is estimated as
+previous * (1 - elapsed_fraction) + current. Memory is O(1) per client,
+idle clients are evicted periodically, and with RATE_LIMIT_BACKEND=redis the
+counters live in Redis (one atomic Lua script per request, which also returns
+the remaining counts for the response headers) so limits hold across workers.
+The Redis round trip runs in the executor, off the event loop.
 """
+import asyncio
+import math
+import threading
 import time
-from collections import defaultdict
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from app.config import settings
 from app.utils.logger import logger
 
+# (limit, window_seconds)
+Window = Tuple[int, int]
+
+
+def _retry_after(current: float, previous: float, limit: int, window: int, now: float) -> int:
+    """Seconds until the sliding estimate drops below `limit` again"""
+    elapsed = now % window
+    if current >= limit or previous <= 0:
+        # Blocked by this window alone: wait for the next one
+        return max(1, math.ceil(window - elapsed))
+    # Solve previous * (1 - (elapsed + t) / window) + current < limit for t
+    wait = window * (1 - (limit - current) / previous) - elapsed
+    return max(1, min(window, math.ceil(wait)))
+
+
+class SlidingWindowCounter:
+    """
+    In-memory sliding window counters keyed by (client key, window)
+    
+    Each entry is [window index, current count, previous count]. Entries whose
+    windows have both passed carry no weight and are dropped by evict_idle(),
+    which hit() runs every `eviction_interval` seconds.
+    """
+    
+    def __init__(self, eviction_interval: int = 60):
+        self._counters: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+        self.eviction_interval = eviction_interval
+        self._last_eviction = 0.0
+    
+    def _load(self, key: str, window: int, now: float) -> list:
+        """Counter entry for (key, window), rolled forward to the current window"""
+        index = int(now // window)
+        entry = self._counters.get((key, window))
+        if entry is None:
+            entry = self._counters[(key, window)] = [index, 0, 0]
+        elif entry[0] != index:
+            entry[2] = entry[1] if entry[0] == index - 1 else 0
+            entry[1] = 0
+            entry[0] = index
+        return entry
+    
+    @staticmethod
+    def _estimate(entry: list, window: int, now: float) -> float:
+        return entry[2] * (1 - (now % window) / window) + entry[1]
+    
+    def hit(self, key: str, windows: List[Window], now: Optional[float] = None) -> Tuple[bool, int, int, List[int]]:
+        """
+        Count one request against every window, or none if any window is full
+        
+        Returns:
+            (allowed, index of the window that blocked (-1 if allowed), retry_after seconds,
+             requests left per window after this one (all 0 when blocked))
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if now - self._last_eviction >= self.eviction_interval:
+                self._evict(now)
+            
+            entries = [self._load(key, window, now) for _, window in windows]
+            for i, ((limit, window), entry) in enumerate(zip(windows, entries)):
+                if self._estimate(entry, window, now) >= limit:
+                    return False, i, _retry_after(entry[1], entry[2], limit, window, now), [0] * len(windows)
+            
+            for entry in entries:
+                entry[1] += 1
+            remaining = [
+                max(0, int(limit - self._estimate(entry, window, now)))
+                for (limit, window), entry in zip(windows, entries)
+            ]
+        return True, -1, 0, remaining
+    
+    def remaining(self, key: str, limit: int, window: int, now: Optional[float] = None) -> int:
+        """Requests left in the window without counting one"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if (key, window) not in self._counters:
+                return limit
+            entry = self._load(key, window, now)
+            return max(0, int(limit - self._estimate(entry, window, now)))
+    
+    def _evict(self, now: float) -> int:
+        idle = [
+            (key, window) for (key, window), entry in self._counters.items()
+            if entry[0] < int(now // window) - 1
+        ]
+        for k in idle:
+            del self._counters[k]
+        self._last_eviction = now
+        return len(idle)
+    
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop counters of clients idle for more than two windows"""
+        with self._lock:
+            return self._evict(time.time() if now is None else now)
+    
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+class RedisSlidingWindowCounter:
+    """
+    Sliding window counters in Redis, shared by all workers
+    
+    Check-and-increment for all windows of a request runs as one Lua script,
+    so concurrent workers can't overshoot a limit. Keys expire after two
+    windows, which takes care of idle clients.
+    """
+    
+    # KEYS: [current, previous] per window; ARGV: now, then [limit, window] per window
+    # Returns {allowed, blocked index, current, previous, remaining per window...}
+    LUA_SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local n = #KEYS / 2
+    for i = 1, n do
+        local limit = tonumber(ARGV[2 * i])
+        local window = tonumber(ARGV[2 * i + 1])
+        local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+        local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+        local elapsed = (now % window) / window
+        if previous * (1 - elapsed) + current >= limit then
+            return {0, i - 1, current, previous}
+        end
+    end
+    local result = {1, -1, 0, 0}
+    for i = 1, n do
+        local limit = tonumber(ARGV[2 * i])
+        local window = tonumber(ARGV[2 * i + 1])
+        local current = redis.call('INCR', KEYS[2 * i - 1])
+        redis.call('EXPIRE', KEYS[2 * i - 1], window * 2)
+        local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+        local elapsed = (now % window) / window
+        result[4 + i] = math.max(0, math.floor(limit - (previous * (1 - elapsed) + current)))
+    end
+    return result
+    """
+    
+    def __init__(self, redis_client, prefix: str = "investia:ratelimit"):
+        self._redis = redis_client
+        self._script = redis_client.register_script(self.LUA_SCRIPT)
+        self.prefix = prefix
+    
+    def _keys(self, key: str, window: int, now: float) -> List[str]:
+        index = int(now // window)
+        return [f"{self.prefix}:{window}:{key}:{index}", f"{self.prefix}:{window}:{key}:{index - 1}"]
+    
+    def hit(self, key: str, windows: List[Window], now: Optional[float] = None) -> Tuple[bool, int, int, List[int]]:
+        """One script round trip; same result as SlidingWindowCounter.hit"""
+        now = time.time() if now is None else now
+        keys, args = [], [now]
+        for limit, window in windows:
+            keys.extend(self._keys(key, window, now))
+            args.extend([limit, window])
+        
+        allowed, index, current, previous, *remaining = self._script(keys=keys, args=args)
+        if allowed:
+            return True, -1, 0, [int(r) for r in remaining]
+        limit, window = windows[index]
+        return False, index, _retry_after(int(current), int(previous), limit, window, now), [0] * len(windows)
+    
+    def remaining(self, key: str, limit: int, window: int, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        current, previous = (int(v or 0) for v in self._redis.mget(self._keys(key, window, now)))
+        estimate = previous * (1 - (now % window) / window) + current
+        return max(0, int(limit - estimate))
+    
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        return 0  # keys expire on their own
+
+
+def create_counter_backend(backend: str = "memory"):
+    """Counter backend for RATE_LIMIT_BACKEND, falling back to memory if Redis is unavailable"""
+    if backend == "redis":
+        try:
+            import redis
+            client = redis.Redis.from_url(
+                settings.redis_url,
+                decode_responses=True,
+                socket_timeout=1,
+                socket_connect_timeout=1
+            )
+            client.ping()
+            logger.info("✅ Rate limiter using Redis backend")
+            return RedisSlidingWindowCounter(client)
+        except Exception as e:
+            logger.warning(f"⚠️ Redis not available for rate limiting, using memory: {e}")
+    return SlidingWindowCounter()
+
 
 class RateLimiter:
     """
-    Token bucket rate limiter implementation
+    Sliding window counter rate limiter (burst / minute / hour)
     """
     
     def __init__(
         self,
         requests_per_minute: int = 60,
         requests_per_hour: int = 1000,
-        burst_limit: int = 10
+        burst_limit: int = 10,
+        backend: str = "memory"
     ):
         """
         Initialize rate limiter
@@ -28,16 +228,24 @@ class RateLimiter:
         Args:
             requests_per_minute: Maximum requests allowed per minute
             requests_per_hour: Maximum requests allowed per hour
-            burst_limit: Maximum burst requests allowed
+            burst_limit: Maximum requests allowed per second
+            backend: Counter storage - "memory" (per process) or "redis" (shared)
         """
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
         self.burst_limit = burst_limit
         
-        # Storage for tracking requests: {ip: [(timestamp, count), ...]}
-        self.minute_requests: Dict[str, list] = defaultdict(list)
-        self.hour_requests: Dict[str, list] = defaultdict(list)
-        self.burst_requests: Dict[str, Tuple[float, int]] = {}
+        self.counters = create_counter_backend(backend)
+        # Shared (network) counters: the middleware checks requests in the executor
+        self.shared = not isinstance(self.counters, SlidingWindowCounter)
+        self._fallback = SlidingWindowCounter() if self.shared else None
+        
+        # Checked together per request; index order matches the error messages below
+        self.windows: List[Window] = [
+            (burst_limit, 1),
+            (requests_per_minute, 60),
+            (requests_per_hour, 3600),
+        ]
         
         # Whitelist for trusted IPs/paths
         self.whitelist_ips = {"127.0.0.1", "::1"}
@@ -50,11 +258,6 @@ class RateLimiter:
             "/api/auth/login/form"
         }
         self.auth_limit_per_minute = 5  # Only 5 login attempts per minute
-        
-    def _clean_old_requests(self, requests: list, window_seconds: int) -> list:
-        """Remove requests older than the time window"""
-        current_time = time.time()
-        return [r for r in requests if current_time - r < window_seconds]
     
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP from request"""
@@ -69,6 +272,16 @@ class RateLimiter:
         
         return request.client.host if request.client else "unknown"
     
+    def _hit(self, key: str, windows: List[Window]) -> Tuple[bool, int, int, List[int]]:
+        """Count a request, using the local counters if the shared backend fails"""
+        try:
+            return self.counters.hit(key, windows)
+        except Exception as e:
+            if self._fallback is None:
+                raise
+            logger.warning(f"Rate limit backend error, using local counters: {e}")
+            return self._fallback.hit(key, windows)
+    
     def is_allowed(self, request: Request) -> Tuple[bool, Optional[str], Optional[int]]:
         """
         Check if request is allowed based on rate limits
@@ -76,79 +289,60 @@ class RateLimiter:
         Returns:
             Tuple of (is_allowed, error_message, retry_after_seconds)
         """
+        return self.check(request)[:3]
+    
+    def check(self, request: Request) -> Tuple[bool, Optional[str], Optional[int], int]:
+        """
+        is_allowed() plus the requests left this minute, from the same counter call
+        
+        Blocking with a shared backend (one Redis round trip) - run it in the executor.
+        
+        Returns:
+            Tuple of (is_allowed, error_message, retry_after_seconds, minute_remaining)
+        """
         client_ip = self._get_client_ip(request)
         path = request.url.path
-        current_time = time.time()
         
         # Check whitelist
         if client_ip in self.whitelist_ips:
-            return True, None, None
+            return True, None, None, self.requests_per_minute
         
         if path in self.whitelist_paths:
-            return True, None, None
+            return True, None, None, self.requests_per_minute
         
         # Stricter rate limiting for auth endpoints (brute force protection)
         if path in self.auth_paths:
-            auth_key = f"auth:{client_ip}"
-            self.minute_requests[auth_key] = self._clean_old_requests(
-                self.minute_requests.get(auth_key, []), 60
-            )
-            if len(self.minute_requests[auth_key]) >= self.auth_limit_per_minute:
-                oldest = min(self.minute_requests[auth_key])
-                retry_after = int(60 - (current_time - oldest)) + 1
+            allowed, _, retry_after, _ = self._hit(f"auth:{client_ip}", [(self.auth_limit_per_minute, 60)])
+            if not allowed:
                 logger.warning(f"Auth rate limit exceeded for IP: {client_ip}")
-                return False, "Çok fazla giriş denemesi. Lütfen bekleyin.", retry_after
-            self.minute_requests[auth_key].append(current_time)
+                return False, "Çok fazla giriş denemesi. Lütfen bekleyin.", retry_after, 0
         
-        # Check burst limit (10 requests per second)
-        if client_ip in self.burst_requests:
-            last_time, count = self.burst_requests[client_ip]
-            if current_time - last_time < 1:  # Within 1 second
-                if count >= self.burst_limit:
-                    logger.warning(f"Burst limit exceeded for IP: {client_ip}")
-                    return False, "Çok hızlı istek gönderiyorsunuz. Lütfen bekleyin.", 1
-                self.burst_requests[client_ip] = (last_time, count + 1)
-            else:
-                self.burst_requests[client_ip] = (current_time, 1)
-        else:
-            self.burst_requests[client_ip] = (current_time, 1)
+        allowed, blocked, retry_after, remaining = self._hit(client_ip, self.windows)
+        if allowed:
+            return True, None, None, remaining[1]
         
-        # Check minute limit
-        self.minute_requests[client_ip] = self._clean_old_requests(
-            self.minute_requests[client_ip], 60
-        )
-        if len(self.minute_requests[client_ip]) >= self.requests_per_minute:
-            oldest = min(self.minute_requests[client_ip])
-            retry_after = int(60 - (current_time - oldest)) + 1
+        if blocked == 0:
+            logger.warning(f"Burst limit exceeded for IP: {client_ip}")
+            return False, "Çok hızlı istek gönderiyorsunuz. Lütfen bekleyin.", retry_after, 0
+        if blocked == 1:
             logger.warning(f"Minute rate limit exceeded for IP: {client_ip}")
-            return False, "Dakikalık istek limitine ulaştınız.", retry_after
-        
-        # Check hour limit
-        self.hour_requests[client_ip] = self._clean_old_requests(
-            self.hour_requests[client_ip], 3600
-        )
-        if len(self.hour_requests[client_ip]) >= self.requests_per_hour:
-            oldest = min(self.hour_requests[client_ip])
-            retry_after = int(3600 - (current_time - oldest)) + 1
-            logger.warning(f"Hourly rate limit exceeded for IP: {client_ip}")
-            return False, "Saatlik istek limitine ulaştınız.", retry_after
-        
-        # Record request
-        self.minute_requests[client_ip].append(current_time)
-        self.hour_requests[client_ip].append(current_time)
-        
-        return True, None, None
+            return False, "Dakikalık istek limitine ulaştınız.", retry_after, 0
+        logger.warning(f"Hourly rate limit exceeded for IP: {client_ip}")
+        return False, "Saatlik istek limitine ulaştınız.", retry_after, 0
     
     def get_remaining(self, request: Request) -> Dict[str, int]:
         """Get remaining requests for client"""
         client_ip = self._get_client_ip(request)
         
-        minute_used = len(self.minute_requests.get(client_ip, []))
-        hour_used = len(self.hour_requests.get(client_ip, []))
+        try:
+            minute_remaining = self.counters.remaining(client_ip, self.requests_per_minute, 60)
+            hour_remaining = self.counters.remaining(client_ip, self.requests_per_hour, 3600)
+        except Exception:
+            minute_remaining, hour_remaining = self.requests_per_minute, self.requests_per_hour
         
         return {
-            "minute_remaining": max(0, self.requests_per_minute - minute_used),
-            "hour_remaining": max(0, self.requests_per_hour - hour_used),
+            "minute_remaining": minute_remaining,
+            "hour_remaining": hour_remaining,
             "minute_limit": self.requests_per_minute,
             "hour_limit": self.requests_per_hour
         }
@@ -165,14 +359,16 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         requests_per_minute: int = 60,
         requests_per_hour: int = 1000,
         burst_limit: int = 10,
-        enabled: bool = True
+        enabled: bool = True,
+        backend: str = "memory"
     ):
         super().__init__(app)
         self.enabled = enabled
         self.rate_limiter = RateLimiter(
             requests_per_minute=requests_per_minute,
             requests_per_hour=requests_per_hour,
-            burst_limit=burst_limit
+            burst_limit=burst_limit,
+            backend=backend if enabled else "memory"
         )
     
     async def dispatch(self, request: Request, call_next):
@@ -181,8 +377,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if not self.enabled:
             return await call_next(request)
         
-        # Check rate limit
-        is_allowed, error_message, retry_after = self.rate_limiter.is_allowed(request)
+        # Check rate limit (Redis round trip off the event loop)
+        if self.rate_limiter.shared:
+            is_allowed, error_message, retry_after, minute_remaining = await asyncio.get_running_loop().run_in_executor(
+                None, self.rate_limiter.check, request
+            )
+        else:
+            is_allowed, error_message, retry_after, minute_remaining = self.rate_limiter.check(request)
         
         if not is_allowed:
             return JSONResponse(
@@ -202,10 +403,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # Process request
         response = await call_next(request)
         
-        # Add rate limit headers to response
-        remaining = self.rate_limiter.get_remaining(request)
-        response.headers["X-RateLimit-Limit"] = str(remaining["minute_limit"])
-        response.headers["X-RateLimit-Remaining"] = str(remaining["minute_remaining"])
+        # Add rate limit headers to response (counts returned by the check above)
+        response.headers["X-RateLimit-Limit"] = str(self.rate_limiter.requests_per_minute)
+        response.headers["X-RateLimit-Remaining"] = str(minute_remaining)
         
         return response
 
@@ -218,20 +418,14 @@ class RouteRateLimiter:
     
     def __init__(self, requests_per_minute: int = 10):
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, list] = defaultdict(list)
+        self.counters = SlidingWindowCounter()
     
     def __call__(self, request: Request):
         """Check if request is allowed"""
         client_ip = self._get_client_ip(request)
-        current_time = time.time()
-        
-        # Clean old requests
-        self.requests[client_ip] = [
-            r for r in self.requests[client_ip]
-            if current_time - r < 60
-        ]
         
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
+        allowed, _, _, _ = self.counters.hit(client_ip, [(self.requests_per_minute, 60)])
+        if not allowed:
             raise HTTPException(
                 status_code=429,
                 detail={
@@ -240,7 +434,6 @@ class RouteRateLimiter:
                 }
             )
         
-        self.requests[client_ip].append(current_time)
         return True
     
     def _get_client_ip(self, request: Request) -> str:
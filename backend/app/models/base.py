@@ -8,6 +8,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool, QueuePool
 from app.config import settings
 from app.utils.logger import logger
+from app.services.metrics import DB_SESSION_SECONDS
 import os
 import ssl
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
@@ -117,7 +118,8 @@ def get_db():
     
     db = SessionLocal()
     try:
-        yield db
+        with DB_SESSION_SECONDS.time():
+            yield db
     finally:
         db.close()
 
@@ -93,3 +93,24 @@ class ChatMessage(Base):
             'trade_data': self.trade_data,
             'created_at': self.created_at.isoformat() if self.created_at else None,
         }
+
+
+class AIConversationMessage(Base):
+    """
+    AI assistant conversation message
+    Backing store for the per-user ring buffers in ConversationStore
+    """
+    __tablename__ = "ai_conversation_messages"
+    __table_args__ = (
+        Index('ix_ai_conversation_messages_user_id_id', 'user_id', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String(100), nullable=False)  # AI route user_id, not necessarily a users.id
+    message_id = Column(String(64), nullable=False)
+    role = Column(String(20), nullable=False)  # user, assistant
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<AIConversationMessage {self.id} user={self.user_id} role={self.role}>"
@@ -1,20 +1,30 @@
 """Trading services - Professional Trading Bot"""
-from app.services.trading_rules import (
-    TradingRulesEngine,
-    get_trading_rules_engine,
-    RiskParameters,
-    MarketPhase,
-    RiskLevel,
-    TradeSignal,
-    MarketAnalysis
-)
-# Hybrid Strategy
-try:
-    from app.services.hybrid_strategy import (
-        HybridSignalGenerator,
-        HybridRiskManagement,
-        HybridSignal,
-        simulate_hybrid_trade
-    )
-except ImportError:
-    pass
\ No newline at end of file
+import importlib
+
+# Re-exports are resolved on first access, so importing any app.services
+# module doesn't pull in trading_rules / hybrid_strategy (pandas, yfinance)
+_EXPORTS = {
+    "TradingRulesEngine": "app.services.trading_rules",
+    "get_trading_rules_engine": "app.services.trading_rules",
+    "RiskParameters": "app.services.trading_rules",
+    "MarketPhase": "app.services.trading_rules",
+    "RiskLevel": "app.services.trading_rules",
+    "TradeSignal": "app.services.trading_rules",
+    "MarketAnalysis": "app.services.trading_rules",
+    # Hybrid Strategy
+    "HybridSignalGenerator": "app.services.hybrid_strategy",
+    "HybridRiskManagement": "app.services.hybrid_strategy",
+    "HybridSignal": "app.services.hybrid_strategy",
+    "simulate_hybrid_trade": "app.services.hybrid_strategy",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
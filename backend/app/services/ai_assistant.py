@@ -2,35 +2,28 @@
 AI Trading Assistant Service
 Trading tavsiyesi ve bilgi sağlayan AI asistan servisi - Claude API Entegrasyonu
 """
+import asyncio
+import importlib.util
 import logging
 import re
 import os
+import weakref
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional, Any
+
+from app.config import settings
+from app.services.conversation_store import ChatMessage, ConversationStore
+from app.services.features import feature_store
+from app.services.response_cache import BarKeyedCache, SingleFlight, bar_marker
 
 logger = logging.getLogger(__name__)
 
-# Claude API
-try:
-    import anthropic  # type: ignore
-    CLAUDE_AVAILABLE = True
-except ImportError:
-    anthropic = None  # type: ignore
-    CLAUDE_AVAILABLE = False
+# Claude API - SDK ilk client oluşturulurken import edilir (import süresi uzun)
+CLAUDE_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+if not CLAUDE_AVAILABLE:
     logger.warning("Anthropic SDK not installed. Using fallback mode.")
 
 
-@dataclass
-class ChatMessage:
-    """Sohbet mesajı"""
-    id: str
-    role: str  # "user" veya "assistant"
-    content: str
-    timestamp: datetime = field(default_factory=datetime.now)
-    metadata: Optional[Dict] = None
-
-
 # Trading konusunda uzmanlaşmış system prompt - PROFESSIONAL TRADING BOT
 TRADING_SYSTEM_PROMPT = """Sen bir Profesyonel AI Trading Asistanısın. BIST (Borsa İstanbul) odaklı günlük trade tavsiyeleri veriyorsun. Türkçe yanıt veriyorsun.
 
@@ -154,27 +147,95 @@ Stop-Loss Yönetimi:
 """
 
 
+# Analiz/özet şablonları değişince artırın - eski önbellek girdileri geçersiz olur
+RESPONSE_TEMPLATE_VERSION = "1"
+
+
 class AITradingAssistant:
     """
     AI Trading Asistan - Claude API + Fallback Kural Tabanlı Sistem
     """
     
-    def __init__(self):
-        self.conversations: Dict[str, List[ChatMessage]] = {}
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.conversations = ConversationStore(
+            max_messages=settings.ai_history_max_messages,
+            max_users=settings.ai_history_max_users,
+            persist=settings.ai_history_persist,
+            refresh_interval=settings.ai_history_refresh_seconds
+        )
         self.knowledge_base = self._init_knowledge_base()
         self.quick_suggestions = self._init_suggestions()
         
-        # Claude API client
+        # LLM çağrıları için eşzamanlılık ve süre sınırı
+        self.max_concurrency = max(1, max_concurrency or settings.ai_max_concurrency)
+        self.timeout = timeout or settings.ai_timeout_seconds
+        
+        # Bar bazlı yanıt önbelleği (hisse analizi, piyasa özeti)
+        self.response_cache = BarKeyedCache("ai_response", max_entries=settings.ai_response_cache_size)
+        self._single_flight = SingleFlight()
+        self._fetcher = None
+        self._technical_analysis = None
+        self._signal_generator = None
+        
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        
+        # Claude API client (async - event loop'u bloklamaz)
         self.claude_client: Any = None
-        api_key = os.getenv("ANTHROPIC_API_KEY")
+        api_key = api_key or settings.anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
+        base_url = base_url or settings.anthropic_base_url or None
         
-        if CLAUDE_AVAILABLE and anthropic and api_key and not api_key.startswith("your-"):
+        if CLAUDE_AVAILABLE and api_key and not api_key.startswith("your-"):
             try:
-                self.claude_client = anthropic.Anthropic(api_key=api_key)
+                import anthropic
+                self.claude_client = anthropic.AsyncAnthropic(
+                    api_key=api_key,
+                    base_url=base_url,
+                    timeout=self.timeout,
+                    max_retries=0
+                )
                 logger.info("Claude API client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Claude client: {e}")
     
+    @property
+    def fetcher(self):
+        if self._fetcher is None:
+            from .data_fetcher import DataFetcher
+            self._fetcher = DataFetcher()
+        return self._fetcher
+    
+    @fetcher.setter
+    def fetcher(self, value):
+        self._fetcher = value
+    
+    @property
+    def technical_analysis(self):
+        if self._technical_analysis is None:
+            from .technical_analysis import TechnicalAnalysis
+            self._technical_analysis = TechnicalAnalysis()
+        return self._technical_analysis
+    
+    @property
+    def signal_generator(self):
+        if self._signal_generator is None:
+            from .signal_generator import SignalGenerator
+            self._signal_generator = SignalGenerator()
+        return self._signal_generator
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Aktif event loop için LLM semaforu (semafor loop'a bağlıdır)"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+    
     def _init_suggestions(self) -> List[str]:
         """Öneri sorularını başlat"""
         return [
@@ -302,40 +363,89 @@ class AITradingAssistant:
         
         return None
     
+    @staticmethod
+    def _build_messages(message: str, conversation_history: List[Dict]) -> List[Dict]:
+        """Conversation history'yi Claude formatına dönüştür (son 10 mesaj + yeni mesaj)"""
+        messages = [
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in conversation_history[-10:]
+        ]
+        messages.append({"role": "user", "content": message})
+        return messages
+    
     async def _get_claude_response(self, message: str, conversation_history: List[Dict], system_prompt: Optional[str] = None) -> Optional[str]:
         """Claude API'den yanıt al"""
         if not self.claude_client:
             return None
         
+        async def _call():
+            async with self._get_semaphore():
+                return await self.claude_client.messages.create(
+                    model=settings.ai_model,
+                    max_tokens=2048,
+                    system=system_prompt or TRADING_SYSTEM_PROMPT,
+                    messages=self._build_messages(message, conversation_history)
+                )
+        
         try:
-            # Conversation history'yi Claude formatına dönüştür
-            messages = []
-            for msg in conversation_history[-10:]:  # Son 10 mesaj
-                messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
-            
-            # Yeni mesajı ekle
-            messages.append({
-                "role": "user",
-                "content": message
-            })
-            
-            # Claude API çağrısı
-            response = self.claude_client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=2048,
-                system=system_prompt or TRADING_SYSTEM_PROMPT,
-                messages=messages
-            )
-            
+            # Timeout semafor kuyruğunu da kapsar
+            response = await asyncio.wait_for(_call(), timeout=self.timeout)
             return response.content[0].text
             
+        except asyncio.TimeoutError:
+            logger.warning(f"Claude API timeout after {self.timeout}s")
+            return None
         except Exception as e:
             logger.error(f"Claude API error: {e}")
             return None
     
+    async def _stream_claude_response(self, message: str, conversation_history: List[Dict], system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Claude yanıtını token token akıt
+        
+        Timeout semafor kuyruğu dahil toplam süreye uygulanır. Hata veya zaman
+        aşımında akış sessizce biter - çağıran taraf hiçbir şey gelmediyse
+        fallback'e düşer.
+        """
+        if not self.claude_client:
+            return
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        semaphore = self._get_semaphore()
+        
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Claude API queue timeout after {self.timeout}s")
+            return
+        
+        try:
+            async with self.claude_client.messages.stream(
+                model=settings.ai_model,
+                max_tokens=2048,
+                system=system_prompt or TRADING_SYSTEM_PROMPT,
+                messages=self._build_messages(message, conversation_history)
+            ) as stream:
+                chunks = stream.text_stream.__aiter__()
+                while True:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    try:
+                        text = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+                    except StopAsyncIteration:
+                        break
+                    if text:
+                        yield text
+        
+        except asyncio.TimeoutError:
+            logger.warning(f"Claude API stream timeout after {self.timeout}s")
+        except Exception as e:
+            logger.error(f"Claude API stream error: {e}")
+        finally:
+            semaphore.release()
+    
     def _generate_fallback_response(self, message: str) -> str:
         """Fallback yanıt üret"""
         message_lower = message.lower()
@@ -367,60 +477,93 @@ Yukarıdaki öneri sorularından seçebilirsiniz!"""
 
 Lütfen daha spesifik bir soru sorun! 🎯"""
     
+    async def _cached_response(
+        self,
+        namespace: str,
+        symbol: str,
+        load: Callable[[], Any],
+        build: Callable[[Any], str]
+    ) -> Optional[str]:
+        """
+        Son bara göre önbelleklenmiş yanıt
+        
+        Anahtar: sembol + son bar + şablon versiyonu. Aynı anda gelen özdeş
+        istekler tek çalıştırmada birleşir; veri çekme ve hesaplama thread'de
+        yapılır. Veri yoksa None döner (önbelleğe yazılmaz).
+        """
+        async def run():
+            df = await asyncio.to_thread(load)
+            bar = bar_marker(df)
+            if bar is None:
+                return None
+            
+            cached = self.response_cache.get(namespace, symbol, bar, RESPONSE_TEMPLATE_VERSION)
+            if cached is not None:
+                return cached
+            
+            text = await asyncio.to_thread(build, df)
+            self.response_cache.set(namespace, symbol, bar, RESPONSE_TEMPLATE_VERSION, text)
+            return text
+        
+        return await self._single_flight.do((namespace, symbol), run)
+    
     async def get_stock_analysis(self, ticker: str) -> str:
         """Hisse için analiz üret"""
+        symbol = f"{ticker}.IS" if not ticker.endswith(".IS") else ticker
         try:
-            from .data_fetcher import DataFetcher
-            from .technical_analysis import TechnicalAnalysis
-            
-            fetcher = DataFetcher()
-            ta = TechnicalAnalysis()
-            
-            symbol = f"{ticker}.IS" if not ticker.endswith(".IS") else ticker
-            df = fetcher.fetch_realtime_data(symbol, interval="1d", period="1mo")
-            
-            if df.empty:
-                return f"⚠️ {ticker} için veri bulunamadı."
-            
-            df_with_ind = ta.calculate_all_indicators(df)
-            latest = ta.get_latest_indicators(df_with_ind)
-            
-            from .signal_generator import SignalGenerator
-            sg = SignalGenerator()
+            analysis = await self._cached_response(
+                "stock_analysis",
+                symbol,
+                lambda: self.fetcher.fetch_realtime_data(symbol, interval="1d", period="1mo"),
+                lambda df: self._build_stock_analysis(ticker, df)
+            )
+            return analysis or f"⚠️ {ticker} için veri bulunamadı."
             
-            # Indicators dict for signal generator
-            indicators_dict = {
-                'trend': {
-                    'ema_9': latest.get('ema_9', 0),
-                    'ema_21': latest.get('ema_21', 0),
-                    'adx': latest.get('adx', 0),
-                },
-                'momentum': {
-                    'rsi': latest.get('rsi', 50),
-                    'macd': latest.get('macd', 0),
-                    'macd_signal': latest.get('macd_signal', 0),
-                    'stoch_k': latest.get('stoch_k', 50),
-                },
-                'volatility': {
-                    'atr': latest.get('atr', 0),
-                    'bb_lower': latest.get('bb_lower', 0),
-                    'bb_middle': latest.get('bb_middle', 0),
-                    'bb_upper': latest.get('bb_upper', 0),
-                },
-                'volume': {
-                    'mfi': latest.get('mfi', 50),
-                }
+        except Exception as e:
+            logger.error(f"Stock analysis error: {e}")
+            return f"⚠️ {ticker} analizi yapılırken hata oluştu."
+    
+    def _build_stock_analysis(self, ticker: str, df) -> str:
+        """Barlardan analiz metnini üret"""
+        ta = self.technical_analysis
+        
+        symbol = f"{ticker}.IS" if not ticker.endswith(".IS") else ticker
+        df_with_ind = feature_store.frame(symbol, "1d", "1mo", df)
+        latest = ta.get_latest_indicators(df_with_ind)
+        
+        # Indicators dict for signal generator
+        indicators_dict = {
+            'trend': {
+                'ema_9': latest.get('ema_9', 0),
+                'ema_21': latest.get('ema_21', 0),
+                'adx': latest.get('adx', 0),
+            },
+            'momentum': {
+                'rsi': latest.get('rsi', 50),
+                'macd': latest.get('macd', 0),
+                'macd_signal': latest.get('macd_signal', 0),
+                'stoch_k': latest.get('stoch_k', 50),
+            },
+            'volatility': {
+                'atr': latest.get('atr', 0),
+                'bb_lower': latest.get('bb_lower', 0),
+                'bb_middle': latest.get('bb_middle', 0),
+                'bb_upper': latest.get('bb_upper', 0),
+            },
+            'volume': {
+                'mfi': latest.get('mfi', 50),
             }
-            signal = sg.generate_signal(df_with_ind, indicators_dict)
-            
-            rsi = latest.get('rsi', 50)
-            macd = latest.get('macd', 0)
-            price = latest.get('close', 0)
-            
-            rsi_status = "Aşırı Alım ⚠️" if rsi > 70 else "Aşırı Satım ⚠️" if rsi < 30 else "Nötr"
-            trend = "Yükseliş 📈" if macd > 0 else "Düşüş 📉"
-            
-            return f"""📊 **{ticker} Teknik Analiz**
+        }
+        signal = self.signal_generator.generate_signal(df_with_ind, indicators_dict)
+        
+        rsi = latest.get('rsi', 50)
+        macd = latest.get('macd', 0)
+        price = latest.get('close', 0)
+        
+        rsi_status = "Aşırı Alım ⚠️" if rsi > 70 else "Aşırı Satım ⚠️" if rsi < 30 else "Nötr"
+        trend = "Yükseliş 📈" if macd > 0 else "Düşüş 📉"
+        
+        return f"""📊 **{ticker} Teknik Analiz**
 
 💰 **Fiyat**: ₺{price:.2f}
 
@@ -431,10 +574,6 @@ Lütfen daha spesifik bir soru sorun! 🎯"""
 🎯 **Sinyal**: {signal.get('signal', 'HOLD').upper()}
 
 ⚠️ *Yatırım tavsiyesi değildir.*"""
-            
-        except Exception as e:
-            logger.error(f"Stock analysis error: {e}")
-            return f"⚠️ {ticker} analizi yapılırken hata oluştu."
     
     async def analyze_portfolio(self, portfolio_data: Dict) -> str:
         """Portföy analizi yap"""
@@ -599,25 +738,34 @@ Kısa ve öz tut, maksimum 5 madde."""
     async def get_market_summary(self) -> str:
         """Piyasa özeti oluştur"""
         try:
-            from .data_fetcher import DataFetcher
-            
-            fetcher = DataFetcher()
-            
             # BIST 100 verisi
-            bist100 = fetcher.fetch_realtime_data("XU100.IS", interval="1d", period="5d")
+            summary = await self._cached_response(
+                "market_summary",
+                "XU100.IS",
+                lambda: self.fetcher.fetch_realtime_data("XU100.IS", interval="1d", period="5d"),
+                self._build_market_summary
+            )
             
-            if bist100.empty:
+            if summary is None:
                 return """📊 **Piyasa Özeti**
 
 ⚠️ Piyasa verisi alınamadı. Lütfen daha sonra tekrar deneyin."""
             
-            latest_price = bist100['close'].iloc[-1]
-            prev_price = bist100['close'].iloc[-2] if len(bist100) > 1 else latest_price
-            change = ((latest_price - prev_price) / prev_price) * 100
+            return summary
             
-            trend = "📈 Yükseliş" if change > 0 else "📉 Düşüş" if change < 0 else "➖ Yatay"
-            
-            return f"""📊 **Piyasa Özeti**
+        except Exception as e:
+            logger.error(f"Market summary error: {e}")
+            return "⚠️ Piyasa özeti alınırken bir hata oluştu."
+    
+    def _build_market_summary(self, bist100) -> str:
+        """BIST 100 barlarından piyasa özeti üret"""
+        latest_price = bist100['close'].iloc[-1]
+        prev_price = bist100['close'].iloc[-2] if len(bist100) > 1 else latest_price
+        change = ((latest_price - prev_price) / prev_price) * 100
+        
+        trend = "📈 Yükseliş" if change > 0 else "📉 Düşüş" if change < 0 else "➖ Yatay"
+        
+        return f"""📊 **Piyasa Özeti**
 
 🏛️ **BIST 100**: {latest_price:,.2f} ({change:+.2f}%)
 {trend}
@@ -627,24 +775,20 @@ Kısa ve öz tut, maksimum 5 madde."""
 • İşlem hacmi ve momentum takip edilmeli
 
 ⚠️ *Yatırım tavsiyesi değildir.*"""
-            
-        except Exception as e:
-            logger.error(f"Market summary error: {e}")
-            return "⚠️ Piyasa özeti alınırken bir hata oluştu."
     
-    async def chat(self, user_id: str, message: str, context: Optional[Dict] = None) -> ChatMessage:
-        """Kullanıcı mesajına yanıt ver"""
-        
-        if user_id not in self.conversations:
-            self.conversations[user_id] = []
+    def _start_chat(self, user_id: str, message: str, context: Optional[Dict] = None) -> tuple:
+        """Claude'a gidecek mesajı, geçmişi ve (henüz kaydedilmemiş) kullanıcı mesajını hazırla"""
+        history = [
+            {"role": msg.role, "content": msg.content}
+            for msg in self.conversations.history(user_id)
+        ]
         
-        # Kullanıcı mesajını kaydet
+        # Kullanıcı mesajı yanıtla birlikte kaydedilir (_finish_chat), geçmiş hep çift kalır
         user_msg = ChatMessage(
             id=f"msg_{datetime.now().timestamp()}",
             role="user",
             content=message
         )
-        self.conversations[user_id].append(user_msg)
         
         # Context varsa (portföy, trade vs.) ekle
         full_message = message
@@ -660,45 +804,83 @@ Kullanıcı Sorusu: {message}"""
 
 Kullanıcı Sorusu: {message}"""
         
-        # Hisse analizi isteniyor mu?
+        return full_message, history, user_msg
+    
+    async def _get_builtin_response(self, message: str) -> Optional[str]:
+        """Hisse analizi / piyasa özeti istekleri Claude'a gitmeden yanıtlanır"""
         ticker = self._extract_ticker(message)
         if ticker and any(word in message.lower() for word in ["analiz", "incele", "bak", "durum", "ne der"]):
-            response_text = await self.get_stock_analysis(ticker)
-        elif any(word in message.lower() for word in ["piyasa", "borsa", "bist", "market", "genel durum"]):
-            response_text = await self.get_market_summary()
-        else:
+            return await self.get_stock_analysis(ticker)
+        if any(word in message.lower() for word in ["piyasa", "borsa", "bist", "market", "genel durum"]):
+            return await self.get_market_summary()
+        return None
+    
+    def _finish_chat(self, user_id: str, user_msg: ChatMessage, response_text: str) -> ChatMessage:
+        """Kullanıcı mesajını ve asistan yanıtını birlikte kaydet"""
+        assistant_msg = ChatMessage(
+            id=f"msg_{datetime.now().timestamp()}_resp",
+            role="assistant",
+            content=response_text
+        )
+        # Geçmiş, yazarken ring buffer ile sınırlanır
+        self.conversations.append(user_id, user_msg)
+        self.conversations.append(user_id, assistant_msg)
+        
+        return assistant_msg
+    
+    async def chat(self, user_id: str, message: str, context: Optional[Dict] = None) -> ChatMessage:
+        """Kullanıcı mesajına yanıt ver"""
+        full_message, history, user_msg = await asyncio.to_thread(self._start_chat, user_id, message, context)
+        
+        response_text = await self._get_builtin_response(message)
+        if response_text is None:
             # Önce Claude API'yi dene
-            history = [
-                {"role": msg.role, "content": msg.content}
-                for msg in self.conversations[user_id][:-1]
-            ]
-            
             response_text = await self._get_claude_response(full_message, history)
             
             # Claude başarısız olduysa fallback
             if not response_text:
                 response_text = self._generate_fallback_response(message)
         
-        # Asistan yanıtını oluştur
-        assistant_msg = ChatMessage(
-            id=f"msg_{datetime.now().timestamp()}_resp",
-            role="assistant",
-            content=response_text
-        )
-        self.conversations[user_id].append(assistant_msg)
+        return await asyncio.to_thread(self._finish_chat, user_id, user_msg, response_text)
+    
+    async def stream_chat(self, user_id: str, message: str, context: Optional[Dict] = None) -> AsyncIterator[str]:
+        """
+        Kullanıcı mesajına yanıtı parça parça üret
         
-        # Geçmişi sınırla
-        if len(self.conversations[user_id]) > 50:
-            self.conversations[user_id] = self.conversations[user_id][-50:]
+        Claude token'ları geldikçe iletilir; hazır yanıtlar (analiz, piyasa
+        özeti, fallback) tek parça gelir. Yanıt akış bitince geçmişe yazılır;
+        istemci yarıda koparsa o ana kadar gönderilen kısım yazılır, hiçbir şey
+        gönderilmediyse kullanıcı mesajı da yazılmaz.
+        """
+        full_message, history, user_msg = await asyncio.to_thread(self._start_chat, user_id, message, context)
+        parts: List[str] = []
         
-        return assistant_msg
+        try:
+            builtin = await self._get_builtin_response(message)
+            if builtin is not None:
+                parts.append(builtin)
+                yield builtin
+            else:
+                async for text in self._stream_claude_response(full_message, history):
+                    parts.append(text)
+                    yield text
+                
+                # Claude hiç yanıt vermediyse fallback
+                if not parts:
+                    fallback = self._generate_fallback_response(message)
+                    parts.append(fallback)
+                    yield fallback
+        finally:
+            if parts:
+                # Kopan istemcide de tamamlanır (iptal edilse bile thread'deki yazma sürer)
+                save = asyncio.get_running_loop().run_in_executor(
+                    None, self._finish_chat, user_id, user_msg, "".join(parts)
+                )
+                await asyncio.shield(save)
     
     def get_conversation_history(self, user_id: str, limit: int = 20) -> List[Dict]:
         """Konuşma geçmişini döndür"""
-        if user_id not in self.conversations:
-            return []
-        
-        messages = self.conversations[user_id][-limit:]
+        messages = self.conversations.history(user_id, limit)
         return [
             {
                 "id": msg.id,
@@ -711,8 +893,7 @@ Kullanıcı Sorusu: {message}"""
     
     def clear_conversation(self, user_id: str):
         """Konuşma geçmişini temizle"""
-        if user_id in self.conversations:
-            del self.conversations[user_id]
+        self.conversations.clear(user_id)
 
 
 # Global instance
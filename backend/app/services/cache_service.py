@@ -6,6 +6,7 @@ import json
 import time
 from typing import Optional, Any
 from app.config import settings
+from app.services.metrics import record_cache
 from app.utils.logger import logger
 
 
@@ -29,32 +30,45 @@ class CacheService:
         
         self._redis = None
         self._memory_cache: dict = {}
-        self._use_redis = False
+        self._redis_ready: Optional[bool] = None  # None = not tried yet
         self._initialized = True
         
-        # Try to connect to Redis
-        if settings.redis_enabled:
-            try:
-                import redis
-                self._redis = redis.Redis.from_url(
-                    settings.redis_url,
-                    decode_responses=True,
-                    socket_timeout=2,
-                    socket_connect_timeout=2,
-                    retry_on_timeout=True
-                )
-                self._redis.ping()
-                self._use_redis = True
-                logger.info("✅ Redis cache connected")
-            except Exception as e:
-                logger.warning(f"⚠️ Redis not available, using memory cache: {e}")
-                self._redis = None
-                self._use_redis = False
-        else:
+        if not settings.redis_enabled:
+            self._redis_ready = False
             logger.info("📦 Using in-memory cache (Redis disabled)")
     
+    @property
+    def _use_redis(self) -> bool:
+        """Connect to Redis on first use (keeps the ping off the import path)"""
+        if self._redis_ready is None:
+            self._redis_ready = self._connect()
+        return self._redis_ready
+    
+    def _connect(self) -> bool:
+        try:
+            import redis
+            self._redis = redis.Redis.from_url(
+                settings.redis_url,
+                decode_responses=True,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+                retry_on_timeout=True
+            )
+            self._redis.ping()
+            logger.info("✅ Redis cache connected")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Redis not available, using memory cache: {e}")
+            self._redis = None
+            return False
+    
     def get(self, key: str) -> Optional[Any]:
         """Get a cached value by key"""
+        value = self._get(key)
+        record_cache("cache_service", value is not None)
+        return value
+    
+    def _get(self, key: str) -> Optional[Any]:
         try:
             if self._use_redis and self._redis:
                 data = self._redis.get(f"investia:{key}")
@@ -0,0 +1,125 @@
+"""
+Conditional HTTP
+Per-URL validators (ETag, Last-Modified, content hash) for polled feeds
+
+Refreshes send If-None-Match / If-Modified-Since; on 304, or when a 200 body
+hashes the same as last time, the caller reuses the previously parsed result
+instead of parsing again. Refresh cost then follows actual changes.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+from app.services.metrics import record_cache
+
+
+@dataclass
+class FeedState:
+    """Validators and last parsed result for one URL"""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    parsed: Any = None
+    changed: bool = True  # did the last check bring new content?
+    checked_at: float = 0.0
+
+
+def content_hash(body: Union[bytes, str]) -> str:
+    if isinstance(body, str):
+        body = body.encode("utf-8", "replace")
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class ValidatorStore:
+    """
+    Bounded per-URL validator store (LRU), safe to use from executor threads
+
+    Typical use:
+        headers.update(store.request_headers(url))
+        if status == 304: return store.not_modified(url).parsed
+        state, changed = store.update(url, body, etag, last_modified)
+        if not changed and state.parsed is not None: return state.parsed
+        store.set_parsed(url, parse(body))
+    """
+
+    def __init__(self, name: str = "feed", max_entries: int = 256):
+        self.name = name
+        self.max_entries = max_entries
+        self._states: "OrderedDict[str, FeedState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[FeedState]:
+        return self._states.get(url)
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for `url` (empty on first fetch)"""
+        state = self._states.get(url)
+        headers: Dict[str, str] = {}
+        # Without a parsed result a 304 would leave us with nothing to serve
+        if state is None or state.parsed is None:
+            return headers
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        return headers
+
+    def not_modified(self, url: str) -> FeedState:
+        """Record a 304 response"""
+        with self._lock:
+            state = self._touch(url)
+            state.changed = False
+            state.checked_at = time.time()
+        record_cache(self.name, True)
+        return state
+
+    def update(
+        self,
+        url: str,
+        body: Union[bytes, str, None] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        digest: Optional[str] = None
+    ) -> Tuple[FeedState, bool]:
+        """
+        Record a 200 response; returns (state, content changed?)
+
+        Pass `digest` instead of `body` when the body isn't read in full.
+        """
+        if digest is None:
+            digest = content_hash(body)
+        with self._lock:
+            state = self._touch(url)
+            changed = digest != state.content_hash or state.parsed is None
+            state.etag = etag or None
+            state.last_modified = last_modified or None
+            state.content_hash = digest
+            state.changed = changed
+            state.checked_at = time.time()
+        record_cache(self.name, not changed)
+        return state, changed
+
+    def set_parsed(self, url: str, parsed: Any):
+        with self._lock:
+            self._touch(url).parsed = parsed
+
+    def changed_since(self, since: float) -> bool:
+        """Did any URL checked after `since` bring new content?"""
+        with self._lock:
+            return any(s.changed for s in self._states.values() if s.checked_at >= since)
+
+    def _touch(self, url: str) -> FeedState:
+        state = self._states.get(url)
+        if state is None:
+            state = self._states[url] = FeedState()
+            while len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(url)
+        return state
+
+    def __len__(self) -> int:
+        return len(self._states)
@@ -0,0 +1,279 @@
+"""
+Conversation Store
+Bounded, DB-backed AI assistant conversation history
+
+Each user's history is a ring buffer (deque with maxlen), so trimming happens
+at write time. Only the most recently active users stay resident; the rest
+are evicted LRU-style and lazily hydrated from the database on next access.
+Every message is written through, so history survives restarts and is shared
+by all workers: a resident buffer remembers the newest row id it holds and is
+re-read when another worker has written since (checked at most every
+`refresh_interval` seconds per user). Without a database the store degrades
+to memory-only.
+
+Database I/O happens under a per-user lock only, so users don't wait on each
+other; the shared lock just guards the in-memory maps.
+
+All methods do blocking database I/O; async callers run them in a thread.
+"""
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+
+from app.models import base as db_base
+from app.models.chat import AIConversationMessage
+from app.utils.logger import logger
+
+
+@dataclass
+class ChatMessage:
+    """Sohbet mesajı"""
+    id: str
+    role: str  # "user" veya "assistant"
+    content: str
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
+class ConversationStore:
+    """
+    Per-user ring buffers with a global LRU cap on resident users
+
+    Args:
+        max_messages: Messages kept per user (memory and database)
+        max_users: Users kept resident in memory
+        persist: Write through to / hydrate from the database
+        refresh_interval: Seconds a resident buffer is trusted before checking for writes from other workers
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(
+        self,
+        max_messages: int = 50,
+        max_users: int = 1000,
+        persist: bool = True,
+        refresh_interval: float = 2.0
+    ):
+        self.max_messages = max_messages
+        self.max_users = max_users
+        self.persist = persist
+        self.refresh_interval = refresh_interval
+        self._buffers: "OrderedDict[str, Deque[ChatMessage]]" = OrderedDict()
+        self._versions: Dict[str, Optional[int]] = {}  # user -> newest persisted row id in the buffer
+        self._checked: Dict[str, float] = {}  # user -> monotonic time the buffer was last known fresh
+        self._lock = threading.Lock()  # maps only, never held across I/O
+        # Striped per-user locks: bounded memory, unrelated users rarely share one
+        self._user_locks = [threading.RLock() for _ in range(self.LOCK_STRIPES)]
+        self._table_ready = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, user_id: str) -> Deque[ChatMessage]:
+        """User's buffer, hydrated from the database if not resident or written elsewhere"""
+        buffer = self._resident(user_id, fresh_only=True)
+        if buffer is not None:
+            return buffer
+
+        with self._user_lock(user_id):
+            buffer = self._resident(user_id, fresh_only=True)
+            if buffer is not None:
+                return buffer
+
+            buffer = self._resident(user_id)
+            if buffer is not None and self._latest_id(user_id) == self._versions.get(user_id):
+                self._mark_fresh(user_id)
+                return buffer
+
+            messages, version = self._load(user_id)
+            buffer = deque(messages, maxlen=self.max_messages)
+            with self._lock:
+                self._buffers[user_id] = buffer
+                self._buffers.move_to_end(user_id)
+                self._versions[user_id] = version
+                self._checked[user_id] = time.monotonic()
+                self._evict()
+            return buffer
+
+    def append(self, user_id: str, message: ChatMessage):
+        """Append a message; the oldest one falls off once the buffer is full"""
+        with self._user_lock(user_id):
+            self.get(user_id).append(message)
+            previous, saved = self._save(user_id, message)
+            if saved is None:
+                return
+            with self._lock:
+                if previous == self._versions.get(user_id):
+                    self._versions[user_id] = saved
+                else:
+                    # Another worker wrote in between: re-read on next access
+                    self._versions.pop(user_id, None)
+                    self._checked.pop(user_id, None)
+
+    def history(self, user_id: str, limit: Optional[int] = None) -> List[ChatMessage]:
+        """Last `limit` messages, oldest first"""
+        messages = list(self.get(user_id))
+        return messages[-limit:] if limit else messages
+
+    def clear(self, user_id: str):
+        """Forget a user's history everywhere"""
+        with self._user_lock(user_id):
+            with self._lock:
+                self._buffers.pop(user_id, None)
+                self._versions.pop(user_id, None)
+                self._checked.pop(user_id, None)
+            self._delete(user_id)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._buffers
+
+    def __len__(self) -> int:
+        """Resident users"""
+        return len(self._buffers)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _user_lock(self, user_id: str) -> threading.RLock:
+        # crc32, not hash(): stable stripe per user across processes and runs
+        return self._user_locks[zlib.crc32(user_id.encode()) % self.LOCK_STRIPES]
+
+    def _resident(self, user_id: str, fresh_only: bool = False) -> Optional[Deque[ChatMessage]]:
+        """Resident buffer (bumped in the LRU); with fresh_only, only if checked within refresh_interval"""
+        with self._lock:
+            buffer = self._buffers.get(user_id)
+            if buffer is None:
+                return None
+            if fresh_only:
+                checked = self._checked.get(user_id)
+                if checked is None or time.monotonic() - checked >= self.refresh_interval:
+                    return None
+            self._buffers.move_to_end(user_id)
+            return buffer
+
+    def _mark_fresh(self, user_id: str):
+        with self._lock:
+            if user_id in self._buffers:
+                self._checked[user_id] = time.monotonic()
+
+    def _evict(self):
+        while len(self._buffers) > self.max_users:
+            user_id, _ = self._buffers.popitem(last=False)
+            self._versions.pop(user_id, None)
+            self._checked.pop(user_id, None)
+
+    def _session(self):
+        """DB session, or None when persistence is off / unavailable"""
+        if not self.persist:
+            return None
+        if db_base.SessionLocal is None and not db_base._init_database():
+            return None
+        if not self._table_ready:
+            try:
+                AIConversationMessage.__table__.create(bind=db_base.engine, checkfirst=True)
+                self._table_ready = True
+            except Exception as e:
+                logger.warning(f"AI conversation table not available, using memory only: {e}")
+                return None
+        return db_base.SessionLocal()
+
+    def _latest_id(self, user_id: str) -> Optional[int]:
+        """Newest persisted row id of a user; the resident version when there is no database"""
+        db = self._session()
+        if db is None:
+            return self._versions.get(user_id)
+        try:
+            return db.execute(
+                select(func.max(AIConversationMessage.id)).where(AIConversationMessage.user_id == user_id)
+            ).scalar()
+        except Exception as e:
+            logger.warning(f"Could not check AI conversation for {user_id}: {e}")
+            return self._versions.get(user_id)
+        finally:
+            db.close()
+
+    def _load(self, user_id: str) -> Tuple[List[ChatMessage], Optional[int]]:
+        """(messages oldest first, newest row id)"""
+        db = self._session()
+        if db is None:
+            return [], None
+        try:
+            rows = db.execute(
+                select(AIConversationMessage)
+                .where(AIConversationMessage.user_id == user_id)
+                .order_by(AIConversationMessage.id.desc())
+                .limit(self.max_messages)
+            ).scalars().all()
+            messages = [
+                ChatMessage(id=row.message_id, role=row.role, content=row.content, timestamp=row.created_at)
+                for row in reversed(rows)
+            ]
+            return messages, rows[0].id if rows else None
+        except Exception as e:
+            logger.warning(f"Could not load AI conversation for {user_id}: {e}")
+            return [], None
+        finally:
+            db.close()
+
+    def _save(self, user_id: str, message: ChatMessage) -> Tuple[Optional[int], Optional[int]]:
+        """Write through; returns (newest row id before the insert, inserted row id)"""
+        db = self._session()
+        if db is None:
+            return None, None
+        try:
+            previous = db.execute(
+                select(func.max(AIConversationMessage.id)).where(AIConversationMessage.user_id == user_id)
+            ).scalar()
+            row = AIConversationMessage(
+                user_id=user_id,
+                message_id=message.id,
+                role=message.role,
+                content=message.content,
+                created_at=message.timestamp,
+            )
+            db.add(row)
+            db.flush()
+            saved = row.id
+
+            # Trim the persisted history to the same size as the ring buffer
+            keep = (
+                select(AIConversationMessage.id)
+                .where(AIConversationMessage.user_id == user_id)
+                .order_by(AIConversationMessage.id.desc())
+                .limit(self.max_messages)
+                .scalar_subquery()
+            )
+            db.execute(
+                delete(AIConversationMessage)
+                .where(AIConversationMessage.user_id == user_id)
+                .where(AIConversationMessage.id.not_in(keep))
+            )
+            db.commit()
+            return previous, saved
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not persist AI message for {user_id}: {e}")
+            return None, None
+        finally:
+            db.close()
+
+    def _delete(self, user_id: str):
+        db = self._session()
+        if db is None:
+            return
+        try:
+            db.execute(delete(AIConversationMessage).where(AIConversationMessage.user_id == user_id))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not delete AI conversation for {user_id}: {e}")
+        finally:
+            db.close()
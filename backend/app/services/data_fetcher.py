@@ -1,14 +1,18 @@
 """
-Data fetching service for stock market data using yfinance
+Data fetching service for stock market data
 Supports real-time and historical data with caching
+Bars come from a pluggable provider (yfinance by default, see data_providers)
 With fallback to mock data for serverless environments
 """
-import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from app.utils.logger import logger
 from app.services.cache_service import cache_service
+from app.services.data_providers import MarketDataProvider, get_market_data_provider, slice_period
+from app.services.market_calendar import bist_calendar, is_bist_symbol
+from app.services.metrics import DATA_FETCH_SECONDS, PROVIDER_FETCH_SECONDS, record_cache
+from app.config import settings
 import time
 import os
 import random
@@ -16,11 +20,32 @@ import numpy as np
 
 
 class DataFetcher:
-    """Service for fetching stock data from yfinance with mock data fallback"""
+    """Service for fetching stock data from a market data provider with mock data fallback"""
     
     # Class-level cache for better memory management
     _shared_cache: Dict[str, Dict[str, Any]] = {}
     
+    # Derived (resampled) frames, memoized per base bar close
+    _resample_cache: Dict[str, Dict[str, Any]] = {}
+    
+    # Base feeds kept per ticker; coarser views are derived from these
+    INTRADAY_BASE = ("1m", "5d")
+    DAILY_BASE = ("1d", "1y")
+    INTRADAY_BASE_PERIODS = {"1d", "5d"}
+    DAILY_BASE_PERIODS = {"1d", "5d", "1mo", "3mo", "6mo", "1y", "ytd"}
+    
+    # Intraday interval -> pandas resample rule (None = base resolution)
+    INTRADAY_RESAMPLE_RULES = {
+        "1m": None,
+        "2m": "2min",
+        "5m": "5min",
+        "15m": "15min",
+        "30m": "30min",
+        "60m": "60min",
+        "90m": "90min",
+        "1h": "60min",
+    }
+    
     # Base prices for mock data generation (approximate real prices in TRY)
     MOCK_BASE_PRICES = {
         # BIST Hisseleri
@@ -81,11 +106,19 @@ class DataFetcher:
         "^DJI": 44500.0,       # Dow Jones
     }
     
-    def __init__(self):
-        """Initialize the data fetcher"""
+    def __init__(self, provider: Optional[MarketDataProvider] = None):
+        """
+        Initialize the data fetcher
+        
+        Args:
+            provider: Market data source; defaults to the configured provider
+        """
+        self._provider = provider
         self.cache = DataFetcher._shared_cache  # Use shared cache
-        self.cache_ttl: int = 300  # 5 minutes - prevents Yahoo Finance rate limiting
+        self.cache_ttl: int = 300  # 5 minutes - prevents Yahoo Finance rate limiting (non-BIST symbols)
         self.use_mock_data = os.getenv("VERCEL") == "1"  # Use mock data on Vercel
+        # Mock data is generated locally, deriving it from a base feed saves nothing
+        self.resampling_enabled = settings.data_resampling_enabled and not self.use_mock_data
         
         # BIST 30 + Altın hisseleri
         self.bist30_tickers = [
@@ -122,6 +155,15 @@ class DataFetcher:
         
         logger.info(f"DataFetcher initialized (mock_data={self.use_mock_data})")
     
+    @property
+    def provider(self) -> MarketDataProvider:
+        """Provider used for this fetcher (resolved lazily so overrides apply)"""
+        return self._provider or get_market_data_provider()
+    
+    def _mock_allowed(self) -> bool:
+        """Mock data is only a fallback for live providers, never for recorded data"""
+        return self.provider.allow_mock_fallback
+    
     def _generate_mock_data(self, ticker: str, interval: str, period: str) -> pd.DataFrame:
         """
         Generate realistic mock stock data for demo purposes
@@ -241,8 +283,7 @@ class DataFetcher:
             return True
         
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self.provider.fetch_info(ticker)
             
             if not info or 'symbol' not in info:
                 logger.warning(f"Invalid ticker: {ticker}")
@@ -267,10 +308,85 @@ class DataFetcher:
         if cache_key not in self.cache:
             return False
         
-        cached_time = self.cache[cache_key].get('timestamp', 0)
+        entry = self.cache[cache_key]
         current_time = time.time()
+        if 'expires' in entry:
+            return current_time < entry['expires']
+        
+        return (current_time - entry.get('timestamp', 0)) < self.cache_ttl
+    
+    def _entry_ttl(self, ticker: str, interval: str) -> float:
+        """Cache lifetime of a fresh (ticker, interval) feed; BIST follows the trading calendar"""
+        if settings.session_cache_ttl_enabled and is_bist_symbol(ticker):
+            return bist_calendar.data_ttl(interval)
+        return self.cache_ttl
+    
+    def _get_resample_base(self, interval: str, period: str) -> Optional[tuple]:
+        """
+        Return the (interval, period) base feed a request can be derived from,
+        or None if it has to be fetched directly from the provider
+        """
+        if not self.resampling_enabled:
+            return None
+        
+        if interval in self.INTRADAY_RESAMPLE_RULES and period in self.INTRADAY_BASE_PERIODS:
+            return self.INTRADAY_BASE
+        
+        if interval == self.DAILY_BASE[0] and period in self.DAILY_BASE_PERIODS:
+            return self.DAILY_BASE
+        
+        return None
+    
+    def _resample_ohlcv(self, df: pd.DataFrame, interval: str) -> pd.DataFrame:
+        """Aggregate base bars into coarser OHLCV bars aligned to the clock"""
+        rule = self.INTRADAY_RESAMPLE_RULES[interval]
+        if rule is None or df.empty:
+            return df
+        
+        agg = {col: 'sum' for col in df.columns}
+        agg.update({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
         
-        return (current_time - cached_time) < self.cache_ttl
+        resampled = df.resample(rule, label='left', closed='left').agg(agg)
+        # Drop empty buckets (overnight gaps, auction breaks)
+        return resampled.dropna(subset=['open'])
+    
+    def _fetch_resampled(self, ticker: str, interval: str, period: str, base: tuple) -> pd.DataFrame:
+        """
+        Derive (interval, period) bars from the ticker's base feed
+        
+        The base feed is fetched and cached like any other request. Derived frames
+        are memoized per base bar close, so every view of a ticker is built from the
+        same bars and is only recomputed when the base feed changes.
+        """
+        base_df = self.fetch_realtime_data(ticker, interval=base[0], period=base[1])
+        if base_df.empty or not {'open', 'high', 'low', 'close', 'volume'}.issubset(base_df.columns):
+            return pd.DataFrame()
+        
+        # Never derive real views from a mock base - let the direct request try the provider
+        base_entry = self.cache.get(self._get_cache_key(ticker, base[0], base[1]), {})
+        if base_entry.get('mock'):
+            return pd.DataFrame()
+        
+        memo_key = self._get_cache_key(ticker, interval, period)
+        marker = (base_df.index[-1], float(base_df['close'].iloc[-1]), len(base_df))
+        
+        memo = self._resample_cache.get(memo_key)
+        record_cache("resample", memo is not None and memo['marker'] == marker)
+        if memo is not None and memo['marker'] == marker:
+            return memo['data'].copy()
+        
+        intraday = base == self.INTRADAY_BASE
+        try:
+            df = slice_period(base_df, period, intraday=intraday)
+            if intraday:
+                df = self._resample_ohlcv(df, interval)
+        except Exception as e:
+            logger.warning(f"Could not derive {interval}/{period} bars for {ticker}: {e}")
+            return pd.DataFrame()
+        
+        self._resample_cache[memo_key] = {'marker': marker, 'data': df.copy()}
+        logger.debug(f"Derived {len(df)} {interval}/{period} bars for {ticker} from {base[0]}/{base[1]} base feed")
+        return df
     
     def fetch_realtime_data(
         self, 
@@ -281,6 +397,10 @@ class DataFetcher:
         """
         Fetch real-time stock data
         
+        Intraday requests up to 5d and daily requests up to 1y are derived from one
+        base feed per ticker (1m/5d and 1d/1y) instead of a provider call per
+        (interval, period) pair.
+        
         Args:
             ticker: Stock ticker symbol (e.g., "TRALT.IS")
             interval: Data interval - 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo
@@ -289,66 +409,130 @@ class DataFetcher:
         Returns:
             DataFrame with columns: Open, High, Low, Close, Volume, and datetime index
         """
+        start = time.perf_counter()
+        
+        base = self._get_resample_base(interval, period)
+        if base is not None and base != (interval, period):
+            df = self._fetch_resampled(ticker, interval, period, base)
+            if not df.empty:
+                DATA_FETCH_SECONDS.observe(time.perf_counter() - start, source="derived")
+                return df
+            logger.info(f"Base feed unavailable for {ticker}, fetching {interval}/{period} directly")
+        
         cache_key = self._get_cache_key(ticker, interval, period)
         
         # Check cache first
-        if self._is_cache_valid(cache_key):
+        cache_hit = self._is_cache_valid(cache_key)
+        record_cache("data_fetcher", cache_hit)
+        if cache_hit:
             logger.info(f"Returning cached data for {ticker}")
-            return self.cache[cache_key]['data'].copy()
+            df = self.cache[cache_key]['data'].copy()
+            DATA_FETCH_SECONDS.observe(time.perf_counter() - start, source="cache")
+            return df
         
         df = pd.DataFrame()
         
-        # Try yfinance first (unless we know it won't work on Vercel)
+        # Try the provider first (unless we know it won't work on Vercel)
         if not self.use_mock_data:
             try:
                 logger.info(f"Fetching real-time data for {ticker} (interval={interval}, period={period})")
+                with PROVIDER_FETCH_SECONDS.time(provider=self.provider.name, call="bars"):
+                    df = self.provider.fetch_bars(ticker, interval, period)
                 
-                stock = yf.Ticker(ticker)
-                
-                # Add timeout and better error handling for yfinance
-                try:
-                    df = stock.history(period=period, interval=interval, timeout=15)
-                except TypeError:
-                    # Older yfinance versions don't support timeout parameter
-                    df = stock.history(period=period, interval=interval)
-                except Exception as hist_err:
-                    logger.error(f"yfinance history error for {ticker}: {hist_err}")
-                    df = pd.DataFrame()
-                
-                # Handle None return from yfinance
-                if df is None:
-                    df = pd.DataFrame()
-                
-                # Check if df is actually a DataFrame
-                if not isinstance(df, pd.DataFrame):
-                    logger.warning(f"yfinance returned unexpected type {type(df)} for {ticker}")
-                    df = pd.DataFrame()
-                    
                 if not df.empty:
-                    # Clean column names - check if columns exist
-                    if hasattr(df, 'columns') and df.columns is not None and len(df.columns) > 0:
-                        df.columns = df.columns.str.lower()
-                    
                     logger.info(f"Successfully fetched {len(df)} real data points for {ticker}")
                     
             except Exception as e:
                 logger.error(f"Error fetching real-time data for {ticker}: {type(e).__name__}: {str(e)}")
                 df = pd.DataFrame()
         
-        # Fallback to mock data if yfinance failed or we're on Vercel
-        if df.empty:
+        df = self._store(ticker, interval, period, df)
+        source = "mock" if self.cache.get(cache_key, {}).get('mock') else "provider"
+        DATA_FETCH_SECONDS.observe(time.perf_counter() - start, source=source)
+        return df
+    
+    def _store(self, ticker: str, interval: str, period: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Cache provider bars, falling back to mock data if the provider returned nothing"""
+        # Fallback to mock data if the provider failed or we're on Vercel
+        is_mock = df.empty and (self.use_mock_data or self._mock_allowed())
+        if is_mock:
             logger.info(f"Using mock data for {ticker} (Vercel={self.use_mock_data})")
             df = self._generate_mock_data(ticker, interval, period)
         
         # Cache the data
         if not df.empty:
-            self.cache[cache_key] = {
+            now = time.time()
+            self.cache[self._get_cache_key(ticker, interval, period)] = {
                 'data': df.copy(),
-                'timestamp': time.time()
+                'timestamp': now,
+                'expires': now + self._entry_ttl(ticker, interval),
+                'mock': is_mock
             }
         
         return df
     
+    def fetch_realtime_data_batch(
+        self,
+        tickers: List[str],
+        interval: str = "5m",
+        period: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch real-time data for many tickers with one provider round trip
+        
+        Feeds that are missing from the cache (the base feed when the request can be
+        derived) are downloaded in a single batch call, then every result is served
+        through fetch_realtime_data from the warm cache.
+        
+        Args:
+            tickers: Stock ticker symbols
+            interval: Data interval
+            period: Data period
+        
+        Returns:
+            Dict of ticker -> DataFrame (empty frames are omitted)
+        """
+        base = self._get_resample_base(interval, period)
+        feed = base if base is not None else (interval, period)
+        
+        missing = [
+            t for t in tickers
+            if not self._is_cache_valid(self._get_cache_key(t, *feed))
+        ]
+        
+        if missing and not self.use_mock_data:
+            try:
+                logger.info(f"Batch fetching {len(missing)} tickers (interval={feed[0]}, period={feed[1]})")
+                with PROVIDER_FETCH_SECONDS.time(provider=self.provider.name, call="bars_batch"):
+                    frames = self.provider.fetch_bars_batch(missing, feed[0], feed[1])
+            except Exception as e:
+                logger.error(f"Error batch fetching {len(missing)} tickers: {type(e).__name__}: {str(e)}")
+                frames = {}
+            
+            # Only cache real bars here; tickers the batch missed get the regular per-ticker path
+            for ticker, df in frames.items():
+                if df is not None and not df.empty:
+                    self._store(ticker, feed[0], feed[1], df)
+        
+        results = {}
+        for ticker in tickers:
+            df = self.fetch_realtime_data(ticker, interval=interval, period=period)
+            if not df.empty:
+                results[ticker] = df
+        return results
+    
+    def prefetch(self, tickers: List[str], feeds: List[tuple]) -> int:
+        """
+        Warm the cache: one batch fetch per (interval, period) feed
+        
+        Returns:
+            Number of (ticker, feed) frames now cached
+        """
+        return sum(
+            len(self.fetch_realtime_data_batch(tickers, interval, period))
+            for interval, period in feeds
+        )
+    
     def fetch_historical_data(
         self, 
         ticker: str, 
@@ -369,33 +553,12 @@ class DataFetcher:
         try:
             logger.info(f"Fetching historical data for {ticker} from {start_date} to {end_date}")
             
-            stock = yf.Ticker(ticker)
-            
-            # Add timeout and better error handling for yfinance
-            try:
-                df = stock.history(start=start_date, end=end_date, timeout=10)
-            except TypeError:
-                # Older yfinance versions don't support timeout parameter
-                df = stock.history(start=start_date, end=end_date)
-            
-            # Handle None return from yfinance
-            if df is None:
-                logger.warning(f"yfinance returned None for {ticker}")
-                return pd.DataFrame()
-            
-            # Check if df is actually a DataFrame
-            if not isinstance(df, pd.DataFrame):
-                logger.warning(f"yfinance returned unexpected type {type(df)} for {ticker}")
-                return pd.DataFrame()
+            df = self.provider.fetch_history(ticker, start_date, end_date)
                 
             if df.empty:
                 logger.warning(f"No historical data returned for {ticker}")
                 return pd.DataFrame()
             
-            # Clean column names - check if columns exist
-            if hasattr(df, 'columns') and df.columns is not None and len(df.columns) > 0:
-                df.columns = df.columns.str.lower()
-            
             logger.info(f"Successfully fetched {len(df)} historical data points for {ticker}")
             return df
             
@@ -413,23 +576,19 @@ class DataFetcher:
         Returns:
             Current price or None if unavailable
         """
-        # Check centralized cache first (60s TTL for prices)
+        # Check centralized cache first (60s TTL for prices, BIST: until the next open when closed)
         cache_key = f"price:{ticker}"
         cached = cache_service.get(cache_key)
         if cached is not None:
             return cached
 
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
-            # Try different price fields
-            price = info.get('currentPrice') or info.get('regularMarketPrice') or info.get('previousClose')
+            quote = self.provider.fetch_quote(ticker)
+            price = quote['price'] if quote else None
             
             if price:
-                price = float(price)
-                # Cache for 60 seconds
-                cache_service.set(cache_key, price, ttl=60)
+                ttl = bist_calendar.ttl(60) if settings.session_cache_ttl_enabled and is_bist_symbol(ticker) else 60
+                cache_service.set(cache_key, price, ttl=ttl)
                 logger.info(f"Current price for {ticker}: {price}")
                 return price
             else:
@@ -447,25 +606,24 @@ class DataFetcher:
         Returns:
             Dictionary with market status information
         """
-        # Check cache (30s TTL)
+        # Check cache (30s TTL in session, until the next open otherwise)
         cached = cache_service.get("market_status")
         if cached is not None:
             return cached
 
         try:
             # Get BIST 100 index as market indicator
-            bist = yf.Ticker("XU100.IS")
-            info = bist.info
+            info = self.provider.fetch_info("XU100.IS")
             
             status = {
                 "market": "BIST",
-                "is_open": True,  # Simplified - would need real-time API for actual status
+                "is_open": bist_calendar.is_open(),
                 "current_time": datetime.now().isoformat(),
                 "index_price": info.get('regularMarketPrice', 'N/A')
             }
             
             logger.info("Market status retrieved")
-            cache_service.set("market_status", status, ttl=30)
+            cache_service.set("market_status", status, ttl=bist_calendar.ttl(30) if settings.session_cache_ttl_enabled else 30)
             return status
             
         except Exception as e:
@@ -488,8 +646,7 @@ class DataFetcher:
             Dictionary with stock information
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self.provider.fetch_info(ticker)
             
             # Extract relevant information
             stock_info = {
@@ -518,4 +675,5 @@ class DataFetcher:
     def clear_cache(self):
         """Clear all cached data"""
         self.cache.clear()
+        self._resample_cache.clear()
         logger.info("Cache cleared")
@@ -0,0 +1,380 @@
+"""
+Market Data Providers
+Pluggable sources for OHLCV bars and quotes used by DataFetcher
+
+- YFinanceProvider: live data from Yahoo Finance (default)
+- ReplayProvider: deterministic replay of recorded bars from local CSV files,
+  for load tests and benchmarks that must not hit Yahoo
+"""
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+from app.config import settings
+from app.utils.logger import logger
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
+
+
+def slice_period(df: pd.DataFrame, period: str, intraday: bool) -> pd.DataFrame:
+    """
+    Trim bars down to a yfinance-style period (1d, 5d, 1mo, 3mo, 1y, ytd, max)
+
+    Intraday 'Nd' periods count trading sessions like yfinance does, daily
+    'Nd' periods count bars, month/year periods are calendar offsets from the
+    last bar.
+    """
+    if df.empty or period == 'max':
+        return df
+
+    if period.endswith('d') and period != 'ytd':
+        days = int(period[:-1])
+        if intraday:
+            session_dates = df.index.normalize()
+            keep = session_dates.unique()[-days:]
+            return df[session_dates.isin(keep)]
+        return df.tail(days)
+
+    last = df.index[-1]
+    if period == 'ytd':
+        start = last.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        return df[df.index >= start]
+    if period.endswith('mo'):
+        start = last - pd.DateOffset(months=int(period[:-2]))
+    else:  # 'y'
+        start = last - pd.DateOffset(years=int(period[:-1]))
+    return df[df.index > start]
+
+
+class MarketDataProvider(ABC):
+    """
+    Base interface for market data sources
+
+    Bars are returned as DataFrames with lowercase OHLCV columns and a datetime
+    index; an empty DataFrame means "no data". Batch variants fall back to one
+    call per ticker unless a provider can do better.
+    """
+
+    name = "base"
+
+    # Whether DataFetcher may substitute random mock data when this provider returns nothing
+    allow_mock_fallback = True
+
+    @abstractmethod
+    def fetch_bars(self, ticker: str, interval: str, period: str) -> pd.DataFrame:
+        """Last `period` of `interval` bars"""
+
+    @abstractmethod
+    def fetch_history(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Daily bars between two dates"""
+
+    @abstractmethod
+    def fetch_info(self, ticker: str) -> Dict[str, Any]:
+        """Company info dict (yfinance `Ticker.info` keys)"""
+
+    def fetch_quote(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Latest price snapshot: {'ticker', 'price', 'previous_close'}"""
+        info = self.fetch_info(ticker)
+        price = info.get('currentPrice') or info.get('regularMarketPrice') or info.get('previousClose')
+        if not price:
+            return None
+        return {
+            'ticker': ticker,
+            'price': float(price),
+            'previous_close': info.get('previousClose'),
+        }
+
+    def fetch_bars_batch(self, tickers: List[str], interval: str, period: str) -> Dict[str, pd.DataFrame]:
+        return {ticker: self.fetch_bars(ticker, interval, period) for ticker in tickers}
+
+    def fetch_quotes_batch(self, tickers: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        return {ticker: self.fetch_quote(ticker) for ticker in tickers}
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Yahoo Finance via yfinance"""
+
+    name = "yfinance"
+
+    def __init__(self, timeout: int = 15):
+        self.timeout = timeout
+
+    @staticmethod
+    def _normalize(df: Any, ticker: str) -> pd.DataFrame:
+        """Coerce a yfinance result into a clean lowercase-column DataFrame"""
+        # Handle None return from yfinance
+        if df is None:
+            return pd.DataFrame()
+
+        # Check if df is actually a DataFrame
+        if not isinstance(df, pd.DataFrame):
+            logger.warning(f"yfinance returned unexpected type {type(df)} for {ticker}")
+            return pd.DataFrame()
+
+        if df.empty:
+            return df
+
+        # Clean column names - check if columns exist
+        if df.columns is not None and len(df.columns) > 0:
+            df.columns = df.columns.str.lower()
+        return df
+
+    def fetch_bars(self, ticker: str, interval: str, period: str) -> pd.DataFrame:
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker)
+        try:
+            df = stock.history(period=period, interval=interval, timeout=self.timeout)
+        except TypeError:
+            # Older yfinance versions don't support timeout parameter
+            df = stock.history(period=period, interval=interval)
+        except Exception as hist_err:
+            logger.error(f"yfinance history error for {ticker}: {hist_err}")
+            df = pd.DataFrame()
+
+        return self._normalize(df, ticker)
+
+    def fetch_history(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker)
+        try:
+            df = stock.history(start=start_date, end=end_date, timeout=10)
+        except TypeError:
+            # Older yfinance versions don't support timeout parameter
+            df = stock.history(start=start_date, end=end_date)
+
+        return self._normalize(df, ticker)
+
+    def fetch_info(self, ticker: str) -> Dict[str, Any]:
+        import yfinance as yf
+
+        return yf.Ticker(ticker).info or {}
+
+    def fetch_bars_batch(self, tickers: List[str], interval: str, period: str) -> Dict[str, pd.DataFrame]:
+        """One yf.download call for the whole list instead of one request per ticker"""
+        import yfinance as yf
+
+        if len(tickers) <= 1:
+            return super().fetch_bars_batch(tickers, interval, period)
+
+        try:
+            # Same shape as Ticker.history: adjusted prices, exchange-local tz-aware index
+            raw = yf.download(
+                tickers, period=period, interval=interval,
+                group_by='ticker', threads=True, progress=False, timeout=self.timeout,
+                auto_adjust=True, ignore_tz=False
+            )
+        except Exception as e:
+            logger.error(f"yfinance batch download error ({len(tickers)} tickers): {e}")
+            return {}
+
+        if raw is None or raw.empty:
+            return {}
+
+        frames = {}
+        for ticker in tickers:
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            df = self._normalize(raw[ticker].dropna(how='all').copy(), ticker)
+            frames[ticker] = df.drop(columns=['adj close'], errors='ignore')
+
+        logger.info(f"Batch fetched {len(frames)}/{len(tickers)} tickers (interval={interval}, period={period})")
+        return frames
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Deterministic replay of recorded bars
+
+    Recordings live in `<data_dir>/<TICKER>/<interval>.csv` with a `timestamp`
+    column plus OHLCV columns (see `record_bars`).
+
+    Clock:
+    - speed <= 0: frozen at the end of the recording (fully deterministic)
+    - speed > 0: starts at `start_at` (default: the first bar of the last
+      recorded session) and advances `speed` recorded seconds per wall second
+    - set_clock(): pin the clock to a timestamp, e.g. to step through a session
+    """
+
+    name = "replay"
+    allow_mock_fallback = False
+
+    # Recordings are stored in UTC and served in exchange time, like yfinance does for .IS tickers
+    TIMEZONE = "Europe/Istanbul"
+
+    def __init__(self, data_dir: str, speed: float = 0.0, start_at: Optional[str] = None):
+        self.data_dir = Path(data_dir)
+        self.speed = speed
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+        self._start: Optional[pd.Timestamp] = pd.Timestamp(start_at) if start_at else None
+        self._pinned: Optional[pd.Timestamp] = None
+        self._wall_origin = time.monotonic()
+        logger.info(f"ReplayProvider initialized (dir={self.data_dir}, speed={speed})")
+
+    def _load(self, ticker: str, interval: str) -> pd.DataFrame:
+        key = (ticker, interval)
+        if key not in self._frames:
+            path = self.data_dir / ticker / f"{interval}.csv"
+            if not path.exists():
+                self._frames[key] = pd.DataFrame()
+            else:
+                df = pd.read_csv(path)
+                df.index = pd.DatetimeIndex(pd.to_datetime(df.pop('timestamp'), utc=True)).tz_convert(self.TIMEZONE)
+                df.index.name = 'Datetime'
+                self._frames[key] = df.sort_index()
+
+                if self._start is None and self.speed > 0 and not df.empty:
+                    last_session = df.index.normalize()[-1]
+                    self._start = df.index[df.index >= last_session][0]
+        return self._frames[key]
+
+    def set_clock(self, timestamp: Optional[Any]):
+        """Pin the replay clock to `timestamp` (None to resume real-time replay)"""
+        self._pinned = pd.Timestamp(timestamp) if timestamp is not None else None
+        if self._pinned is not None and self._pinned.tzinfo is None:
+            self._pinned = self._pinned.tz_localize(self.TIMEZONE)
+
+    def reset(self):
+        """Restart the replay clock from `start_at`"""
+        self._wall_origin = time.monotonic()
+        self._pinned = None
+
+    def now(self) -> Optional[pd.Timestamp]:
+        """Current replay time, None when the clock is frozen at the end of the recording"""
+        if self._pinned is not None:
+            return self._pinned
+        if self.speed <= 0 or self._start is None:
+            return None
+        start = self._start if self._start.tzinfo else self._start.tz_localize(self.TIMEZONE)
+        return start + pd.Timedelta(seconds=(time.monotonic() - self._wall_origin) * self.speed)
+
+    def _visible(self, df: pd.DataFrame) -> pd.DataFrame:
+        now = self.now()
+        if now is None or df.empty:
+            return df
+        return df[df.index <= now]
+
+    def fetch_bars(self, ticker: str, interval: str, period: str) -> pd.DataFrame:
+        df = self._visible(self._load(ticker, interval))
+        return slice_period(df, period, intraday=interval in INTRADAY_INTERVALS).copy()
+
+    def fetch_history(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        df = self._visible(self._load(ticker, '1d'))
+        if df.empty:
+            return df
+        start = pd.Timestamp(start_date, tz=df.index.tz)
+        end = pd.Timestamp(end_date, tz=df.index.tz)
+        return df[(df.index >= start) & (df.index < end)].copy()
+
+    def fetch_quote(self, ticker: str) -> Optional[Dict[str, Any]]:
+        for interval in ('1m', '5m', '1h', '1d'):
+            df = self._visible(self._load(ticker, interval))
+            if df.empty:
+                continue
+
+            sessions = df.index.normalize()
+            previous = df[sessions < sessions[-1]]
+            return {
+                'ticker': ticker,
+                'price': float(df['close'].iloc[-1]),
+                'previous_close': float(previous['close'].iloc[-1]) if not previous.empty else None,
+                'timestamp': df.index[-1].isoformat(),
+            }
+        return None
+
+    def fetch_info(self, ticker: str) -> Dict[str, Any]:
+        quote = self.fetch_quote(ticker)
+        if quote is None:
+            return {}
+        return {
+            'symbol': ticker,
+            'currentPrice': quote['price'],
+            'regularMarketPrice': quote['price'],
+            'previousClose': quote['previous_close'],
+            'currency': 'TRY',
+            'exchange': 'IST',
+        }
+
+
+def record_bars(
+    tickers: List[str],
+    data_dir: str,
+    feeds: Optional[List[tuple]] = None,
+    source: Optional[MarketDataProvider] = None
+) -> Dict[str, int]:
+    """
+    Record bars from `source` (default: yfinance) into ReplayProvider's layout
+
+    Args:
+        tickers: Tickers to record
+        data_dir: Output directory
+        feeds: (interval, period) pairs, default 1m/5d and 1d/1y (DataFetcher base feeds)
+        source: Provider to record from
+
+    Returns:
+        Rows written per file
+    """
+    feeds = feeds or [("1m", "5d"), ("1d", "1y")]
+    source = source or YFinanceProvider()
+    written = {}
+
+    for interval, period in feeds:
+        frames = source.fetch_bars_batch(tickers, interval, period)
+        for ticker, df in frames.items():
+            if df.empty:
+                continue
+            path = Path(data_dir) / ticker / f"{interval}.csv"
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            out = df[[c for c in OHLCV_COLUMNS if c in df.columns]].copy()
+            out.index = pd.DatetimeIndex(out.index).tz_convert('UTC') if out.index.tz else out.index
+            out.index.name = 'timestamp'
+            out.to_csv(path)
+            written[str(path)] = len(out)
+
+    logger.info(f"Recorded {len(written)} bar files to {data_dir}")
+    return written
+
+
+# Process-wide default provider, created lazily from settings
+_default_provider: Optional[MarketDataProvider] = None
+
+
+def get_market_data_provider() -> MarketDataProvider:
+    """Get the configured market data provider (MARKET_DATA_PROVIDER=yfinance|replay)"""
+    global _default_provider
+    if _default_provider is None:
+        if settings.market_data_provider == "replay":
+            _default_provider = ReplayProvider(settings.replay_data_dir, speed=settings.replay_speed)
+        else:
+            _default_provider = YFinanceProvider()
+    return _default_provider
+
+
+def set_market_data_provider(provider: Optional[MarketDataProvider]):
+    """
+    Override the process-wide provider (None = back to the configured one)
+
+    DataFetcher caches are not touched; call DataFetcher().clear_cache() when
+    switching sources mid-process.
+    """
+    global _default_provider
+    _default_provider = provider
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.constants import BIST30_TICKERS
+
+    parser = argparse.ArgumentParser(description="Record market data for ReplayProvider")
+    parser.add_argument("--out", default=settings.replay_data_dir, help="Output directory")
+    parser.add_argument("--tickers", default=",".join(BIST30_TICKERS + ["XU100.IS"]), help="Comma-separated tickers")
+    args = parser.parse_args()
+
+    record_bars([t.strip() for t in args.tickers.split(",") if t.strip()], args.out)
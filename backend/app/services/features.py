@@ -0,0 +1,239 @@
+"""
+Feature Store
+One canonical indicator frame per (ticker, interval, period, last bar)
+
+The screener, signal routes, WebSocket producers, AI analysis and the hybrid
+generator used to compute the same indicators separately (and slightly
+differently) for the same bars. They now read one frame built by
+TechnicalAnalysis plus the extra columns the strategies need, cached until a
+new bar arrives. Every default column is causal, so a backtest may read row
+`idx` of a frame built once instead of recomputing on `df[:idx+1]`.
+
+Indicators are registry nodes with declared dependencies (MACD needs EMA
+12/26, ...). Callers that read only a few values ask for them by name and
+only that part of the graph is evaluated; later requests for the same bar
+add their missing columns to the cached frame.
+"""
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from app.services.response_cache import BarKeyedCache, bar_marker
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Bump when a column definition changes (invalidates cached frames)
+FEATURE_VERSION = "1"
+
+# EMA spans consumers read: TechnicalAnalysis (9/21/50/200), MACD (12/26), hybrid stops (20)
+FEATURE_EMA_PERIODS = [9, 12, 20, 21, 26, 50, 200]
+FEATURE_SMA_PERIODS = [20, 50, 100]
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+_tech_analysis = None
+_tech_lock = threading.Lock()
+
+
+def _technical_analysis():
+    global _tech_analysis
+    if _tech_analysis is None:
+        with _tech_lock:
+            if _tech_analysis is None:
+                from app.services.technical_analysis import TechnicalAnalysis
+                _tech_analysis = TechnicalAnalysis()
+    return _tech_analysis
+
+
+def normalize_ohlcv(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Lowercase OHLCV column names (yfinance-style frames use Open/High/...)"""
+    if "close" in df.columns:
+        return df
+    return df.rename(columns={column.capitalize(): column for column in OHLCV_COLUMNS})
+
+
+def capitalize_ohlcv(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Open/High/Low/Close/Volume names for win_rate_booster; indicator columns unchanged"""
+    return df.rename(columns={column: column.capitalize() for column in OHLCV_COLUMNS})
+
+
+# ---------------------------------------------------------------------------
+# Indicator registry
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Indicator:
+    """Registry node: `compute(ta, df)` adds `outputs` to df once `requires` are present"""
+    name: str
+    outputs: Tuple[str, ...]
+    compute: Callable[[Any, "pd.DataFrame"], Any]
+    requires: Tuple[str, ...] = ()
+    default: bool = True  # part of the full feature frame
+
+
+INDICATORS: Dict[str, Indicator] = {}
+_COLUMN_OWNERS: Dict[str, str] = {}
+
+
+def register_indicator(name: str, outputs: Iterable[str], compute: Callable[[Any, "pd.DataFrame"], Any],
+                       requires: Iterable[str] = (), default: bool = True):
+    """Add (or replace) a node; `requires` are node or column names"""
+    INDICATORS[name] = Indicator(name, tuple(outputs), compute, tuple(requires), default)
+    for column in outputs:
+        _COLUMN_OWNERS[column] = name
+    _plan.cache_clear()
+
+
+@lru_cache(maxsize=256)
+def _plan(names: Tuple[str, ...]) -> Tuple[Tuple[Indicator, ...], FrozenSet[str]]:
+    """Nodes for `names` in dependency order, plus every column they produce"""
+    order, seen = [], set()
+
+    def visit(name: str):
+        node = INDICATORS.get(name) or INDICATORS.get(_COLUMN_OWNERS.get(name, ""))
+        if node is None:
+            raise KeyError(f"Unknown indicator: {name}")
+        if node.name in seen:
+            return
+        seen.add(node.name)
+        for dependency in node.requires:
+            visit(dependency)
+        order.append(node)
+
+    for name in names:
+        visit(name)
+    return tuple(order), frozenset(column for node in order for column in node.outputs)
+
+
+def resolve_indicators(names: Iterable[str]) -> Tuple[Indicator, ...]:
+    """Registry nodes needed for `names` (node or column names), dependencies first"""
+    return _plan(tuple(names))[0]
+
+
+def _volume_sma_20(ta, df):
+    df["volume_sma_20"] = df["volume"].rolling(window=20).mean()
+
+
+def _ichimoku(ta, df):
+    lines = ta.calculate_ichimoku(df[["high", "low", "close"]])
+    for column in INDICATORS["ichimoku"].outputs:
+        df[column] = lines[column]
+
+
+for _period in FEATURE_EMA_PERIODS:
+    register_indicator(f"ema_{_period}", [f"ema_{_period}"], lambda ta, df, p=_period: ta.calculate_ema(df, [p]))
+for _period in FEATURE_SMA_PERIODS:
+    register_indicator(f"sma_{_period}", [f"sma_{_period}"], lambda ta, df, p=_period: ta.calculate_sma(df, [p]))
+register_indicator("atr", ["atr"], lambda ta, df: ta.calculate_atr(df))
+register_indicator("adx", ["adx", "di_plus", "di_minus"], lambda ta, df: ta.calculate_adx(df))
+register_indicator("rsi", ["rsi"], lambda ta, df: ta.calculate_rsi(df))
+register_indicator("macd", ["macd", "macd_signal", "macd_histogram"], lambda ta, df: ta.calculate_macd(df),
+                   requires=["ema_12", "ema_26"])
+register_indicator("stochastic", ["stoch_k", "stoch_d"], lambda ta, df: ta.calculate_stochastic(df))
+register_indicator("cci", ["cci"], lambda ta, df: ta.calculate_cci(df))
+register_indicator("bollinger", ["bb_middle", "bb_upper", "bb_lower", "bb_bandwidth", "bb_percent"],
+                   lambda ta, df: ta.calculate_bollinger_bands(df))
+register_indicator("obv", ["obv"], lambda ta, df: ta.calculate_obv(df))
+register_indicator("vwap", ["vwap"], lambda ta, df: ta.calculate_vwap(df))
+register_indicator("mfi", ["mfi"], lambda ta, df: ta.calculate_mfi(df))
+register_indicator("volume_sma_20", ["volume_sma_20"], _volume_sma_20)
+# Chikou is close shifted back 26 bars (looks ahead), so Ichimoku is on request only
+register_indicator(
+    "ichimoku",
+    ["ichimoku_tenkan", "ichimoku_kijun", "ichimoku_senkou_a", "ichimoku_senkou_b", "ichimoku_chikou"],
+    _ichimoku, default=False,
+)
+
+# Nodes TechnicalAnalysis.get_latest_indicators reads (live price payloads)
+LATEST_INDICATORS = (
+    "ema_9", "ema_21", "ema_50", "sma_20", "adx", "rsi", "macd", "stochastic", "cci",
+    "bollinger", "atr", "obv", "vwap", "mfi",
+)
+
+
+def default_indicators() -> Tuple[str, ...]:
+    return tuple(name for name, node in INDICATORS.items() if node.default)
+
+
+def evaluate_indicators(df: "pd.DataFrame", names: Iterable[str]) -> "pd.DataFrame":
+    """Add the columns for `names` (and their dependencies) to `df` in place; present ones are kept"""
+    ta = _technical_analysis()
+    for node in resolve_indicators(names):
+        if not all(column in df.columns for column in node.outputs):
+            node.compute(ta, df)
+    return df
+
+
+def compute_features(df: "pd.DataFrame", indicators: Optional[Iterable[str]] = None) -> "pd.DataFrame":
+    """
+    Indicator frame for `df` (uncached; the input is not modified)
+
+    indicators: node or column names to evaluate (default: the full canonical set)
+    """
+    frame = normalize_ohlcv(df).copy()
+    if frame.empty:
+        return frame
+    return evaluate_indicators(frame, default_indicators() if indicators is None else indicators)
+
+
+class _Slot:
+    """Cached frame for one bar; grows as callers request more indicators"""
+
+    def __init__(self, frame: "pd.DataFrame"):
+        self.frame = frame
+        self.lock = threading.Lock()
+
+
+class FeatureStore:
+    """
+    Bar-keyed cache of feature frames
+
+    One slot per (interval, period, ticker); a frame is reused while the
+    first bar, bar count and last bar (time, close, volume) are unchanged.
+    Missing indicators are added copy-on-write, so a frame a caller already
+    holds never changes under it.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self._frames = BarKeyedCache("features", max_entries)
+
+    def frame(self, ticker: str, interval: str, period: str, df: "pd.DataFrame",
+              indicators: Optional[Iterable[str]] = None, copy: bool = True) -> "pd.DataFrame":
+        """
+        Feature frame for `df` (bars of `ticker` at interval/period)
+
+        indicators: node or column names to make sure are present
+            (default: the full canonical set); the frame may hold more.
+        Pass copy=False only for read-only use; the cached frame is shared.
+        """
+        if df is None or df.empty:
+            return df
+
+        namespace = f"{interval}:{period}"
+        bar = (len(df), df.index[0], bar_marker(normalize_ohlcv(df)))
+        slot = self._frames.get(namespace, ticker, bar, FEATURE_VERSION)
+        if slot is None:
+            slot = _Slot(normalize_ohlcv(df).copy())
+            self._frames.set(namespace, ticker, bar, FEATURE_VERSION, slot)
+
+        names = default_indicators() if indicators is None else tuple(indicators)
+        frame = slot.frame
+        if not _plan(names)[1].issubset(frame.columns):
+            with slot.lock:
+                frame = slot.frame
+                if not _plan(names)[1].issubset(frame.columns):
+                    frame = evaluate_indicators(frame.copy(deep=False), names)
+                    slot.frame = frame
+        return frame.copy() if copy else frame
+
+    def invalidate(self, ticker: Optional[str] = None) -> int:
+        return self._frames.invalidate(ticker)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+# Global instance
+feature_store = FeatureStore()
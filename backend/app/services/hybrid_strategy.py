@@ -17,17 +17,20 @@ V3'ten Alınan:
 - Win Rate Booster: Bonus olarak (opsiyonel)
 """
 import pandas as pd
-import numpy as np
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, date
 import json
 import os
+import threading
 
+from app.constants import DAILY_PICKS_TICKERS
 from app.utils.logger import logger
 from app.services.data_fetcher import DataFetcher
+from app.services.features import capitalize_ohlcv, compute_features, feature_store
+from app.services.metrics import SIGNAL_SECONDS
 
 # Win Rate Booster'ı import et (opsiyonel)
 try:
@@ -460,10 +463,14 @@ class HybridSignalGenerator:
     V2 Filtreleri + V3 Exit Stratejisi + Win Rate Booster (opsiyonel)
     """
     
-    # Günlük çalışma takibi
+    # Günlük çalışma takibi (tüm instance'lar ortak; _state_lock ile korunur)
     _last_run_date: date = None
     _daily_signals: List[Dict] = []
     _daily_sectors: Dict[str, int] = {}
+    _state_lock = threading.RLock()
+    
+    # Paralel tarama (veri batch çekildikten sonra skor hesaplama)
+    SCAN_WORKERS = 4
     
     # Sektör eşleştirme
     SECTOR_MAP = {
@@ -485,13 +492,14 @@ class HybridSignalGenerator:
         self.booster_available = BOOSTER_AVAILABLE
         self._reset_daily_state()
     
-    def _reset_daily_state(self):
-        """Günlük state'i sıfırla"""
+    def _reset_daily_state(self, force: bool = False):
+        """Günlük state'i sıfırla (gün değiştiyse veya force)"""
         today = date.today()
-        if HybridSignalGenerator._last_run_date != today:
-            HybridSignalGenerator._last_run_date = today
-            HybridSignalGenerator._daily_signals = []
-            HybridSignalGenerator._daily_sectors = {}
+        with HybridSignalGenerator._state_lock:
+            if force or HybridSignalGenerator._last_run_date != today:
+                HybridSignalGenerator._last_run_date = today
+                HybridSignalGenerator._daily_signals = []
+                HybridSignalGenerator._daily_sectors = {}
     
     def _check_daily_limit(self) -> bool:
         """Max picks kontrolü"""
@@ -507,16 +515,58 @@ class HybridSignalGenerator:
         current_count = HybridSignalGenerator._daily_sectors.get(sector, 0)
         return current_count < self.params.max_per_sector
     
-    def _register_signal(self, ticker: str):
-        """Sinyal kaydı"""
-        HybridSignalGenerator._daily_signals.append({
-            'ticker': ticker,
-            'timestamp': datetime.now().isoformat()
-        })
+    def _register_signal(self, ticker: str) -> bool:
+        """
+        Sinyal kaydı - limitler hâlâ uygunsa
         
-        sector = self.SECTOR_MAP.get(ticker.replace('.IS', ''), 'Diğer')
-        HybridSignalGenerator._daily_sectors[sector] = \
-            HybridSignalGenerator._daily_sectors.get(sector, 0) + 1
+        Kontrol ve kayıt aynı kilit altında; paralel çağrılar limiti aşamaz.
+        """
+        with HybridSignalGenerator._state_lock:
+            if not (self._check_daily_limit() and self._check_sector_limit(ticker)):
+                return False
+            
+            HybridSignalGenerator._daily_signals.append({
+                'ticker': ticker,
+                'timestamp': datetime.now().isoformat()
+            })
+            
+            sector = self.SECTOR_MAP.get(ticker.replace('.IS', ''), 'Diğer')
+            HybridSignalGenerator._daily_sectors[sector] = \
+                HybridSignalGenerator._daily_sectors.get(sector, 0) + 1
+            return True
+    
+    def _limit_hold_signal(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Günlük / sektör limiti doluysa HOLD sinyali, değilse None"""
+        if not self._check_daily_limit():
+            hold_signal = self._hold_signal(ticker)
+            hold_signal["warnings"].append(
+                f"❌ Günlük sinyal limiti doldu ({self.params.max_picks_per_day}/{self.params.max_picks_per_day})"
+            )
+            hold_signal["reasons"].append("Günlük limit aşıldı")
+            return hold_signal
+        
+        if ticker and not self._check_sector_limit(ticker):
+            sector = self.SECTOR_MAP.get(ticker.replace('.IS', ''), 'Diğer')
+            hold_signal = self._hold_signal(ticker)
+            hold_signal["warnings"].append(
+                f"❌ {sector} sektöründen zaten {self.params.max_per_sector} sinyal var"
+            )
+            hold_signal["reasons"].append(f"Sektör limiti: {sector}")
+            return hold_signal
+        
+        return None
+    
+    @staticmethod
+    def _hold_signal(ticker: str) -> Dict[str, Any]:
+        return {
+            "signal": "HOLD",
+            "strength": 0,
+            "confidence": 0,
+            "reasons": [],
+            "warnings": [],
+            "filters_passed": False,
+            "ticker": ticker
+        }
     
     def check_market_filter(self) -> Tuple[bool, str]:
         """
@@ -579,11 +629,12 @@ class HybridSignalGenerator:
         
         try:
             with open(state_file, 'w') as f:
-                json.dump({
-                    'last_run_date': today_str,
-                    'signals_count': len(HybridSignalGenerator._daily_signals),
-                    'sectors': HybridSignalGenerator._daily_sectors
-                }, f)
+                with HybridSignalGenerator._state_lock:
+                    json.dump({
+                        'last_run_date': today_str,
+                        'signals_count': len(HybridSignalGenerator._daily_signals),
+                        'sectors': HybridSignalGenerator._daily_sectors
+                    }, f)
         except:
             pass
     
@@ -607,7 +658,7 @@ class HybridSignalGenerator:
         apply_booster: bool = True  # Win rate booster opsiyonel
     ) -> Dict[str, Any]:
         """
-        Hybrid sinyal üret
+        Hybrid sinyal üret (günlük limit ve sektör kontrolü dahil)
         
         Args:
             df: OHLCV veri
@@ -615,38 +666,40 @@ class HybridSignalGenerator:
             ticker: Hisse kodu (sektör kontrolü için)
             apply_booster: Win rate booster'ı uygula (opsiyonel)
         """
-        # Default HOLD sinyali
-        hold_signal = {
-            "signal": "HOLD",
-            "strength": 0,
-            "confidence": 0,
-            "reasons": [],
-            "warnings": [],
-            "filters_passed": False,
-            "ticker": ticker
-        }
+        # === V2 ÖN KONTROLLER === (yetersiz veri uyarısı evaluate_candidate'ten gelir)
+        if not df.empty and len(df) >= 50:
+            limit_hold = self._limit_hold_signal(ticker)
+            if limit_hold is not None:
+                return limit_hold
         
-        if df.empty or len(df) < 50:
-            hold_signal["warnings"].append("⚠️ Yetersiz veri")
-            return hold_signal
+        signal = self.evaluate_candidate(df, indicators, ticker, apply_booster)
         
-        # === V2 ÖN KONTROLLER ===
+        # Sinyal kaydı (V2: sektör ve günlük limit takibi)
+        if ticker and signal.get("signal") == "BUY" and not self._register_signal(ticker):
+            # Değerlendirme sırasında başka bir çağrı limiti doldurdu
+            return self._limit_hold_signal(ticker) or self._hold_signal(ticker)
         
-        # 1. Max Picks Kontrolü
-        if not self._check_daily_limit():
-            hold_signal["warnings"].append(
-                f"❌ Günlük sinyal limiti doldu ({self.params.max_picks_per_day}/{self.params.max_picks_per_day})"
-            )
-            hold_signal["reasons"].append("Günlük limit aşıldı")
-            return hold_signal
+        return signal
+    
+    @SIGNAL_SECONDS.timed(generator="hybrid")
+    def evaluate_candidate(
+        self,
+        df: pd.DataFrame,
+        indicators: Dict,
+        ticker: str = "",
+        apply_booster: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Filtreler + skor + seviyeler; günlük/sektör state'ine dokunmaz
         
-        # 2. Sektör Çeşitlendirme Kontrolü
-        if ticker and not self._check_sector_limit(ticker):
-            sector = self.SECTOR_MAP.get(ticker.replace('.IS', ''), 'Diğer')
-            hold_signal["warnings"].append(
-                f"❌ {sector} sektöründen zaten {self.params.max_per_sector} sinyal var"
-            )
-            hold_signal["reasons"].append(f"Sektör limiti: {sector}")
+        Paralel taramada aday üretmek için kullanılır; seçim (limitler)
+        select_signals'ta ayrı bir son aşamadır.
+        """
+        # Default HOLD sinyali
+        hold_signal = self._hold_signal(ticker)
+        
+        if df.empty or len(df) < 50:
+            hold_signal["warnings"].append("⚠️ Yetersiz veri")
             return hold_signal
         
         # === V2 FİLTRELERİ (Sıkı) ===
@@ -765,10 +818,6 @@ class HybridSignalGenerator:
             timestamp=datetime.now().isoformat()
         )
         
-        # Sinyal kaydı (V2: sektör ve günlük limit takibi)
-        if ticker:
-            self._register_signal(ticker)
-        
         result = signal.to_dict()
         result['ticker'] = ticker
         return result
@@ -833,9 +882,7 @@ class HybridSignalGenerator:
         
         # Force run ise günlük state'i sıfırla
         if force_run:
-            HybridSignalGenerator._last_run_date = None
-            HybridSignalGenerator._daily_signals = []
-            HybridSignalGenerator._daily_sectors = {}
+            self._reset_daily_state(force=True)
         
         # Market filtresi - sadece bilgi amaçlı, engelleme yapmıyor
         market_ok, market_msg = self.check_market_filter()
@@ -856,63 +903,41 @@ class HybridSignalGenerator:
                 'KOZAA.IS'
             ]
         
-        signals = []
-        scanned = 0
-        errors = []
-        
         logger.info(f"📊 HYBRID V2+V3 TARAMA BAŞLADI | Tarih: {date.today().isoformat()} | Market: {market_msg} | Hisse: {len(tickers)} | Max: {self.params.max_picks_per_day}/gün")
         
-        for ticker in tickers:
-            # Max picks kontrolü
-            if not self._check_daily_limit():
-                logger.info(f"Günlük sinyal limiti doldu ({self.params.max_picks_per_day} sinyal)")
-                break
-            
-            try:
-                # Veri çek - DataFetcher kullan (cache + mock fallback)
-                fetcher = DataFetcher()
-                df = fetcher.fetch_realtime_data(ticker, interval='1d', period=period)
-                
-                if df is None:
-                    df = pd.DataFrame()
-                
-                # Column isimlerini standartlaştır (DataFetcher lowercase döner)
-                if not df.empty and hasattr(df, 'columns'):
-                    df.columns = [c.capitalize() for c in df.columns]
-                
-                if df.empty or len(df) < 50:
-                    continue
-                
-                scanned += 1
-                
-                # Teknik göstergeleri hesapla
-                indicators = self._calculate_indicators(df)
-                
-                # Sinyal üret
-                signal = self.generate_signal(
-                    df=df,
-                    indicators=indicators,
-                    ticker=ticker,
-                    apply_booster=apply_booster
-                )
-                
-                if signal.get('signal') == 'BUY':
-                    signals.append(signal)
-                    sector = self.SECTOR_MAP.get(ticker.replace('.IS', ''), 'Diğer')
-                    logger.info(f"✅ {ticker}: Score {signal.get('strength', 0):.0f} | TP1: ₺{signal.get('take_profit_1', 0):.2f} | Sektör: {sector}")
-                          
-            except Exception as e:
-                errors.append(f"{ticker}: {str(e)[:30]}")
+        # 1. Veri - tek batch çağrı (cache + mock fallback DataFetcher'da)
+        frames = DataFetcher().fetch_realtime_data_batch(tickers, interval='1d', period=period)
+        work = [(ticker, frames[ticker]) for ticker in tickers if len(frames.get(ticker, ())) >= 50]
+        
+        # 2. Göstergeler + skor - paralel, paylaşılan state'e dokunmadan
+        candidates = []
+        errors = []
+        if work:
+            workers = min(self.SCAN_WORKERS, len(work))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hybrid-scan") as executor:
+                outcomes = list(executor.map(
+                    lambda item: self._scan_ticker(item[0], item[1], period, apply_booster), work
+                ))
+            for signal, error in outcomes:
+                if error:
+                    errors.append(error)
+                elif signal.get('signal') == 'BUY':
+                    candidates.append(signal)
+        scanned = len(work)
+        
+        # 3. Seçim - günlük limit + sektör çeşitlendirmesi, deterministik son aşama
+        signals = self.select_signals(candidates)
+        for signal in signals:
+            sector = self.SECTOR_MAP.get(signal['ticker'].replace('.IS', ''), 'Diğer')
+            logger.info(f"✅ {signal['ticker']}: Score {signal.get('strength', 0):.0f} | TP1: ₺{signal.get('take_profit_1', 0):.2f} | Sektör: {sector}")
         
         # Çalışmayı kaydet
         self.mark_run_complete()
         
-        # Skora göre sırala
-        signals = sorted(signals, key=lambda x: x.get('strength', 0), reverse=True)
-        
         # Özet
         summary = {
             'total_scanned': scanned,
+            'candidates': len(candidates),
             'signals_found': len(signals),
             'max_picks': self.params.max_picks_per_day,
             'market_filter': 'PASSED' if market_ok else 'WARNING',
@@ -921,89 +946,49 @@ class HybridSignalGenerator:
             'errors': len(errors)
         }
         
-        logger.info(f"📊 TARAMA SONUCU: Taranan: {scanned} | Sinyal: {len(signals)} | Hata: {len(errors)}")
+        logger.info(f"📊 TARAMA SONUCU: Taranan: {scanned} | Aday: {len(candidates)} | Sinyal: {len(signals)} | Hata: {len(errors)}")
         
         return {
             'date': date.today().isoformat(),
             'market_status': market_msg,
-            'signals': signals[:self.params.max_picks_per_day],  # Max 5
+            'signals': signals,
             'summary': summary
         }
     
+    def _scan_ticker(self, ticker: str, df: pd.DataFrame, period: str, apply_booster: bool) -> Tuple[Optional[Dict], Optional[str]]:
+        """Tek hisse: ortak feature frame + aday sinyal -> (sinyal, hata)"""
+        try:
+            features = feature_store.frame(ticker, '1d', period, df, copy=False)
+            indicators = self._indicators_from_features(features)
+            # Booster büyük harfli OHLCV bekliyor; rsi / macd_histogram kolonlarını frame'den okur
+            return self.evaluate_candidate(capitalize_ohlcv(features), indicators, ticker, apply_booster), None
+        except Exception as e:
+            return None, f"{ticker}: {str(e)[:30]}"
+    
+    def select_signals(self, candidates: List[Dict]) -> List[Dict]:
+        """
+        Adaylardan günün sinyallerini seç
+        
+        En güçlüden başlayarak (eşitlikte aday sırası korunur) günlük limit ve
+        sektör çeşitlendirmesi uygulanır; seçilenler günlük state'e kaydedilir.
+        """
+        ranked = sorted(candidates, key=lambda x: x.get('strength', 0), reverse=True)
+        selected = []
+        for signal in ranked:
+            if not self._check_daily_limit():
+                break
+            if self._register_signal(signal['ticker']):
+                selected.append(signal)
+        return selected
+    
     def _calculate_indicators(self, df: pd.DataFrame) -> Dict:
-        """Teknik göstergeleri hesapla"""
+        """Teknik göstergeleri hesapla (ortak feature tanımlarıyla, önbelleksiz)"""
         try:
             # Multi-index kontrolü
             if isinstance(df.columns, pd.MultiIndex):
                 df.columns = df.columns.get_level_values(0)
             
-            # Sütun isimlerini kontrol et
-            close_col = 'Close' if 'Close' in df.columns else 'close'
-            high_col = 'High' if 'High' in df.columns else 'high'
-            low_col = 'Low' if 'Low' in df.columns else 'low'
-            volume_col = 'Volume' if 'Volume' in df.columns else 'volume'
-            
-            close = df[close_col].values.flatten()
-            high = df[high_col].values.flatten()
-            low = df[low_col].values.flatten()
-            volume = df[volume_col].values.flatten()
-            
-            # EMAs
-            ema_9 = pd.Series(close).ewm(span=9).mean().iloc[-1]
-            ema_21 = pd.Series(close).ewm(span=21).mean().iloc[-1]
-            ema_50 = pd.Series(close).ewm(span=50).mean().iloc[-1]
-            ema_200 = pd.Series(close).ewm(span=200).mean().iloc[-1] if len(close) >= 200 else ema_50
-            
-            # RSI
-            delta = pd.Series(close).diff()
-            gain = delta.where(delta > 0, 0).rolling(14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            # MACD
-            ema_12 = pd.Series(close).ewm(span=12).mean()
-            ema_26 = pd.Series(close).ewm(span=26).mean()
-            macd_line = ema_12 - ema_26
-            signal_line = macd_line.ewm(span=9).mean()
-            macd_hist = macd_line - signal_line
-            
-            # Volume
-            vol_sma = pd.Series(volume).rolling(20).mean().iloc[-1]
-            vol_ratio = volume[-1] / vol_sma if vol_sma > 0 else 1.0
-            
-            # ATR
-            tr = pd.DataFrame({
-                'hl': high - low,
-                'hc': abs(high - np.roll(close, 1)),
-                'lc': abs(low - np.roll(close, 1))
-            }).max(axis=1)
-            atr = pd.Series(tr).rolling(14).mean().iloc[-1]
-            
-            return {
-                'trend': {
-                    'ema_9': ema_9,
-                    'ema_21': ema_21,
-                    'ema_50': ema_50,
-                    'ema_200': ema_200,
-                    'ema_20': pd.Series(close).ewm(span=20).mean().iloc[-1]
-                },
-                'momentum': {
-                    'rsi': rsi.iloc[-1] if not pd.isna(rsi.iloc[-1]) else 50,
-                    'macd': macd_line.iloc[-1],
-                    'macd_signal': signal_line.iloc[-1],
-                    'macd_hist': macd_hist.iloc[-1]
-                },
-                'volume': {
-                    'current': volume[-1],
-                    'average': vol_sma,
-                    'ratio': vol_ratio
-                },
-                'volatility': {
-                    'atr': atr,
-                    'atr_pct': (atr / close[-1]) * 100 if close[-1] > 0 else 0
-                }
-            }
+            return self._indicators_from_features(compute_features(df))
         except Exception as e:
             # Hata durumunda varsayılan değerler döndür
             return {
@@ -1013,6 +998,42 @@ class HybridSignalGenerator:
                 'volatility': {'atr': 0, 'atr_pct': 0},
                 'error': str(e)
             }
+    
+    @staticmethod
+    def _indicators_from_features(features: pd.DataFrame) -> Dict:
+        """Filtrelerin beklediği gösterge sözlüğü (feature frame'in son satırından)"""
+        last = features.iloc[-1]
+        close = last['close']
+        ema_50 = last['ema_50']
+        rsi = last['rsi']
+        volume = last['volume']
+        vol_sma = last['volume_sma_20']
+        atr = last['atr']
+        
+        return {
+            'trend': {
+                'ema_9': last['ema_9'],
+                'ema_21': last['ema_21'],
+                'ema_50': ema_50,
+                'ema_200': last['ema_200'] if len(features) >= 200 else ema_50,
+                'ema_20': last['ema_20']
+            },
+            'momentum': {
+                'rsi': rsi if not pd.isna(rsi) else 50,
+                'macd': last['macd'],
+                'macd_signal': last['macd_signal'],
+                'macd_hist': last['macd_histogram']
+            },
+            'volume': {
+                'current': volume,
+                'average': vol_sma,
+                'ratio': volume / vol_sma if vol_sma > 0 else 1.0
+            },
+            'volatility': {
+                'atr': atr,
+                'atr_pct': (atr / close) * 100 if close > 0 else 0
+            }
+        }
 
 
 # === BACKTEST İÇİN HELPER FONKSİYONLAR ===
@@ -1102,6 +1123,108 @@ def simulate_hybrid_trade(
     }
 
 
+def build_daily_picks(generator: "HybridSignalGenerator", max_picks: int = 5,
+                      tickers: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    /signals/daily-picks payload: market filter + V2+V3 hybrid scan of `tickers`
+    
+    Used by the endpoint and by the pre-market warm-up, which stores it in the
+    shared cache under daily_picks_cache_key(max_picks).
+    """
+    tickers = tickers or DAILY_PICKS_TICKERS
+    
+    # Market filter kontrolü (esnek mod - uyarı ver ama engelleme)
+    market_ok, market_msg = generator.check_market_filter()
+    market_warnings = []
+    
+    if not market_ok:
+        market_warnings.append(f"⚠️ {market_msg} - DİKKATLİ OLUN!")
+        market_warnings.append("🔴 BIST100 düşüş trendinde - pozisyon boyutunu %50 azaltın")
+        logger.warning(f"Market filter failed but continuing: {market_msg}")
+    
+    # V2+V3 Hybrid tarama (market durumundan bağımsız)
+    result = generator.scan_all_stocks(
+        tickers=tickers,
+        period='3mo',
+        apply_booster=True,
+        force_run=True
+    )
+    
+    # Sinyalleri formatla
+    picks = []
+    for signal in result.get('signals', [])[:max_picks]:
+        entry = signal.get('entry_price', 0)
+        stop = signal.get('stop_loss', 0)
+        tp1 = signal.get('take_profit_1', 0)
+        tp2 = signal.get('take_profit_2', 0)
+        
+        risk_pct = abs((entry - stop) / entry * 100) if entry > 0 else 0
+        reward_pct_1 = abs((tp1 - entry) / entry * 100) if entry > 0 else 0
+        reward_pct_2 = abs((tp2 - entry) / entry * 100) if entry > 0 else 0
+        
+        picks.append({
+            "ticker": signal.get('ticker', ''),
+            "signal": "BUY",
+            "strength": signal.get('strength', 0),
+            "confidence": signal.get('confidence', 0),
+            "entry_price": round(entry, 2),
+            "stop_loss": round(stop, 2),
+            "take_profit": round(tp1, 2),  # TP1 (legacy)
+            "take_profit_1": round(tp1, 2),
+            "take_profit_2": round(tp2, 2),
+            "risk_reward_ratio": signal.get('risk_reward_1', 2.5),
+            "risk_reward_2": signal.get('risk_reward_2', 4.0),
+            "sector": generator.SECTOR_MAP.get(
+                signal.get('ticker', '').replace('.IS', ''), 'Diğer'
+            ),
+            "reasons": signal.get('reasons', []),
+            "exit_strategy": signal.get('exit_strategy', {
+                "tp1_action": "TP1'de %50 pozisyon kapat",
+                "tp1_new_stop": "Break-even'a çek",
+                "tp2_action": "TP2'de kalan %50 kapat"
+            }),
+            "partial_exit_pct": 0.5,
+            "risk_pct": round(risk_pct, 2),
+            "reward_pct": round(reward_pct_1, 2),
+            "reward_pct_2": round(reward_pct_2, 2)
+        })
+    
+    response_data = {
+        "status": "success",
+        "timestamp": datetime.now().isoformat(),
+        "market_status": {
+            "phase": "hybrid_v2_v3_active" if market_ok else "hybrid_v2_v3_caution",
+            "message": market_msg,
+            "tradeable": market_ok,
+            "market_trend": "YUKSELIS" if market_ok else "DUSUS"
+        },
+        "strategy": "hybrid_v2_v3",
+        "total_scanned": result.get('summary', {}).get('total_scanned', len(tickers)),
+        "signals_found": len(picks),
+        "found": len(picks),
+        "picks": picks,
+        "warnings": market_warnings,
+        "strategy_info": {
+            "name": "V2+V3 Hybrid",
+            "min_score": 75,
+            "max_picks_per_day": 5,
+            "max_per_sector": 1,
+            "partial_exit": "50% at TP1, 50% at TP2",
+            "tp1_rr": "1:2.5",
+            "tp2_rr": "1:4.0",
+            "expected_wr": "62-70%",
+            "expected_pf": "2.5+",
+            "market_filter_passed": market_ok,
+            "win_rate": "62-70%",
+            "profit_factor": "2.5+"
+        },
+        "sectors_used": result.get('summary', {}).get('sectors_used', {}),
+        "market_trend": "YUKSELIS" if market_ok else "DUSUS"
+    }
+    
+    return response_data
+
+
 if __name__ == "__main__":
     logger.info("🎯 HYBRID STRATEGY - V2 + V3 | Min Score: 75+ | SL: Teknik ~%2 | TP1: 1:2.5 | TP2: 1:4.0 | Partial Exit: %50")
     logger.info(f"Win Rate Booster: {'Aktif' if BOOSTER_AVAILABLE else 'Yüklenmedi'}")
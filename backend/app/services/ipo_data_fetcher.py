@@ -15,12 +15,17 @@ import os
 import logging
 import re
 import random
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any
 from pathlib import Path
+from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor
 
+from app.services.conditional_http import ValidatorStore
+from app.services.ipo_store import IPORecordStore, get_ipo_store
+
 # Cloudscraper - Cloudflare bypass
 try:
     import cloudscraper
@@ -48,10 +53,50 @@ logger = logging.getLogger(__name__)
 # Data dosyası yolu
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
 IPO_DATA_FILE = DATA_DIR / "ipo_data.json"
-IPO_CACHE_FILE = DATA_DIR / "ipo_cache.json"
-IPO_MANUAL_FILE = DATA_DIR / "ipo_manual.json"
+IPO_CACHE_FILE = DATA_DIR / "ipo_cache.json"  # Eski format - store boşsa bir kez içe aktarılır
+IPO_MANUAL_FILE = DATA_DIR / "ipo_manual.json"  # Eski format - store boşsa bir kez içe aktarılır
 IPO_INITIAL_FILE = DATA_DIR / "ipo_initial.json"
 
+# Tüm kaynaklar için toplam süre sınırı (saniye)
+FETCH_DEADLINE_SECONDS = 45.0
+
+
+class HostRateLimiter:
+    """
+    Host bazlı istek aralığı
+    
+    Her istek, host'unun bir sonraki boş zaman dilimini rezerve eder; farklı
+    host'lar birbirini beklemez. Rezervasyon kilit altında yapılır, bekleme
+    kilit dışında - thread'lerden (executor) ve coroutine'lerden kullanılabilir.
+    """
+    
+    def __init__(self, min_interval: float = 1.0, jitter: tuple = (0.1, 0.5)):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def reserve(self, url: str) -> float:
+        """Bu istek için beklenecek süre (saniye)"""
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        with self._lock:
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval + random.uniform(*self.jitter)
+        return slot - now
+    
+    def wait(self, url: str):
+        """Blocking bekleme (executor thread'leri için)"""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def wait_async(self, url: str):
+        """Event loop'u bloklamadan bekle"""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
 
 class IPODataFetcher:
     """
@@ -122,18 +167,27 @@ class IPODataFetcher:
         },
     ]
     
-    def __init__(self):
-        self.scraper = None
+    def __init__(self, store: Optional[IPORecordStore] = None):
+        self.store = store or get_ipo_store()
+        self._scrapers: Dict[str, Any] = {}  # host -> keep-alive cloudscraper session
+        self._host_locks: Dict[str, threading.Lock] = {}  # host -> session kullanım kilidi
+        self._scraper_lock = threading.Lock()
         self.aio_session: Optional[aiohttp.ClientSession] = None
         self.last_fetch: Optional[datetime] = None
         self.cached_data: Dict[str, Any] = {}
         self.manual_data: Dict[str, Any] = {}
+        self._dirty_cache_ids: set = set()  # Store'a yazılmayı bekleyen cache kayıtları
         self.fetch_errors: List[str] = []
-        self.executor = ThreadPoolExecutor(max_workers=3)
+        # Blocking scraper'lar (cloudscraper, feedparser) için - bir refresh'teki tüm sayfalara yeter
+        self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ipo-fetch")
+        self.deadline = FETCH_DEADLINE_SECONDS
+        
+        # Rate limiting (host bazlı)
+        self.min_request_interval = 1.0  # Aynı host'a minimum 1 saniye arası
+        self.rate_limiter = HostRateLimiter(self.min_request_interval)
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # Minimum 1 saniye arası
+        # Sayfa/feed bazlı ETag, Last-Modified ve içerik hash'i - değişmeyen sayfa parse edilmez
+        self.validators = ValidatorStore("ipo_source")
         
         # Data klasörünü oluştur
         DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -145,8 +199,9 @@ class IPODataFetcher:
         self._load_cache()
         self._load_manual_data()
         
-        # Cloudscraper'ı başlat
-        self._init_scraper()
+        # Cloudscraper session'ları host bazlı, ilk istekte açılır
+        if not HAS_CLOUDSCRAPER:
+            logger.warning("Cloudscraper not available, using basic requests")
     
     def _load_initial_data(self):
         """Başlangıç verilerini yükle (ilk çalıştırma için)"""
@@ -162,27 +217,46 @@ class IPODataFetcher:
         except Exception as e:
             logger.error(f"Error loading initial data: {e}")
     
-    def _init_scraper(self):
-        """Cloudscraper'ı başlat"""
-        if HAS_CLOUDSCRAPER and cloudscraper is not None:
-            try:
-                browser = random.choice(['chrome', 'firefox'])
-                self.scraper = cloudscraper.create_scraper(
-                    browser={
-                        'browser': browser,
-                        'platform': random.choice(['windows', 'darwin', 'linux']),
-                        'desktop': True,
-                    },
-                    delay=random.uniform(3, 7),
-                )
-                # Random cookie ekle
-                self.scraper.cookies.set('visited', 'true', domain='.halkaarz.com')
-                logger.info(f"Cloudscraper initialized with {browser}")
-            except Exception as e:
-                logger.error(f"Failed to init cloudscraper: {e}")
-                self.scraper = None
-        else:
-            logger.warning("Cloudscraper not available, using basic requests")
+    def _create_scraper(self):
+        """Yeni bir cloudscraper session oluştur"""
+        try:
+            browser = random.choice(['chrome', 'firefox'])
+            scraper = cloudscraper.create_scraper(
+                browser={
+                    'browser': browser,
+                    'platform': random.choice(['windows', 'darwin', 'linux']),
+                    'desktop': True,
+                },
+                delay=random.uniform(3, 7),
+            )
+            # Random cookie ekle
+            scraper.cookies.set('visited', 'true', domain='.halkaarz.com')
+            logger.info(f"Cloudscraper initialized with {browser}")
+            return scraper
+        except Exception as e:
+            logger.error(f"Failed to init cloudscraper: {e}")
+            return None
+    
+    def _get_scraper(self, url: str):
+        """
+        Host'a ait keep-alive scraper session
+        
+        requests.Session thread-safe değil; host başına ayrı session ve aynı
+        host'a istekler _host_lock ile sıralanır, session aynı anda tek
+        thread'de kullanılır.
+        """
+        host = urlparse(url).netloc
+        with self._scraper_lock:
+            scraper = self._scrapers.get(host)
+            if scraper is None and HAS_CLOUDSCRAPER and cloudscraper is not None:
+                scraper = self._scrapers[host] = self._create_scraper()
+            return scraper
+    
+    def _host_lock(self, url: str) -> threading.Lock:
+        """Host'un session'ını kullanırken tutulan kilit"""
+        host = urlparse(url).netloc
+        with self._scraper_lock:
+            return self._host_locks.setdefault(host, threading.Lock())
     
     def _get_headers(self, referer: Optional[str] = None) -> Dict[str, str]:
         """Rastgele gerçekçi headers döndür"""
@@ -191,21 +265,27 @@ class IPODataFetcher:
             headers['Referer'] = referer
         return headers
     
-    def _rate_limit(self):
-        """Rate limiting uygula"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed + random.uniform(0.1, 0.5))
-        self.last_request_time = time.time()
+    def _rate_limit(self, url: str):
+        """Host bazlı rate limiting uygula (executor thread'inde çağrılır)"""
+        self.rate_limiter.wait(url)
+    
+    def _load_legacy_json(self, path: Path) -> Optional[Dict]:
+        """Eski JSON dosyasını oku (store'a tek seferlik aktarım için)"""
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
     
     def _load_manual_data(self):
         """Manuel eklenen verileri yükle"""
         try:
-            if IPO_MANUAL_FILE.exists():
-                with open(IPO_MANUAL_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            self.manual_data = self.store.load("ipo_manual")
+            if not self.manual_data:
+                data = self._load_legacy_json(IPO_MANUAL_FILE)
+                if data:
                     self.manual_data = data.get('ipos', {})
-                    logger.info(f"Loaded {len(self.manual_data)} manual IPOs")
+                    self.store.write("ipo_manual", upserts=self.manual_data)
+            logger.info(f"Loaded {len(self.manual_data)} manual IPOs")
         except Exception as e:
             logger.error(f"Error loading manual data: {e}")
             self.manual_data = {}
@@ -213,29 +293,34 @@ class IPODataFetcher:
     def _load_cache(self):
         """Cache'den verileri yükle"""
         try:
-            if IPO_CACHE_FILE.exists():
-                with open(IPO_CACHE_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.cached_data = data.get('ipos', {})
+            cached = self.store.load("ipo_cache")
+            last_fetch = self.store.get_meta("ipo_cache.last_fetch")
+            if not cached:
+                data = self._load_legacy_json(IPO_CACHE_FILE)
+                if data:
+                    cached = data.get('ipos', {})
                     last_fetch = data.get('last_fetch')
-                    if last_fetch:
-                        self.last_fetch = datetime.fromisoformat(last_fetch)
-                    logger.info(f"Loaded {len(self.cached_data)} IPOs from cache")
+                    self.store.write("ipo_cache", upserts=cached, meta={"ipo_cache.last_fetch": last_fetch})
+            if cached:
+                self.cached_data = cached
+                if last_fetch:
+                    self.last_fetch = datetime.fromisoformat(last_fetch)
+                logger.info(f"Loaded {len(self.cached_data)} IPOs from cache")
         except Exception as e:
             logger.error(f"Error loading cache: {e}")
             self.cached_data = {}
     
     def _save_cache(self):
-        """Verileri cache'e kaydet"""
+        """Değişen cache kayıtlarını store'a yaz (tek transaction)"""
         try:
-            data = {
-                'ipos': self.cached_data,
-                'last_fetch': datetime.now().isoformat(),
-                'source': 'auto_fetch'
-            }
-            with open(IPO_CACHE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2, default=str)
-            logger.info(f"Saved {len(self.cached_data)} IPOs to cache")
+            dirty = self._dirty_cache_ids & self.cached_data.keys()
+            written = self.store.write(
+                "ipo_cache",
+                upserts={ipo_id: self.cached_data[ipo_id] for ipo_id in dirty},
+                meta={"ipo_cache.last_fetch": datetime.now().isoformat()}
+            )
+            self._dirty_cache_ids.clear()
+            logger.info(f"Saved {written} changed IPOs to cache")
         except Exception as e:
             logger.error(f"Error saving cache: {e}")
     
@@ -247,15 +332,9 @@ class IPODataFetcher:
             ipo_data['source'] = 'manual'
             ipo_data['added_at'] = datetime.now().isoformat()
             
+            self.store.write("ipo_manual", upserts={ipo_id: ipo_data})
             self.manual_data[ipo_id] = ipo_data
             
-            data = {
-                'ipos': self.manual_data,
-                'last_update': datetime.now().isoformat()
-            }
-            with open(IPO_MANUAL_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2, default=str)
-            
             logger.info(f"Saved manual IPO: {ipo_id}")
             return True
         except Exception as e:
@@ -266,13 +345,8 @@ class IPODataFetcher:
         """Manuel IPO'yu sil"""
         try:
             if ipo_id in self.manual_data:
+                self.store.write("ipo_manual", deletes=[ipo_id])
                 del self.manual_data[ipo_id]
-                data = {
-                    'ipos': self.manual_data,
-                    'last_update': datetime.now().isoformat()
-                }
-                with open(IPO_MANUAL_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2, default=str)
                 return True
             return False
         except Exception as e:
@@ -290,48 +364,88 @@ class IPODataFetcher:
         """Son fetch hatalarını döndür"""
         return self.fetch_errors.copy()
     
-    def _fetch_with_cloudscraper(self, url: str, referer: Optional[str] = None) -> Optional[str]:
-        """Cloudscraper ile sayfa çek (bot bypass)"""
-        if not self.scraper:
-            self._init_scraper()
-        
-        if not self.scraper:
+    def _request(self, url: str, referer: Optional[str] = None, extra_headers: Optional[Dict[str, str]] = None):
+        """Cloudscraper ile GET (bot bypass) - blocking, executor'da çalıştırın"""
+        scraper = self._get_scraper(url)
+        if not scraper:
             return None
         
-        self._rate_limit()
+        self._rate_limit(url)
         
         try:
             headers = self._get_headers(referer)
-            response = self.scraper.get(
-                url,
-                headers=headers,
-                timeout=15,
-                allow_redirects=True
-            )
-            
-            if response.status_code == 200:
-                logger.info(f"Successfully fetched {url} ({len(response.text)} chars)")
-                return response.text
-            else:
-                logger.warning(f"HTTP {response.status_code} for {url}")
-                return None
-                
+            if extra_headers:
+                headers.update(extra_headers)
+            with self._host_lock(url):
+                return scraper.get(
+                    url,
+                    headers=headers,
+                    timeout=15,
+                    allow_redirects=True
+                )
         except Exception as e:
             logger.error(f"Cloudscraper error for {url}: {e}")
             return None
     
+    def _fetch_with_cloudscraper(self, url: str, referer: Optional[str] = None) -> Optional[str]:
+        """Cloudscraper ile sayfa çek (bot bypass)"""
+        response = self._request(url, referer)
+        if response is None:
+            return None
+        
+        if response.status_code == 200:
+            logger.info(f"Successfully fetched {url} ({len(response.text)} chars)")
+            return response.text
+        
+        logger.warning(f"HTTP {response.status_code} for {url}")
+        return None
+    
+    def _fetch_parsed(self, url: str, referer: Optional[str], parse: Callable[[str], List[Dict]], min_length: int = 0) -> List[Dict]:
+        """
+        Sayfayı koşullu çek ve parse et (blocking, executor'da çalıştırın)
+        
+        304 veya aynı içerik hash'inde önceki parse sonucu döner. Dönen
+        dict'ler kopyadır; _merge_results onları değiştirebilir.
+        """
+        response = self._request(url, referer, self.validators.request_headers(url))
+        if response is None:
+            return []
+        
+        if response.status_code == 304:
+            logger.info(f"Not modified: {url}")
+            return [dict(item) for item in self.validators.not_modified(url).parsed or []]
+        
+        if response.status_code != 200:
+            logger.warning(f"HTTP {response.status_code} for {url}")
+            return []
+        
+        html = response.text
+        state, changed = self.validators.update(
+            url, html, response.headers.get('ETag'), response.headers.get('Last-Modified')
+        )
+        if not changed:
+            logger.info(f"Unchanged: {url}")
+            return [dict(item) for item in state.parsed]
+        
+        logger.info(f"Successfully fetched {url} ({len(html)} chars)")
+        parsed = parse(html) if len(html) > min_length else []  # Gerçek içerik kontrolü
+        self.validators.set_parsed(url, parsed)
+        return [dict(item) for item in parsed]
+    
     async def _fetch_async(self, url: str) -> Optional[str]:
         """Async HTTP fetch"""
         try:
             if self.aio_session is None or self.aio_session.closed:
                 timeout = aiohttp.ClientTimeout(total=15, connect=5)
-                connector = aiohttp.TCPConnector(ssl=False, limit=3, force_close=True)
+                # Keep-alive havuzu: host başına 2 bağlantı, boşta 30 sn açık kalır
+                connector = aiohttp.TCPConnector(ssl=False, limit=10, limit_per_host=2, keepalive_timeout=30)
                 self.aio_session = aiohttp.ClientSession(
                     headers=self._get_headers(),
                     timeout=timeout,
                     connector=connector
                 )
             
+            await self.rate_limiter.wait_async(url)
             async with self.aio_session.get(url) as response:
                 if response.status == 200:
                     return await response.text()
@@ -358,54 +472,39 @@ class IPODataFetcher:
                 sources_tried.append('initial_data')
                 logger.info(f"✓ Başlangıç verileri: {len(self.cached_data)} IPO yüklendi")
         
-        # 2. halkaarz.com'dan veri çek (Cloudscraper ile)
-        try:
-            halkaarz_data = await self._fetch_halkaarz()
-            if halkaarz_data:
-                results['halkaarz'] = halkaarz_data
-                sources_tried.append('halkaarz')
-                web_ipos_found += len(halkaarz_data)
-                logger.info(f"✓ halkaarz.com: {len(halkaarz_data)} IPO bulundu")
-        except Exception as e:
-            self.fetch_errors.append(f"halkaarz: {str(e)[:100]}")
-            logger.error(f"halkaarz.com error: {e}")
+        # 2. Tüm kaynakları eşzamanlı çek - toplam süre en yavaş kaynak kadar
+        sources: Dict[str, Awaitable] = {
+            'halkaarz': self._fetch_halkaarz(),
+            'bigpara': self._fetch_bigpara(),
+            'investing': self._fetch_investing(),
+        }
+        if HAS_FEEDPARSER:
+            sources['rss'] = self._fetch_rss_feeds()
         
-        # 3. bigpara'dan veri çek
-        try:
-            bigpara_data = await self._fetch_bigpara()
-            if bigpara_data:
-                results['bigpara'] = bigpara_data
-                sources_tried.append('bigpara')
-                web_ipos_found += len(bigpara_data)
-                logger.info(f"✓ bigpara: {len(bigpara_data)} IPO bulundu")
-        except Exception as e:
-            self.fetch_errors.append(f"bigpara: {str(e)[:100]}")
-            logger.error(f"bigpara error: {e}")
+        refresh_started = time.time()
+        fetched = await self._gather_sources(sources)
         
-        # 4. RSS Feed'lerden haber çek
-        if HAS_FEEDPARSER:
-            try:
-                rss_data = await self._fetch_rss_feeds()
-                if rss_data:
-                    news_items.extend(rss_data)
-                    sources_tried.append('rss')
-                    logger.info(f"✓ RSS: {len(rss_data)} haber bulundu")
-            except Exception as e:
-                self.fetch_errors.append(f"RSS: {str(e)[:100]}")
-        
-        # 5. investing.com'dan veri çek
-        try:
-            investing_data = await self._fetch_investing()
-            if investing_data:
-                results['investing'] = investing_data
-                sources_tried.append('investing')
-                web_ipos_found += len(investing_data)
-                logger.info(f"✓ investing: {len(investing_data)} veri bulundu")
-        except Exception as e:
-            self.fetch_errors.append(f"investing: {str(e)[:100]}")
+        for name, data in fetched.items():
+            if isinstance(data, Exception):
+                self.fetch_errors.append(f"{name}: {str(data)[:100]}")
+                logger.error(f"{name} error: {data}")
+            elif not data:
+                continue
+            elif name == 'rss':
+                news_items.extend(data)
+                sources_tried.append('rss')
+                logger.info(f"✓ RSS: {len(data)} haber bulundu")
+            else:
+                results[name] = data
+                sources_tried.append(name)
+                web_ipos_found += len(data)
+                logger.info(f"✓ {name}: {len(data)} IPO bulundu")
         
-        # Sonuçları birleştir
-        merged_ipos = self._merge_results(results)
+        # Sonuçları birleştir - hiçbir sayfa değişmediyse (304 / aynı hash) atla
+        content_changed = self.validators.changed_since(refresh_started) or not self.cached_data
+        merged_ipos = self._merge_results(results) if content_changed else {}
+        if not content_changed:
+            logger.info("IPO kaynakları değişmedi, birleştirme atlandı")
         
         # Cache'e kaydet
         if merged_ipos:
@@ -415,6 +514,7 @@ class IPODataFetcher:
                 else:
                     # Mevcut veriyi güncelle
                     self.cached_data[ipo_id].update(ipo_data)
+                self._dirty_cache_ids.add(ipo_id)
             
             self.last_fetch = datetime.now()
             self._save_cache()
@@ -445,41 +545,66 @@ class IPODataFetcher:
             'manual_ipos': len(self.manual_data),
             'errors': self.fetch_errors,
             'news_found': len(news_items),
+            'changed': content_changed,
             'timestamp': datetime.now().isoformat()
         }
     
+    async def _gather_sources(self, sources: Dict[str, Awaitable]) -> Dict[str, Any]:
+        """
+        Kaynakları eşzamanlı çalıştır, toplam süreyi `self.deadline` ile sınırla
+        
+        Süresi dolan kaynaklar iptal edilir ve TimeoutError olarak döner;
+        executor'daki blocking çağrılar arka planda biter, sonuçları yok sayılır.
+        """
+        tasks = {name: asyncio.ensure_future(coro) for name, coro in sources.items()}
+        done, pending = await asyncio.wait(tasks.values(), timeout=self.deadline)
+        
+        for task in pending:
+            task.cancel()
+        
+        fetched: Dict[str, Any] = {}
+        for name, task in tasks.items():
+            if task in pending:
+                fetched[name] = asyncio.TimeoutError(f"deadline ({self.deadline:.0f}s) exceeded")
+            elif task.exception() is not None:
+                fetched[name] = task.exception()
+            else:
+                fetched[name] = task.result()
+        return fetched
+    
+    async def _fetch_page(
+        self,
+        url: str,
+        referer: Optional[str],
+        parse: Callable[[str], List[Dict]],
+        min_length: int = 0
+    ) -> List[Dict]:
+        """Blocking koşullu çek + parse işini executor'da çalıştır"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._fetch_parsed, url, referer, parse, min_length)
+    
     async def _fetch_halkaarz(self) -> List[Dict]:
         """halkaarz.com'dan veri çek"""
         ipos = []
         
-        # Thread pool ile cloudscraper kullan
-        loop = asyncio.get_event_loop()
-        
         urls = [
             (self.SOURCES['halkaarz'], None),
             (self.SOURCES['halkaarzcom_aktif'], self.SOURCES['halkaarz']),
             (self.SOURCES['halkaarzcom_yaklasan'], self.SOURCES['halkaarz']),
         ]
         
-        for url, referer in urls:
-            try:
-                html = await loop.run_in_executor(
-                    self.executor,
-                    self._fetch_with_cloudscraper,
-                    url,
-                    referer
-                )
-                
-                if html and len(html) > 1000:  # Gerçek içerik kontrolü
-                    parsed = self._parse_halkaarz_html(html)
-                    ipos.extend(parsed)
-                    logger.info(f"  halkaarz {url}: {len(parsed)} IPO parsed")
-                    
-                # Rate limiting
-                await asyncio.sleep(random.uniform(1.5, 3.0))
-                
-            except Exception as e:
-                logger.error(f"halkaarz fetch error for {url}: {e}")
+        # Sayfalar birlikte kuyruğa girer; aynı host olduğu için rate limiter aralıklandırır
+        pages = await asyncio.gather(
+            *(self._fetch_page(url, referer, self._parse_halkaarz_html, min_length=1000) for url, referer in urls),
+            return_exceptions=True
+        )
+        
+        for (url, _), parsed in zip(urls, pages):
+            if isinstance(parsed, Exception):
+                logger.error(f"halkaarz fetch error for {url}: {parsed}")
+                continue
+            ipos.extend(parsed)
+            logger.info(f"  halkaarz {url}: {len(parsed)} IPO")
         
         return ipos
     
@@ -536,18 +661,13 @@ class IPODataFetcher:
         """bigpara.hurriyet.com.tr'den veri çek"""
         ipos = []
         
-        loop = asyncio.get_event_loop()
-        
         try:
-            html = await loop.run_in_executor(
-                self.executor,
-                self._fetch_with_cloudscraper,
+            ipos = await self._fetch_page(
                 self.SOURCES['bigpara'],
-                "https://bigpara.hurriyet.com.tr/"
+                "https://bigpara.hurriyet.com.tr/",
+                self._parse_bigpara_html,
+                min_length=500
             )
-            
-            if html and len(html) > 500:
-                ipos = self._parse_bigpara_html(html)
                 
         except Exception as e:
             logger.error(f"bigpara fetch error: {e}")
@@ -585,30 +705,30 @@ class IPODataFetcher:
         """investing.com'dan veri çek"""
         ipos = []
         
-        loop = asyncio.get_event_loop()
-        
         try:
-            html = await loop.run_in_executor(
-                self.executor,
-                self._fetch_with_cloudscraper,
+            ipos = await self._fetch_page(
                 self.SOURCES['investing'],
-                "https://tr.investing.com/"
+                "https://tr.investing.com/",
+                self._parse_investing_html
             )
-            
-            if html:
-                soup = BeautifulSoup(html, 'html.parser')
-                # Hisse tablosu
-                rows = soup.select('tr[data-id], table tr')
-                for row in rows:
-                    ipo = self._parse_table_row(row, 'investing')
-                    if ipo and ipo.get('name'):
-                        ipos.append(ipo)
                         
         except Exception as e:
             logger.error(f"investing fetch error: {e}")
         
         return ipos
     
+    def _parse_investing_html(self, html: str) -> List[Dict]:
+        """investing.com HTML parse"""
+        ipos = []
+        soup = BeautifulSoup(html, 'html.parser')
+        # Hisse tablosu
+        rows = soup.select('tr[data-id], table tr')
+        for row in rows:
+            ipo = self._parse_table_row(row, 'investing')
+            if ipo and ipo.get('name'):
+                ipos.append(ipo)
+        return ipos
+    
     async def _fetch_rss_feeds(self) -> List[Dict]:
         """RSS Feed'lerden haber çek"""
         items = []
@@ -621,41 +741,62 @@ class IPODataFetcher:
             self.SOURCES.get('bloomberght_rss'),
             "https://www.dunya.com/rss/borsa",
         ]
+        feeds = [url for url in feeds if url]
         
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         
-        for url in feeds:
-            if not url:
-                continue
-            try:
-                if feedparser is None:
-                    continue
-                feed = await loop.run_in_executor(
-                    self.executor,
-                    feedparser.parse,
-                    url
-                )
+        keywords = ['halka arz', 'halka açıl', 'ipo', 'borsa istanbul', 'bist', 'sermaye artırım']
+        
+        def fetch_feed(url: str) -> List[Dict]:
+            """Koşullu çek (feedparser ETag/Last-Modified destekler), değişmediyse önceki sonuç"""
+            self._rate_limit(url)
+            state = self.validators.get(url)
+            use_validators = state is not None and state.parsed is not None
+            feed = feedparser.parse(
+                url,
+                etag=state.etag if use_validators else None,
+                modified=state.last_modified if use_validators else None
+            )
+            if feed.get('status') == 304:
+                return list(self.validators.not_modified(url).parsed)
+            
+            fingerprint = "\n".join(f"{e.get('link', '')}|{e.get('title', '')}" for e in feed.entries[:30])
+            state, changed = self.validators.update(url, fingerprint, feed.get('etag'), feed.get('modified'))
+            if not changed:
+                return list(state.parsed)
+            
+            feed_items = []
+            for entry in feed.entries[:30]:
+                title_raw = entry.get('title', '')
+                summary_raw = entry.get('summary', '')
+                title = str(title_raw).lower() if title_raw else ''
+                summary = str(summary_raw).lower() if summary_raw else ''
                 
-                for entry in feed.entries[:30]:
-                    title_raw = entry.get('title', '')
-                    summary_raw = entry.get('summary', '')
-                    title = str(title_raw).lower() if title_raw else ''
-                    summary = str(summary_raw).lower() if summary_raw else ''
-                    
-                    # Halka arz ile ilgili mi?
-                    keywords = ['halka arz', 'halka açıl', 'ipo', 'borsa istanbul', 'bist', 'sermaye artırım']
-                    if any(kw in title or kw in summary for kw in keywords):
-                        summary_text = str(summary_raw) if summary_raw else ''
-                        items.append({
-                            'title': str(title_raw) if title_raw else '',
-                            'summary': summary_text[:200] if summary_text else '',
-                            'link': entry.get('link', ''),
-                            'date': entry.get('published', ''),
-                            'source': 'rss',
-                        })
-                        
-            except Exception as e:
-                logger.debug(f"RSS error for {url}: {e}")
+                # Halka arz ile ilgili mi?
+                if any(kw in title or kw in summary for kw in keywords):
+                    summary_text = str(summary_raw) if summary_raw else ''
+                    feed_items.append({
+                        'title': str(title_raw) if title_raw else '',
+                        'summary': summary_text[:200] if summary_text else '',
+                        'link': entry.get('link', ''),
+                        'date': entry.get('published', ''),
+                        'source': 'rss',
+                    })
+            
+            self.validators.set_parsed(url, feed_items)
+            return list(feed_items)
+        
+        # Farklı host'lar - paralel çekilir
+        parsed_feeds = await asyncio.gather(
+            *(loop.run_in_executor(self.executor, fetch_feed, url) for url in feeds),
+            return_exceptions=True
+        )
+        
+        for url, feed_items in zip(feeds, parsed_feeds):
+            if isinstance(feed_items, Exception):
+                logger.debug(f"RSS error for {url}: {feed_items}")
+                continue
+            items.extend(feed_items)
         
         return items
     
@@ -802,6 +943,11 @@ class IPODataFetcher:
         """Kaynakları temizle"""
         if self.aio_session and not self.aio_session.closed:
             await self.aio_session.close()
+        with self._scraper_lock:
+            for scraper in self._scrapers.values():
+                if scraper is not None:
+                    scraper.close()
+            self._scrapers.clear()
         self.executor.shutdown(wait=False)
 
 
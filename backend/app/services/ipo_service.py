@@ -5,7 +5,7 @@ Gerçek veriler KAP, SPK ve Borsa İstanbul kaynaklarından çekilir
 
 Özellikler:
 - Otomatik günlük güncelleme (08:00, 18:30, 00:30)
-- JSON dosyasında veri saklama (persistence)
+- SQLite'ta artımlı veri saklama (persistence, lazy yükleme)
 - Web scraping ile gerçek veri çekme
 - Yedek veri seti (kaynak çalışmazsa)
 """
@@ -20,6 +20,9 @@ import requests
 from bs4 import BeautifulSoup
 import re
 import logging
+import threading
+
+from app.services.ipo_store import IPORecordStore, get_ipo_store
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +43,7 @@ def get_alert_manager():
 
 # Veri dosyaları
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
-IPO_DATA_FILE = DATA_DIR / "ipo_data.json"
+IPO_DATA_FILE = DATA_DIR / "ipo_data.json"  # Eski format - store boşsa bir kez içe aktarılır
 IPO_MANUAL_FILE = DATA_DIR / "ipo_manual.json"  # Manuel eklenen veriler
 IPO_INITIAL_FILE = DATA_DIR / "ipo_initial.json"  # Başlangıç verileri
 
@@ -177,49 +180,243 @@ class IPOAlert:
     is_triggered: bool = False
     created_at: datetime = field(default_factory=datetime.now)
 
+def _ipo_sort_key(ipo: IPOCompany):
+    """Tarihe göre sıralama (aktif ve yaklaşanlar önce)"""
+    if ipo.status == IPOStatus.ACTIVE:
+        return (0, ipo.demand_end or datetime.max)
+    elif ipo.status == IPOStatus.UPCOMING:
+        return (1, ipo.demand_start or datetime.max)
+    elif ipo.status == IPOStatus.TRADING:
+        return (2, -(ipo.price_change_percent or 0))
+    else:
+        return (3, ipo.announcement_date)
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class IPOCatalog:
+    """
+    Halka arzların okuma için hazırlanmış görünümü
+    
+    Serialized dicts, sorted status views, secondary indexes (status, sector,
+    symbol), a trigram index for search and the stats are built once per data
+    change. `to_dict()` includes day counters relative to now, so the catalog
+    also expires at the next moment one of them would change (`valid_until`).
+    """
+    
+    def __init__(self, ipos: Dict[str, IPOCompany], now: Optional[datetime] = None):
+        now = now or datetime.now()
+        self.position = {ipo_id: i for i, ipo_id in enumerate(ipos)}
+        self.dicts: Dict[str, Dict] = {ipo_id: ipo.to_dict() for ipo_id, ipo in ipos.items()}
+        
+        ordered = sorted(ipos.values(), key=_ipo_sort_key)
+        self.all_sorted: List[str] = [ipo.id for ipo in ordered]
+        self.by_status: Dict[IPOStatus, List[str]] = {status: [] for status in IPOStatus}
+        self.by_sector: Dict[str, set] = {}
+        self.by_symbol: Dict[str, str] = {}
+        for ipo in ordered:
+            self.by_status[ipo.status].append(ipo.id)
+            self.by_sector.setdefault(ipo.sector.lower(), set()).add(ipo.id)
+        for ipo in ipos.values():
+            self.by_symbol.setdefault(ipo.symbol.upper(), ipo.id)
+        
+        # Son işlem görmeye başlayanlar, yeniden eskiye
+        self.recent_trading = sorted(
+            (ipo for ipo in ipos.values() if ipo.status == IPOStatus.TRADING and ipo.trading_start),
+            key=lambda ipo: ipo.trading_start,
+            reverse=True
+        )
+        
+        # Arama: alan başına .lower() yerine tek seferlik metin + trigram index
+        self._haystacks: Dict[str, str] = {}
+        self._trigram_index: Dict[str, set] = {}
+        for ipo in ipos.values():
+            haystack = "\x00".join((ipo.symbol, ipo.name, ipo.sector, ipo.description)).lower()
+            self._haystacks[ipo.id] = haystack
+            for gram in _trigrams(haystack):
+                self._trigram_index.setdefault(gram, set()).add(ipo.id)
+        
+        self.stats = self._build_stats(ipos)
+        self.valid_until = self._next_day_change(ipos.values(), now)
+    
+    def view(self, status: Optional[IPOStatus] = None, sector: Optional[str] = None) -> List[Dict]:
+        ids = self.by_status[status] if status else self.all_sorted
+        if sector:
+            in_sector = self.by_sector.get(sector.lower(), set())
+            ids = [ipo_id for ipo_id in ids if ipo_id in in_sector]
+        return [self.dicts[ipo_id] for ipo_id in ids]
+    
+    def recent(self, cutoff: datetime) -> List[Dict]:
+        result = []
+        for ipo in self.recent_trading:
+            if ipo.trading_start < cutoff:
+                break
+            result.append(self.dicts[ipo.id])
+        return result
+    
+    def search(self, query: str) -> List[Dict]:
+        query = query.lower()
+        if len(query) >= 3:
+            postings = sorted((self._trigram_index.get(gram, set()) for gram in _trigrams(query)), key=len)
+            candidates = set.intersection(*postings)
+        else:
+            candidates = self._haystacks.keys()
+        
+        # Trigramlar aday listesini daraltır, eşleşmeyi alt-dizgi kontrolü kesinleştirir
+        matches = [ipo_id for ipo_id in candidates if query in self._haystacks[ipo_id]]
+        matches.sort(key=self.position.__getitem__)
+        return [self.dicts[ipo_id] for ipo_id in matches]
+    
+    def _build_stats(self, ipos: Dict[str, IPOCompany]) -> Dict:
+        all_ipos = list(ipos.values())
+        active = [ipos[ipo_id] for ipo_id in self.by_status[IPOStatus.ACTIVE]]
+        upcoming = [ipos[ipo_id] for ipo_id in self.by_status[IPOStatus.UPCOMING]]
+        trading = [ipo for ipo in all_ipos if ipo.status == IPOStatus.TRADING]
+        completed = [ipo for ipo in all_ipos if ipo.status == IPOStatus.COMPLETED]
+        
+        # Performans ortalaması
+        trading_with_perf = [ipo for ipo in trading + completed if ipo.price_change_percent is not None]
+        perf_values = [ipo.price_change_percent for ipo in trading_with_perf]
+        avg_performance = sum(perf_values) / len(perf_values) if perf_values else 0.0
+        
+        # En yüksek talep
+        demand_values = [ipo.demand_multiple for ipo in all_ipos if ipo.demand_multiple is not None]
+        max_demand = max(demand_values) if demand_values else 0.0
+        
+        # En iyi performans
+        best_performer = max(trading_with_perf, key=lambda x: x.price_change_percent or 0.0) if trading_with_perf else None
+        
+        # Toplam arz değeri (aktif + yaklaşan)
+        total_offering = sum(
+            (ipo.final_price or ipo.price_range_max) * ipo.shares_offered 
+            for ipo in active + upcoming
+        )
+        
+        return {
+            "total_ipos": len(all_ipos),
+            "active_count": len(active),
+            "upcoming_count": len(upcoming),
+            "trading_count": len(trading),
+            "completed_count": len(completed),
+            "avg_performance_percent": round(avg_performance, 2),
+            "max_demand_multiple": round(max_demand, 1),
+            "total_offering_value": total_offering,
+            "sectors": list(set(ipo.sector for ipo in all_ipos)),
+            "best_performer": self.dicts[best_performer.id] if best_performer else None,
+        }
+    
+    @staticmethod
+    def _next_day_change(ipos, now: datetime) -> datetime:
+        """En yakın `days_until_*` değişim anı (günlük sayaçlar o ana kadar geçerli)"""
+        valid_until = datetime.max
+        for ipo in ipos:
+            if ipo.status == IPOStatus.UPCOMING:
+                target = ipo.demand_start
+            elif ipo.status == IPOStatus.ACTIVE:
+                target = ipo.demand_end
+            else:
+                continue
+            if target is None:
+                continue
+            days = (target - now).days
+            if days >= 1:
+                valid_until = min(valid_until, target - timedelta(days=days))
+        return valid_until
+
+
 class IPOService:
     """Halka Arz Takip Servisi - Otomatik Güncelleme Destekli"""
     
-    def __init__(self):
-        self.ipos: Dict[str, IPOCompany] = {}
+    def __init__(self, store: Optional[IPORecordStore] = None):
+        self.store = store or get_ipo_store()
+        self._ipos: Dict[str, IPOCompany] = {}
+        self._watchlist: Dict[str, List[str]] = {}  # user_id -> [ipo_ids]
         self.alerts: List[IPOAlert] = []
-        self.watchlist: Dict[str, List[str]] = {}  # user_id -> [ipo_ids]
         self.last_update: Optional[datetime] = None
         self.last_fetch_source: str = "none"
         self.update_interval = 3600  # 1 saat (saniye cinsinden)
         self._scheduler_started = False
         self._known_ipo_ids: set = set()  # Bilinen IPO'ları takip et
+        self._catalog: Optional[IPOCatalog] = None  # Okuma görünümü, veri değişince yeniden kurulur
+        self._catalog_lock = threading.Lock()
         
-        # Data klasörünü oluştur
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        
-        # Başlangıçta verileri yükle
-        self._load_data()
-        
-        # Mevcut IPO'ları bilinen listesine ekle
-        self._known_ipo_ids = set(self.ipos.keys())
+        # Veriler ilk erişimde yüklenir - modül import'u dosya okumaz
+        self._loaded = False
+        self._loading = False  # yükleyen thread'in kendi ipos/watchlist erişimleri için
+        self._load_lock = threading.RLock()
+    
+    def _ensure_loaded(self):
+        """İlk erişimde verileri yükle"""
+        if self._loaded:
+            return
+        with self._load_lock:
+            # _loading: yükleme sırasında aynı thread'den gelen erişim (RLock) - diğer thread'ler kilitte bekler
+            if self._loaded or self._loading:
+                return
+            self._loading = True
+            try:
+                self._load_data()
+                # Mevcut IPO'ları bilinen listesine ekle
+                self._known_ipo_ids = set(self._ipos.keys())
+                # Yalnızca yükleme bitince - diğer thread'ler yarım veri / katalog görmesin
+                self._loaded = True
+                self._invalidate_catalog()
+            finally:
+                self._loading = False
+    
+    @property
+    def ipos(self) -> Dict[str, IPOCompany]:
+        self._ensure_loaded()
+        return self._ipos
+    
+    @property
+    def watchlist(self) -> Dict[str, List[str]]:
+        self._ensure_loaded()
+        return self._watchlist
+    
+    def _get_catalog(self) -> IPOCatalog:
+        """Güncel katalog (gerekirse yeniden kur)"""
+        catalog = self._catalog
+        now = datetime.now()
+        if catalog is None or now >= catalog.valid_until:
+            with self._catalog_lock:
+                catalog = self._catalog
+                if catalog is None or now >= catalog.valid_until:
+                    catalog = self._catalog = IPOCatalog(self.ipos, now)
+        return catalog
+    
+    def _invalidate_catalog(self):
+        """IPO verisi değişti - katalog bir sonraki okumada yeniden kurulur"""
+        self._catalog = None
     
     def _load_data(self):
-        """Verileri yükle - önce JSON, yoksa başlangıç verileri, en son fallback"""
+        """Verileri yükle - önce store, yoksa eski JSON, başlangıç verileri, en son fallback"""
         logger.info("Loading IPO data...")
         
-        # Önce JSON dosyasından yükle
+        if self._load_from_store():
+            logger.info(f"Loaded {len(self.ipos)} IPOs from store")
+            return
+        
+        # Store boş - eski JSON dosyasını bir kez içe aktar
         if self._load_from_json():
-            logger.info(f"Loaded {len(self.ipos)} IPOs from JSON file")
+            logger.info(f"Imported {len(self.ipos)} IPOs from JSON file")
+            self._save_data()
             return
         
         # JSON yoksa başlangıç verilerini dene
         if self._load_initial_data():
             logger.info(f"Loaded {len(self.ipos)} IPOs from initial data")
-            self._save_to_json()
+            self._save_data()
             return
         
         # Hiçbiri yoksa fallback verileri yükle
-        logger.info("No JSON/initial data found, loading fallback data...")
+        logger.info("No stored/initial data found, loading fallback data...")
         self._load_fallback_ipos()
         
-        # Sonra JSON'a kaydet
-        self._save_to_json()
+        # Sonra store'a kaydet
+        self._save_data()
         
         self.last_update = datetime.now()
         logger.info(f"Loaded {len(self.ipos)} fallback IPOs")
@@ -319,7 +516,7 @@ class IPOService:
             self.last_fetch_source = data.get('source', 'json')
             
             # Watchlist yükle
-            self.watchlist = data.get('watchlist', {})
+            self._watchlist = data.get('watchlist', {})
             
             return len(self.ipos) > 0
             
@@ -327,25 +524,52 @@ class IPOService:
             logger.error(f"Error loading from JSON: {e}")
             return False
     
-    def _save_to_json(self):
-        """Verileri JSON dosyasına kaydet"""
+    def _load_from_store(self) -> bool:
+        """Store'dan verileri yükle"""
         try:
-            data = {
-                'ipos': [self._ipo_to_dict(ipo) for ipo in self.ipos.values()],
-                'last_update': datetime.now().isoformat(),
-                'source': self.last_fetch_source,
-                'watchlist': self.watchlist,
-                'version': '2.0',
-                'auto_update_enabled': True
-            }
+            for ipo_id, ipo_dict in self.store.load("ipos").items():
+                try:
+                    self._ipos[ipo_id] = self._dict_to_ipo(ipo_dict)
+                except Exception as e:
+                    logger.error(f"Error loading IPO {ipo_id}: {e}")
             
-            with open(IPO_DATA_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+            meta = self.store.get_meta("ipo_service", {})
+            if meta.get('last_update'):
+                self.last_update = datetime.fromisoformat(meta['last_update'])
+            self.last_fetch_source = meta.get('source', 'store')
+            self._watchlist = meta.get('watchlist', {})
             
-            logger.info(f"Saved {len(self.ipos)} IPOs to JSON file")
+            return len(self._ipos) > 0
+            
+        except Exception as e:
+            logger.error(f"Error loading from store: {e}")
+            return False
+    
+    def _save_data(self, changed: Optional[List[str]] = None, deleted: List[str] = ()):
+        """
+        Değişiklikleri store'a yaz (tek transaction)
+        
+        `changed` verilmezse tüm kayıtlar karşılaştırılır; yalnızca içeriği
+        değişenler yazılır, artık olmayanlar silinir.
+        """
+        try:
+            ipo_ids = self._ipos.keys() if changed is None else [i for i in changed if i in self._ipos]
+            written = self.store.write(
+                "ipos",
+                upserts={ipo_id: self._ipo_to_dict(self._ipos[ipo_id]) for ipo_id in ipo_ids},
+                deletes=deleted,
+                meta={"ipo_service": {
+                    'last_update': datetime.now().isoformat(),
+                    'source': self.last_fetch_source,
+                    'watchlist': self._watchlist,
+                    'version': '3.0',
+                }},
+                prune=changed is None
+            )
+            logger.info(f"Saved IPO data ({written} changed records)")
             
         except Exception as e:
-            logger.error(f"Error saving to JSON: {e}")
+            logger.error(f"Error saving IPO data: {e}")
     
     def _dict_to_ipo(self, d: Dict) -> IPOCompany:
         """Dictionary'den IPOCompany oluştur"""
@@ -506,7 +730,13 @@ class IPOService:
             # Fetcher'dan tüm verileri al (cache + manual dahil)
             all_ipos = fetcher.get_all_ipos()
             
-            if all_ipos:
+            if all_ipos and not fetch_result.get('changed', True) and self.ipos:
+                # Kaynaklar değişmedi - tekrar uygulamaya ve dosyaya yazmaya gerek yok
+                results['ipos_found'] = len(self.ipos)
+                results['success'] = True
+                self.last_fetch_source = 'fetcher'
+                logger.info("IPO update: sources unchanged, nothing to apply")
+            elif all_ipos:
                 # Mevcut verileri güncelle
                 updated_count = 0
                 news_count = 0
@@ -537,7 +767,8 @@ class IPOService:
                 results['success'] = True
                 
                 self.last_fetch_source = 'fetcher'
-                self._save_to_json()
+                self._invalidate_catalog()
+                self._save_data()
                 
                 logger.info(f"IPO update: {updated_count} updated (Web: {results['web_ipos_found']}, Cache: {results['cache_ipos']}, Manual: {results['manual_ipos']})")
             else:
@@ -618,7 +849,8 @@ class IPOService:
             )
             
             self.ipos[ipo_id] = ipo
-            self._save_to_json()
+            self._invalidate_catalog()
+            self._save_data([ipo_id])
             
             logger.info(f"Manually added IPO: {ipo_id}")
             return ipo_id
@@ -632,7 +864,8 @@ class IPOService:
         try:
             if ipo_id in self.ipos:
                 del self.ipos[ipo_id]
-                self._save_to_json()
+                self._invalidate_catalog()
+                self._save_data([], deleted=[ipo_id])
                 logger.info(f"Deleted IPO: {ipo_id}")
                 return True
             return False
@@ -1070,8 +1303,12 @@ class IPOService:
             logger.debug("Data is still fresh, skipping refresh")
             return False
         
-        # Önce JSON'dan yükle
-        self._load_data()
+        # Store'dan yeniden yükle
+        if self._loaded:
+            self._load_data()
+        else:
+            self._ensure_loaded()
+        self._invalidate_catalog()
         return True
     
     async def refresh_data_async(self) -> Dict[str, Any]:
@@ -1080,17 +1317,18 @@ class IPOService:
     
     def force_save(self):
         """Verileri zorla kaydet"""
-        self._save_to_json()
+        self._save_data()
         return True
     
     def get_update_status(self) -> Dict[str, Any]:
         """Güncelleme durumunu döndür"""
+        self._ensure_loaded()
         return {
             'last_update': self.last_update.isoformat() if self.last_update else None,
             'source': self.last_fetch_source,
             'ipo_count': len(self.ipos),
-            'data_file': str(IPO_DATA_FILE),
-            'data_file_exists': IPO_DATA_FILE.exists(),
+            'data_file': str(self.store.path),
+            'data_file_exists': self.store.path.exists(),
             'update_interval_seconds': self.update_interval,
             'is_stale': self._is_data_stale()
         }
@@ -1103,46 +1341,25 @@ class IPOService:
         return age > timedelta(hours=max_age_hours)
     
     def get_all_ipos(self, status: Optional[str] = None, sector: Optional[str] = None) -> List[Dict]:
-        """Tüm halka arzları getir"""
-        ipos = list(self.ipos.values())
-        
+        """Tüm halka arzları getir (aktif ve yaklaşanlar önce)"""
+        status_enum = None
         if status:
             try:
                 status_enum = IPOStatus(status)
-                ipos = [ipo for ipo in ipos if ipo.status == status_enum]
             except ValueError:
                 pass
         
-        if sector:
-            ipos = [ipo for ipo in ipos if ipo.sector.lower() == sector.lower()]
-        
-        # Tarihe göre sırala (aktif ve yaklaşanlar önce)
-        def sort_key(ipo):
-            if ipo.status == IPOStatus.ACTIVE:
-                return (0, ipo.demand_end or datetime.max)
-            elif ipo.status == IPOStatus.UPCOMING:
-                return (1, ipo.demand_start or datetime.max)
-            elif ipo.status == IPOStatus.TRADING:
-                return (2, -(ipo.price_change_percent or 0))
-            else:
-                return (3, ipo.announcement_date)
-        
-        ipos.sort(key=sort_key)
-        return [ipo.to_dict() for ipo in ipos]
+        return self._get_catalog().view(status_enum, sector)
     
     def get_ipo(self, ipo_id: str) -> Optional[Dict]:
         """Belirli bir halka arzı getir"""
-        ipo = self.ipos.get(ipo_id)
-        if ipo:
-            return ipo.to_dict()
-        return None
+        return self._get_catalog().dicts.get(ipo_id)
     
     def get_ipo_by_symbol(self, symbol: str) -> Optional[Dict]:
         """Sembole göre halka arz getir"""
-        for ipo in self.ipos.values():
-            if ipo.symbol.upper() == symbol.upper():
-                return ipo.to_dict()
-        return None
+        catalog = self._get_catalog()
+        ipo_id = catalog.by_symbol.get(symbol.upper())
+        return catalog.dicts[ipo_id] if ipo_id else None
     
     def get_active_ipos(self) -> List[Dict]:
         """Aktif (talep toplama devam eden) halka arzlar"""
@@ -1155,51 +1372,12 @@ class IPOService:
     def get_recent_ipos(self, days: int = 90) -> List[Dict]:
         """Son X gün içinde işlem görmeye başlayanlar"""
         cutoff = datetime.now() - timedelta(days=days)
-        ipos = [
-            ipo for ipo in self.ipos.values() 
-            if ipo.status == IPOStatus.TRADING and ipo.trading_start and ipo.trading_start >= cutoff
-        ]
-        return [ipo.to_dict() for ipo in sorted(ipos, key=lambda x: x.trading_start or datetime.min, reverse=True)]
+        return self._get_catalog().recent(cutoff)
     
     def get_ipo_stats(self) -> Dict:
         """Halka arz istatistikleri"""
-        all_ipos = list(self.ipos.values())
-        
-        active = [ipo for ipo in all_ipos if ipo.status == IPOStatus.ACTIVE]
-        upcoming = [ipo for ipo in all_ipos if ipo.status == IPOStatus.UPCOMING]
-        trading = [ipo for ipo in all_ipos if ipo.status == IPOStatus.TRADING]
-        completed = [ipo for ipo in all_ipos if ipo.status == IPOStatus.COMPLETED]
-        
-        # Performans ortalaması
-        trading_with_perf = [ipo for ipo in trading + completed if ipo.price_change_percent is not None]
-        perf_values = [ipo.price_change_percent for ipo in trading_with_perf if ipo.price_change_percent is not None]
-        avg_performance = sum(perf_values) / len(perf_values) if perf_values else 0.0
-        
-        # En yüksek talep
-        all_with_demand = [ipo for ipo in all_ipos if ipo.demand_multiple is not None]
-        demand_values = [ipo.demand_multiple for ipo in all_with_demand if ipo.demand_multiple is not None]
-        max_demand = max(demand_values) if demand_values else 0.0
-        
-        # En iyi performans
-        best_performer = max(trading_with_perf, key=lambda x: x.price_change_percent or 0.0) if trading_with_perf else None
-        
-        # Toplam arz değeri (aktif + yaklaşan)
-        total_offering = sum(
-            (ipo.final_price or ipo.price_range_max) * ipo.shares_offered 
-            for ipo in active + upcoming
-        )
-        
         return {
-            "total_ipos": len(all_ipos),
-            "active_count": len(active),
-            "upcoming_count": len(upcoming),
-            "trading_count": len(trading),
-            "completed_count": len(completed),
-            "avg_performance_percent": round(avg_performance, 2),
-            "max_demand_multiple": round(max_demand, 1),
-            "total_offering_value": total_offering,
-            "sectors": list(set(ipo.sector for ipo in all_ipos)),
-            "best_performer": best_performer.to_dict() if best_performer else None,
+            **self._get_catalog().stats,
             "last_update": self.last_update.isoformat() if self.last_update else None
         }
     
@@ -1227,7 +1405,8 @@ class IPOService:
         if user_id not in self.watchlist:
             return []
         
-        return [self.ipos[ipo_id].to_dict() for ipo_id in self.watchlist[user_id] if ipo_id in self.ipos]
+        dicts = self._get_catalog().dicts
+        return [dicts[ipo_id] for ipo_id in self.watchlist[user_id] if ipo_id in dicts]
     
     def calculate_investment(self, ipo_id: str, lot_count: int) -> Optional[Dict]:
         """Yatırım hesaplama"""
@@ -1262,18 +1441,8 @@ class IPOService:
         }
     
     def search_ipos(self, query: str) -> List[Dict]:
-        """Halka arz ara"""
-        query = query.lower()
-        results = []
-        
-        for ipo in self.ipos.values():
-            if (query in ipo.symbol.lower() or 
-                query in ipo.name.lower() or 
-                query in ipo.sector.lower() or
-                query in ipo.description.lower()):
-                results.append(ipo.to_dict())
-        
-        return results
+        """Halka arz ara (sembol, isim, sektör, açıklama)"""
+        return self._get_catalog().search(query)
 
 # Global instance
 ipo_service = IPOService()
@@ -0,0 +1,178 @@
+"""
+IPO Store
+SQLite-backed record store for IPO data (service records, fetcher cache, manual entries)
+
+Records are kept per collection as one JSON row each, with a content digest.
+A write only touches rows whose digest changed (or that were deleted), and
+every write - records plus metadata - is a single transaction, so a crash
+never leaves a half-written file behind. Legacy JSON files are imported once
+by the callers when a collection is still empty.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+IPO_STORE_FILE = DATA_DIR / "ipo_store.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class IPORecordStore:
+    """
+    Keyed JSON records + metadata in one SQLite file
+
+    The connection is opened on first use, so constructing the store costs
+    nothing at import time.
+    """
+
+    def __init__(self, path: Path = IPO_STORE_FILE):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._digests: Dict[str, Dict[str, str]] = {}  # collection -> id -> digest
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _known_digests(self, collection: str) -> Dict[str, str]:
+        digests = self._digests.get(collection)
+        if digests is None:
+            rows = self._connect().execute(
+                "SELECT id, digest FROM records WHERE collection = ?", (collection,)
+            )
+            digests = self._digests[collection] = dict(rows)
+        return digests
+
+    def load(self, collection: str) -> Dict[str, Dict]:
+        """All records of a collection"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id, data, digest FROM records WHERE collection = ? ORDER BY rowid", (collection,)
+            ).fetchall()
+            self._digests[collection] = {record_id: digest for record_id, _, digest in rows}
+        return {record_id: json.loads(data) for record_id, data, _ in rows}
+
+    def count(self, collection: str) -> int:
+        with self._lock:
+            return len(self._known_digests(collection))
+
+    def write(
+        self,
+        collection: str,
+        upserts: Optional[Dict[str, Dict]] = None,
+        deletes: Iterable[str] = (),
+        meta: Optional[Dict[str, Any]] = None,
+        prune: bool = False
+    ) -> int:
+        """
+        Apply changes in one transaction; returns the number of rows written
+
+        Args:
+            upserts: Records to store - unchanged ones (same digest) are skipped
+            deletes: Record ids to remove
+            meta: Metadata values to store alongside
+            prune: `upserts` is the whole collection; remove everything else
+        """
+        upserts = upserts or {}
+        now = datetime.now().isoformat()
+        with self._lock:
+            conn = self._connect()
+            known = self._known_digests(collection)
+
+            changed = []
+            for record_id, record in upserts.items():
+                data = _dumps(record)
+                digest = hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+                if known.get(record_id) != digest:
+                    changed.append((collection, record_id, data, digest, now))
+
+            removed = set(deletes)
+            if prune:
+                removed |= known.keys() - upserts.keys()
+            removed &= known.keys()
+
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO records (collection, id, data, digest, updated_at) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (collection, id) DO UPDATE SET "
+                        "data = excluded.data, digest = excluded.digest, updated_at = excluded.updated_at",
+                        changed
+                    )
+                    conn.executemany(
+                        "DELETE FROM records WHERE collection = ? AND id = ?",
+                        [(collection, record_id) for record_id in removed]
+                    )
+                    if meta:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                            [(key, _dumps(value)) for key, value in meta.items()]
+                        )
+            except Exception:
+                # Transaction rolled back - digests must be re-read
+                self._digests.pop(collection, None)
+                raise
+
+            for _, record_id, _, digest, _ in changed:
+                known[record_id] = digest
+            for record_id in removed:
+                known.pop(record_id, None)
+
+        if changed or removed:
+            logger.debug(f"IPO store [{collection}]: {len(changed)} written, {len(removed)} deleted")
+        return len(changed) + len(removed)
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._digests.clear()
+
+
+_store: Optional[IPORecordStore] = None
+
+
+def get_ipo_store() -> IPORecordStore:
+    """Paylaşılan store (servis ve fetcher aynı dosyayı kullanır)"""
+    global _store
+    if _store is None:
+        _store = IPORecordStore()
+    return _store
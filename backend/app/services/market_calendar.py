@@ -0,0 +1,156 @@
+"""
+BIST Trading Calendar
+Session hours, weekends and holidays; drives cache lifetimes
+
+Cached BIST data used to expire after a flat 5 minutes, so bars that cannot
+change were re-fetched all evening and weekend while daily bars went up to 5
+minutes stale during the session. Lifetimes now follow the calendar: outside
+the session data is kept until the next open; inside it entries expire on the
+next bar boundary (at most every `settings.cache_ttl_realtime` seconds).
+"""
+import math
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional, Tuple
+
+import pytz
+
+from app.config import settings
+
+BIST_TZ = pytz.timezone('Europe/Istanbul')
+
+SESSION_OPEN = time(10, 0)
+SESSION_CLOSE = time(18, 10)    # 18:00 continuous trading + closing auction
+HALF_DAY_CLOSE = time(12, 40)   # arife: 12:30 + closing auction
+DATA_DELAY = timedelta(minutes=15)  # Yahoo BIST bars are ~15 minutes delayed
+BAR_PUBLISH_DELAY = 5  # seconds after a bar boundary before the provider has the bar
+
+# Fixed-date public holidays (month, day)
+FIXED_HOLIDAYS = [(1, 1), (4, 23), (5, 1), (5, 19), (7, 15), (8, 30), (10, 29)]
+# Eve of Republic Day is a half session every year
+FIXED_HALF_DAYS = [(10, 28)]
+
+# Ramazan / Kurban Bayramı (Diyanet takvimi; yıllık güncellenir)
+RELIGIOUS_HOLIDAYS = [
+    date(2025, 3, 31), date(2025, 4, 1),
+    date(2025, 6, 6), date(2025, 6, 9),
+    date(2026, 3, 20),
+    date(2026, 5, 27), date(2026, 5, 28), date(2026, 5, 29),
+    date(2027, 3, 9), date(2027, 3, 10), date(2027, 3, 11),
+    date(2027, 5, 17), date(2027, 5, 18), date(2027, 5, 19),
+]
+RELIGIOUS_HALF_DAYS = [
+    date(2025, 6, 5),
+    date(2026, 3, 19), date(2026, 5, 26),
+    date(2027, 3, 8),
+]
+
+_BAR_UNITS = {'m': 60, 'h': 3600}
+
+
+def bar_seconds(interval: str) -> Optional[int]:
+    """Length of an intraday bar ('5m' -> 300, '1h' -> 3600); None for daily and longer"""
+    unit = interval[-1:]
+    if unit in _BAR_UNITS and interval[:-1].isdigit():
+        return int(interval[:-1]) * _BAR_UNITS[unit]
+    return None
+
+
+def is_bist_symbol(ticker: str) -> bool:
+    """Borsa Istanbul stocks and indices (XU100.IS, ...)"""
+    return ticker.endswith('.IS')
+
+
+class BistCalendar:
+    """
+    Borsa Istanbul equity market sessions
+
+    Args:
+        holidays: extra closed days (e.g. bridge days announced by BIST)
+        half_days: extra half sessions
+    """
+
+    def __init__(self, holidays: Iterable[date] = (), half_days: Iterable[date] = ()):
+        self.holidays = set(RELIGIOUS_HOLIDAYS) | set(holidays)
+        self.half_days = set(RELIGIOUS_HALF_DAYS) | set(half_days)
+
+    def now(self) -> datetime:
+        return datetime.now(BIST_TZ)
+
+    def _local(self, moment: Optional[datetime]) -> datetime:
+        if moment is None:
+            return self.now()
+        if moment.tzinfo is None:
+            return BIST_TZ.localize(moment)
+        return moment.astimezone(BIST_TZ)
+
+    def is_trading_day(self, day: date) -> bool:
+        if day.weekday() >= 5 or day in self.holidays:
+            return False
+        return (day.month, day.day) not in FIXED_HOLIDAYS
+
+    def is_half_day(self, day: date) -> bool:
+        return day in self.half_days or (day.month, day.day) in FIXED_HALF_DAYS
+
+    def session(self, day: date) -> Optional[Tuple[datetime, datetime]]:
+        """(open, close) of `day`, or None when the market is closed all day"""
+        if not self.is_trading_day(day):
+            return None
+        close = HALF_DAY_CLOSE if self.is_half_day(day) else SESSION_CLOSE
+        return (
+            BIST_TZ.localize(datetime.combine(day, SESSION_OPEN)),
+            BIST_TZ.localize(datetime.combine(day, close)),
+        )
+
+    def is_open(self, moment: Optional[datetime] = None) -> bool:
+        moment = self._local(moment)
+        session = self.session(moment.date())
+        return session is not None and session[0] <= moment < session[1]
+
+    def next_open(self, moment: Optional[datetime] = None) -> datetime:
+        """First session open after `moment` (today's open if it is still ahead)"""
+        moment = self._local(moment)
+        day = moment.date()
+        for _ in range(30):
+            session = self.session(day)
+            if session is not None and session[0] > moment:
+                return session[0]
+            day += timedelta(days=1)
+        raise ValueError(f"No BIST session within 30 days of {moment}")
+
+    def _data_session(self, moment: datetime) -> Optional[Tuple[datetime, datetime]]:
+        """Today's session if `moment` is inside its data window (open .. close + DATA_DELAY)"""
+        session = self.session(moment.date())
+        if session is not None and session[0] <= moment < session[1] + DATA_DELAY:
+            return session
+        return None
+
+    def data_ttl(self, interval: str, moment: Optional[datetime] = None) -> float:
+        """
+        Seconds a freshly fetched `interval` bar feed of a BIST symbol stays valid
+
+        Bars can change from the open until the provider has published the
+        close (close + DATA_DELAY); outside that window they are kept until
+        the next open. Inside it the feed expires on the next bar boundary,
+        or every `settings.cache_ttl_realtime` seconds for longer bars.
+        """
+        moment = self._local(moment)
+        session = self._data_session(moment)
+        if session is None:
+            return (self.next_open(moment) - moment).total_seconds()
+
+        step = min(bar_seconds(interval) or math.inf, settings.cache_ttl_realtime)
+        elapsed = (moment - session[0]).total_seconds()
+        boundary = session[0] + timedelta(seconds=(math.floor(elapsed / step) + 1) * step)
+        expires = min(boundary, session[1] + DATA_DELAY) + timedelta(seconds=BAR_PUBLISH_DELAY)
+        return max((expires - moment).total_seconds(), 1.0)
+
+    def ttl(self, default: int, moment: Optional[datetime] = None) -> int:
+        """CacheService TTL: `default` during the session, otherwise until the next open"""
+        moment = self._local(moment)
+        if self._data_session(moment) is not None:
+            return default
+        return max(default, math.ceil((self.next_open(moment) - moment).total_seconds()))
+
+
+# Global instance
+bist_calendar = BistCalendar()
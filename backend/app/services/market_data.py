@@ -2,13 +2,9 @@
 Market Data Service - Küresel Piyasa Verileri
 USD/TRY, EUR/TRY, Altın, Bitcoin, S&P500, NASDAQ
 """
-import yfinance as yf
 from typing import Dict, Optional
 from datetime import datetime
 import asyncio
-import pandas as pd
-from app.services.data_fetcher import DataFetcher
-from app.utils.logger import logger
 
 class MarketDataService:
     """Küresel piyasa verilerini çeken servis"""
@@ -25,71 +21,61 @@ class MarketDataService:
         "BIST30": "XU030.IS"     # BIST 30
     }
     
-    def __init__(self):
+    # Response key -> TICKERS key
+    OVERVIEW_KEYS = {
+        "bist100": "BIST100",
+        "bist30": "BIST30",
+        "usd_try": "USD_TRY",
+        "eur_try": "EUR_TRY",
+        "gold": "GOLD",
+        "btc": "BTC",
+        "sp500": "SP500",
+        "nasdaq": "NASDAQ",
+    }
+    
+    def __init__(self, board=None):
         self.cache = {}
         self.last_update = None
-        self.data_fetcher = DataFetcher()
+        self._board = board
     
-    def _fetch_bist_index(self, ticker: str) -> Optional[Dict]:
-        """BIST endeks verisini DataFetcher üzerinden çek"""
-        try:
-            df = self.data_fetcher.fetch_realtime_data(ticker, interval="1d", period="5d")
-            if df is None or df.empty:
-                return None
-
-            current_price = float(df["close"].iloc[-1])
-            previous_close = float(df["close"].iloc[-2]) if len(df) > 1 else current_price
-            change = current_price - previous_close
-            change_percent = (change / previous_close * 100) if previous_close else 0
-
-            return {
-                "ticker": ticker,
-                "price": round(current_price, 2),
-                "change": round(change, 2),
-                "change_percent": round(change_percent, 2),
-                "is_up": change >= 0,
-                "timestamp": datetime.now().isoformat(),
-            }
-        except Exception as e:
-            logger.error(f"Error fetching BIST index {ticker}: {e}")
-            return None
-
-    def _fetch_yahoo_price(self, ticker: str) -> Optional[Dict]:
-        """Genel piyasa verilerini DataFetcher üzerinden çek (yf.Ticker + cache + fallback)"""
-        try:
-            df = self.data_fetcher.fetch_realtime_data(ticker, interval="1d", period="5d")
-            if df is None or df.empty:
-                logger.warning(f"No data returned for {ticker}")
-                return None
-
-            # DataFetcher returns lowercase column names
-            close_col = "close" if "close" in df.columns else "Close"
-            if close_col not in df.columns:
-                df.columns = df.columns.str.lower()
-                close_col = "close"
-
-            current_price = float(df[close_col].iloc[-1])
-            previous_close = float(df[close_col].iloc[-2]) if len(df) > 1 else current_price
-            change = current_price - previous_close
-            change_percent = (change / previous_close * 100) if previous_close else 0
-
-            return {
-                "ticker": ticker,
-                "price": round(current_price, 2),
-                "change": round(change, 2),
-                "change_percent": round(change_percent, 2),
-                "is_up": change >= 0,
-                "timestamp": datetime.now().isoformat(),
-            }
-        except Exception as e:
-            logger.error(f"Error fetching {ticker}: {e}")
+    @property
+    def board(self):
+        if self._board is None:
+            from app.services.quote_board import quote_board
+            self._board = quote_board
+        return self._board
+    
+    async def _quotes(self) -> Dict:
+        """Quote board snapshot; only a stale board (no refresher running) costs a fetch"""
+        if self.board.is_stale():
+            await asyncio.get_running_loop().run_in_executor(None, self.board.ensure_fresh)
+        return self.board.snapshot()
+    
+    @staticmethod
+    def _payload(ticker: str, quote: Optional[Dict]) -> Optional[Dict]:
+        """Board quote in the response shape of the market endpoints"""
+        if quote is None:
             return None
+        return {
+            "ticker": ticker,
+            "price": round(quote["price"], 2),
+            "change": round(quote["change"], 2),
+            "change_percent": round(quote["change_percent"], 2),
+            "is_up": quote["change"] >= 0,
+            "timestamp": datetime.now().isoformat(),
+        }
+    
+    async def _select(self, keys: Dict[str, str]) -> Dict[str, Optional[Dict]]:
+        """response key -> payload (None when the board has no quote) for TICKERS keys"""
+        quotes = await self._quotes()
+        return {
+            key: self._payload(self.TICKERS[name], quotes.get(self.TICKERS[name]))
+            for key, name in keys.items()
+        }
     
     async def get_all_market_data(self) -> Dict:
-        """Tüm piyasa verilerini çek (Paralel)"""
+        """Tüm piyasa verileri (fiyat panosundan)"""
         try:
-            loop = asyncio.get_event_loop()
-
             def _fallback(key: str) -> Dict:
                 return {
                     "ticker": self.TICKERS.get(key.upper(), key),
@@ -100,56 +86,15 @@ class MarketDataService:
                     "timestamp": datetime.now().isoformat(),
                     "error": True,
                 }
-
-            # Helper wrappers for exception handling
-            async def fetch_bist_safe(key: str):
-                try:
-                    res = await loop.run_in_executor(None, lambda: self._fetch_bist_index(self.TICKERS[key.upper()]))
-                    return key, res
-                except Exception:
-                    return key, None
-
-            async def fetch_yahoo_safe(key: str, ticker: str):
-                try:
-                    res = await loop.run_in_executor(None, lambda: self._fetch_yahoo_price(ticker))
-                    return key, res
-                except Exception:
-                    return key, None
-
-            # Prepare all tasks
-            tasks = []
             
-            # BIST tasks
-            tasks.append(fetch_bist_safe("bist100"))
-            tasks.append(fetch_bist_safe("bist30"))
-
-            # Yahoo tasks
-            yahoo_map = {
-                "usd_try": self.TICKERS["USD_TRY"],
-                "eur_try": self.TICKERS["EUR_TRY"],
-                "gold": self.TICKERS["GOLD"],
-                "btc": self.TICKERS["BTC"],
-                "sp500": self.TICKERS["SP500"],
-                "nasdaq": self.TICKERS["NASDAQ"],
+            market_data = {
+                key: res if isinstance(res, dict) else _fallback(key)
+                for key, res in (await self._select(self.OVERVIEW_KEYS)).items()
             }
             
-            for key, ticker in yahoo_map.items():
-                tasks.append(fetch_yahoo_safe(key, ticker))
-
-            # Execute all parallel
-            results = await asyncio.gather(*tasks)
-            
-            # Process results
-            market_data = {}
-            for key, res in results:
-                if isinstance(res, dict):
-                    market_data[key] = res
-                else:
-                    market_data[key] = _fallback(key)
-
             self.cache = market_data
             self.last_update = datetime.now()
-
+            
             return {
                 "success": True,
                 "data": market_data,
@@ -163,58 +108,31 @@ class MarketDataService:
             }
     
     async def get_forex_data(self) -> Dict:
-        """Sadece döviz verilerini çek"""
+        """Sadece döviz verileri"""
         try:
-            loop = asyncio.get_event_loop()
-            usd_data, eur_data = await asyncio.gather(
-                loop.run_in_executor(None, lambda: self._fetch_yahoo_price(self.TICKERS["USD_TRY"])),
-                loop.run_in_executor(None, lambda: self._fetch_yahoo_price(self.TICKERS["EUR_TRY"]))
-            )
-            
             return {
                 "success": True,
-                "data": {
-                    "usd_try": usd_data,
-                    "eur_try": eur_data
-                }
+                "data": await self._select({"usd_try": "USD_TRY", "eur_try": "EUR_TRY"})
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     async def get_commodities_data(self) -> Dict:
-        """Emtia verilerini çek (Altın, Bitcoin)"""
+        """Emtia verileri (Altın, Bitcoin)"""
         try:
-            loop = asyncio.get_event_loop()
-            gold_data, btc_data = await asyncio.gather(
-                loop.run_in_executor(None, lambda: self._fetch_yahoo_price(self.TICKERS["GOLD"])),
-                loop.run_in_executor(None, lambda: self._fetch_yahoo_price(self.TICKERS["BTC"]))
-            )
-            
             return {
                 "success": True,
-                "data": {
-                    "gold": gold_data,
-                    "bitcoin": btc_data
-                }
+                "data": await self._select({"gold": "GOLD", "bitcoin": "BTC"})
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     async def get_global_indices_data(self) -> Dict:
-        """Küresel endeks verilerini çek"""
+        """Küresel endeks verileri"""
         try:
-            loop = asyncio.get_event_loop()
-            sp500_data, nasdaq_data = await asyncio.gather(
-                loop.run_in_executor(None, lambda: self._fetch_yahoo_price(self.TICKERS["SP500"])),
-                loop.run_in_executor(None, lambda: self._fetch_yahoo_price(self.TICKERS["NASDAQ"]))
-            )
-            
             return {
                 "success": True,
-                "data": {
-                    "sp500": sp500_data,
-                    "nasdaq": nasdaq_data
-                }
+                "data": await self._select({"sp500": "SP500", "nasdaq": "NASDAQ"})
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -0,0 +1,313 @@
+"""
+Metrics Service
+Lightweight in-process counters and histograms for hot paths,
+exposed in Prometheus text format on /metrics
+
+Recording is a dict lookup plus a bisect under a lock; with METRICS_ENABLED=false
+every call returns immediately.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.config import settings
+
+# Seconds; covers cache hits (~10us) up to slow provider calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    """Base for labelled metrics"""
+
+    type = "untyped"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abstractmethod
+    def reset(self):
+        """Drop all recorded values"""
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Prometheus sample lines (without HELP/TYPE)"""
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values (seconds for timers)"""
+
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Time a block: `with HISTOGRAM.time(route="/x"): ...`"""
+        if not self.registry.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def timed(self, **labels):
+        """Decorator timing every call of a sync function"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.registry.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start, **labels)
+            return wrapper
+        return decorator
+
+    def get_count(self, **labels) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(entry[0]), entry[1], entry[2]) for key, entry in self._values.items()]
+
+        lines = []
+        bounds = list(self.buckets) + [float("inf")]
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds all metrics and renders the Prometheus exposition format"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets=buckets))
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def render(self) -> str:
+        """All metrics in Prometheus text format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(samples)
+
+        ratios = cache_hit_ratios()
+        if ratios:
+            lines.append("# HELP investia_cache_hit_ratio Cache hits / lookups since start")
+            lines.append("# TYPE investia_cache_hit_ratio gauge")
+            for cache, ratio in ratios.items():
+                lines.append(f'investia_cache_hit_ratio{{cache="{_escape(cache)}"}} {_format_value(round(ratio, 4))}')
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry(enabled=settings.metrics_enabled)
+
+# Hot paths
+DATA_FETCH_SECONDS = metrics.histogram(
+    "investia_data_fetch_seconds",
+    "DataFetcher.fetch_realtime_data duration by where the bars came from",
+    ["source"],
+)
+PROVIDER_FETCH_SECONDS = metrics.histogram(
+    "investia_provider_fetch_seconds",
+    "Market data provider I/O duration",
+    ["provider", "call"],
+)
+INDICATORS_SECONDS = metrics.histogram(
+    "investia_indicators_seconds",
+    "TechnicalAnalysis.calculate_all_indicators duration",
+)
+HYBRID_SCORE_SECONDS = metrics.histogram(
+    "investia_hybrid_score_seconds",
+    "StockScreener.calculate_hybrid_score duration",
+)
+SCREENER_STAGE_SECONDS = metrics.histogram(
+    "investia_screener_stage_seconds",
+    "StockScreener.screen_all_stocks duration by pipeline stage",
+    ["stage"],
+)
+WARMUP_STAGE_SECONDS = metrics.histogram(
+    "investia_warmup_stage_seconds",
+    "Pre-market warm-up duration by stage",
+    ["stage"],
+)
+SIGNAL_SECONDS = metrics.histogram(
+    "investia_signal_generation_seconds",
+    "generate_signal duration by generator",
+    ["generator"],
+)
+DB_SESSION_SECONDS = metrics.histogram(
+    "investia_db_session_seconds",
+    "Lifetime of request-scoped database sessions",
+)
+WEBSOCKET_SEND_SECONDS = metrics.histogram(
+    "investia_websocket_send_seconds",
+    "Time to send one WebSocket frame",
+)
+WEBSOCKET_BROADCAST_SECONDS = metrics.histogram(
+    "investia_websocket_broadcast_seconds",
+    "Time to fan a message out to all subscribers of a channel",
+    ["channel"],
+)
+WEBSOCKET_MESSAGES = metrics.counter(
+    "investia_websocket_messages_total",
+    "WebSocket frames sent by result",
+    ["result"],
+)
+
+# HTTP
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "investia_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+
+# Caches
+CACHE_REQUESTS = metrics.counter(
+    "investia_cache_requests_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ["cache", "result"],
+)
+
+
+def record_cache(cache: str, hit: bool):
+    """Count one lookup against `cache`"""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def cache_hit_ratios() -> Dict[str, float]:
+    """Hit ratio per cache from the lookup counters"""
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in list(CACHE_REQUESTS._values.items()):
+        entry = totals.setdefault(cache, [0.0, 0.0])
+        entry[1] += value
+        if result == "hit":
+            entry[0] += value
+    return {cache: hits / total for cache, (hits, total) in totals.items() if total}
+
+
+def get_metrics_summary() -> Optional[Dict[str, float]]:
+    """Cache hit ratios for /health, None when metrics are disabled"""
+    if not metrics.enabled:
+        return None
+    return {cache: round(ratio, 4) for cache, ratio in cache_hit_ratios().items()}
@@ -3,18 +3,31 @@ News Service - Fetches economy and general news from RSS feeds
 """
 import aiohttp
 import asyncio
+from bisect import bisect_right
 from datetime import datetime
-from typing import List, Dict, Optional
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional, Tuple
 import xml.etree.ElementTree as ET
 from loguru import logger
 import re
 import html
 import time
+from app.services.conditional_http import ValidatorStore, content_hash
+from app.services.response_cache import SingleFlight
 
-# In-memory news cache (avoid repeated slow RSS fetches on Render)
+# In-memory news snapshots, served immediately (stale-while-revalidate)
 _news_cache: Dict[str, Dict] = {}
 _news_cache_time: Dict[str, float] = {}
-NEWS_CACHE_TTL = 600  # 10 minutes
+NEWS_CACHE_TTL = 600  # 10 minutes - older snapshots trigger a background refresh
+NEWS_REFRESH_INTERVAL = 300  # background refresher period
+NEWS_FETCH_TIMEOUT = 15
+NEWS_ITEMS_PER_REGION = 20
+
+# Feed URL -> ETag / Last-Modified / content hash + parsed items
+_feed_validators = ValidatorStore("news_feed")
+_refresh_flight = SingleFlight()
+_refresher_task: Optional[asyncio.Task] = None
+_background_refreshes: Dict[str, asyncio.Task] = {}
 
 # RSS Feed kaynakları
 ECONOMY_FEEDS = {
@@ -42,96 +55,195 @@ GENERAL_FEEDS = {
 }
 
 
+MAX_ITEMS_PER_FEED = 10
+FEED_CHUNK_SIZE = 16 * 1024
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ITEM_TAGS = frozenset({"item", f"{_ATOM}entry"})
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+_DATE_FORMATS = (
+    "%a, %d %b %Y %H:%M:%S %z",
+    "%a, %d %b %Y %H:%M:%S %Z",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%d %b %Y %H:%M:%S %z",
+)
+
+
 def clean_html(raw_html: str) -> str:
     """HTML taglarını ve özel karakterleri temizle"""
     if not raw_html:
         return ""
-    # HTML taglarını kaldır
-    clean = re.sub(r'<[^>]+>', '', raw_html)
-    # HTML entities decode
-    clean = html.unescape(clean)
+    clean = raw_html
+    # Çoğu başlıkta tag/entity yok - regex ve unescape'i atla
+    if "<" in clean:
+        clean = _TAG_RE.sub('', clean)
+    if "&" in clean:
+        clean = html.unescape(clean)
     # Fazla boşlukları temizle
-    clean = ' '.join(clean.split())
+    clean = _WHITESPACE_RE.sub(' ', clean).strip()
     return clean[:500]  # Max 500 karakter
 
 
 def parse_rss_date(date_str: str) -> Optional[datetime]:
     """RSS tarih formatlarını parse et"""
-    formats = [
-        "%a, %d %b %Y %H:%M:%S %z",
-        "%a, %d %b %Y %H:%M:%S %Z",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%d %b %Y %H:%M:%S %z",
-    ]
-    for fmt in formats:
+    if not date_str:
+        return None
+    date_str = date_str.strip()
+    
+    # Hızlı yol: ISO 8601 (Atom) ve RFC 822 (RSS), strptime denemeden
+    if date_str[:4].isdigit():
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+    else:
+        try:
+            return parsedate_to_datetime(date_str)
+        except (TypeError, ValueError, IndexError):
+            pass
+    
+    for fmt in _DATE_FORMATS:
         try:
-            return datetime.strptime(date_str.strip(), fmt)
+            return datetime.strptime(date_str, fmt)
         except ValueError:
             continue
     return None
 
 
+def _item_key(item: Dict) -> str:
+    """Identity of a feed item (a re-titled item counts as new)"""
+    return f"{item.get('link', '')}\n{item['title']}"
+
+
+class FeedItemParser:
+    """
+    Incremental RSS 2.0 / Atom item extractor
+    
+    Body chunks are fed to an XMLPullParser as they arrive; each finished
+    <item>/<entry> is converted and cleared, so no full tree is built. Parsing
+    stops once `max_items` are collected or the newest item of the previous
+    fetch (`known_head`) shows up - everything after it is already known.
+    """
+    
+    def __init__(self, source: str, known_head: Optional[str] = None, max_items: int = MAX_ITEMS_PER_FEED):
+        self.source = source
+        self.known_head = known_head
+        self.max_items = max_items
+        self.items: List[Dict] = []
+        self.reached_known = False
+        self._parser = ET.XMLPullParser(events=("end",))
+    
+    @property
+    def done(self) -> bool:
+        return self.reached_known or len(self.items) >= self.max_items
+    
+    def feed(self, chunk: bytes) -> bool:
+        """Parse a chunk; returns True when no more input is needed"""
+        self._parser.feed(chunk)
+        return self._drain()
+    
+    def close(self):
+        """End of body"""
+        self._parser.close()
+        self._drain()
+    
+    def _drain(self) -> bool:
+        for _, elem in self._parser.read_events():
+            if elem.tag not in _ITEM_TAGS or self.done:
+                continue
+            item = self._extract(elem)
+            elem.clear()
+            if item is None:
+                continue
+            if self.known_head is not None and _item_key(item) == self.known_head:
+                self.reached_known = True
+            else:
+                self.items.append(item)
+        return self.done
+    
+    def _extract(self, elem: ET.Element) -> Optional[Dict]:
+        if elem.tag == "item":
+            title = elem.findtext("title")
+            link = elem.findtext("link") or ""
+            description = elem.findtext("description")
+            date_text = elem.findtext("pubDate")
+        else:
+            title = elem.findtext(f"{_ATOM}title")
+            link_elem = elem.find(f"{_ATOM}link")
+            link = link_elem.get("href", "") if link_elem is not None else ""
+            description = elem.findtext(f"{_ATOM}summary")
+            date_text = elem.findtext(f"{_ATOM}updated")
+        
+        if not title:
+            return None
+        
+        published = parse_rss_date(date_text) if date_text else None
+        if published is None:
+            published = datetime.now()
+        return {
+            "title": clean_html(title),
+            "link": link,
+            "description": clean_html(description or ""),
+            "source": self.source,
+            "published": published.isoformat(),
+            "timestamp": published.timestamp()
+        }
+
+
 async def fetch_rss_feed(session: aiohttp.ClientSession, feed: Dict) -> List[Dict]:
-    """Tek bir RSS feed'i çek ve parse et"""
+    """
+    Tek bir RSS feed'i çek ve parse et
+    
+    Koşullu istek gönderilir; 304 ise önceki parse sonucu döner. Gövde parça
+    parça parse edilir ve önceki çekimin en yeni haberine gelince okuma durur;
+    geri kalanı önbellekteki listeden tamamlanır.
+    """
+    url = feed["url"]
     try:
         headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            **_feed_validators.request_headers(url)
         }
-        async with session.get(feed["url"], headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as response:
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            if response.status == 304:
+                logger.debug(f"{feed['name']} not modified")
+                return list(_feed_validators.not_modified(url).parsed or [])
+            
             if response.status != 200:
                 logger.warning(f"Failed to fetch {feed['name']}: {response.status}")
                 return []
             
-            content = await response.text()
-            root = ET.fromstring(content)
+            state = _feed_validators.get(url)
+            cached = list(state.parsed) if state is not None and state.parsed else []
+            parser = FeedItemParser(feed["name"], known_head=_item_key(cached[0]) if cached else None)
+            
+            # bytes -> parser XML encoding bildirimini kendisi uygular
+            async for chunk in response.content.iter_chunked(FEED_CHUNK_SIZE):
+                if parser.feed(chunk):
+                    break
+            else:
+                parser.close()
             
-            items = []
-            # RSS 2.0 format
-            for item in root.findall(".//item")[:10]:  # Max 10 haber per feed
-                title = item.find("title")
-                link = item.find("link")
-                description = item.find("description")
-                pub_date = item.find("pubDate")
-                
-                if title is not None and title.text:
-                    parsed_date = None
-                    if pub_date is not None and pub_date.text:
-                        parsed_date = parse_rss_date(pub_date.text)
-                    
-                    items.append({
-                        "title": clean_html(title.text),
-                        "link": link.text if link is not None else "",
-                        "description": clean_html(description.text if description is not None else ""),
-                        "source": feed["name"],
-                        "published": parsed_date.isoformat() if parsed_date else datetime.now().isoformat(),
-                        "timestamp": parsed_date.timestamp() if parsed_date else datetime.now().timestamp()
-                    })
+            items = parser.items
+            if parser.reached_known:
+                items = (items + cached)[:MAX_ITEMS_PER_FEED]
             
-            # Atom format fallback
-            if not items:
-                for entry in root.findall(".//{http://www.w3.org/2005/Atom}entry")[:10]:
-                    title = entry.find("{http://www.w3.org/2005/Atom}title")
-                    link = entry.find("{http://www.w3.org/2005/Atom}link")
-                    summary = entry.find("{http://www.w3.org/2005/Atom}summary")
-                    updated = entry.find("{http://www.w3.org/2005/Atom}updated")
-                    
-                    if title is not None and title.text:
-                        parsed_date = None
-                        if updated is not None and updated.text:
-                            parsed_date = parse_rss_date(updated.text)
-                        
-                        items.append({
-                            "title": clean_html(title.text),
-                            "link": link.get("href") if link is not None else "",
-                            "description": clean_html(summary.text if summary is not None else ""),
-                            "source": feed["name"],
-                            "published": parsed_date.isoformat() if parsed_date else datetime.now().isoformat(),
-                            "timestamp": parsed_date.timestamp() if parsed_date else datetime.now().timestamp()
-                        })
+            # Gövde sonuna kadar okunmayabilir - hash çıkarılan haberlerin kimliğinden
+            state, changed = _feed_validators.update(
+                url,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                digest=content_hash("\n".join(_item_key(item) for item in items))
+            )
+            if not changed:
+                logger.debug(f"{feed['name']} unchanged")
+                return list(state.parsed)
             
-            logger.info(f"Fetched {len(items)} items from {feed['name']}")
-            return items
+            _feed_validators.set_parsed(url, items)
+            logger.info(f"Fetched {len(parser.items)} new items from {feed['name']}")
+            return list(items)
             
     except asyncio.TimeoutError:
         logger.warning(f"Timeout fetching {feed['name']}")
@@ -144,87 +256,199 @@ async def fetch_rss_feed(session: aiohttp.ClientSession, feed: Dict) -> List[Dic
         return []
 
 
-async def fetch_all_news(feeds: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
-    """Tüm feed'lerden haberleri çek"""
-    async with aiohttp.ClientSession() as session:
-        result = {"turkey": [], "world": []}
-        
-        for region, feed_list in feeds.items():
-            tasks = [fetch_rss_feed(session, feed) for feed in feed_list]
-            feed_results = await asyncio.gather(*tasks)
+class NewsBuffer:
+    """
+    Bounded, deduplicated, newest-first news list
+    
+    New items are inserted in place (bisect on timestamp) instead of
+    re-sorting everything; items older than the oldest kept one are dropped
+    once the buffer is full.
+    """
+    
+    def __init__(self, max_items: int = NEWS_ITEMS_PER_REGION):
+        self.max_items = max_items
+        self.signature: Optional[tuple] = None  # feed content hashes at the last merge
+        self._items: List[Dict] = []
+        self._order: List[float] = []  # -timestamp, ascending (parallel to _items)
+        self._keys: set = set()
+    
+    @staticmethod
+    def _key(item: Dict) -> str:
+        return item["title"][:50].lower()
+    
+    def merge(self, items: List[Dict]) -> int:
+        """Insert unseen items; returns how many were added"""
+        added = 0
+        for item in items:
+            key = self._key(item)
+            if key in self._keys:
+                continue
+            
+            order = -item.get("timestamp", 0)
+            if len(self._items) >= self.max_items and order >= self._order[-1]:
+                continue
             
-            # Tüm sonuçları birleştir
-            all_items = []
-            for items in feed_results:
-                all_items.extend(items)
+            index = bisect_right(self._order, order)
+            self._order.insert(index, order)
+            self._items.insert(index, item)
+            self._keys.add(key)
+            added += 1
+            
+            if len(self._items) > self.max_items:
+                self._order.pop()
+                self._keys.discard(self._key(self._items.pop()))
+        return added
+    
+    def items(self) -> List[Dict]:
+        return list(self._items)
+    
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+# (kind, region) -> NewsBuffer
+_news_buffers: Dict[Tuple[str, str], NewsBuffer] = {}
+
+
+async def fetch_all_news(feeds: Dict[str, List[Dict]], kind: str = "news") -> Dict[str, List[Dict]]:
+    """
+    Tüm feed'lerden haberleri çek ve bölge tamponlarına ekle
+    
+    Bölgeler ve feed'ler paralel çekilir. Bir bölgedeki hiçbir feed
+    değişmediyse (304 / aynı hash) birleştirme atlanır.
+    """
+    async with aiohttp.ClientSession() as session:
+        async def fetch_region(region: str, feed_list: List[Dict]) -> Tuple[str, List[Dict]]:
+            feed_results = await asyncio.gather(*(fetch_rss_feed(session, feed) for feed in feed_list))
             
-            # Tarihe göre sırala (en yeni önce)
-            all_items.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
+            buffer = _news_buffers.get((kind, region))
+            if buffer is None:
+                buffer = _news_buffers[(kind, region)] = NewsBuffer()
             
-            # Duplicate başlıkları kaldır
-            seen_titles = set()
-            unique_items = []
-            for item in all_items:
-                title_key = item["title"][:50].lower()
-                if title_key not in seen_titles:
-                    seen_titles.add(title_key)
-                    unique_items.append(item)
+            signature = tuple(
+                state.content_hash if (state := _feed_validators.get(feed["url"])) else None
+                for feed in feed_list
+            )
+            if buffer.signature != signature or not len(buffer):
+                for items in feed_results:
+                    buffer.merge(items)
+                buffer.signature = signature
             
-            result[region] = unique_items[:20]  # Max 20 haber per region
+            return region, buffer.items()
+        
+        regions = await asyncio.gather(*(fetch_region(region, feed_list) for region, feed_list in feeds.items()))
         
+        result = {"turkey": [], "world": []}
+        result.update(dict(regions))
         return result
 
 
-async def get_economy_news() -> Dict:
-    """Ekonomi haberlerini getir (cached)"""
-    cache_key = "economy"
-    now = time.time()
-    if cache_key in _news_cache and (now - _news_cache_time.get(cache_key, 0)) < NEWS_CACHE_TTL:
-        logger.debug("Returning cached economy news")
-        return _news_cache[cache_key]
+NEWS_KINDS = {
+    "economy": (ECONOMY_FEEDS, lambda: DEMO_ECONOMY_NEWS),
+    "general": (GENERAL_FEEDS, lambda: DEMO_GENERAL_NEWS),
+}
+
+
+async def refresh_news(kind: str) -> Optional[Dict]:
+    """
+    `kind` haberlerini yeniden çek ve snapshot'ı güncelle
     
-    try:
-        news = await asyncio.wait_for(fetch_all_news(ECONOMY_FEEDS), timeout=15)
-    except asyncio.TimeoutError:
-        logger.warning("Economy news fetch timed out, returning cached/demo data")
-        return _news_cache.get(cache_key, DEMO_ECONOMY_NEWS)
+    Eşzamanlı çağrılar tek fetch'te birleşir (single-flight). Zaman aşımında
+    mevcut snapshot korunur ve None döner.
+    """
+    async def run():
+        feeds, _ = NEWS_KINDS[kind]
+        try:
+            news = await asyncio.wait_for(fetch_all_news(feeds, kind), timeout=NEWS_FETCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"{kind.capitalize()} news fetch timed out, keeping the current snapshot")
+            return None
+        
+        result = {
+            "type": kind,
+            "turkey": news["turkey"],
+            "world": news["world"],
+            "last_updated": datetime.now().isoformat()
+        }
+        _news_cache[kind] = result
+        _news_cache_time[kind] = time.time()
+        return result
     
-    result = {
-        "type": "economy",
-        "turkey": news["turkey"],
-        "world": news["world"],
-        "last_updated": datetime.now().isoformat()
-    }
-    _news_cache[cache_key] = result
-    _news_cache_time[cache_key] = now
-    return result
+    return await _refresh_flight.do(kind, run)
 
 
-async def get_general_news() -> Dict:
-    """Genel haberleri getir (cached)"""
-    cache_key = "general"
-    now = time.time()
-    if cache_key in _news_cache and (now - _news_cache_time.get(cache_key, 0)) < NEWS_CACHE_TTL:
-        logger.debug("Returning cached general news")
-        return _news_cache[cache_key]
+def _refresh_in_background(kind: str):
+    """Stale snapshot -> arka planda yenile (çağıranı bekletmez)"""
+    if kind in _background_refreshes:
+        return
+    task = asyncio.get_running_loop().create_task(refresh_news(kind))
+    _background_refreshes[kind] = task
     
-    try:
-        news = await asyncio.wait_for(fetch_all_news(GENERAL_FEEDS), timeout=15)
-    except asyncio.TimeoutError:
-        logger.warning("General news fetch timed out, returning cached/demo data")
-        return _news_cache.get(cache_key, DEMO_GENERAL_NEWS)
+    def _done(finished: asyncio.Task):
+        _background_refreshes.pop(kind, None)
+        if not finished.cancelled() and finished.exception():
+            logger.error(f"Background news refresh failed for {kind}: {finished.exception()}")
+    
+    task.add_done_callback(_done)
+
+
+async def _get_news(kind: str) -> Dict:
+    """Son snapshot'ı hemen döndür; eskiyse arka planda yenile, hiç yoksa bekle"""
+    snapshot = _news_cache.get(kind)
+    if snapshot is not None:
+        if time.time() - _news_cache_time.get(kind, 0) >= NEWS_CACHE_TTL:
+            _refresh_in_background(kind)
+        return snapshot
     
-    result = {
-        "type": "general",
-        "turkey": news["turkey"],
-        "world": news["world"],
-        "last_updated": datetime.now().isoformat()
-    }
-    _news_cache[cache_key] = result
-    _news_cache_time[cache_key] = now
+    # Soğuk başlangıç - eşzamanlı istekler aynı fetch'i bekler
+    result = await refresh_news(kind)
+    if result is None:
+        _, demo = NEWS_KINDS[kind]
+        return _news_cache.get(kind, demo())
     return result
 
 
+async def get_economy_news() -> Dict:
+    """Ekonomi haberlerini getir (cached)"""
+    return await _get_news("economy")
+
+
+async def get_general_news() -> Dict:
+    """Genel haberleri getir (cached)"""
+    return await _get_news("general")
+
+
+async def _refresher_loop(interval: float):
+    while True:
+        for kind in NEWS_KINDS:
+            try:
+                await refresh_news(kind)
+            except Exception as e:
+                logger.error(f"Background news refresh failed for {kind}: {e}")
+        await asyncio.sleep(interval)
+
+
+def start_news_refresher(interval: float = NEWS_REFRESH_INTERVAL) -> asyncio.Task:
+    """Ekonomi ve genel haberleri sıcak tutan arka plan görevini başlat"""
+    global _refresher_task
+    if _refresher_task is None or _refresher_task.done():
+        _refresher_task = asyncio.get_running_loop().create_task(_refresher_loop(interval))
+        logger.info(f"News refresher started (every {interval}s)")
+    return _refresher_task
+
+
+async def stop_news_refresher():
+    """Arka plan görevini durdur"""
+    global _refresher_task
+    if _refresher_task is not None:
+        _refresher_task.cancel()
+        try:
+            await _refresher_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _refresher_task = None
+
+
 # Demo data for fallback
 DEMO_ECONOMY_NEWS = {
     "type": "economy",
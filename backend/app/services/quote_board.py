@@ -0,0 +1,172 @@
+"""
+Quote Board
+In-memory day quotes for the whole universe, filled by one batched poll
+
+Top movers used to download five daily bars per ticker on every request, the
+market overview fired eight executor calls per request and the alert check
+fetched prices one ticker at a time. A background task now refreshes a single
+board (BIST30 plus the indices/FX/commodities of the market overview) with one
+batch fetch; those endpoints read it from memory. When the refresher is not
+running (serverless, tests) the first stale read refreshes the board itself.
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from app.services.features import normalize_ohlcv
+from app.utils.logger import logger
+
+if TYPE_CHECKING:  # pandas is imported on first refresh, not with app.main
+    import pandas as pd
+
+QUOTE_BOARD_INTERVAL = 60  # seconds; DataFetcher serves bars from its cache in between
+QUOTE_BOARD_MAX_AGE = 300  # older boards are refreshed on read
+QUOTE_DATA_INTERVAL = "1d"
+QUOTE_DATA_PERIOD = "5d"
+
+_refresher_task: Optional[asyncio.Task] = None
+
+
+def build_quote(symbol: str, df: "pd.DataFrame") -> Optional[Dict[str, Any]]:
+    """Day quote from daily bars (last row is today); None without data"""
+    df = normalize_ohlcv(df)
+    if df is None or df.empty:
+        return None
+
+    today = df.iloc[-1]
+    price = float(today["close"])
+    prev_close = float(df["close"].iloc[-2]) if len(df) > 1 else price
+    change = price - prev_close
+    return {
+        "symbol": symbol,
+        "price": price,
+        "prev_close": prev_close,
+        "open": float(today["open"]),
+        "high": float(today["high"]),
+        "low": float(today["low"]),
+        "volume": float(today["volume"]),
+        "avg_volume": float(df["volume"].tail(5).mean()),
+        "change": change,
+        "change_percent": (change / prev_close * 100) if prev_close else 0.0,
+        "bar_time": df.index[-1],
+    }
+
+
+class QuoteBoard:
+    """
+    Latest day quote per symbol
+
+    refresh() replaces the whole board at once, so readers always see one
+    consistent poll. Quotes are shared; callers must not modify them.
+    """
+
+    def __init__(self, data_fetcher=None, symbols: Optional[Iterable[str]] = None):
+        self._data_fetcher = data_fetcher
+        self._symbols = list(symbols) if symbols is not None else None
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._refresh_lock = threading.Lock()
+        self.updated_at: Optional[datetime] = None
+        self._updated_monotonic: Optional[float] = None
+
+    @property
+    def data_fetcher(self):
+        if self._data_fetcher is None:
+            from app.services.data_fetcher import DataFetcher
+            self._data_fetcher = DataFetcher()
+        return self._data_fetcher
+
+    @property
+    def symbols(self) -> List[str]:
+        """BIST30 followed by the market overview symbols"""
+        if self._symbols is None:
+            from app.services.market_data import MarketDataService
+            universe = list(self.data_fetcher.bist30_tickers)
+            universe += [s for s in MarketDataService.TICKERS.values() if s not in universe]
+            self._symbols = universe
+        return self._symbols
+
+    def refresh(self) -> int:
+        """One batch poll for every symbol (blocking); returns the number of quotes"""
+        with self._refresh_lock:
+            return self._poll()
+
+    def _poll(self) -> int:
+        frames = self.data_fetcher.fetch_realtime_data_batch(
+            self.symbols, QUOTE_DATA_INTERVAL, QUOTE_DATA_PERIOD
+        )
+        quotes = {}
+        for symbol, df in frames.items():
+            try:
+                quote = build_quote(symbol, df)
+            except Exception as e:
+                logger.warning(f"Quote board: bad bars for {symbol}: {e}")
+                continue
+            if quote:
+                quotes[symbol] = quote
+
+        # Keep the last known quote of a symbol the poll missed
+        self._quotes = {**self._quotes, **quotes}
+        self.updated_at = datetime.now()
+        self._updated_monotonic = time.monotonic()
+        return len(quotes)
+
+    def is_stale(self, max_age: float = QUOTE_BOARD_MAX_AGE) -> bool:
+        return self._updated_monotonic is None or time.monotonic() - self._updated_monotonic > max_age
+
+    def ensure_fresh(self, max_age: float = QUOTE_BOARD_MAX_AGE):
+        """Refresh only if stale; concurrent callers wait for one poll"""
+        if self.is_stale(max_age):
+            with self._refresh_lock:
+                if self.is_stale(max_age):
+                    self._poll()
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return self._quotes.get(symbol)
+
+    def snapshot(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """symbol -> quote for `symbols` (default: all) that are on the board"""
+        quotes = self._quotes
+        if symbols is None:
+            return dict(quotes)
+        return {s: quotes[s] for s in symbols if s in quotes}
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+
+async def _refresher_loop(interval: float):
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            count = await loop.run_in_executor(None, quote_board.refresh)
+            logger.debug(f"Quote board refreshed: {count} symbols")
+        except Exception as e:
+            logger.error(f"Quote board refresh failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def start_quote_board(interval: float = QUOTE_BOARD_INTERVAL) -> asyncio.Task:
+    """Fiyat panosunu sıcak tutan arka plan görevini başlat"""
+    global _refresher_task
+    if _refresher_task is None or _refresher_task.done():
+        _refresher_task = asyncio.get_running_loop().create_task(_refresher_loop(interval))
+        logger.info(f"Quote board refresher started (every {interval}s)")
+    return _refresher_task
+
+
+async def stop_quote_board():
+    """Arka plan görevini durdur"""
+    global _refresher_task
+    if _refresher_task is not None:
+        _refresher_task.cancel()
+        try:
+            await _refresher_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _refresher_task = None
+
+
+# Global instance
+quote_board = QuoteBoard()
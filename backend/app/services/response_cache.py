@@ -0,0 +1,120 @@
+"""
+Response Cache
+Bar-keyed cache and request collapsing for deterministic per-ticker responses
+
+A response that only depends on a ticker's bars (stock analysis, market
+summary) is the same for every user until a new bar arrives. Entries are keyed
+by (namespace, ticker) and tagged with the last bar and a template version;
+storing a newer bar replaces the old entry, so nothing stale outlives its bar.
+"""
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.services.metrics import record_cache
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def bar_marker(df: "pd.DataFrame") -> Optional[Tuple]:
+    """
+    Identity of the last bar in `df`
+
+    Timestamp alone isn't enough: during a session the last daily bar keeps
+    its timestamp while its close and volume move, so both are part of it.
+    """
+    if df is None or df.empty:
+        return None
+    last = df.iloc[-1]
+    return (
+        df.index[-1],
+        float(last.get("close", 0) or 0),
+        float(last.get("volume", 0) or 0),
+    )
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution
+
+    The first caller starts the work as a task; callers arriving while it runs
+    await the same task. A cancelled caller doesn't cancel the shared work.
+    Calls are tracked per event loop, since tasks can't be awaited across loops.
+    """
+
+    def __init__(self):
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+
+        task = calls.get(key)
+        if task is None:
+            task = loop.create_task(func())
+            calls[key] = task
+
+            def _done(finished: asyncio.Task, key=key):
+                if calls.get(key) is finished:
+                    del calls[key]
+
+            task.add_done_callback(_done)
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        try:
+            return len(self._calls.get(asyncio.get_running_loop(), {}))
+        except RuntimeError:
+            return 0
+
+
+class BarKeyedCache:
+    """
+    LRU of responses tagged with (last bar, version)
+
+    One slot per (namespace, ticker): a lookup hits only if both the bar and the
+    version match, and a write for a newer bar overwrites the slot.
+    """
+
+    def __init__(self, name: str = "response", max_entries: int = 512):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, ticker: str, bar: Any, version: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((namespace, ticker))
+            hit = entry is not None and entry[0] == bar and entry[1] == version
+            if hit:
+                self._entries.move_to_end((namespace, ticker))
+        record_cache(self.name, hit)
+        return entry[2] if hit else None
+
+    def set(self, namespace: str, ticker: str, bar: Any, version: str, value: Any):
+        with self._lock:
+            self._entries[(namespace, ticker)] = (bar, version, value)
+            self._entries.move_to_end((namespace, ticker))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, ticker: Optional[str] = None) -> int:
+        """Drop entries for `ticker` (all namespaces), or everything"""
+        with self._lock:
+            if ticker is None:
+                count = len(self._entries)
+                self._entries.clear()
+                return count
+            keys = [key for key in self._entries if key[1] == ticker]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -15,6 +15,7 @@ from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime, time
 from app.utils.logger import logger
+from app.services.metrics import SIGNAL_SECONDS
 
 # Hybrid Strategy Import
 try:
@@ -240,6 +241,7 @@ class SignalGenerator:
             "max_loss": round(risk_amount, 2)
         }
 
+    @SIGNAL_SECONDS.timed(generator="strategy")
     def generate_signal(self, df: pd.DataFrame, indicators: Dict) -> Dict[str, Any]:
         """
         Generate signal using IMPROVED STRATEGY LOGIC
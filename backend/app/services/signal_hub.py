@@ -0,0 +1,192 @@
+"""
+Signal Hub
+One signal producer per (ticker, strategy), shared by every /ws/signals viewer
+
+Each producer polls the ticker's 5m bars, re-evaluates indicators and the
+signal only when the last bar changed, keeps the latest signal as a snapshot
+for newly connected clients and broadcasts only when the signal changes.
+Signal compute then follows the number of watched tickers, not sockets; the
+producer stops with its last subscriber.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+from app.services.features import feature_store
+from app.services.response_cache import bar_marker
+from app.services.websocket_manager import ChannelType, WebSocketMessage, ws_manager
+from app.utils.logger import logger
+
+SIGNAL_POLL_INTERVAL = 5  # seconds
+SIGNAL_DATA_INTERVAL = "5m"
+SIGNAL_DATA_PERIOD = "1d"
+DEFAULT_STRATEGY = "moderate"
+
+
+def signal_payload(signal: Dict[str, Any], strategy: str) -> Dict[str, Any]:
+    """Fields sent to clients (same shape as the former per-socket loop)"""
+    return {
+        "signal": signal.get("signal"),
+        "strength": signal.get("strength"),
+        "confidence": signal.get("confidence"),
+        "entry_price": signal.get("entry_price"),
+        "stop_loss": signal.get("stop_loss"),
+        "take_profit": signal.get("take_profit"),
+        "reasons": signal.get("reasons", []),
+        "strategy": strategy,
+    }
+
+
+@dataclass
+class SignalProducer:
+    """Polling state for one (ticker, strategy)"""
+    ticker: str
+    strategy: str
+    subscribers: Set[WebSocket] = field(default_factory=set)
+    last_bar: Optional[Tuple] = None
+    last_signal: Optional[Dict[str, Any]] = None
+    evaluations: int = 0
+    generator: Any = None
+    task: Optional[asyncio.Task] = None
+
+
+class SignalHub:
+    """
+    Shared signal producers for WebSocket viewers
+
+    Usage (inside a WebSocket endpoint, after ws_manager.connect):
+        await signal_hub.subscribe(websocket, ticker)
+        ...
+        signal_hub.unsubscribe(websocket, ticker)
+    """
+
+    def __init__(self, data_fetcher=None, tech_analysis=None, manager=None,
+                 poll_interval: float = SIGNAL_POLL_INTERVAL, features=None):
+        self._data_fetcher = data_fetcher
+        self._tech_analysis = tech_analysis
+        self.features = features or feature_store
+        self.manager = manager or ws_manager
+        self.poll_interval = poll_interval
+        self._producers: Dict[Tuple[str, str], SignalProducer] = {}
+
+    @property
+    def data_fetcher(self):
+        if self._data_fetcher is None:
+            from app.services.data_fetcher import DataFetcher
+            self._data_fetcher = DataFetcher()
+        return self._data_fetcher
+
+    @property
+    def tech_analysis(self):
+        if self._tech_analysis is None:
+            from app.services.technical_analysis import TechnicalAnalysis
+            self._tech_analysis = TechnicalAnalysis()
+        return self._tech_analysis
+
+    async def subscribe(self, websocket: WebSocket, ticker: str, strategy: str = DEFAULT_STRATEGY) -> SignalProducer:
+        """Attach a client; it gets the current signal at once if there is one"""
+        key = (ticker, strategy)
+        producer = self._producers.get(key)
+        if producer is None:
+            producer = self._producers[key] = SignalProducer(ticker, strategy)
+            producer.task = asyncio.create_task(self._run(producer))
+            logger.info(f"Signal producer started: {ticker} ({strategy})")
+
+        producer.subscribers.add(websocket)
+
+        if producer.last_signal is not None:
+            await self.manager.send_to_client(websocket, WebSocketMessage(
+                channel=ChannelType.SIGNAL.value,
+                event="signal_snapshot",
+                data={"ticker": ticker, **producer.last_signal}
+            ))
+        return producer
+
+    def unsubscribe(self, websocket: WebSocket, ticker: str, strategy: str = DEFAULT_STRATEGY):
+        """Detach a client; the producer stops with its last subscriber"""
+        key = (ticker, strategy)
+        producer = self._producers.get(key)
+        if producer is None:
+            return
+
+        producer.subscribers.discard(websocket)
+        if not producer.subscribers:
+            del self._producers[key]
+            if producer.task is not None:
+                producer.task.cancel()
+            logger.info(f"Signal producer stopped: {ticker} ({strategy})")
+
+    async def stop(self):
+        """Cancel every producer (application shutdown)"""
+        producers = list(self._producers.values())
+        self._producers.clear()
+        tasks = [p.task for p in producers if p.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def evaluate(self, producer: SignalProducer) -> Optional[Dict[str, Any]]:
+        """
+        Signal for the latest bar, or None when the bar hasn't changed
+
+        Blocking (data fetch + indicators); run in an executor.
+        """
+        df = self.data_fetcher.fetch_realtime_data(
+            producer.ticker, interval=SIGNAL_DATA_INTERVAL, period=SIGNAL_DATA_PERIOD
+        )
+        if df.empty:
+            return None
+
+        marker = bar_marker(df)
+        if marker == producer.last_bar:
+            return None
+
+        if producer.generator is None:
+            from app.services.signal_generator import SignalGenerator
+            producer.generator = SignalGenerator(strategy_type=producer.strategy)
+
+        df_with_indicators = self.features.frame(
+            producer.ticker, SIGNAL_DATA_INTERVAL, SIGNAL_DATA_PERIOD, df
+        )
+        latest_indicators = self.tech_analysis.get_latest_indicators(df_with_indicators)
+        signal = producer.generator.generate_signal(df_with_indicators, latest_indicators)
+
+        producer.last_bar = marker
+        producer.evaluations += 1
+        return signal
+
+    async def _run(self, producer: SignalProducer):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                signal = await loop.run_in_executor(None, self.evaluate, producer)
+                if signal:
+                    await self._publish(producer, signal_payload(signal, producer.strategy))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Signal update error for {producer.ticker}: {e}")
+
+            await asyncio.sleep(self.poll_interval)
+
+    async def _publish(self, producer: SignalProducer, payload: Dict[str, Any]):
+        previous = producer.last_signal
+        producer.last_signal = payload
+        if previous is None or previous["signal"] != payload["signal"]:
+            await self.manager.broadcast_signal(producer.ticker, payload)
+
+    def get_stats(self) -> dict:
+        return {
+            f"{ticker}:{strategy}": {
+                "subscribers": len(p.subscribers),
+                "evaluations": p.evaluations,
+                "signal": p.last_signal["signal"] if p.last_signal else None,
+            }
+            for (ticker, strategy), p in self._producers.items()
+        }
+
+
+# Global instance
+signal_hub = SignalHub()
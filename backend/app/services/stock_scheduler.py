@@ -11,6 +11,7 @@ from typing import Optional, Callable, Dict, Any, List
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED
+from app.services.market_calendar import bist_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -27,25 +28,33 @@ class StockScheduler:
     
     Tarama zamanı:
     - Her gün saat 18:30 (piyasa kapandıktan 30 dakika sonra)
+    
+    Açılış öncesi ısınma:
+    - İşlem günlerinde 09:15 (veri, indikatörler, piyasa filtresi, öneriler önceden hazırlanır)
     """
     
     def __init__(self):
         self.scheduler: Optional[AsyncIOScheduler] = None
         self.is_running = False
         self._scan_callback: Optional[Callable] = None
+        self._warmup_callback: Optional[Callable] = None
+        self._last_warmup: Optional[datetime] = None
+        self._last_warmup_result: Optional[Dict] = None
         self._last_run: Optional[datetime] = None
         self._last_result: Optional[Dict] = None
         self._run_count = 0
         self._error_count = 0
     
-    def setup(self, scan_callback: Callable):
+    def setup(self, scan_callback: Callable, warmup_callback: Optional[Callable] = None):
         """
         Scheduler'ı kur
         
         Args:
             scan_callback: Tarama yapılacak async fonksiyon
+            warmup_callback: Açılış öncesi sabah çıktılarını hazırlayan async fonksiyon
         """
         self._scan_callback = scan_callback
+        self._warmup_callback = warmup_callback
         
         # Scheduler oluştur
         self.scheduler = AsyncIOScheduler(
@@ -83,14 +92,25 @@ class StockScheduler:
         )
         
         logger.info("📅 Daily stock scan scheduled at 18:30 (Europe/Istanbul)")
+        
+        # Açılış öncesi ısınma (tatil günleri _run_warmup içinde atlanır)
+        if self._warmup_callback:
+            self.scheduler.add_job(
+                self._run_warmup,
+                CronTrigger(day_of_week='mon-fri', hour=9, minute=15),
+                id='premarket_warmup',
+                name='Açılış Öncesi Isınma',
+                replace_existing=True
+            )
+            logger.info("📅 Pre-market warm-up scheduled at 09:15 on trading days (Europe/Istanbul)")
     
     def _job_event_listener(self, event):
         """Job event listener"""
         if event.exception:
             self._error_count += 1
-            logger.error(f"❌ Stock scan job failed: {event.exception}")
+            logger.error(f"❌ Scheduled job {event.job_id} failed: {event.exception}")
         else:
-            logger.info(f"✅ Stock scan job completed successfully")
+            logger.info(f"✅ Scheduled job {event.job_id} completed successfully")
     
     async def _run_scan(self):
         """Tarama çalıştır ve sonuçları kaydet"""
@@ -117,6 +137,20 @@ class StockScheduler:
             logger.error(f"❌ Stock scan failed: {e}")
             raise
     
+    async def _run_warmup(self):
+        """Açılıştan önce sabah çıktılarını hazırla (tatil günlerinde atla)"""
+        today = bist_calendar.now().date()
+        if not bist_calendar.is_trading_day(today):
+            logger.info(f"⏭️ Pre-market warm-up skipped - BIST closed on {today}")
+            return None
+        
+        logger.info("🔄 Pre-market warm-up starting...")
+        result = await self._warmup_callback()
+        self._last_warmup = datetime.now()
+        self._last_warmup_result = result
+        logger.info("✅ Pre-market warm-up completed")
+        return result
+    
     async def _save_daily_picks(self, result: Dict):
         """Günlük önerileri JSON dosyasına kaydet"""
         try:
@@ -192,10 +226,14 @@ class StockScheduler:
     def get_status(self) -> Dict[str, Any]:
         """Scheduler durumunu döndür"""
         next_run = None
+        next_warmup = None
         if self.scheduler:
             job = self.scheduler.get_job('daily_stock_scan')
             if job and job.next_run_time:
                 next_run = job.next_run_time.isoformat()
+            job = self.scheduler.get_job('premarket_warmup')
+            if job and job.next_run_time:
+                next_warmup = job.next_run_time.isoformat()
         
         return {
             "is_running": self.is_running,
@@ -203,7 +241,10 @@ class StockScheduler:
             "next_run": next_run,
             "run_count": self._run_count,
             "error_count": self._error_count,
-            "schedule": "Daily at 18:30 (Europe/Istanbul)"
+            "schedule": "Daily at 18:30 (Europe/Istanbul)",
+            "last_warmup": self._last_warmup.isoformat() if self._last_warmup else None,
+            "next_warmup": next_warmup,
+            "warmup": self._last_warmup_result
         }
     
     async def run_now(self) -> Dict:
@@ -241,9 +282,9 @@ class StockScheduler:
 stock_scheduler = StockScheduler()
 
 
-def setup_stock_scheduler(scan_callback: Callable):
+def setup_stock_scheduler(scan_callback: Callable, warmup_callback: Optional[Callable] = None):
     """Stock scheduler'ı kur"""
-    stock_scheduler.setup(scan_callback)
+    stock_scheduler.setup(scan_callback, warmup_callback)
 
 
 def start_stock_scheduler():
@@ -2,18 +2,84 @@
 Stock Screener Service - OPTIMIZED HYBRID STRATEGY
 Trend-following + pullback detection with market filters
 """
+import asyncio
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
-from datetime import datetime, time
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional, Tuple
+from datetime import datetime, time, timedelta
 import pytz
 from app.services.data_fetcher import DataFetcher
 from app.services.technical_analysis import TechnicalAnalysis
+from app.config import settings
+from app.services.features import feature_store
+from app.services.market_calendar import bist_calendar
+from app.services.response_cache import bar_marker
+from app.services.metrics import HYBRID_SCORE_SECONDS, SCREENER_STAGE_SECONDS
 from app.utils.logger import logger
-import concurrent.futures
+import threading
+from bisect import bisect_left, insort
+from time import perf_counter
 
 
 
+class ScoredTable:
+    """
+    Resident screening results for one (interval, period)
+    
+    Each ticker is tagged with the bar it was last screened on, so a refresh
+    only rescores tickers whose bar changed. The ranking is a list of
+    (-score, ticker) kept sorted with bisect: a rescored ticker moves in
+    place instead of the whole table being re-sorted.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.context: Optional[bool] = None  # market filter state the rows were scored under
+        self._bars: Dict[str, Any] = {}       # ticker -> bar marker (pre-filter rejects included)
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._order: List[Tuple[float, str]] = []
+    
+    def bar(self, ticker: str) -> Optional[Any]:
+        return self._bars.get(ticker)
+    
+    def tickers(self) -> set:
+        return set(self._bars)
+    
+    def put(self, ticker: str, bar: Any, row: Optional[Dict[str, Any]]):
+        """Record `ticker` as screened on `bar`; row None = rejected by a pre-filter"""
+        self._unrank(ticker)
+        self._bars[ticker] = bar
+        if row is not None:
+            self._rows[ticker] = row
+            insort(self._order, (-row['score'], ticker))
+    
+    def drop(self, ticker: str):
+        self._unrank(ticker)
+        self._bars.pop(ticker, None)
+    
+    def clear(self):
+        self._bars.clear()
+        self._rows.clear()
+        self._order.clear()
+    
+    def _unrank(self, ticker: str):
+        row = self._rows.pop(ticker, None)
+        if row is not None:
+            del self._order[bisect_left(self._order, (-row['score'], ticker))]
+    
+    def ranked(self, min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Rows by score (ties by ticker), as copies callers may annotate"""
+        rows = []
+        for neg_score, ticker in self._order:
+            if min_score is not None and -neg_score < min_score:
+                break
+            rows.append(dict(self._rows[ticker]))
+        return rows
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
 class StockScreener:
     """Optimized hybrid strategy with ADAPTIVE parameters per stock"""
     
@@ -23,6 +89,11 @@ class StockScreener:
     MARKET_CLOSE = time(18, 0)
     TZ = pytz.timezone('Europe/Istanbul')
     
+    # Screening pre-filters (cheap disqualifiers, whole universe at once)
+    PREFILTER_MIN_BARS = 50           # indicators need EMA50 history
+    PREFILTER_MIN_AVG_VOLUME = 1_000  # shares per bar over the last 20 bars
+    PREFILTER_TREND_EMAS = (21, 50)   # medium trend up: EMA21 > EMA50
+    
     # Sector definitions for BIST stocks
     STOCK_SECTORS = {
         "AKBNK.IS": "Bankacılık",
@@ -81,8 +152,9 @@ class StockScreener:
         self.data_fetcher = DataFetcher()
         self.tech_analysis = TechnicalAnalysis()
         self.bist30_tickers = self.data_fetcher.bist30_tickers
-        self._market_trend_cache = {'trend': None, 'timestamp': None}
+        self._market_trend_cache = {'trend': None, 'timestamp': None, 'expires': None}
         self._atr_cache = {}  # Her hisse için ATR cache'i
+        self._tables: Dict[Tuple[str, str], ScoredTable] = {}  # (interval, period) -> resident scores
         logger.info("StockScreener initialized - Optimized Hybrid Strategy v4 (WR:57%, PF:1.94)")
     
     def get_stock_volatility_profile(self, ticker: str) -> Dict:
@@ -177,11 +249,11 @@ class StockScreener:
         Used as market filter - only trade when market is bullish
         """
         try:
-            # Cache for 5 minutes to avoid excessive API calls
+            # Cache for 5 minutes to avoid excessive API calls (market closed: until the next open)
             cache = self._market_trend_cache
             now = datetime.now()
             
-            if cache['timestamp'] and (now - cache['timestamp']).seconds < 300:
+            if cache['timestamp'] and now < cache['expires']:
                 return cache['trend']
             
             # Fetch BIST100 index data
@@ -191,8 +263,8 @@ class StockScreener:
                 logger.warning("Insufficient BIST100 data for trend check")
                 return True  # Default to allow trading if data unavailable
             
-            # Calculate EMAs
-            df_with_indicators = self.tech_analysis.calculate_all_indicators(df)
+            # Calculate EMAs (only the two this check reads)
+            df_with_indicators = feature_store.frame("XU100.IS", "1d", "3mo", df, ["ema_21", "ema_50"])
             indicators = self.tech_analysis.get_latest_indicators(df_with_indicators)
             
             ema_20 = indicators.get('trend', {}).get('ema_21')
@@ -200,7 +272,8 @@ class StockScreener:
             
             if ema_20 and ema_50:
                 is_uptrend = ema_20 > ema_50
-                self._market_trend_cache = {'trend': is_uptrend, 'timestamp': now}
+                ttl = bist_calendar.ttl(300) if settings.session_cache_ttl_enabled else 300
+                self._market_trend_cache = {'trend': is_uptrend, 'timestamp': now, 'expires': now + timedelta(seconds=ttl)}
                 logger.info(f"BIST100 trend: {'UPTREND' if is_uptrend else 'DOWNTREND'} (EMA20={ema_20:.0f}, EMA50={ema_50:.0f})")
                 return is_uptrend
             
@@ -233,6 +306,7 @@ class StockScreener:
             logger.error(f"Error checking trading time: {e}")
             return True  # Default
     
+    @HYBRID_SCORE_SECONDS.timed()
     def calculate_hybrid_score(self, ticker: str, df: pd.DataFrame, indicators: Dict) -> Dict[str, Any]:
         """
         OPTIMIZED HYBRID STRATEGY SCORING (0-100)
@@ -383,31 +457,7 @@ class StockScreener:
         market_safe = self.is_market_uptrend()
         time_safe = self.is_trading_time_safe()
         
-        # Recommendation - Optimized threshold (60+ for +105% backtest)
-        if score >= 70 and market_safe and time_safe:
-            recommendation = 'BUY'
-            setup_quality = 'Excellent'
-            momentum_status = 'very_strong'
-        elif score >= 60 and market_safe and time_safe:
-            recommendation = 'BUY'  # Lowered threshold based on backtest
-            setup_quality = 'Good'
-            momentum_status = 'strong'
-        elif score >= 60 and not market_safe:
-            recommendation = 'WAIT'  # Good setup but market not favorable
-            setup_quality = 'Good'
-            momentum_status = 'strong'
-        elif score >= 60 and not time_safe:
-            recommendation = 'WAIT'  # Good setup but early trading hours
-            setup_quality = 'Good'
-            momentum_status = 'strong'
-        elif score >= 50:
-            recommendation = 'WATCH'
-            setup_quality = 'Moderate'
-            momentum_status = 'moderate'
-        else:
-            recommendation = 'AVOID'
-            setup_quality = 'Poor'
-            momentum_status = 'weak'
+        recommendation, setup_quality, momentum_status = self._recommend(score, market_safe, time_safe)
         
         # Add filter status to details
         details['market_uptrend'] = market_safe
@@ -431,6 +481,40 @@ class StockScreener:
             'atr': atr
         }
     
+    @staticmethod
+    def _recommend(score: float, market_safe: bool, time_safe: bool) -> Tuple[str, str, str]:
+        """(recommendation, setup_quality, momentum) for a hybrid score under the market/session filters"""
+        # Recommendation - Optimized threshold (60+ for +105% backtest)
+        if score >= 70 and market_safe and time_safe:
+            return 'BUY', 'Excellent', 'very_strong'
+        if score >= 60 and market_safe and time_safe:
+            return 'BUY', 'Good', 'strong'  # Lowered threshold based on backtest
+        if score >= 60:
+            return 'WAIT', 'Good', 'strong'  # Good setup but market not favorable / early trading hours
+        if score >= 50:
+            return 'WATCH', 'Moderate', 'moderate'
+        return 'AVOID', 'Poor', 'weak'
+    
+    def _with_session_gate(self, row: Dict[str, Any], time_safe: bool) -> Dict[str, Any]:
+        """
+        Copy of a resident row with the trading-time filter applied now
+        
+        Resident rows are keyed on the market filter only; the session gate
+        (first 30 minutes, market hours) changes during the day without any
+        bar changing, so it is applied when rows are read.
+        """
+        details = row.get('details', {})
+        if 'trading_time_safe' not in details:  # scored without indicators
+            return dict(row)
+        recommendation, setup_quality, momentum = self._recommend(row['score'], details['market_uptrend'], time_safe)
+        return {
+            **row,
+            'recommendation': recommendation,
+            'setup_quality': setup_quality,
+            'momentum': momentum,
+            'details': {**details, 'trading_time_safe': time_safe},
+        }
+    
     def calculate_technical_levels(self, df: pd.DataFrame) -> Dict[str, float]:
         """
         Calculate technical support/resistance levels
@@ -583,29 +667,57 @@ class StockScreener:
             'sector': atr_levels['sector']
         }
     
-    def _process_stock_for_screening(self, ticker: str, interval: str, period: str) -> Optional[Dict[str, Any]]:
-        """Helper method to process a single stock for screening"""
+    def prefilter(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+        """
+        Cheap disqualifiers on the whole universe in one vectorized pass
+        
+        Bars are aligned on their last row, so each column's EWM and tail
+        mean equal the per-ticker values the full scoring computes.
+        
+        Returns:
+            {'survivors': [...], 'rejected': {'bars': n, 'liquidity': n, 'trend': n}}
+        """
+        rejected = {'bars': 0, 'liquidity': 0, 'trend': 0}
+        long_enough = {t: df for t, df in frames.items() if len(df) >= self.PREFILTER_MIN_BARS}
+        rejected['bars'] = len(frames) - len(long_enough)
+        if not long_enough:
+            return {'survivors': [], 'rejected': rejected}
+        
+        def aligned(column: str) -> pd.DataFrame:
+            return pd.DataFrame({
+                t: pd.Series(df[column].to_numpy(dtype=float), index=np.arange(1 - len(df), 1))
+                for t, df in long_enough.items()
+            })
+        
+        volumes = aligned('volume')
+        liquid = volumes.tail(20).mean() >= self.PREFILTER_MIN_AVG_VOLUME
+        rejected['liquidity'] = int((~liquid).sum())
+        
+        closes = aligned('close').loc[:, liquid]
+        fast, slow = (
+            closes.ewm(span=span, adjust=False).mean().iloc[-1] for span in self.PREFILTER_TREND_EMAS
+        )
+        trending = fast > slow
+        rejected['trend'] = int((~trending).sum())
+        
+        return {'survivors': list(trending.index[trending]), 'rejected': rejected}
+    
+    def _score_stock(self, ticker: str, df: pd.DataFrame, interval: str, period: str) -> Optional[Dict[str, Any]]:
+        """Full indicators + hybrid score for one pre-filter survivor"""
         try:
-            # Fetch data
-            df = self.data_fetcher.fetch_realtime_data(ticker, interval, period)
-            
-            if df.empty or len(df) < 50:
-                return None
-            
-            # Calculate indicators
-            df_with_indicators = self.tech_analysis.calculate_all_indicators(df)
+            df_with_indicators = feature_store.frame(ticker, interval, period, df, copy=False)
             indicators = self.tech_analysis.get_latest_indicators(df_with_indicators)
-            
-            # Calculate hybrid score
-            score_data = self.calculate_hybrid_score(ticker, df, indicators)
-            
-            # Calculate ATR-based entry/exit levels (adaptive per stock)
+            return self.calculate_hybrid_score(ticker, df, indicators)
+        except Exception as e:
+            logger.error(f"Error screening {ticker}: {e}")
+            return None
+    
+    def _complete_result(self, score_data: Dict[str, Any], df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """ATR-based entry/exit levels (adaptive per stock) and sector profile"""
+        ticker = score_data['ticker']
+        try:
             levels = self.calculate_entry_exit_levels(ticker, df, score_data)
-            
-            # Get volatility profile for this stock
             vol_profile = self.get_stock_volatility_profile(ticker)
-            
-            # Combine results
             return {
                 **score_data,
                 'levels': levels,
@@ -616,30 +728,158 @@ class StockScreener:
         except Exception as e:
             logger.error(f"Error screening {ticker}: {e}")
             return None
-
+    
+    def _table(self, interval: str, period: str) -> ScoredTable:
+        return self._tables.setdefault((interval, period), ScoredTable())
+    
+    def screen(self, interval: str = '1h', period: str = '1mo',
+               min_score: Optional[float] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Refresh the resident table for (interval, period) and read its ranking
+        
+        Returns:
+            (results sorted by score, {'universe': n, 'stages': [...]})
+        """
+        ranking = self._refresh(interval, period, min_score)
+        return ranking['stocks'], ranking['pipeline']
+    
+    async def stream_screen(self, interval: str = '1h', period: str = '1mo',
+                            publish: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        screen() as a stream: each ticker is emitted as soon as it is ready
+        
+        Events:
+            {'type': 'result', 'rescored': bool, 'stock': {...}} - cached rows
+                first, then every rescored ticker as its levels complete
+            {'type': 'ranking', 'stocks': [...], 'pipeline': {...}} - closing event
+        
+        publish: also push rescored tickers and the ranking to the WebSocket
+            'screener' channel (ws_manager.broadcast_screener_update)
+        
+        The refresh runs to completion in a worker that queues the events, so
+        a slow or departed client never holds the table lock.
+        """
+        from app.services.websocket_manager import ws_manager
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        def emit(event):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # loop closed: nobody is listening any more
+        
+        def run():
+            try:
+                emit(self._refresh(interval, period, emit=emit))
+            except Exception as e:
+                emit(e)
+        
+        loop.run_in_executor(None, run)
+        while True:
+            event = await queue.get()
+            if isinstance(event, Exception):
+                raise event
+            if publish and (event['type'] == 'ranking' or event['rescored']):
+                await ws_manager.broadcast_screener_update(event)
+            yield event
+            if event['type'] == 'ranking':
+                break
+    
+    def _refresh(self, interval: str, period: str, min_score: Optional[float] = None,
+                 emit: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Staged refresh of the resident table; returns the closing ranking event
+        
+        Tickers whose last bar changed since they were screened go through
+        fetch (one batch) -> prefilter (vectorized) -> score -> levels; each
+        stage only sees the previous stage's survivors. `emit` receives one
+        result event per ready ticker while the table lock is held, so it
+        must not block.
+        """
+        emit = emit or (lambda event: None)
+        table = self._table(interval, period)
+        universe = list(self.bist30_tickers)
+        stats = {'universe': len(universe), 'stages': []}
+        
+        def finish_stage(name: str, survivors: int, seconds: float, **extra):
+            SCREENER_STAGE_SECONDS.observe(seconds, stage=name)
+            stats['stages'].append({'stage': name, 'survivors': survivors, 'ms': round(seconds * 1000, 2), **extra})
+        
+        def result(row: Dict[str, Any], rescored: bool) -> Dict[str, Any]:
+            return {'type': 'result', 'interval': interval, 'period': period, 'rescored': rescored, 'stock': row}
+        
+        with table.lock:
+            # Recommendations depend on the market filter: rescore everything when it flips.
+            # The session gate is applied on read (_with_session_gate), so 09:30 rescores nothing.
+            context = self.is_market_uptrend()
+            if context != table.context:
+                table.clear()
+                table.context = context
+            time_safe = self.is_trading_time_safe()
+            
+            started = perf_counter()
+            frames = self.data_fetcher.fetch_realtime_data_batch(universe, interval, period)
+            for ticker in table.tickers() - frames.keys():
+                table.drop(ticker)
+            bars = {t: bar_marker(df) for t, df in frames.items()}
+            changed = {t: df for t, df in frames.items() if table.bar(t) != bars[t]}
+            finish_stage('fetch', len(frames), perf_counter() - started, changed=len(changed))
+            
+            for row in table.ranked(min_score):
+                if row['ticker'] not in changed:
+                    emit(result(self._with_session_gate(row, time_safe), False))
+            
+            started = perf_counter()
+            prefiltered = self.prefilter(changed)
+            survivors = set(prefiltered['survivors'])
+            for ticker in changed.keys() - survivors:
+                table.put(ticker, bars[ticker], None)
+            finish_stage('prefilter', len(survivors), perf_counter() - started, rejected=prefiltered['rejected'])
+            
+            scored = completed = 0
+            score_seconds = levels_seconds = 0.0
+            for ticker in prefiltered['survivors']:
+                started = perf_counter()
+                score_data = self._score_stock(ticker, frames[ticker], interval, period)
+                score_seconds += perf_counter() - started
+                if not score_data:
+                    table.drop(ticker)  # retried on the next refresh
+                    continue
+                scored += 1
+                
+                started = perf_counter()
+                row = self._complete_result(score_data, frames[ticker])
+                levels_seconds += perf_counter() - started
+                if not row:
+                    table.drop(ticker)
+                    continue
+                table.put(ticker, bars[ticker], row)
+                completed += 1
+                if min_score is None or row['score'] >= min_score:
+                    emit(result(self._with_session_gate(row, time_safe), True))
+            
+            finish_stage('score', scored, score_seconds)
+            finish_stage('levels', completed, levels_seconds, ranked=len(table))
+            ranked = [self._with_session_gate(row, time_safe) for row in table.ranked(min_score)]
+            return {
+                'type': 'ranking',
+                'interval': interval,
+                'period': period,
+                'total_stocks': len(ranked),
+                'stocks': ranked,
+                'pipeline': stats,
+            }
+    
     def screen_all_stocks(self, interval: str = '1h', period: str = '1mo') -> List[Dict[str, Any]]:
-        """Scan all BIST30 for bounce setups with ATR-based adaptive parameters (PARALLELIZED)"""
+        """Scan all BIST30 for bounce setups with ATR-based adaptive parameters (staged pipeline)"""
         logger.info("Screening for bounce setups with ATR-adaptive parameters")
-        results = []
-        
-        # Use ThreadPoolExecutor for parallel processing
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            # Create a list of futures
-            future_to_ticker = {
-                executor.submit(self._process_stock_for_screening, ticker, interval, period): ticker 
-                for ticker in self.bist30_tickers
-            }
-            
-            for future in concurrent.futures.as_completed(future_to_ticker):
-                result = future.result()
-                if result:
-                    results.append(result)
-        
-        # Sort by score
-        results.sort(key=lambda x: x['score'], reverse=True)
+        results, stats = self.screen(interval, period)
         
         buy_count = len([r for r in results if r['recommendation'] == 'BUY'])
-        logger.info(f"Found {len(results)} stocks. {buy_count} BUY setups.")
+        stages = ", ".join(f"{s['stage']}={s['survivors']} ({s['ms']}ms)" for s in stats['stages'])
+        logger.info(f"Found {len(results)} stocks. {buy_count} BUY setups. Stages: {stages}")
         return results
     
     def get_top_picks(self, n: int = 10, min_score: int = 75) -> List[Dict[str, Any]]:
@@ -647,10 +887,8 @@ class StockScreener:
         Get top bounce confirmation setups with sector diversification
         min_score default: 75 (excellent setups only)
         """
-        all_results = self.screen_all_stocks()
-        
-        # Filter by minimum score (75+ for strong signals only)
-        filtered = [r for r in all_results if r['score'] >= min_score]
+        # Filter by minimum score (75+ for strong signals only) - read from the ranked table
+        filtered, _ = self.screen('1h', '1mo', min_score=min_score)
         
         # Add sector info to results
         for r in filtered:
@@ -700,7 +938,7 @@ class StockScreener:
             if df.empty:
                 return {'error': 'No data available'}
             
-            df_with_indicators = self.tech_analysis.calculate_all_indicators(df)
+            df_with_indicators = feature_store.frame(ticker, interval, period, df)
             indicators = self.tech_analysis.get_latest_indicators(df_with_indicators)
             
             score_data = self.calculate_hybrid_score(ticker, df, indicators)
@@ -760,16 +998,13 @@ class StockScreener:
                 'reason': 'Market filter blocked trading'
             }
         
-        # Tüm hisseleri tara
-        all_results = self.screen_all_stocks(interval='1h', period='1mo')
+        # GÜÇLÜ SİNYAL FİLTRESİ: Score >= 75 (yükseltildi 60'tan) - sıralı tablodan okunur
+        buy_candidates, _ = self.screen('1h', '1mo', min_score=75)
         
         # Sektör bilgisi ekle
-        for r in all_results:
+        for r in buy_candidates:
             r['sector'] = self.STOCK_SECTORS.get(r['ticker'], 'Diğer')
         
-        # GÜÇLÜ SİNYAL FİLTRESİ: Score >= 75 (yükseltildi 60'tan)
-        buy_candidates = [r for r in all_results if r['score'] >= 75]
-        
         # SEKTÖR ÇEŞİTLENDİRMESİ: Her sektörden max 1 hisse
         top_picks = self._apply_sector_diversification(buy_candidates, max_picks)
         
@@ -985,12 +1220,37 @@ class StockScreener:
         
         return instructions
 
+    def _mover_row(self, ticker: str, quote: Dict[str, Any]) -> Dict[str, Any]:
+        """Top movers row from a quote board entry"""
+        low = quote['low']
+        day_range_pct = ((quote['high'] - low) / low) * 100 if low > 0 else 0
+        # Hacim ortalaması (son 5 gün)
+        avg_volume = quote['avg_volume']
+        volume_ratio = quote['volume'] / avg_volume if avg_volume > 0 else 1
+        
+        return {
+            'ticker': ticker,
+            'symbol': ticker.replace('.IS', ''),
+            'sector': self.STOCK_SECTORS.get(ticker, 'Diğer'),
+            'price': round(quote['price'], 2),
+            'change': round(quote['change'], 2),
+            'change_percent': round(quote['change_percent'], 2),
+            'open': round(quote['open'], 2),
+            'high': round(quote['high'], 2),
+            'low': round(low, 2),
+            'volume': int(quote['volume']),
+            'volume_ratio': round(volume_ratio, 2),
+            'day_range_pct': round(day_range_pct, 2),
+            'prev_close': round(quote['prev_close'], 2)
+        }
+
     def get_top_movers(self, top_n: int = 5) -> Dict[str, Any]:
         """
         🔥 EN ÇOK HAREKET EDEN HİSSELER - Günlük
         
-        BIST30'da günlük en çok yükselen ve düşen hisseleri döndürür.
-        Realtime veri çekerek her zaman güncel kalır.
+        BIST30'da günlük en çok yükselen ve düşen hisseler; fiyat panosundan
+        (quote_board) okunur, istek başına veri çekilmez. Pano bayatsa
+        yenilenir (blocking) - async çağıranlar executor'da çalıştırır.
         
         Args:
             top_n: Kaç hisse gösterilecek (varsayılan: 5)
@@ -998,88 +1258,14 @@ class StockScreener:
         Returns:
             Top gainers (yükselenler) ve top losers (düşenler) listesi
         """
-        logger.info(f"Getting top movers (top {top_n})")
+        from app.services.quote_board import quote_board
         
-    def _process_ticker_for_mover(self, ticker: str) -> Optional[Dict[str, Any]]:
-        """Helper method to process a single ticker for top movers"""
-        try:
-            # Günlük veri çek
-            df = self.data_fetcher.fetch_realtime_data(ticker, interval='1d', period='5d')
-            
-            if df.empty or len(df) < 2:
-                return None
-            
-            # Bugünün verisi
-            today = df.iloc[-1]
-            yesterday = df.iloc[-2]
-            
-            current_price = float(today['close'])
-            prev_close = float(yesterday['close'])
-            open_price = float(today['open'])
-            high = float(today['high'])
-            low = float(today['low'])
-            volume = float(today['volume'])
-            
-            # Günlük değişim hesapla
-            change = current_price - prev_close
-            change_percent = ((current_price - prev_close) / prev_close) * 100
-            
-            # Gün içi range
-            day_range = high - low
-            day_range_pct = (day_range / low) * 100 if low > 0 else 0
-            
-            # Hacim ortalaması (son 5 gün)
-            avg_volume = df['volume'].tail(5).mean()
-            volume_ratio = volume / avg_volume if avg_volume > 0 else 1
-            
-            sector = self.STOCK_SECTORS.get(ticker, 'Diğer')
-            
-            return {
-                'ticker': ticker,
-                'symbol': ticker.replace('.IS', ''),
-                'sector': sector,
-                'price': round(current_price, 2),
-                'change': round(change, 2),
-                'change_percent': round(change_percent, 2),
-                'open': round(open_price, 2),
-                'high': round(high, 2),
-                'low': round(low, 2),
-                'volume': int(volume),
-                'volume_ratio': round(volume_ratio, 2),
-                'day_range_pct': round(day_range_pct, 2),
-                'prev_close': round(prev_close, 2)
-            }
-        except Exception as e:
-            logger.warning(f"Error getting data for {ticker}: {e}")
-            return None
-
-    def get_top_movers(self, top_n: int = 5) -> Dict[str, Any]:
-        """
-        🔥 EN ÇOK HAREKET EDEN HİSSELER - Günlük
-        PARALLEL PROCESSING with Safe Fallback
-        """
-        logger.info(f"Getting top movers (top {top_n}) - Parallel Execution")
-        
-        movers = []
+        logger.info(f"Getting top movers (top {top_n})")
         
         try:
-            # Use ThreadPoolExecutor to fetch data in parallel
-            # Reduced workers to 5 to prevent OOM on Vercel
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                # Submit all tasks
-                future_to_ticker = {
-                    executor.submit(self._process_ticker_for_mover, ticker): ticker 
-                    for ticker in self.bist30_tickers
-                }
-                
-                # Process results as they complete
-                for future in concurrent.futures.as_completed(future_to_ticker):
-                    try:
-                        result = future.result()
-                        if result:
-                            movers.append(result)
-                    except Exception as e:
-                        logger.error(f"Error processing ticker future: {e}")
+            quote_board.ensure_fresh()
+            quotes = quote_board.snapshot(self.bist30_tickers)
+            movers = [self._mover_row(ticker, quote) for ticker, quote in quotes.items()]
 
             if not movers:
                 logger.warning("No movers data found, returning empty success response")
@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any, List
 from app.utils.logger import logger
+from app.services.metrics import INDICATORS_SECONDS
 
 
 class TechnicalAnalysis:
@@ -91,8 +92,9 @@ class TechnicalAnalysis:
         if 'macd' in df.columns:
             return df
         
-        ema_fast = df['close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = df['close'].ewm(span=slow, adjust=False).mean()
+        # Reuse EMA columns when calculate_ema already produced them
+        ema_fast = df[f'ema_{fast}'] if f'ema_{fast}' in df.columns else df['close'].ewm(span=fast, adjust=False).mean()
+        ema_slow = df[f'ema_{slow}'] if f'ema_{slow}' in df.columns else df['close'].ewm(span=slow, adjust=False).mean()
         
         df['macd'] = ema_fast - ema_slow
         df['macd_signal'] = df['macd'].ewm(span=signal, adjust=False).mean()
@@ -238,17 +240,23 @@ class TechnicalAnalysis:
     
     # COMPREHENSIVE ANALYSIS
     
-    def calculate_all_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    @INDICATORS_SECONDS.timed()
+    def calculate_all_indicators(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
         """Calculate all technical indicators at once - Optimized
         
         Uses in-place modifications and skips already calculated indicators
-        for better performance.
+        for better performance. Callers that serve the same bars repeatedly
+        should use features.feature_store, which caches this frame per bar.
+        
+        Args:
+            copy: Work on a copy (False: add columns to `df` itself)
         """
         if df.empty:
             return df
         
         # Make a single copy at the start
-        df = df.copy()
+        if copy:
+            df = df.copy()
         
         # All indicator functions now check if columns exist and skip if so
         # Trend indicators
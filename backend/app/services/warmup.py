@@ -0,0 +1,104 @@
+"""
+Pre-market Warm-up
+Materializes the morning artifacts before the open
+
+The first users each morning used to pay for cold caches: morning picks,
+the daily-picks hybrid scan, the BIST100 market filter, top movers and the
+per-ticker indicator frames were all computed on the first request. The
+scheduler now runs this pipeline before the session (see StockScheduler):
+one bulk fetch of the universe, then every derived artifact is built on the
+same instances the routes use (app.api.dependencies providers), so the
+first request of the day reads warm state. Outside the session the cached
+bars stay valid until the open (market_calendar), and the screener applies
+its trading-time gate when rows are read, so warmed rows are rescored only
+once a ticker's bar changes or the market filter flips - not when the
+first-30-minutes window ends.
+"""
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.cache_service import cache_service
+from app.services.features import feature_store
+from app.services.metrics import WARMUP_STAGE_SECONDS
+from app.utils.logger import logger
+
+# Feeds fetched in bulk: screener, hybrid scan / market filter, quote board, live signals
+WARMUP_FEEDS: List[Tuple[str, str]] = [("1h", "1mo"), ("1d", "3mo"), ("1d", "5d"), ("5m", "1d")]
+# Indicator frames read by the default /stocks, /signals and /indicators requests
+WARMUP_FEATURE_FEEDS: List[Tuple[str, str]] = [("1h", "1mo"), ("1d", "3mo"), ("5m", "1d")]
+# Resident screener tables: morning picks / top picks (1h) and /screener/scan (5m)
+WARMUP_SCREEN_FEEDS: List[Tuple[str, str]] = [("1h", "1mo"), ("5m", "1d")]
+WARMUP_DAILY_PICKS = 5  # /signals/daily-picks default max_picks
+
+
+def warmup_universe(data_fetcher) -> List[str]:
+    """BIST30 (screener and daily-picks lists) plus the BIST100 index"""
+    from app.constants import BIST30_TICKERS, DAILY_PICKS_TICKERS
+    return list(dict.fromkeys([*data_fetcher.bist30_tickers, *BIST30_TICKERS, *DAILY_PICKS_TICKERS, "XU100.IS"]))
+
+
+def run_premarket_warmup(data_fetcher=None, screener=None, hybrid_generator=None,
+                         board=None) -> Dict[str, Any]:
+    """
+    Build every morning artifact (blocking; run in an executor)
+
+    Stages run in order and a failing stage does not stop the rest.
+
+    Returns:
+        {'universe': n, 'stages': [{'stage', 'ms', 'ok', ...}]}
+    """
+    from app.api.dependencies import (
+        get_data_fetcher, get_hybrid_generator, get_quote_board, get_stock_screener
+    )
+    from app.constants import DAILY_PICKS_CACHE_TTL, daily_picks_cache_key
+    from app.services.hybrid_strategy import build_daily_picks
+
+    data_fetcher = data_fetcher if data_fetcher is not None else get_data_fetcher()
+    screener = screener if screener is not None else get_stock_screener()
+    hybrid_generator = hybrid_generator if hybrid_generator is not None else get_hybrid_generator()
+    board = board if board is not None else get_quote_board()  # an empty board is falsy (__len__)
+    universe = warmup_universe(data_fetcher)
+    stats: Dict[str, Any] = {'universe': len(universe), 'stages': []}
+
+    def stage(name: str, run: Callable[[], Optional[Dict[str, Any]]]):
+        started = perf_counter()
+        try:
+            extra, ok = run() or {}, True
+        except Exception as e:
+            logger.error(f"Pre-market warm-up stage {name} failed: {e}")
+            extra, ok = {'error': str(e)}, False
+        seconds = perf_counter() - started
+        WARMUP_STAGE_SECONDS.observe(seconds, stage=name)
+        stats['stages'].append({'stage': name, 'ms': round(seconds * 1000, 2), 'ok': ok, **extra})
+
+    def features():
+        frames = 0
+        for interval, period in WARMUP_FEATURE_FEEDS:
+            for ticker, df in data_fetcher.fetch_realtime_data_batch(universe, interval, period).items():
+                feature_store.frame(ticker, interval, period, df, copy=False)
+                frames += 1
+        return {'frames': frames}
+
+    def market_filter():
+        uptrend = screener.is_market_uptrend()
+        filter_ok, _ = hybrid_generator.check_market_filter()
+        return {'uptrend': uptrend, 'hybrid_filter': filter_ok}
+
+    def screen():
+        return {f"{i}:{p}": len(screener.screen(i, p)[0]) for i, p in WARMUP_SCREEN_FEEDS}
+
+    def daily_picks():
+        picks = build_daily_picks(hybrid_generator, max_picks=WARMUP_DAILY_PICKS)
+        cache_service.set(daily_picks_cache_key(WARMUP_DAILY_PICKS), picks, ttl=DAILY_PICKS_CACHE_TTL)
+        return {'picks': picks['found']}
+
+    stage('fetch', lambda: {'feeds': data_fetcher.prefetch(universe, WARMUP_FEEDS)})
+    stage('features', features)
+    stage('market_filter', market_filter)
+    stage('screener', screen)
+    stage('quote_board', lambda: {'quotes': board.refresh()})
+    stage('daily_picks', daily_picks)
+
+    summary = ", ".join(f"{s['stage']}={'ok' if s['ok'] else 'FAILED'} ({s['ms']}ms)" for s in stats['stages'])
+    logger.info(f"Pre-market warm-up: {len(universe)} tickers. Stages: {summary}")
+    return stats
@@ -10,6 +10,7 @@ from fastapi import WebSocket, WebSocketDisconnect
 from enum import Enum
 from dataclasses import dataclass, asdict, field
 from app.utils.logger import logger
+from app.services.metrics import WEBSOCKET_SEND_SECONDS, WEBSOCKET_BROADCAST_SECONDS, WEBSOCKET_MESSAGES
 
 
 class ChannelType(str, Enum):
@@ -242,11 +243,14 @@ class AdvancedWebSocketManager:
     async def send_to_client(self, websocket: WebSocket, message: WebSocketMessage) -> bool:
         """Send message to a specific client"""
         try:
-            await websocket.send_text(message.to_json())
+            with WEBSOCKET_SEND_SECONDS.time():
+                await websocket.send_text(message.to_json())
             self.stats["total_messages_sent"] += 1
+            WEBSOCKET_MESSAGES.inc(result="sent")
             return True
         except Exception as e:
             logger.error(f"Error sending to client: {e}")
+            WEBSOCKET_MESSAGES.inc(result="failed")
             self.disconnect(websocket)
             return False
     
@@ -279,17 +283,22 @@ class AdvancedWebSocketManager:
         
         # Send to all matching connections
         dead_connections = []
-        for websocket in connections:
-            try:
-                await websocket.send_text(message.to_json())
-                self.stats["total_messages_sent"] += 1
-            except Exception:
-                dead_connections.append(websocket)
+        # Timed per broadcast, not per frame, to keep large fan-outs cheap
+        with WEBSOCKET_BROADCAST_SECONDS.time(channel=channel):
+            for websocket in connections:
+                try:
+                    await websocket.send_text(message.to_json())
+                    self.stats["total_messages_sent"] += 1
+                except Exception:
+                    dead_connections.append(websocket)
         
         # Cleanup dead connections
         for ws in dead_connections:
             self.disconnect(ws)
         
+        WEBSOCKET_MESSAGES.inc(len(connections) - len(dead_connections), result="sent")
+        if dead_connections:
+            WEBSOCKET_MESSAGES.inc(len(dead_connections), result="failed")
         self.stats["total_broadcasts"] += 1
     
     async def broadcast_price_update(self, ticker: str, price_data: dict):
@@ -26,6 +26,8 @@ from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from app.services.features import capitalize_ohlcv, feature_store
+
 # Win Rate Booster
 try:
     from win_rate_booster import apply_win_rate_boosters
@@ -123,32 +125,22 @@ def generate_hybrid_signal(df: pd.DataFrame, ticker: str, idx: int) -> Optional[
     if idx < 200:
         return None
     
-    close = df['Close'].iloc[:idx+1]
-    high = df['High'].iloc[:idx+1]
-    low = df['Low'].iloc[:idx+1]
-    volume = df['Volume'].iloc[:idx+1]
-    
-    current_price = close.iloc[-1]
+    # İndikatörler: ortak feature frame (tüm sütunlar nedensel, satır idx = df[:idx+1] üzerinde hesap)
+    features = capitalize_ohlcv(feature_store.frame(ticker, "1d", "backtest", df, copy=False))
+    row = features.iloc[idx]
     
-    # İndikatörler
-    rsi = calculate_rsi(close)
-    ema_9 = calculate_ema(close, 9)
-    ema_21 = calculate_ema(close, 21)
-    ema_50 = calculate_ema(close, 50)
-    ema_200 = calculate_ema(close, 200)
-    atr = calculate_atr(df.iloc[:idx+1])
-    macd_line, signal_line, macd_hist = calculate_macd(close)
+    current_price = row['Close']
     
     # Mevcut değerler
-    rsi_val = rsi.iloc[-1]
-    ema_9_val = ema_9.iloc[-1]
-    ema_21_val = ema_21.iloc[-1]
-    ema_50_val = ema_50.iloc[-1]
-    ema_200_val = ema_200.iloc[-1]
-    atr_val = atr.iloc[-1]
-    macd_val = macd_line.iloc[-1]
-    signal_val = signal_line.iloc[-1]
-    macd_hist_val = macd_hist.iloc[-1]
+    rsi_val = row['rsi']
+    ema_9_val = row['ema_9']
+    ema_21_val = row['ema_21']
+    ema_50_val = row['ema_50']
+    ema_200_val = row['ema_200']
+    atr_val = row['atr']
+    macd_val = row['macd']
+    signal_val = row['macd_signal']
+    macd_hist_val = row['macd_histogram']
     
     # === V2 BASE SCORING ===
     score = 0
@@ -182,8 +174,8 @@ def generate_hybrid_signal(df: pd.DataFrame, ticker: str, idx: int) -> Optional[
         reasons.append("MACD yukarı kesişim")
     
     # 4. Volume (15 puan)
-    vol_avg_20 = volume.iloc[-20:].mean()
-    vol_current = volume.iloc[-1]
+    vol_avg_20 = row['volume_sma_20']
+    vol_current = row['Volume']
     if vol_current > vol_avg_20 * 1.2:
         score += 15
         reasons.append("Volume yüksek")
@@ -192,8 +184,8 @@ def generate_hybrid_signal(df: pd.DataFrame, ticker: str, idx: int) -> Optional[
         reasons.append("Volume normal")
     
     # 5. Pozisyon (15 puan)
-    swing_low = low.iloc[-10:].min()
-    swing_high = high.iloc[-10:].max()
+    swing_low = features['Low'].iloc[idx-9:idx+1].min()
+    swing_high = features['High'].iloc[idx-9:idx+1].max()
     position = (current_price - swing_low) / (swing_high - swing_low + 1e-10)
     if 0.3 <= position <= 0.6:
         score += 15
@@ -206,7 +198,7 @@ def generate_hybrid_signal(df: pd.DataFrame, ticker: str, idx: int) -> Optional[
     booster_active = False
     if BOOSTER_AVAILABLE:
         try:
-            boosted_score, booster_reasons = apply_win_rate_boosters(df.iloc[:idx+1], idx, score)
+            boosted_score, booster_reasons = apply_win_rate_boosters(features.iloc[:idx+1], idx, score)
             if boosted_score > score:
                 score = boosted_score
                 reasons.extend(booster_reasons)
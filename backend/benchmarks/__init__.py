@@ -0,0 +1,26 @@
+"""
+Performance benchmarks for scan, indicator and serving hot paths
+
+All cases run against fixed recorded bars served by ReplayProvider, never Yahoo.
+
+Standalone runner (no extra dependencies):
+    python -m benchmarks.runner                        # run all cases
+    python -m benchmarks.runner -k screener --rounds 10
+    python -m benchmarks.runner --save benchmarks/baseline.json
+    python -m benchmarks.runner --compare benchmarks/baseline.json --threshold 0.15
+    python -m benchmarks.runner --import-profile       # slowest imports of app.main
+
+pytest-benchmark (pip install pytest-benchmark):
+    python -m pytest benchmarks/ --benchmark-autosave
+    python -m pytest benchmarks/ --benchmark-compare --benchmark-compare-fail=median:15%
+"""
+import os
+
+# Same isolation as tests/conftest.py; set before any app module reads settings
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-not-for-production")
+os.environ.setdefault("REDIS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("MARKET_DATA_PROVIDER", "replay")
+os.environ.pop("VERCEL", None)
@@ -0,0 +1,285 @@
+"""
+Benchmark cases
+
+Each case has a setup that runs once (data loading, cache warm-up, client
+connections) and returns the zero-argument callable that gets timed. Data
+comes from the recording through DataFetcher, so timed calls measure the
+computation and serving path with a warm data cache, not network latency.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+import pandas as pd
+
+from app.services.cache_service import cache_service
+from app.services.data_fetcher import DataFetcher
+from app.services.data_providers import ReplayProvider, set_market_data_provider
+
+BENCH_TICKER = "THYAO.IS"
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Number of connected clients for WebSocket fan-out cases
+FANOUT_CLIENTS = (10, 100, 1000)
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    group: str
+    setup: Callable[["BenchmarkContext"], Callable[[], Any]]
+    rounds: int = 5
+    description: str = ""
+
+
+CASES: List[BenchmarkCase] = []
+
+
+def case(name: str, group: str, rounds: int = 5):
+    """Register a benchmark setup function"""
+    def decorator(setup):
+        CASES.append(BenchmarkCase(name, group, setup, rounds, (setup.__doc__ or "").strip()))
+        return setup
+    return decorator
+
+
+def select_cases(pattern: Optional[str] = None) -> List[BenchmarkCase]:
+    """Cases whose name or group contains `pattern` (all if None)"""
+    if not pattern:
+        return list(CASES)
+    return [c for c in CASES if pattern in c.name or pattern in c.group]
+
+
+class BenchmarkContext:
+    """Shared state for one benchmark session, bound to one recording"""
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self.provider = ReplayProvider(data_dir)
+        set_market_data_provider(self.provider)
+
+        self.fetcher = DataFetcher()
+        self.fetcher.clear_cache()
+        cache_service.clear()
+        self._client = None
+
+    def bars(self, ticker: str = BENCH_TICKER, interval: str = "1h", period: str = "1mo") -> pd.DataFrame:
+        df = self.fetcher.fetch_realtime_data(ticker, interval=interval, period=period)
+        if df.empty:
+            raise RuntimeError(f"No recorded bars for {ticker} {interval}/{period} in {self.data_dir}")
+        return df
+
+    @property
+    def client(self):
+        """FastAPI TestClient (startup events are not run, so no schedulers start)"""
+        if self._client is None:
+            from fastapi.testclient import TestClient
+            from app.main import app
+            self._client = TestClient(app)
+        return self._client
+
+    def close(self):
+        set_market_data_provider(None)
+        self.fetcher.clear_cache()
+
+
+# ---------------------------------------------------------------------------
+# Indicators and scoring
+# ---------------------------------------------------------------------------
+
+@case("indicators.calculate_all_indicators", "indicators", rounds=20)
+def bench_calculate_all_indicators(ctx: BenchmarkContext):
+    """Full indicator set on one month of 1h bars"""
+    from app.services.technical_analysis import TechnicalAnalysis
+
+    ta = TechnicalAnalysis()
+    df = ctx.bars()
+    return lambda: ta.calculate_all_indicators(df)
+
+
+@case("indicators.calculate_all_indicators_daily", "indicators", rounds=20)
+def bench_calculate_all_indicators_daily(ctx: BenchmarkContext):
+    """Full indicator set on one year of daily bars"""
+    from app.services.technical_analysis import TechnicalAnalysis
+
+    ta = TechnicalAnalysis()
+    df = ctx.bars(interval="1d", period="1y")
+    return lambda: ta.calculate_all_indicators(df)
+
+
+@case("screener.calculate_hybrid_score", "screener", rounds=20)
+def bench_calculate_hybrid_score(ctx: BenchmarkContext):
+    """Hybrid score for one ticker with precomputed indicators"""
+    from app.services.stock_screener import StockScreener
+
+    screener = StockScreener()
+    df = ctx.bars()
+    indicators = screener.tech_analysis.get_latest_indicators(
+        screener.tech_analysis.calculate_all_indicators(df)
+    )
+    screener.is_market_uptrend()  # warm the 5 minute market trend cache
+    return lambda: screener.calculate_hybrid_score(BENCH_TICKER, df, indicators)
+
+
+@case("screener.screen_all_stocks", "screener")
+def bench_screen_all_stocks(ctx: BenchmarkContext):
+    """BIST30 refresh on 1h/1mo bars with no new bars (served from the resident table)"""
+    from app.services.stock_screener import StockScreener
+
+    screener = StockScreener()
+    screener.screen_all_stocks("1h", "1mo")  # warm data cache
+    return lambda: screener.screen_all_stocks("1h", "1mo")
+
+
+@case("screener.screen_all_stocks_cold", "screener")
+def bench_screen_all_stocks_cold(ctx: BenchmarkContext):
+    """BIST30 scan on 1h/1mo bars, every ticker rescored"""
+    from app.services.features import feature_store
+    from app.services.stock_screener import StockScreener
+
+    screener = StockScreener()
+    screener.screen_all_stocks("1h", "1mo")  # warm data cache
+
+    def run():
+        screener._tables.clear()
+        feature_store.invalidate()
+        return screener.screen_all_stocks("1h", "1mo")
+    return run
+
+
+@case("signals.hybrid_scan_all_stocks", "signals")
+def bench_hybrid_scan_all_stocks(ctx: BenchmarkContext):
+    """HybridSignalGenerator V2+V3 scan over its default universe"""
+    from app.services.hybrid_strategy import HybridSignalGenerator, HybridRiskManagement
+
+    generator = HybridSignalGenerator(HybridRiskManagement(run_once_per_day=False))
+    generator.scan_all_stocks(force_run=True)  # warm data cache
+    return lambda: generator.scan_all_stocks(force_run=True)
+
+
+# ---------------------------------------------------------------------------
+# Backtesting
+# ---------------------------------------------------------------------------
+
+@case("backtest.run_backtest", "backtest", rounds=10)
+def bench_run_backtest(ctx: BenchmarkContext):
+    """Backtester over one year of daily bars with EMA crossover entries"""
+    from app.services.backtester import Backtester
+
+    df = ctx.bars(interval="1d", period="1y")
+    fast = df["close"].ewm(span=9, adjust=False).mean()
+    slow = df["close"].ewm(span=21, adjust=False).mean()
+    crossed_up = (fast > slow) & (fast.shift(1) <= slow.shift(1))
+
+    signals = pd.DataFrame({
+        "signal": crossed_up.map({True: "BUY", False: "HOLD"}),
+        "strength": 70,
+    }, index=df.index)
+
+    return lambda: Backtester(initial_capital=100000).run_backtest(df, signals)
+
+
+@case("backtest.strategy_tester", "backtest", rounds=3)
+def bench_strategy_tester(ctx: BenchmarkContext):
+    """StrategyTester daily strategy over the last two recorded weeks"""
+    from app.services.strategy_tester import StrategyTester
+
+    tester = StrategyTester()
+    run = lambda: tester.backtest_daily_strategy("2026-02-23", "2026-03-06", min_score=50)
+    run()  # warm data and market trend caches
+    return run
+
+
+# ---------------------------------------------------------------------------
+# WebSocket fan-out
+# ---------------------------------------------------------------------------
+
+class BenchmarkSocket:
+    """Minimal client side of a WebSocket: accepts and counts frames"""
+
+    def __init__(self):
+        self.frames = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        self.frames += 1
+
+
+def _fanout_case(clients: int):
+    def setup(ctx: BenchmarkContext):
+        from app.services.websocket_manager import AdvancedWebSocketManager
+
+        loop = asyncio.new_event_loop()
+        manager = AdvancedWebSocketManager()
+
+        # Half follow the benchmark ticker, half another one; both get filtered per message
+        async def connect_all():
+            for i in range(clients):
+                ticker = BENCH_TICKER if i % 2 == 0 else "GARAN.IS"
+                await manager.connect(BenchmarkSocket(), channels=["price"], tickers=[ticker])
+
+        loop.run_until_complete(connect_all())
+        price_data = {"price": 312.5, "change": 1.25, "change_percent": 0.4, "volume": 1_250_000}
+        return lambda: loop.run_until_complete(manager.broadcast_price_update(BENCH_TICKER, price_data))
+
+    setup.__doc__ = f"broadcast_price_update to {clients} connected clients"
+    return setup
+
+
+for _clients in FANOUT_CLIENTS:
+    case(f"websocket.fanout_{_clients}", "websocket", rounds=20)(_fanout_case(_clients))
+
+
+# ---------------------------------------------------------------------------
+# REST endpoints
+# ---------------------------------------------------------------------------
+
+def _endpoint_case(path: str):
+    def setup(ctx: BenchmarkContext):
+        client = ctx.client
+        response = client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}: {response.text[:200]}")
+        return lambda: client.get(path)
+
+    setup.__doc__ = f"GET {path}"
+    return setup
+
+
+ENDPOINTS = {
+    "api.stock_data": f"/api/stocks/{BENCH_TICKER}/data",
+    "api.stock_indicators": f"/api/stocks/{BENCH_TICKER}/indicators",
+    "api.ichimoku": f"/api/indicators/{BENCH_TICKER}/ichimoku",
+    "api.bollinger": f"/api/indicators/{BENCH_TICKER}/bollinger",
+    "api.signal": f"/api/signals/{BENCH_TICKER}",
+    "api.screener_scan": "/api/screener/scan",
+    "api.top_movers": "/api/screener/top-movers",
+    "api.market_all": "/api/market/all",
+}
+
+for _name, _path in ENDPOINTS.items():
+    case(_name, "api", rounds=10)(_endpoint_case(_path))
+
+
+# ---------------------------------------------------------------------------
+# Startup
+# ---------------------------------------------------------------------------
+
+def import_app(*python_flags: str) -> subprocess.CompletedProcess:
+    """Import app.main in a fresh interpreter (what every cold start pays)"""
+    return subprocess.run(
+        [sys.executable, *python_flags, "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=os.environ.copy(), capture_output=True, text=True, check=True
+    )
+
+
+@case("startup.import_app", "startup", rounds=5)
+def bench_import_app(ctx: BenchmarkContext):
+    """import app.main in a fresh interpreter"""
+    return import_app
@@ -0,0 +1,20 @@
+"""
+Benchmark fixtures
+"""
+import pytest
+
+import benchmarks  # noqa: F401  (environment defaults)
+
+
+@pytest.fixture(scope="session")
+def bench_context(tmp_path_factory):
+    """BenchmarkContext over the generated fixed recording"""
+    from benchmarks.cases import BenchmarkContext
+    from benchmarks.recording import generate_recording
+
+    data_dir = str(tmp_path_factory.mktemp("replay"))
+    generate_recording(data_dir)
+
+    ctx = BenchmarkContext(data_dir)
+    yield ctx
+    ctx.close()
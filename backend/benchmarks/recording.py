@@ -0,0 +1,120 @@
+"""
+Fixed recorded market data for benchmarks
+
+Generates a deterministic recording (seeded random walks per ticker) in the
+ReplayProvider layout, so every run scores exactly the same bars. A real
+recording made with `python -m app.services.data_providers --out DIR` can be
+used instead via `--data-dir`.
+"""
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.constants import BIST30_TICKERS
+from app.services.data_providers import MarketDataProvider, record_bars
+
+# BIST30 + HybridSignalGenerator's default universe + index used by market filters
+RECORDED_TICKERS = sorted(set(BIST30_TICKERS) | {
+    "TRALT.IS", "HALKB.IS", "AYGAZ.IS", "TTKOM.IS", "MGROS.IS", "SOKM.IS",
+    "KOZAL.IS", "KOZAA.IS", "VESTL.IS", "XU100.IS",
+})
+
+# Last recorded session (a Friday); the replay clock is frozen here
+RECORDING_END = "2026-03-06"
+
+TIMEZONE = "Europe/Istanbul"
+
+
+class RecordedFrames(MarketDataProvider):
+    """In-memory source used to write generated bars through record_bars"""
+
+    allow_mock_fallback = False
+
+    def __init__(self, frames: Dict[tuple, pd.DataFrame]):
+        self.frames = frames
+
+    def fetch_bars(self, ticker: str, interval: str, period: str) -> pd.DataFrame:
+        return self.frames.get((ticker, interval), pd.DataFrame())
+
+    def fetch_history(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return pd.DataFrame()
+
+    def fetch_info(self, ticker: str) -> Dict[str, Any]:
+        return {}
+
+
+def _random_walk(ticker: str, interval: str, index: pd.DatetimeIndex, volatility: float) -> pd.DataFrame:
+    """OHLCV bars for `index`, seeded per (ticker, interval) so output never changes"""
+    rng = np.random.default_rng(zlib.crc32(f"{ticker}:{interval}".encode()))
+    base = 10000.0 if ticker.startswith("XU") else 20 + (zlib.crc32(ticker.encode()) % 400)
+
+    returns = rng.normal(0.0004, volatility, len(index))
+    close = base * np.exp(np.cumsum(returns))
+    open_ = np.concatenate([[base], close[:-1]]) * (1 + rng.normal(0, volatility / 4, len(index)))
+    spread = np.abs(rng.normal(0, volatility, len(index))) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(50_000, 2_000_000, len(index))
+
+    return pd.DataFrame({
+        "open": open_.round(2),
+        "high": high.round(2),
+        "low": low.round(2),
+        "close": close.round(2),
+        "volume": volume,
+    }, index=index)
+
+
+def _sessions(days: int) -> pd.DatetimeIndex:
+    """Session dates (business days) ending at RECORDING_END"""
+    return pd.bdate_range(end=RECORDING_END, periods=days, tz=TIMEZONE)
+
+
+def _intraday_index(days: int, freq: str, bars_per_session: int) -> pd.DatetimeIndex:
+    """Bars from 10:00 for each session"""
+    stamps = [
+        pd.date_range(day + pd.Timedelta(hours=10), periods=bars_per_session, freq=freq)
+        for day in _sessions(days)
+    ]
+    return stamps[0].append(stamps[1:])
+
+
+def generate_recording(data_dir: str, tickers: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Write the benchmark recording to `data_dir`
+
+    Feeds: 1d (400 sessions), 1h (70 sessions) and 1m (5 sessions), which covers
+    every (interval, period) the benchmarked code paths request.
+
+    Returns:
+        Rows written per file
+    """
+    tickers = tickers or RECORDED_TICKERS
+    feeds = {
+        "1d": (_sessions(400), 0.02),
+        "1h": (_intraday_index(70, "60min", 8), 0.007),
+        "1m": (_intraday_index(5, "1min", 480), 0.001),
+    }
+
+    frames = {
+        (ticker, interval): _random_walk(ticker, interval, index, volatility)
+        for ticker in tickers
+        for interval, (index, volatility) in feeds.items()
+    }
+
+    return record_bars(
+        tickers,
+        data_dir,
+        feeds=[(interval, "max") for interval in feeds],
+        source=RecordedFrames(frames),
+    )
+
+
+def ensure_recording(data_dir: str) -> str:
+    """Generate the recording unless `data_dir` already holds one"""
+    if not any(Path(data_dir).glob("*/1d.csv")):
+        generate_recording(data_dir)
+    return data_dir
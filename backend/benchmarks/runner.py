@@ -0,0 +1,238 @@
+"""
+Standalone benchmark runner
+
+Runs the registered cases against the recording, prints a summary table and
+optionally saves a JSON baseline or compares against one. Exits with status 1
+when a case fails, when a baseline case is missing from the run, or when any
+case's median regressed by more than --threshold.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import benchmarks  # noqa: F401  (environment defaults)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def time_case(run, rounds: int, warmup: int = 1) -> Dict[str, float]:
+    """Time `run` for `rounds` rounds and summarize in seconds"""
+    for _ in range(warmup):
+        run()
+
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+
+    return {
+        "rounds": rounds,
+        "min": min(samples),
+        "max": max(samples),
+        "mean": statistics.fmean(samples),
+        "median": statistics.median(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def run_benchmarks(data_dir: str, pattern: Optional[str] = None, rounds: Optional[int] = None) -> Dict[str, Any]:
+    """Run selected cases and return a result document (the baseline file format)"""
+    from benchmarks.cases import BenchmarkContext, select_cases
+
+    ctx = BenchmarkContext(data_dir)
+    results = {}
+    failures = {}
+    try:
+        for bench in select_cases(pattern):
+            try:
+                run = bench.setup(ctx)
+                stats = time_case(run, rounds or bench.rounds)
+            except Exception as e:
+                failures[bench.name] = f"{type(e).__name__}: {e}"
+                print(f"  {bench.name:<42} FAILED: {failures[bench.name]}", file=sys.stderr)
+                continue
+
+            results[bench.name] = {"group": bench.group, "description": bench.description, **stats}
+            print(f"  {bench.name:<42} median {_fmt(stats['median']):>10}  min {_fmt(stats['min']):>10}  (n={stats['rounds']})")
+    finally:
+        ctx.close()
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "data_dir": data_dir,
+            "filter": pattern,
+        },
+        "benchmarks": results,
+        "failures": failures,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare medians against a baseline
+
+    Returns one row per case present in both runs with status
+    'regression' (slower by more than threshold), 'improved' or 'ok', plus
+    'failed' rows for cases that raised and 'missing' rows for baseline cases
+    the run selected (same -k filter) but did not produce.
+    """
+    rows = []
+    pattern = current.get("meta", {}).get("filter")
+    failures = current.get("failures", {})
+    for name, error in failures.items():
+        base = baseline.get("benchmarks", {}).get(name)
+        rows.append({
+            "name": name,
+            "baseline": base["median"] if base else None,
+            "current": None,
+            "ratio": None,
+            "status": "failed",
+            "error": error,
+        })
+    for name, base in baseline.get("benchmarks", {}).items():
+        if name in current["benchmarks"] or name in failures:
+            continue
+        if pattern and pattern not in name and pattern not in base.get("group", ""):
+            continue
+        rows.append({"name": name, "baseline": base["median"], "current": None, "ratio": None, "status": "missing"})
+
+    for name, stats in current["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base or base["median"] <= 0:
+            continue
+
+        ratio = stats["median"] / base["median"]
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improved"
+        else:
+            status = "ok"
+
+        rows.append({
+            "name": name,
+            "baseline": base["median"],
+            "current": stats["median"],
+            "ratio": ratio,
+            "status": status,
+        })
+    return rows
+
+
+def import_profile(top: int = 15) -> List[Dict[str, Any]]:
+    """
+    Slowest modules by cumulative import time for `import app.main`
+
+    Parses `python -X importtime` output; times are in seconds.
+    """
+    from benchmarks.cases import import_app
+
+    rows = []
+    for line in import_app("-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # column header
+        rows.append({"module": module.strip(), "self": int(self_us) / 1e6, "cumulative": int(cumulative_us) / 1e6})
+
+    rows.sort(key=lambda r: r["cumulative"], reverse=True)
+    return rows[:top]
+
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run Investia backend benchmarks")
+    parser.add_argument("-k", "--filter", help="Only run cases whose name or group contains this")
+    parser.add_argument("--rounds", type=int, help="Override rounds per case")
+    parser.add_argument("--data-dir", help="Recording to replay (default: generated fixed recording)")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed median slowdown (default 0.15 = 15%%)")
+    parser.add_argument("--verbose", action="store_true", help="Keep application logging enabled")
+    parser.add_argument("--import-profile", action="store_true", help="Only print the slowest modules imported by app.main")
+    args = parser.parse_args(argv)
+
+    if args.import_profile:
+        print("Cumulative import time for app.main")
+        for row in import_profile():
+            print(f"  {row['module']:<42} {_fmt(row['cumulative']):>10}  self {_fmt(row['self']):>10}")
+        return 0
+
+    if not args.verbose:
+        from app.utils.logger import logger
+        logger.remove()
+
+    from benchmarks.recording import ensure_recording
+
+    with tempfile.TemporaryDirectory(prefix="investia-bench-") as tmp:
+        data_dir = args.data_dir or ensure_recording(tmp)
+        print(f"Running benchmarks on {data_dir}")
+        current = run_benchmarks(data_dir, args.filter, args.rounds)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved {len(current['benchmarks'])} results to {args.save}")
+
+    if not args.compare:
+        if current["failures"]:
+            print(f"\n{len(current['failures'])} case(s) failed")
+            return 1
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+
+    rows = compare(current, baseline, args.threshold)
+    print(f"\nComparison with {args.compare} (threshold {args.threshold:.0%})")
+    for row in rows:
+        if row["ratio"] is None:
+            baseline_median = _fmt(row["baseline"]) if row["baseline"] is not None else "-"
+            print(f"  {row['name']:<42} {baseline_median:>10} -> {'-':>10}  {row['status'].upper()}")
+            continue
+        print(
+            f"  {row['name']:<42} {_fmt(row['baseline']):>10} -> {_fmt(row['current']):>10}"
+            f"  x{row['ratio']:.2f}  {row['status'].upper()}"
+        )
+
+    status = 0
+    regressions = [r for r in rows if r["status"] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        status = 1
+    broken = [r for r in rows if r["status"] in ("failed", "missing")]
+    if broken:
+        print(f"{len(broken)} case(s) failed or missing from the run")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
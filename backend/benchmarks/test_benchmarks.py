@@ -0,0 +1,17 @@
+"""
+pytest-benchmark entry point for the registered benchmark cases
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.cases import CASES  # noqa: E402
+
+
+@pytest.mark.parametrize("bench", CASES, ids=[c.name for c in CASES])
+def test_benchmark(benchmark, bench_context, bench):
+    """Time one case with the rounds it declares"""
+    run = bench.setup(bench_context)
+    benchmark.group = bench.group
+    benchmark.extra_info["description"] = bench.description
+    benchmark.pedantic(run, rounds=bench.rounds, warmup_rounds=1)
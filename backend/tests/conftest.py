@@ -3,8 +3,79 @@ Test configuration and fixtures
 """
 import pytest
 import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
 
 # Set test environment
 os.environ["LOG_LEVEL"] = "WARNING"
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 os.environ["SECRET_KEY"] = "test-secret-key-for-testing-only-32chars"
+
+
+def make_bars(
+    rows: int = 120,
+    *,
+    closes=None,
+    seed: int = 7,
+    drift: float = 0.0,
+    noise: float = 1.0,
+    open_noise: float = 0.3,
+    wicks: bool = True,
+    spread: float = 1.0,
+    volume=(1_000, 5_000),
+    freq: str = "B",
+    end: str = "2026-03-02",
+    start: Optional[str] = None,
+    tz: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Deterministic OHLCV bars shared by the test modules
+
+    Closes are a seeded random walk (100 + cumsum(drift + N(0, noise))) unless
+    `closes` is given. Random draws happen in a fixed order - close, open
+    (open_noise > 0), wicks, volume - so a seed always yields the same frame.
+
+    Args:
+        closes: Explicit close prices (rows = len(closes))
+        open_noise: Std of open around close; 0 -> open == close
+        wicks: Add U(0, 1) to the high/low distance from close
+        spread: Fixed high/low distance from close
+        volume: (low, high) for random integers, or a constant
+        freq / end / start / tz: Index; anchored at `start` if given, else at `end`
+    """
+    rng = np.random.default_rng(seed)
+    if closes is None:
+        close = 100 + np.cumsum(drift + rng.normal(0, noise, rows))
+    else:
+        close = np.asarray(closes, dtype=float)
+        rows = len(close)
+    open_ = close + rng.normal(0, open_noise, rows) if open_noise else close
+    high = close + spread + (rng.random(rows) if wicks else 0)
+    low = close - spread - (rng.random(rows) if wicks else 0)
+    if isinstance(volume, tuple):
+        volume = rng.integers(volume[0], volume[1], rows).astype(float)
+    else:
+        volume = np.full(rows, volume)
+
+    if start is not None:
+        index = pd.date_range(start, periods=rows, freq=freq, tz=tz)
+    else:
+        index = pd.date_range(end=end, periods=rows, freq=freq, tz=tz)
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume}, index=index)
+
+
+def make_minute_bars(days: int = 2, start: str = "2026-03-02 10:00", open_offset: float = -0.005) -> pd.DataFrame:
+    """Deterministic 1m bars for `days` sessions (10:00-18:00 Istanbul), rising through each session"""
+    frames = []
+    for day in range(days):
+        session_start = pd.Timestamp(start, tz="Europe/Istanbul") + pd.Timedelta(days=day)
+        frame = make_bars(
+            closes=100 + np.arange(480) * 0.01 + day,
+            open_noise=0, wicks=False, spread=0.02, volume=10,
+            freq="1min", start=session_start,
+        )
+        frame["open"] = frame["close"] + open_offset
+        frames.append(frame)
+    return pd.concat(frames)
@@ -0,0 +1,163 @@
+"""
+AI Response Cache Tests
+Bar-keyed analysis cache and request collapsing
+"""
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.ai_assistant import AITradingAssistant
+from app.services.data_fetcher import DataFetcher
+from app.services.data_providers import MarketDataProvider
+from app.services.response_cache import BarKeyedCache, SingleFlight, bar_marker
+from tests.conftest import make_bars
+
+
+def make_daily_bars(days: int = 30) -> pd.DataFrame:
+    return make_bars(
+        closes=100 + np.sin(np.arange(days) / 3) * 5, open_noise=0, wicks=False, volume=1000.0,
+        start="2026-02-02", tz="Europe/Istanbul",
+    )
+
+
+class MutableProvider(MarketDataProvider):
+    """Serves whatever frame is currently set"""
+
+    allow_mock_fallback = False
+
+    def __init__(self, df):
+        self.df = df
+
+    def fetch_bars(self, ticker, interval, period):
+        return self.df.copy()
+
+    def fetch_history(self, ticker, start_date, end_date):
+        return pd.DataFrame()
+
+    def fetch_info(self, ticker):
+        return {}
+
+
+@pytest.fixture
+def assistant():
+    provider = MutableProvider(make_daily_bars())
+    assistant = AITradingAssistant(api_key="")
+    assistant.fetcher = DataFetcher(provider=provider)
+    assistant.builds = 0
+    original = assistant._build_stock_analysis
+
+    def counting_build(ticker, df):
+        assistant.builds += 1
+        return original(ticker, df)
+
+    assistant._build_stock_analysis = counting_build
+    yield assistant, provider
+    DataFetcher._shared_cache.clear()
+    DataFetcher._resample_cache.clear()
+
+
+class TestBarKeyedCache:
+    """Keying and invalidation"""
+
+    def test_hit_requires_same_bar_and_version(self):
+        cache = BarKeyedCache("unit")
+        cache.set("analysis", "THYAO.IS", "bar-1", "1", "text")
+
+        assert cache.get("analysis", "THYAO.IS", "bar-1", "1") == "text"
+        assert cache.get("analysis", "THYAO.IS", "bar-2", "1") is None
+        assert cache.get("analysis", "THYAO.IS", "bar-1", "2") is None
+
+    def test_new_bar_replaces_entry(self):
+        cache = BarKeyedCache("unit")
+        cache.set("analysis", "THYAO.IS", "bar-1", "1", "old")
+        cache.set("analysis", "THYAO.IS", "bar-2", "1", "new")
+
+        assert len(cache) == 1
+        assert cache.get("analysis", "THYAO.IS", "bar-2", "1") == "new"
+
+    def test_lru_cap(self):
+        cache = BarKeyedCache("unit", max_entries=2)
+        for ticker in ("A", "B", "C"):
+            cache.set("analysis", ticker, 1, "1", ticker)
+
+        assert len(cache) == 2
+        assert cache.get("analysis", "A", 1, "1") is None
+
+    def test_forming_bar_changes_marker(self):
+        """Same timestamp, moved close -> different bar"""
+        df = make_daily_bars()
+        moved = df.copy()
+        moved.iloc[-1, moved.columns.get_loc("close")] += 1
+
+        assert bar_marker(df) != bar_marker(moved)
+        assert bar_marker(pd.DataFrame()) is None
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", work) for _ in range(10)))
+
+        assert asyncio.run(run()) == ["done"] * 10
+        assert calls == 1
+
+    def test_errors_propagate_to_all_waiters(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, ValueError) for r in results)
+
+
+class TestAssistantAnalysisCache:
+    """get_stock_analysis computes once per bar"""
+
+    def test_one_computation_per_bar(self, assistant):
+        assistant, provider = assistant
+
+        async def run():
+            return await asyncio.gather(*(assistant.get_stock_analysis("TSTAI") for _ in range(5)))
+
+        results = asyncio.run(run())
+        assert len(set(results)) == 1
+        assert "TSTAI Teknik Analiz" in results[0]
+
+        asyncio.run(assistant.get_stock_analysis("TSTAI"))
+        assert assistant.builds == 1
+
+    def test_new_bar_invalidates(self, assistant):
+        assistant, provider = assistant
+        asyncio.run(assistant.get_stock_analysis("TSTAI"))
+
+        provider.df = make_daily_bars(31)
+        assistant.fetcher.clear_cache()
+        asyncio.run(assistant.get_stock_analysis("TSTAI"))
+
+        assert assistant.builds == 2
+
+    def test_missing_data_is_not_cached(self, assistant):
+        assistant, provider = assistant
+        provider.df = pd.DataFrame()
+
+        result = asyncio.run(assistant.get_stock_analysis("TSTAI"))
+
+        assert "veri bulunamadı" in result
+        assert len(assistant.response_cache) == 0
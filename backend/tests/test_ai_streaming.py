@@ -0,0 +1,235 @@
+"""
+AI Assistant Streaming Tests
+Async Claude client against a local stub of the Messages API
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytest.importorskip("anthropic")
+
+from app.main import app
+from app.services import ai_assistant
+from app.services.ai_assistant import AITradingAssistant
+
+
+class StubMessagesAPI(ThreadingHTTPServer):
+    """Minimal /v1/messages server: JSON or SSE, with optional delay per token"""
+
+    daemon_threads = True
+
+    def __init__(self, tokens, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.tokens = tokens
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append(body)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if body.get("stream"):
+                self._stream(server)
+            else:
+                time.sleep(server.delay * len(server.tokens))
+                self._json(server)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _message(self, content):
+        return {
+            "id": "msg_stub", "type": "message", "role": "assistant", "model": "stub",
+            "content": content, "stop_reason": None, "stop_sequence": None,
+            "usage": {"input_tokens": 1, "output_tokens": 0},
+        }
+
+    def _json(self, server):
+        message = self._message([{"type": "text", "text": "".join(server.tokens)}])
+        message["stop_reason"] = "end_turn"
+        payload = json.dumps(message).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, server):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        def event(name, data):
+            self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode())
+            self.wfile.flush()
+
+        event("message_start", {"type": "message_start", "message": self._message([])})
+        event("content_block_start", {"type": "content_block_start", "index": 0,
+                                      "content_block": {"type": "text", "text": ""}})
+        for token in server.tokens:
+            time.sleep(server.delay)
+            event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                          "delta": {"type": "text_delta", "text": token}})
+        event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        event("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                "usage": {"output_tokens": len(server.tokens)}})
+        event("message_stop", {"type": "message_stop"})
+
+
+@pytest.fixture
+def stub_api():
+    servers = []
+
+    def start(tokens=("Merhaba", ", ", "THYAO", " yükselişte."), delay=0.0):
+        server = StubMessagesAPI(list(tokens), delay)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_assistant(server, **kwargs) -> AITradingAssistant:
+    return AITradingAssistant(api_key="test-key", base_url=server.url, **kwargs)
+
+
+async def collect(assistant, user_id, message):
+    return [chunk async for chunk in assistant.stream_chat(user_id, message)]
+
+
+class TestStreaming:
+    """Token streaming and history"""
+
+    def test_tokens_arrive_in_order(self, stub_api):
+        server = stub_api()
+        assistant = make_assistant(server)
+
+        assistant.clear_conversation("stream-order")
+        chunks = asyncio.run(collect(assistant, "stream-order", "Bugün ne yapmalıyım?"))
+
+        assert chunks == ["Merhaba", ", ", "THYAO", " yükselişte."]
+        assert server.requests[0]["stream"] is True
+        history = assistant.get_conversation_history("stream-order")
+        assert [m["role"] for m in history] == ["user", "assistant"]
+        assert history[-1]["content"] == "Merhaba, THYAO yükselişte."
+
+    def test_disconnect_keeps_history_balanced(self, stub_api):
+        """A client that leaves mid-stream gets its partial reply stored after its message"""
+        server = stub_api(delay=0.05)
+        assistant = make_assistant(server)
+        assistant.clear_conversation("stream-cut")
+
+        async def first_chunk():
+            stream = assistant.stream_chat("stream-cut", "Bugün ne yapmalıyım?")
+            chunk = await stream.__anext__()
+            await stream.aclose()
+            return chunk
+
+        assert asyncio.run(first_chunk()) == "Merhaba"
+        history = assistant.get_conversation_history("stream-cut")
+        assert [(m["role"], m["content"]) for m in history] == [
+            ("user", "Bugün ne yapmalıyım?"), ("assistant", "Merhaba")
+        ]
+
+    def test_chat_uses_async_client(self, stub_api):
+        server = stub_api()
+        assistant = make_assistant(server)
+
+        response = asyncio.run(assistant.chat("u1", "Bugün ne yapmalıyım?"))
+
+        assert response.content == "Merhaba, THYAO yükselişte."
+        assert not server.requests[0].get("stream")
+
+    def test_timeout_falls_back(self, stub_api):
+        """A stalled completion is cut off and the rule-based answer is used"""
+        server = stub_api(delay=1.0)
+        assistant = make_assistant(server, timeout=0.3)
+
+        start = time.perf_counter()
+        chunks = asyncio.run(collect(assistant, "u1", "RSI nedir?"))
+
+        assert time.perf_counter() - start < 1.0
+        assert chunks == [assistant._generate_fallback_response("RSI nedir?")]
+
+    def test_concurrency_is_bounded(self, stub_api):
+        server = stub_api(delay=0.05)
+        assistant = make_assistant(server, max_concurrency=2)
+
+        async def run():
+            return await asyncio.gather(*(collect(assistant, f"u{i}", "Merhaba?") for i in range(5)))
+
+        results = asyncio.run(run())
+
+        assert all("".join(chunks) == "Merhaba, THYAO yükselişte." for chunks in results)
+        assert len(server.requests) == 5
+        assert server.max_in_flight <= 2
+
+    def test_event_loop_is_not_blocked(self, stub_api):
+        """Other coroutines keep running while a completion is in flight"""
+        server = stub_api(delay=0.1)
+        assistant = make_assistant(server)
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await assistant.chat("u1", "Merhaba?")
+            task.cancel()
+            return ticks
+
+        assert asyncio.run(run()) >= 10
+
+
+class TestStreamEndpoint:
+    """/api/ai/chat/stream"""
+
+    def test_sse_events(self, stub_api, monkeypatch):
+        server = stub_api()
+        monkeypatch.setattr(ai_assistant, "_assistant", make_assistant(server))
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/ai/chat/stream",
+            json={"message": "Bugün ne yapmalıyım?", "user_id": "sse"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [json.loads(line[len("data: "):]) for line in response.text.split("\n\n") if line]
+        assert [e["content"] for e in events if e["type"] == "delta"] == ["Merhaba", ", ", "THYAO", " yükselişte."]
+        assert events[-1]["type"] == "done"
+        assert events[-1]["response"]["content"] == "Merhaba, THYAO yükselişte."
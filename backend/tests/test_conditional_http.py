@@ -0,0 +1,184 @@
+"""
+Conditional HTTP Tests
+ETag / Last-Modified revalidation and content hashing for news and IPO feeds
+"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import pytest
+
+from app.services import news_service
+from app.services.conditional_http import ValidatorStore
+from app.services.ipo_data_fetcher import IPODataFetcher
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>BIST 100 yükselişte</title><link>https://example.com/1</link>
+<description>&lt;p&gt;Endeks güne artıda başladı&lt;/p&gt;</description>
+<pubDate>Mon, 02 Mar 2026 09:30:00 +0300</pubDate></item>
+</channel></rss>""".encode()
+
+RSS_SECOND_ITEM = b"""<item><title>Dolar/TL</title><link>https://example.com/2</link>
+<pubDate>Mon, 02 Mar 2026 08:00:00 +0300</pubDate></item>"""
+
+
+class FeedServer(ThreadingHTTPServer):
+    """Serves one RSS body; honours If-None-Match unless `etag` is None"""
+
+    daemon_threads = True
+
+    def __init__(self, etag="\"v1\""):
+        super().__init__(("127.0.0.1", 0), FeedHandler)
+        self.body = RSS
+        self.etag = etag
+        self.conditional_requests = 0
+        self.full_responses = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/rss"
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if self.headers.get("If-None-Match"):
+            server.conditional_requests += 1
+            if server.etag and self.headers["If-None-Match"] == server.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+        server.full_responses += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(server.body)))
+        if server.etag:
+            self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(server.body)
+
+
+@pytest.fixture
+def feed_server():
+    servers = []
+
+    def start(**kwargs):
+        server = FeedServer(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def validators(monkeypatch):
+    store = ValidatorStore("test_feed")
+    monkeypatch.setattr(news_service, "_feed_validators", store)
+    return store
+
+
+def fetch_twice(feed):
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            first = await news_service.fetch_rss_feed(session, feed)
+            second = await news_service.fetch_rss_feed(session, feed)
+            return first, second
+    return asyncio.run(run())
+
+
+class TestNewsFeeds:
+
+    def test_not_modified_reuses_parsed_items(self, feed_server, validators):
+        server = feed_server()
+        feed = {"name": "Test", "url": server.url}
+        first, second = fetch_twice(feed)
+
+        assert server.conditional_requests == 1
+        assert server.full_responses == 1
+        assert first == second
+        assert first[0]["title"] == "BIST 100 yükselişte"
+        assert first[0]["description"] == "Endeks güne artıda başladı"
+        assert validators.get(server.url).changed is False
+
+    def test_same_hash_skips_parsing(self, feed_server, validators, monkeypatch):
+        """Servers without validators: parsing stops at the known head item"""
+        server = feed_server(etag=None)
+        server.body = RSS.replace(b"</channel>", RSS_SECOND_ITEM + b"</channel>")
+        feed = {"name": "Test", "url": server.url}
+        parses = []
+        original = news_service.FeedItemParser._extract
+        monkeypatch.setattr(
+            news_service.FeedItemParser, "_extract", lambda self, elem: parses.append(1) or original(self, elem)
+        )
+
+        first, second = fetch_twice(feed)
+
+        assert server.full_responses == 2
+        assert len(parses) == 3  # 2 items, then only the head
+        assert first == second
+        assert validators.get(server.url).changed is False
+
+    def test_changed_body_is_parsed(self, feed_server, validators):
+        server = feed_server(etag=None)
+        feed = {"name": "Test", "url": server.url}
+
+        async def run():
+            async with aiohttp.ClientSession() as session:
+                await news_service.fetch_rss_feed(session, feed)
+                server.body = RSS.replace(b"BIST 100", b"BIST 30")
+                return await news_service.fetch_rss_feed(session, feed)
+
+        items = asyncio.run(run())
+        assert items[0]["title"] == "BIST 30 yükselişte"
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class TestIPOPages:
+
+    def test_unchanged_page_is_not_reparsed(self, monkeypatch):
+        fetcher = IPODataFetcher()
+        responses = [
+            FakeResponse(200, "<html>" + "x" * 600 + "</html>", {"ETag": '"a"'}),
+            FakeResponse(304),
+        ]
+        sent_headers = []
+
+        def fake_request(url, referer=None, extra_headers=None):
+            sent_headers.append(extra_headers or {})
+            return responses.pop(0)
+
+        parses = []
+
+        def parse(html):
+            parses.append(html)
+            return [{"name": "Örnek Enerji A.Ş."}]
+
+        monkeypatch.setattr(fetcher, "_request", fake_request)
+        url = "https://halkaarz.example/aktif"
+
+        first = fetcher._fetch_parsed(url, None, parse, min_length=500)
+        second = fetcher._fetch_parsed(url, None, parse, min_length=500)
+        fetcher.executor.shutdown(wait=False)
+
+        assert first == second == [{"name": "Örnek Enerji A.Ş."}]
+        assert len(parses) == 1
+        assert sent_headers[1] == {"If-None-Match": '"a"'}
+        # Callers get copies they may mutate
+        first[0]["id"] = "x"
+        assert "id" not in fetcher.validators.get(url).parsed[0]
@@ -0,0 +1,149 @@
+"""
+Conversation Store Tests
+Ring buffers, resident-user LRU and database hydration
+"""
+import threading
+
+import pytest
+
+from app.models import base as db_base
+from app.models.chat import AIConversationMessage
+from app.services.conversation_store import ChatMessage, ConversationStore
+
+
+def message(i: int, role: str = "user") -> ChatMessage:
+    return ChatMessage(id=f"msg_{i}", role=role, content=f"mesaj {i}")
+
+
+@pytest.fixture
+def store():
+    store = ConversationStore(max_messages=5, max_users=3)
+    yield store
+    db = store._session()
+    if db is not None:
+        db.query(AIConversationMessage).filter(AIConversationMessage.user_id.like("store-%")).delete(
+            synchronize_session=False
+        )
+        db.commit()
+        db.close()
+
+
+def persisted_count(user_id: str) -> int:
+    db = db_base.SessionLocal()
+    try:
+        return db.query(AIConversationMessage).filter(AIConversationMessage.user_id == user_id).count()
+    finally:
+        db.close()
+
+
+class TestRingBuffer:
+
+    def test_trimmed_at_write_time(self, store):
+        for i in range(12):
+            store.append("store-a", message(i))
+
+        assert [m.id for m in store.history("store-a")] == [f"msg_{i}" for i in range(7, 12)]
+        assert store.get("store-a").maxlen == 5
+        assert persisted_count("store-a") == 5
+
+    def test_history_limit(self, store):
+        for i in range(4):
+            store.append("store-a", message(i))
+
+        assert [m.id for m in store.history("store-a", 2)] == ["msg_2", "msg_3"]
+
+
+class TestResidency:
+
+    def test_lru_cap_on_resident_users(self, store):
+        for user in ("store-a", "store-b", "store-c"):
+            store.append(user, message(0))
+        store.get("store-a")  # a is now most recent
+        store.append("store-d", message(0))
+
+        assert len(store) == 3
+        assert "store-b" not in store
+        assert "store-a" in store
+
+    def test_evicted_user_is_hydrated_from_db(self, store):
+        store.append("store-a", message(1))
+        store.append("store-a", message(2, "assistant"))
+        for user in ("store-b", "store-c", "store-d"):
+            store.append(user, message(0))
+        assert "store-a" not in store
+
+        history = store.history("store-a")
+        assert [(m.id, m.role, m.content) for m in history] == [
+            ("msg_1", "user", "mesaj 1"),
+            ("msg_2", "assistant", "mesaj 2"),
+        ]
+
+    def test_survives_restart(self, store):
+        store.append("store-a", message(1))
+
+        fresh = ConversationStore(max_messages=5, max_users=3)
+        assert [m.id for m in fresh.history("store-a")] == ["msg_1"]
+
+    def test_sees_writes_from_other_workers(self, store):
+        store.refresh_interval = 0
+        other = ConversationStore(max_messages=5, max_users=3, refresh_interval=0)
+        store.append("store-a", message(1))
+        assert [m.id for m in other.history("store-a")] == ["msg_1"]
+
+        store.append("store-a", message(2, "assistant"))
+        other.append("store-a", message(3))
+
+        assert [m.id for m in other.history("store-a")] == ["msg_1", "msg_2", "msg_3"]
+        assert [m.id for m in store.history("store-a")] == ["msg_1", "msg_2", "msg_3"]
+
+    def test_resident_reads_skip_the_db_within_refresh_interval(self, store, monkeypatch):
+        store.append("store-a", message(1))
+
+        def no_db(user_id):
+            raise AssertionError("freshness query within refresh_interval")
+
+        monkeypatch.setattr(store, "_latest_id", no_db)
+        assert [m.id for m in store.history("store-a")] == ["msg_1"]
+
+        store.refresh_interval = 0
+        monkeypatch.undo()
+        assert [m.id for m in store.history("store-a")] == ["msg_1"]
+
+    def test_slow_load_does_not_block_other_users(self, store, monkeypatch):
+        store.append("store-b", message(1))
+        store.refresh_interval = 0
+        loading, release = threading.Event(), threading.Event()
+        original = store._load
+
+        def slow_load(user_id):
+            if user_id == "store-a":
+                loading.set()
+                release.wait(5)
+            return original(user_id)
+
+        monkeypatch.setattr(store, "_load", slow_load)
+        worker = threading.Thread(target=store.get, args=("store-a",))
+        worker.start()
+        try:
+            assert loading.wait(5)
+            assert [m.id for m in store.history("store-b")] == ["msg_1"]
+        finally:
+            release.set()
+            worker.join(5)
+
+    def test_clear_removes_persisted_history(self, store):
+        store.append("store-a", message(1))
+        store.clear("store-a")
+
+        assert ConversationStore(max_messages=5).history("store-a") == []
+
+
+class TestMemoryOnly:
+
+    def test_no_persistence(self):
+        store = ConversationStore(max_messages=2, max_users=1, persist=False)
+        store.append("mem-a", message(1))
+        store.append("mem-b", message(1))
+
+        assert len(store) == 1
+        assert store.history("mem-a") == []
@@ -0,0 +1,101 @@
+"""
+DataFetcher Tests
+Multi-timeframe resampling from a single base feed
+"""
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_fetcher import DataFetcher
+from tests.conftest import make_bars, make_minute_bars
+
+
+@pytest.fixture
+def fetcher():
+    """DataFetcher with empty shared caches and resampling enabled"""
+    DataFetcher._shared_cache.clear()
+    DataFetcher._resample_cache.clear()
+    f = DataFetcher()
+    f.resampling_enabled = True
+    f.use_mock_data = False
+    yield f
+    f.clear_cache()
+
+
+def seed(fetcher: DataFetcher, ticker: str, base: tuple, df: pd.DataFrame, mock: bool = False):
+    """Put a base feed into the fetcher cache as if it had just been downloaded"""
+    fetcher.cache[fetcher._get_cache_key(ticker, *base)] = {
+        "data": df, "timestamp": time.time(), "mock": mock
+    }
+
+
+class TestIntradayResampling:
+    """Coarser intraday bars are derived from the 1m base feed"""
+
+    def test_5m_bars_aggregate_ohlcv(self, fetcher):
+        base = make_minute_bars()
+        seed(fetcher, "THYAO.IS", DataFetcher.INTRADAY_BASE, base)
+
+        df = fetcher.fetch_realtime_data("THYAO.IS", interval="5m", period="1d")
+
+        assert len(df) == 96  # 480 minutes / 5
+        first = base.iloc[480:485]  # 1d keeps only the last session
+        assert df.iloc[0]["open"] == first["open"].iloc[0]
+        assert df.iloc[0]["high"] == first["high"].max()
+        assert df.iloc[0]["low"] == first["low"].min()
+        assert df.iloc[0]["close"] == first["close"].iloc[-1]
+        assert df.iloc[0]["volume"] == first["volume"].sum()
+
+    def test_hourly_bars_span_all_sessions(self, fetcher):
+        seed(fetcher, "THYAO.IS", DataFetcher.INTRADAY_BASE, make_minute_bars())
+
+        df = fetcher.fetch_realtime_data("THYAO.IS", interval="1h", period="5d")
+
+        # Overnight gap must not produce empty bars
+        assert len(df) == 16
+        assert not df["open"].isna().any()
+
+    def test_derived_frame_memoized_until_new_bar(self, fetcher):
+        base = make_minute_bars()
+        seed(fetcher, "THYAO.IS", DataFetcher.INTRADAY_BASE, base)
+        fetcher.fetch_realtime_data("THYAO.IS", interval="15m", period="1d")
+        memo = DataFetcher._resample_cache["THYAO.IS_15m_1d"]
+
+        fetcher.fetch_realtime_data("THYAO.IS", interval="15m", period="1d")
+        assert DataFetcher._resample_cache["THYAO.IS_15m_1d"] is memo
+
+        extra = base.tail(1).copy()
+        extra.index = extra.index + pd.Timedelta(minutes=1)
+        seed(fetcher, "THYAO.IS", DataFetcher.INTRADAY_BASE, pd.concat([base, extra]))
+        fetcher.fetch_realtime_data("THYAO.IS", interval="15m", period="1d")
+        assert DataFetcher._resample_cache["THYAO.IS_15m_1d"] is not memo
+
+    def test_mock_base_is_not_resampled(self, fetcher):
+        seed(fetcher, "THYAO.IS", DataFetcher.INTRADAY_BASE, make_minute_bars(), mock=True)
+
+        assert fetcher._fetch_resampled("THYAO.IS", "5m", "1d", DataFetcher.INTRADAY_BASE).empty
+
+
+class TestDailySlicing:
+    """Shorter daily periods are sliced from the 1d/1y base feed"""
+
+    def test_period_slices(self, fetcher):
+        base = make_bars(
+            closes=50 + np.arange(250) * 0.1, open_noise=0, wicks=False, volume=1000, tz="Europe/Istanbul"
+        )
+        seed(fetcher, "GARAN.IS", DataFetcher.DAILY_BASE, base)
+
+        five = fetcher.fetch_realtime_data("GARAN.IS", interval="1d", period="5d")
+        three_months = fetcher.fetch_realtime_data("GARAN.IS", interval="1d", period="3mo")
+
+        assert len(five) == 5
+        assert five.index[-1] == base.index[-1]
+        assert 60 <= len(three_months) <= 66
+        assert three_months.index[0] > base.index[-1] - pd.DateOffset(months=3)
+
+    def test_long_periods_bypass_base(self, fetcher):
+        assert fetcher._get_resample_base("1d", "2y") is None
+        assert fetcher._get_resample_base("1h", "1mo") is None
+        assert fetcher._get_resample_base("5m", "1d") == DataFetcher.INTRADAY_BASE
@@ -0,0 +1,137 @@
+"""
+Market Data Provider Tests
+Deterministic replay of recorded bars and DataFetcher provider wiring
+"""
+import pandas as pd
+import pytest
+
+from app.services.data_fetcher import DataFetcher
+from app.services.data_providers import MarketDataProvider, ReplayProvider, YFinanceProvider, record_bars
+from tests.conftest import make_minute_bars
+
+
+class StaticProvider(MarketDataProvider):
+    """Serves fixed frames, used as the recording source"""
+
+    allow_mock_fallback = False
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def fetch_bars(self, ticker, interval, period):
+        return self.frames.get((ticker, interval), pd.DataFrame()).copy()
+
+    def fetch_history(self, ticker, start_date, end_date):
+        return pd.DataFrame()
+
+    def fetch_info(self, ticker):
+        return {}
+
+
+@pytest.fixture
+def replay_dir(tmp_path):
+    """Recording of one ticker with two intraday sessions"""
+    source = StaticProvider({("THYAO.IS", "1m"): make_minute_bars()})
+    record_bars(["THYAO.IS"], str(tmp_path), feeds=[("1m", "5d")], source=source)
+    return tmp_path
+
+
+class TestReplayProvider:
+    """Recorded bars replay"""
+
+    def test_replay_is_deterministic(self, replay_dir):
+        """Two providers over the same recording return identical frames"""
+        first = ReplayProvider(str(replay_dir)).fetch_bars("THYAO.IS", "1m", "5d")
+        second = ReplayProvider(str(replay_dir)).fetch_bars("THYAO.IS", "1m", "5d")
+
+        assert len(first) == 960
+        pd.testing.assert_frame_equal(first, second)
+        assert str(first.index.tz) == "Europe/Istanbul"
+
+    def test_period_counts_sessions(self, replay_dir):
+        """1d returns only the last recorded session"""
+        df = ReplayProvider(str(replay_dir)).fetch_bars("THYAO.IS", "1m", "1d")
+
+        assert len(df) == 480
+        assert df.index[0] == pd.Timestamp("2026-03-03 10:00", tz="Europe/Istanbul")
+
+    def test_clock_hides_future_bars(self, replay_dir):
+        """Bars after the replay clock are not visible, quotes follow the clock"""
+        provider = ReplayProvider(str(replay_dir))
+        provider.set_clock("2026-03-03 10:29")
+
+        df = provider.fetch_bars("THYAO.IS", "1m", "1d")
+        quote = provider.fetch_quote("THYAO.IS")
+
+        assert len(df) == 30
+        assert quote["price"] == pytest.approx(101.29)
+        assert quote["previous_close"] == pytest.approx(100 + 479 * 0.01)
+
+    def test_missing_recording_is_empty(self, replay_dir):
+        """Unknown tickers return an empty frame and no quote"""
+        provider = ReplayProvider(str(replay_dir))
+
+        assert provider.fetch_bars("GARAN.IS", "1m", "1d").empty
+        assert provider.fetch_quote("GARAN.IS") is None
+
+
+class TestYFinanceBatch:
+    """yf.download must return the same bars as the per-ticker Ticker.history path"""
+
+    def test_adjusted_tz_aware_bars(self, monkeypatch):
+        import yfinance as yf
+
+        calls = []
+        index = pd.date_range("2026-03-02", periods=2, freq="D", tz="Europe/Istanbul")
+        columns = pd.MultiIndex.from_product([["THYAO.IS", "GARAN.IS"], ["Open", "High", "Low", "Close", "Adj Close", "Volume"]])
+        raw = pd.DataFrame(1.0, index=index, columns=columns)
+
+        def download(tickers, **kwargs):
+            calls.append(kwargs)
+            return raw
+
+        monkeypatch.setattr(yf, "download", download)
+
+        frames = YFinanceProvider().fetch_bars_batch(["THYAO.IS", "GARAN.IS"], "1d", "5d")
+
+        assert calls[0]["auto_adjust"] is True and calls[0]["ignore_tz"] is False
+        assert list(frames["THYAO.IS"].columns) == ["open", "high", "low", "close", "volume"]
+
+
+class TestDataFetcherProvider:
+    """DataFetcher on top of a replay provider"""
+
+    @pytest.fixture
+    def fetcher(self, replay_dir):
+        DataFetcher._shared_cache.clear()
+        DataFetcher._resample_cache.clear()
+        f = DataFetcher(provider=ReplayProvider(str(replay_dir)))
+        f.use_mock_data = False
+        f.resampling_enabled = True
+        yield f
+        f.clear_cache()
+
+    def test_derived_views_from_replay(self, fetcher):
+        """5m bars are derived from the recorded 1m base feed"""
+        df = fetcher.fetch_realtime_data("THYAO.IS", interval="5m", period="1d")
+
+        assert len(df) == 96
+        assert df["volume"].iloc[0] == 50
+
+    def test_no_mock_fallback_for_replay(self, fetcher):
+        """A ticker without a recording stays empty instead of getting random mock data"""
+        assert fetcher.fetch_realtime_data("GARAN.IS", interval="5m", period="1d").empty
+
+    def test_batch_fetch(self, fetcher):
+        """Batch fetch returns frames for recorded tickers only"""
+        results = fetcher.fetch_realtime_data_batch(["THYAO.IS", "GARAN.IS"], interval="15m", period="1d")
+
+        assert list(results) == ["THYAO.IS"]
+        assert len(results["THYAO.IS"]) == 32
+
+    def test_current_price_from_replay(self, fetcher):
+        """Current price comes from the last recorded bar"""
+        from app.services.cache_service import cache_service
+        cache_service.delete("price:THYAO.IS")
+
+        assert fetcher.get_current_price("THYAO.IS") == pytest.approx(101 + 479 * 0.01)
@@ -0,0 +1,110 @@
+"""
+Feature Store Tests
+One canonical frame per (ticker, interval, period, last bar)
+"""
+import pandas as pd
+import pytest
+
+from app.services.features import FeatureStore, compute_features, default_indicators, resolve_indicators
+from app.services.technical_analysis import TechnicalAnalysis
+from tests.conftest import make_bars
+
+
+@pytest.fixture
+def store():
+    return FeatureStore(max_entries=8)
+
+
+class TestFeatureStore:
+    def test_reused_until_new_bar(self, store, monkeypatch):
+        from app.services import features
+        calls = []
+        evaluate = features.evaluate_indicators
+
+        def counting(df, names):
+            calls.append(len(df))
+            return evaluate(df, names)
+
+        monkeypatch.setattr(features, "evaluate_indicators", counting)
+        df = make_bars(260, seed=11)
+        next_bar = make_bars(1, seed=3).set_axis([df.index[-1] + pd.offsets.BDay()])
+
+        store.frame("THYAO.IS", "1d", "1y", df)
+        store.frame("THYAO.IS", "1d", "1y", df.copy())
+        store.frame("THYAO.IS", "1h", "1mo", df)
+        store.frame("THYAO.IS", "1d", "1y", pd.concat([df, next_bar]))
+
+        assert calls == [260, 260, 261]
+
+    def test_copies_unless_asked(self, store):
+        df = make_bars(260, seed=11)
+
+        first = store.frame("GARAN.IS", "1d", "1y", df)
+        first["rsi"] = 0.0
+
+        assert store.frame("GARAN.IS", "1d", "1y", df)["rsi"].iloc[-1] != 0.0
+        assert store.frame("GARAN.IS", "1d", "1y", df, copy=False) is store.frame("GARAN.IS", "1d", "1y", df, copy=False)
+
+    def test_requested_indicators_only(self, store):
+        df = make_bars(260, seed=11)
+
+        trend = store.frame("XU100.IS", "1d", "3mo", df, ["ema_21", "ema_50"], copy=False)
+        full = store.frame("XU100.IS", "1d", "3mo", df, copy=False)
+
+        assert set(trend.columns) == {"open", "high", "low", "close", "volume", "ema_21", "ema_50"}
+        assert "adx" in full.columns and "adx" not in trend.columns  # grown copy-on-write
+        assert full["ema_21"] is trend["ema_21"] or full["ema_21"].equals(trend["ema_21"])
+        assert store.frame("XU100.IS", "1d", "3mo", df, ["rsi"], copy=False) is full  # nothing missing
+
+    def test_empty_frame_passes_through(self, store):
+        empty = pd.DataFrame()
+
+        assert store.frame("GARAN.IS", "1d", "1y", empty) is empty
+        assert len(store) == 0
+
+
+class TestRegistry:
+    def test_dependencies_first(self):
+        order = [node.name for node in resolve_indicators(["macd_histogram", "ema_12"])]
+
+        assert order == ["ema_12", "ema_26", "macd"]
+
+    def test_unknown_indicator(self):
+        with pytest.raises(KeyError):
+            resolve_indicators(["supertrend"])
+
+    def test_lookahead_indicators_on_request(self):
+        df = make_bars(260, seed=11)
+
+        assert "ichimoku" not in default_indicators()
+        frame = compute_features(df, ["ichimoku"])
+        reference = TechnicalAnalysis().calculate_ichimoku(df)
+
+        pd.testing.assert_series_equal(frame["ichimoku_senkou_b"], reference["ichimoku_senkou_b"])
+
+
+class TestComputeFeatures:
+    def test_matches_technical_analysis(self):
+        df = make_bars(260, seed=11)
+
+        frame = compute_features(df)
+        reference = TechnicalAnalysis().calculate_all_indicators(df)
+
+        pd.testing.assert_frame_equal(frame[reference.columns], reference)
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]  # input untouched
+        assert frame["volume_sma_20"].iloc[-1] == pytest.approx(df["volume"].iloc[-20:].mean())
+
+    def test_capitalized_input(self):
+        df = make_bars(260, seed=11)
+
+        frame = compute_features(df.rename(columns=str.capitalize))
+
+        pd.testing.assert_frame_equal(frame, compute_features(df))
+
+    def test_rows_are_causal(self):
+        df = make_bars(260, seed=11)
+
+        full = compute_features(df)
+        prefix = compute_features(df.iloc[:220])
+
+        pd.testing.assert_series_equal(full.iloc[219], prefix.iloc[-1])
@@ -0,0 +1,115 @@
+"""
+Hybrid Strategy Tests
+Parallel candidate scoring, deterministic selection pass and indicator math
+"""
+import threading
+
+import pandas as pd
+import pytest
+
+from app.services import hybrid_strategy
+from app.services.hybrid_strategy import HybridSignalGenerator
+from tests.conftest import make_bars
+
+
+def candidate(ticker: str, strength: float) -> dict:
+    return {"ticker": ticker, "signal": "BUY", "strength": strength}
+
+
+@pytest.fixture(autouse=True)
+def clean_daily_state(monkeypatch):
+    monkeypatch.setattr(HybridSignalGenerator, "_last_run_date", None)
+    monkeypatch.setattr(HybridSignalGenerator, "_daily_signals", [])
+    monkeypatch.setattr(HybridSignalGenerator, "_daily_sectors", {})
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    generator = HybridSignalGenerator()
+    monkeypatch.setattr(generator, "mark_run_complete", lambda: None)
+    monkeypatch.setattr(generator, "check_market_filter", lambda: (True, "test"))
+    return generator
+
+
+class TestSelection:
+    """Daily limit and sector diversification as a final pass"""
+
+    def test_strongest_per_sector(self, generator):
+        selected = generator.select_signals([
+            candidate("AKBNK.IS", 80), candidate("THYAO.IS", 85), candidate("GARAN.IS", 95),
+        ])
+
+        assert [s["ticker"] for s in selected] == ["GARAN.IS", "THYAO.IS"]
+        assert HybridSignalGenerator._daily_sectors == {"Bankacılık": 1, "Havacılık": 1}
+
+    def test_daily_limit_and_stable_ties(self, generator):
+        tickers = ["THYAO.IS", "TUPRS.IS", "ASELS.IS", "TCELL.IS", "BIMAS.IS", "EKGYO.IS", "ENKAI.IS"]
+
+        selected = generator.select_signals([candidate(t, 100) for t in tickers])
+
+        assert [s["ticker"] for s in selected] == tickers[:generator.params.max_picks_per_day]
+
+    def test_concurrent_registration_respects_limits(self, generator):
+        tickers = ["THYAO.IS", "TUPRS.IS", "ASELS.IS", "TCELL.IS", "BIMAS.IS", "EKGYO.IS", "ENKAI.IS", "GARAN.IS"]
+        accepted = []
+
+        def register(ticker):
+            if generator._register_signal(ticker):
+                accepted.append(ticker)
+
+        threads = [threading.Thread(target=register, args=(t,)) for t in tickers * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(accepted) == generator.params.max_picks_per_day
+        assert all(count == 1 for count in HybridSignalGenerator._daily_sectors.values())
+
+
+class TestScan:
+    def test_scores_every_ticker_then_selects(self, generator, monkeypatch):
+        strengths = {"GARAN.IS": 90, "AKBNK.IS": 99, "THYAO.IS": 80, "SISE.IS": 0}
+        frames = {ticker: make_bars() for ticker in strengths}
+        frames["KOZAA.IS"] = make_bars(rows=20)  # too short to score
+
+        class FakeFetcher:
+            def fetch_realtime_data_batch(self, tickers, interval, period):
+                return {t: frames[t] for t in tickers if t in frames}
+
+        def evaluate(df, indicators, ticker, apply_booster):
+            assert "Close" in df.columns
+            if strengths[ticker] == 0:
+                return {"signal": "HOLD", "ticker": ticker}
+            return candidate(ticker, strengths[ticker])
+
+        monkeypatch.setattr(hybrid_strategy, "DataFetcher", FakeFetcher)
+        monkeypatch.setattr(generator, "evaluate_candidate", evaluate)
+
+        result = generator.scan_all_stocks(tickers=[*strengths, "KOZAA.IS"], force_run=True)
+
+        assert [s["ticker"] for s in result["signals"]] == ["AKBNK.IS", "THYAO.IS"]
+        assert result["summary"]["total_scanned"] == 4
+        assert result["summary"]["candidates"] == 3
+        assert frames["GARAN.IS"].columns[0] == "open"  # input frames are not renamed in place
+
+
+class TestIndicators:
+    def test_matches_rolling_reference(self, generator):
+        df = make_bars().rename(columns=str.capitalize)
+        close, high, low = df["Close"], df["High"], df["Low"]
+
+        indicators = generator._calculate_indicators(df)
+
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+        rsi = (100 - 100 / (1 + gain / (loss + 1e-10))).iloc[-1]
+        prev_close = close.shift(1)
+        tr = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+
+        assert indicators["momentum"]["rsi"] == pytest.approx(rsi)
+        assert indicators["volatility"]["atr"] == pytest.approx(tr.rolling(14).mean().iloc[-1])
+        assert indicators["volume"]["average"] == pytest.approx(df["Volume"].rolling(20).mean().iloc[-1])
+        assert indicators["trend"]["ema_20"] == pytest.approx(close.ewm(span=20, adjust=False).mean().iloc[-1])
+        assert "error" not in indicators
@@ -0,0 +1,154 @@
+"""
+IPO Data Fetcher Tests
+Concurrent sources, overall deadline, per-host rate limiting and persistence
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.services.ipo_data_fetcher import HostRateLimiter, IPODataFetcher
+from app.services.ipo_store import IPORecordStore
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    """Fetcher on a temporary store - never the real backend/data/ipo_store.db"""
+    store = IPORecordStore(tmp_path / "ipo_store.db")
+    fetcher = IPODataFetcher(store=store)
+    monkeypatch.setattr(fetcher, "_save_cache", lambda: None)
+    yield fetcher
+    fetcher.executor.shutdown(wait=False)
+    store.close()
+
+
+def slow_source(seconds, result=None):
+    async def source():
+        await asyncio.sleep(seconds)
+        return result or []
+    return source
+
+
+class TestFetchAllSources:
+
+    def test_sources_run_concurrently(self, fetcher, monkeypatch):
+        """A refresh takes as long as the slowest source, not the sum"""
+        monkeypatch.setattr(fetcher, "_fetch_halkaarz", slow_source(0.3, [{"name": "Örnek Enerji A.Ş."}]))
+        monkeypatch.setattr(fetcher, "_fetch_bigpara", slow_source(0.3))
+        monkeypatch.setattr(fetcher, "_fetch_investing", slow_source(0.3))
+        monkeypatch.setattr(fetcher, "_fetch_rss_feeds", slow_source(0.3))
+
+        start = time.perf_counter()
+        result = asyncio.run(fetcher.fetch_all_sources())
+
+        assert time.perf_counter() - start < 0.6
+        assert "halkaarz" in result["sources_tried"]
+        assert result["web_ipos_found"] == 1
+
+    def test_deadline_cuts_off_slow_sources(self, fetcher, monkeypatch):
+        fetcher.deadline = 0.2
+        monkeypatch.setattr(fetcher, "_fetch_halkaarz", slow_source(5))
+        monkeypatch.setattr(fetcher, "_fetch_bigpara", slow_source(0.01, [{"name": "Örnek Gıda A.Ş."}]))
+        monkeypatch.setattr(fetcher, "_fetch_investing", slow_source(0.01))
+        monkeypatch.setattr(fetcher, "_fetch_rss_feeds", slow_source(0.01))
+
+        start = time.perf_counter()
+        result = asyncio.run(fetcher.fetch_all_sources())
+
+        assert time.perf_counter() - start < 1.0
+        assert "bigpara" in result["sources_tried"]
+        assert any(error.startswith("halkaarz: deadline") for error in result["errors"])
+
+    def test_source_errors_are_isolated(self, fetcher, monkeypatch):
+        async def broken():
+            raise RuntimeError("blocked")
+
+        monkeypatch.setattr(fetcher, "_fetch_halkaarz", broken)
+        monkeypatch.setattr(fetcher, "_fetch_bigpara", slow_source(0, [{"name": "Örnek Gıda A.Ş."}]))
+        monkeypatch.setattr(fetcher, "_fetch_investing", slow_source(0))
+        monkeypatch.setattr(fetcher, "_fetch_rss_feeds", slow_source(0))
+
+        result = asyncio.run(fetcher.fetch_all_sources())
+
+        assert "halkaarz: blocked" in result["errors"]
+        assert "bigpara" in result["sources_tried"]
+
+
+class TestHostRateLimiter:
+
+    def test_same_host_is_spaced(self):
+        limiter = HostRateLimiter(min_interval=1.0, jitter=(0, 0))
+        delays = [limiter.reserve("https://halkaarz.com/a") for _ in range(3)]
+
+        assert delays[0] == pytest.approx(0, abs=0.01)
+        assert delays[1] == pytest.approx(1.0, abs=0.01)
+        assert delays[2] == pytest.approx(2.0, abs=0.01)
+
+    def test_hosts_are_independent(self):
+        limiter = HostRateLimiter(min_interval=1.0, jitter=(0, 0))
+        limiter.reserve("https://halkaarz.com/")
+
+        assert limiter.reserve("https://bigpara.hurriyet.com.tr/") == pytest.approx(0, abs=0.01)
+
+
+class TestScraperSessions:
+
+    def test_same_host_session_is_not_shared_across_threads(self, fetcher, monkeypatch):
+        """Concurrent detail pages of one host use its session one at a time"""
+        class Session:
+            in_flight = 0
+            max_in_flight = 0
+
+            def get(self, url, **kwargs):
+                Session.in_flight += 1
+                Session.max_in_flight = max(Session.max_in_flight, Session.in_flight)
+                time.sleep(0.02)
+                Session.in_flight -= 1
+
+        monkeypatch.setattr(fetcher, "_get_scraper", lambda url: Session())
+        monkeypatch.setattr(fetcher, "_rate_limit", lambda url: None)
+
+        list(fetcher.executor.map(fetcher._request, [f"https://halkaarz.com/{i}" for i in range(6)]))
+
+        assert Session.max_in_flight == 1
+
+
+class TestPersistence:
+    """Cache and manual entries in the IPO store"""
+
+    def test_only_merged_records_are_saved(self, tmp_path, monkeypatch):
+        store = IPORecordStore(tmp_path / "ipo_store.db")
+        fetcher = IPODataFetcher(store=store)
+        fetcher.cached_data = {"old": {"name": "Eski A.Ş."}}
+        fetcher._dirty_cache_ids = {"old"}
+        fetcher._save_cache()
+
+        monkeypatch.setattr(fetcher, "_fetch_halkaarz", slow_source(0, [{"name": "Örnek Enerji A.Ş."}]))
+        for name in ("_fetch_bigpara", "_fetch_investing", "_fetch_rss_feeds"):
+            monkeypatch.setattr(fetcher, name, slow_source(0))
+        monkeypatch.setattr(fetcher.validators, "changed_since", lambda since: True)
+        writes = []
+        original = store.write
+        monkeypatch.setattr(store, "write", lambda c, upserts=None, **kw: writes.append(set(upserts or {})) or original(c, upserts, **kw))
+
+        result = asyncio.run(fetcher.fetch_all_sources())
+
+        assert writes == [set(result["ipos"])]
+        assert "old" not in writes[0]
+        assert set(store.load("ipo_cache")) == {"old"} | set(result["ipos"])
+        fetcher.executor.shutdown(wait=False)
+        store.close()
+
+    def test_manual_ipos_survive_restart(self, tmp_path):
+        store = IPORecordStore(tmp_path / "ipo_store.db")
+        fetcher = IPODataFetcher(store=store)
+        fetcher.save_manual_ipo({"id": "manual-a", "symbol": "AAA"})
+        fetcher.save_manual_ipo({"id": "manual-b", "symbol": "BBB"})
+        fetcher.delete_manual_ipo("manual-a")
+
+        restarted = IPODataFetcher(store=store)
+
+        assert set(restarted.manual_data) == {"manual-b"}
+        for f in (fetcher, restarted):
+            f.executor.shutdown(wait=False)
+        store.close()
@@ -0,0 +1,202 @@
+"""
+IPO Service Tests
+Indexed catalog (views, lookups, search, invalidation) and the SQLite store
+"""
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import ipo_service as ipo_module
+from app.services.ipo_service import IPOCatalog, IPOCompany, IPOService, IPOStatus, _ipo_sort_key
+from app.services.ipo_store import IPORecordStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = IPORecordStore(tmp_path / "ipo_store.db")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def service(store, monkeypatch):
+    """Service on the built-in fallback data set, with a temporary store"""
+    monkeypatch.setattr(ipo_module, "IPO_DATA_FILE", store.path.parent / "missing.json")
+    monkeypatch.setattr(ipo_module, "IPO_INITIAL_FILE", store.path.parent / "missing.json")
+    return IPOService(store=store)
+
+
+def linear_search(service, query):
+    query = query.lower()
+    return [
+        ipo.to_dict() for ipo in service.ipos.values()
+        if query in ipo.symbol.lower() or query in ipo.name.lower()
+        or query in ipo.sector.lower() or query in ipo.description.lower()
+    ]
+
+
+class TestCatalogViews:
+    """Precomputed views match the previous per-request computation"""
+
+    def test_sorted_views(self, service):
+        expected = [ipo.to_dict() for ipo in sorted(service.ipos.values(), key=_ipo_sort_key)]
+        assert service.get_all_ipos() == expected
+
+        for status in IPOStatus:
+            assert service.get_all_ipos(status=status.value) == [d for d in expected if d["status"] == status.value]
+        assert service.get_all_ipos(status="bogus") == expected
+
+    def test_sector_filter(self, service):
+        sector = next(iter(service.ipos.values())).sector
+        result = service.get_all_ipos(sector=sector.upper())
+
+        assert result
+        assert all(d["sector"].lower() == sector.lower() for d in result)
+
+    def test_symbol_lookup(self, service):
+        ipo = next(iter(service.ipos.values()))
+
+        assert service.get_ipo_by_symbol(ipo.symbol.lower())["id"] == ipo.id
+        assert service.get_ipo_by_symbol("YOKBOYLE") is None
+
+    @pytest.mark.parametrize("query", ["", "a", "en", "ener", "A.Ş.", "holding", "zzzz"])
+    def test_search_matches_substring_scan(self, service, query):
+        assert service.search_ipos(query) == linear_search(service, query)
+
+    def test_stats_are_reused(self, service):
+        first = service.get_ipo_stats()
+        second = service.get_ipo_stats()
+
+        assert first == second
+        assert first["total_ipos"] == len(service.ipos)
+        assert service._catalog is not None
+
+
+class TestCatalogInvalidation:
+    """Views are rebuilt only when data changes"""
+
+    def test_manual_add_and_delete(self, service):
+        before = service.get_ipo_stats()["total_ipos"]
+        catalog = service._get_catalog()
+
+        ipo_id = service.add_ipo_manually({"symbol": "TESTX", "name": "Test Enerji", "status": "active"})
+
+        assert service._get_catalog() is not catalog
+        assert service.get_ipo_stats()["total_ipos"] == before + 1
+        assert service.get_ipo_by_symbol("TESTX")["id"] == ipo_id
+        assert ipo_id in [d["id"] for d in service.search_ipos("test ener")]
+
+        assert service.delete_ipo(ipo_id)
+        assert service.get_ipo_by_symbol("TESTX") is None
+
+    def test_expires_when_day_counter_changes(self):
+        now = datetime(2026, 3, 2, 12, 0)
+        ipo = IPOCompany(
+            id="x", symbol="X", name="X", sector="S", description="",
+            status=IPOStatus.UPCOMING, demand_start=now + timedelta(days=2, hours=3)
+        )
+
+        catalog = IPOCatalog({"x": ipo}, now)
+
+        assert catalog.valid_until == now + timedelta(hours=3)
+
+
+class TestIPOStore:
+    """Incremental, transactional persistence"""
+
+    def test_only_changed_records_are_written(self, store):
+        assert store.write("ipos", {"a": {"v": 1}, "b": {"v": 2}}) == 2
+        assert store.write("ipos", {"a": {"v": 1}, "b": {"v": 3}}) == 1
+        assert store.write("ipos", {"a": {"v": 1}}, prune=True) == 1
+
+        assert store.load("ipos") == {"a": {"v": 1}}
+
+    def test_collections_and_meta(self, store):
+        store.write("ipo_cache", {"x": {"name": "Örnek"}}, meta={"ipo_cache.last_fetch": "2026-03-02T09:00:00"})
+        store.write("ipo_cache", deletes=["missing"])
+
+        reopened = IPORecordStore(store.path)
+        assert reopened.load("ipo_cache") == {"x": {"name": "Örnek"}}
+        assert reopened.load("ipos") == {}
+        assert reopened.get_meta("ipo_cache.last_fetch") == "2026-03-02T09:00:00"
+        reopened.close()
+
+
+class TestServicePersistence:
+    """Lazy loading and O(changed) writes"""
+
+    def test_construction_is_lazy(self, service):
+        assert service.store._conn is None
+        assert not service._loaded
+
+        assert service.get_update_status()["ipo_count"] == len(service.ipos) > 0
+        assert service.store.count("ipos") == len(service.ipos)
+
+    def test_concurrent_reader_waits_for_the_full_load(self, service, monkeypatch):
+        """A second thread never sees the half-loaded data (or a catalog built from it)"""
+        loading, release = threading.Event(), threading.Event()
+        original = service._load_data
+
+        def slow_load():
+            original()
+            loading.set()
+            release.wait(5)
+
+        monkeypatch.setattr(service, "_load_data", slow_load)
+        loader = threading.Thread(target=service._ensure_loaded)
+        loader.start()
+        assert loading.wait(5)
+
+        seen = []
+        reader = threading.Thread(target=lambda: seen.append(service.get_ipo_stats()["total_ipos"]))
+        reader.start()
+        reader.join(0.2)
+        assert reader.is_alive() and not service._loaded
+
+        release.set()
+        loader.join(5)
+        reader.join(5)
+        assert seen == [len(service._known_ipo_ids)] and seen[0] > 0
+
+    def test_changes_survive_restart(self, service, store):
+        ipo_id = service.add_ipo_manually({"symbol": "KALCI", "name": "Kalıcı A.Ş."})
+        removed = next(i for i in service.ipos if i != ipo_id)
+        service.delete_ipo(removed)
+        service.add_to_watchlist("u1", ipo_id)
+        service.force_save()
+
+        restarted = IPOService(store=store)
+
+        assert restarted.get_ipo_by_symbol("KALCI")["id"] == ipo_id
+        assert restarted.get_ipo(removed) is None
+        assert restarted.watchlist == {"u1": [ipo_id]}
+        assert len(restarted.ipos) == len(service.ipos)
+
+    def test_unchanged_save_writes_nothing(self, service, monkeypatch):
+        service.get_all_ipos()
+        written = []
+        original = service.store.write
+        monkeypatch.setattr(service.store, "write", lambda *a, **kw: written.append(original(*a, **kw)) or written[-1])
+
+        service.force_save()
+        service.ipos[next(iter(service.ipos))].current_price = 123.4
+        service.force_save()
+
+        assert written == [0, 1]
+
+    def test_legacy_json_is_imported_once(self, store, tmp_path, monkeypatch):
+        legacy = tmp_path / "ipo_data.json"
+        legacy.write_text(json.dumps({
+            "ipos": [{"id": "ipo-eski", "symbol": "ESKI", "name": "Eski A.Ş.", "sector": "Enerji", "description": ""}],
+            "watchlist": {"u1": ["ipo-eski"]},
+        }), encoding="utf-8")
+        monkeypatch.setattr(ipo_module, "IPO_DATA_FILE", legacy)
+
+        assert IPOService(store=store).get_ipo_by_symbol("ESKI") is not None
+        legacy.unlink()
+
+        restarted = IPOService(store=store)
+        assert restarted.get_ipo_by_symbol("ESKI")["id"] == "ipo-eski"
+        assert restarted.watchlist == {"u1": ["ipo-eski"]}
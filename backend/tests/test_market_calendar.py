@@ -0,0 +1,114 @@
+"""
+Market Calendar Tests
+BIST sessions, holidays and the cache lifetimes they drive
+"""
+import asyncio
+import time
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from app.services import market_calendar
+from app.services.data_fetcher import DataFetcher
+from app.services.market_calendar import BIST_TZ, BistCalendar, bar_seconds
+from app.services.stock_scheduler import StockScheduler
+
+
+def at(text: str) -> datetime:
+    return BIST_TZ.localize(datetime.fromisoformat(text))
+
+
+@pytest.fixture
+def calendar():
+    return BistCalendar()
+
+
+class TestSessions:
+    def test_trading_days(self, calendar):
+        assert calendar.is_trading_day(date(2026, 3, 2))
+        assert not calendar.is_trading_day(date(2026, 3, 7))    # Saturday
+        assert not calendar.is_trading_day(date(2026, 4, 23))   # fixed holiday
+        assert not calendar.is_trading_day(date(2026, 5, 27))   # Kurban Bayramı
+
+    def test_half_day_closes_early(self, calendar):
+        assert calendar.session(date(2026, 10, 28))[1] == at("2026-10-28 12:40")
+        assert calendar.is_open(at("2026-10-28 12:00"))
+        assert not calendar.is_open(at("2026-10-28 13:00"))
+
+    def test_next_open_skips_weekend_and_holidays(self, calendar):
+        assert calendar.next_open(at("2026-03-02 09:00")) == at("2026-03-02 10:00")
+        assert calendar.next_open(at("2026-03-06 18:30")) == at("2026-03-09 10:00")
+        assert calendar.next_open(at("2026-05-25 19:00")) == at("2026-05-26 10:00")
+        assert calendar.next_open(at("2026-05-26 19:00")) == at("2026-06-01 10:00")
+
+    def test_bar_seconds(self):
+        assert bar_seconds("5m") == 300
+        assert bar_seconds("1h") == 3600
+        assert bar_seconds("1d") is None
+        assert bar_seconds("1mo") is None
+
+
+class TestDataTtl:
+    def test_closed_market_keeps_data_until_open(self, calendar):
+        assert calendar.data_ttl("1d", at("2026-03-06 19:00")) == (at("2026-03-09 10:00") - at("2026-03-06 19:00")).total_seconds()
+        assert calendar.ttl(60, at("2026-03-07 12:00")) == (at("2026-03-09 10:00") - at("2026-03-07 12:00")).total_seconds()
+
+    def test_session_ttl_aligned_to_boundaries(self, calendar, monkeypatch):
+        monkeypatch.setattr(market_calendar.settings, "cache_ttl_realtime", 60)
+
+        assert calendar.data_ttl("1d", at("2026-03-02 11:00:20")) == 45   # 11:01 + publish delay
+        assert calendar.data_ttl("1m", at("2026-03-02 11:00:59")) == 6
+        assert calendar.ttl(60, at("2026-03-02 11:00:20")) == 60
+
+    def test_delayed_close_is_still_refreshed(self, calendar):
+        assert calendar.data_ttl("1d", at("2026-03-02 18:24:30")) == 35   # close + 15 min delay
+        assert calendar.data_ttl("1d", at("2026-03-02 18:30")) == (at("2026-03-03 10:00") - at("2026-03-02 18:30")).total_seconds()
+
+
+class TestDataFetcherExpiry:
+    @pytest.fixture
+    def fetcher(self, monkeypatch):
+        DataFetcher._shared_cache.clear()
+        fetcher = DataFetcher()
+        fetcher.use_mock_data = False
+        monkeypatch.setattr(market_calendar.bist_calendar, "data_ttl", lambda interval: 3600.0)
+        yield fetcher
+        fetcher.clear_cache()
+
+    def test_bist_entries_follow_calendar(self, fetcher):
+        df = pd.DataFrame({"close": [1.0]}, index=pd.DatetimeIndex(["2026-03-02"]))
+
+        fetcher._store("THYAO.IS", "1d", "5d", df)
+        fetcher._store("BTC-USD", "1d", "5d", df)
+
+        bist = fetcher.cache[fetcher._get_cache_key("THYAO.IS", "1d", "5d")]
+        btc = fetcher.cache[fetcher._get_cache_key("BTC-USD", "1d", "5d")]
+        assert bist["expires"] - bist["timestamp"] == 3600
+        assert btc["expires"] - btc["timestamp"] == fetcher.cache_ttl
+
+    def test_expired_entry_is_invalid(self, fetcher):
+        key = fetcher._get_cache_key("THYAO.IS", "1d", "5d")
+        fetcher.cache[key] = {"data": None, "timestamp": time.time() - 10, "expires": time.time() - 1}
+
+        assert not fetcher._is_cache_valid(key)
+
+
+class TestPremarketWarmup:
+    def test_skipped_on_holidays(self, monkeypatch):
+        calls = []
+
+        async def warmup():
+            calls.append(True)
+            return {"stages": []}
+
+        scheduler = StockScheduler()
+        scheduler._warmup_callback = warmup
+
+        monkeypatch.setattr(market_calendar.bist_calendar, "now", lambda: at("2026-05-27 09:15"))
+        assert asyncio.run(scheduler._run_warmup()) is None
+
+        monkeypatch.setattr(market_calendar.bist_calendar, "now", lambda: at("2026-05-26 09:15"))
+        assert asyncio.run(scheduler._run_warmup()) == {"stages": []}
+        assert len(calls) == 1
+        assert scheduler.get_status()["warmup"] == {"stages": []}
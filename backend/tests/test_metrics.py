@@ -0,0 +1,87 @@
+"""
+Metrics Tests
+Prometheus exposition, hot path timers and per-route latency
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.metrics import (
+    MetricsRegistry, _Metric, CACHE_REQUESTS, HTTP_REQUEST_SECONDS, metrics, record_cache, cache_hit_ratios
+)
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(enabled=True)
+
+
+class TestRegistry:
+    """Counters, histograms and text format"""
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        """Observations land in the first bucket >= value and counts accumulate"""
+        hist = registry.histogram("test_seconds", "Test", ["op"], buckets=(0.1, 1.0))
+        hist.observe(0.05, op="a")
+        hist.observe(0.5, op="a")
+        hist.observe(5.0, op="a")
+
+        text = registry.render()
+        assert '# TYPE test_seconds histogram' in text
+        assert 'test_seconds_bucket{op="a",le="0.1"} 1' in text
+        assert 'test_seconds_bucket{op="a",le="1"} 2' in text
+        assert 'test_seconds_bucket{op="a",le="+Inf"} 3' in text
+        assert 'test_seconds_count{op="a"} 3' in text
+
+    def test_disabled_registry_records_nothing(self, registry):
+        """Switched off, timers and counters are no-ops"""
+        registry.enabled = False
+        hist = registry.histogram("off_seconds", "Off")
+        counter = registry.counter("off_total", "Off")
+
+        with hist.time():
+            pass
+        hist.timed()(lambda: None)()
+        counter.inc()
+
+        assert hist.get_count() == 0
+        assert counter.get() == 0
+        assert "off_" not in registry.render()
+
+    def test_incomplete_metric_fails_at_construction(self, registry):
+        """A metric type without samples() cannot be created, instead of failing on scrape"""
+        class Gauge(_Metric):
+            type = "gauge"
+
+            def reset(self):
+                pass
+
+        with pytest.raises(TypeError):
+            Gauge(registry, "test_gauge", "Test")
+
+    def test_cache_hit_ratio(self):
+        """Hit ratio is derived from the lookup counters"""
+        CACHE_REQUESTS.reset()
+        record_cache("unit", True)
+        record_cache("unit", True)
+        record_cache("unit", False)
+        record_cache("unit", True)
+
+        assert cache_hit_ratios()["unit"] == pytest.approx(0.75)
+        assert 'investia_cache_hit_ratio{cache="unit"} 0.75' in metrics.render()
+
+
+class TestMetricsEndpoint:
+    """/metrics and the latency middleware"""
+
+    def test_route_latency_uses_template(self):
+        """Requests are labelled by route template, not by raw path"""
+        client = TestClient(app)
+        client.get("/health")
+
+        assert HTTP_REQUEST_SECONDS.get_count(method="GET", route="/health", status="200") >= 1
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'investia_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
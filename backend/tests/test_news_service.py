@@ -0,0 +1,181 @@
+"""
+News Service Tests
+Bounded news buffer, single-flight cold start and stale-while-revalidate
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.services import news_service
+from app.services.news_service import NewsBuffer
+
+
+def item(title: str, timestamp: float) -> dict:
+    return {"title": title, "timestamp": timestamp, "source": "test"}
+
+
+@pytest.fixture(autouse=True)
+def clean_news_state(monkeypatch):
+    monkeypatch.setattr(news_service, "_news_cache", {})
+    monkeypatch.setattr(news_service, "_news_cache_time", {})
+    monkeypatch.setattr(news_service, "_news_buffers", {})
+    monkeypatch.setattr(news_service, "_background_refreshes", {})
+
+
+@pytest.fixture
+def fake_fetch(monkeypatch):
+    """fetch_all_news stub counting calls, with an adjustable delay"""
+    state = {"calls": 0, "delay": 0.0}
+
+    async def fetch_all_news(feeds, kind="news"):
+        state["calls"] += 1
+        await asyncio.sleep(state["delay"])
+        return {"turkey": [item(f"{kind} {state['calls']}", time.time())], "world": []}
+
+    monkeypatch.setattr(news_service, "fetch_all_news", fetch_all_news)
+    return state
+
+
+class TestNewsBuffer:
+    """Incremental merge"""
+
+    def test_newest_first_and_deduplicated(self):
+        buffer = NewsBuffer(max_items=10)
+        buffer.merge([item("B", 2), item("A", 1)])
+        added = buffer.merge([item("C", 3), item("b", 5), item("A", 1)])
+
+        assert added == 1
+        assert [i["title"] for i in buffer.items()] == ["C", "B", "A"]
+
+    def test_bounded(self):
+        buffer = NewsBuffer(max_items=3)
+        buffer.merge([item(str(ts), ts) for ts in (5, 1, 4, 2, 3)])
+
+        assert [i["title"] for i in buffer.items()] == ["5", "4", "3"]
+        # Older than everything kept -> ignored; a dropped title may come back later
+        assert buffer.merge([item("0", 0)]) == 0
+        assert buffer.merge([item("1", 6)]) == 1
+        assert [i["title"] for i in buffer.items()] == ["1", "5", "4"]
+
+
+class TestNewsRefresh:
+    """Snapshots served from memory"""
+
+    def test_cold_start_is_single_flight(self, fake_fetch):
+        fake_fetch["delay"] = 0.05
+
+        async def run():
+            return await asyncio.gather(*(news_service.get_economy_news() for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        assert fake_fetch["calls"] == 1
+        assert all(r is results[0] for r in results)
+        assert results[0]["turkey"][0]["title"] == "economy 1"
+
+    def test_stale_snapshot_is_served_immediately(self, fake_fetch):
+        fake_fetch["delay"] = 0.2
+
+        async def run():
+            first = await news_service.get_general_news()
+            news_service._news_cache_time["general"] -= news_service.NEWS_CACHE_TTL
+
+            start = time.perf_counter()
+            stale = await news_service.get_general_news()
+            elapsed = time.perf_counter() - start
+
+            await news_service._background_refreshes["general"]
+            fresh = await news_service.get_general_news()
+            return first, stale, fresh, elapsed
+
+        first, stale, fresh, elapsed = asyncio.run(run())
+
+        assert stale is first
+        assert elapsed < 0.1
+        assert fresh["turkey"][0]["title"] == "general 2"
+        assert fake_fetch["calls"] == 2
+
+    def test_timeout_falls_back_to_demo(self, fake_fetch, monkeypatch):
+        fake_fetch["delay"] = 1.0
+        monkeypatch.setattr(news_service, "NEWS_FETCH_TIMEOUT", 0.05)
+
+        news = asyncio.run(news_service.get_economy_news())
+
+        assert news is news_service.DEMO_ECONOMY_NEWS
+
+    def test_background_refresher(self, fake_fetch):
+        async def run():
+            task = news_service.start_news_refresher(interval=0.01)
+            await asyncio.sleep(0.05)
+            await news_service.stop_news_refresher()
+            return task
+
+        task = asyncio.run(run())
+
+        assert task.cancelled()
+        assert set(news_service._news_cache) == {"economy", "general"}
+
+
+def rss(*items) -> bytes:
+    body = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{i}</link>"
+        f"<pubDate>Mon, 02 Mar 2026 0{i}:00:00 +0300</pubDate></item>"
+        for i, title in enumerate(items)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>{body}</channel></rss>'.encode()
+
+
+class TestFeedItemParser:
+    """Streaming item extraction"""
+
+    def test_chunked_input(self):
+        body = rss("A &amp; B", "&lt;b&gt;C&lt;/b&gt;", "D")
+        parser = news_service.FeedItemParser("test")
+        for start in range(0, len(body), 7):
+            parser.feed(body[start:start + 7])
+        parser.close()
+
+        assert [i["title"] for i in parser.items] == ["A & B", "C", "D"]
+        assert parser.items[0]["published"] == "2026-03-02T00:00:00+03:00"
+
+    def test_stops_at_known_head(self):
+        body = rss("New 1", "New 2", "Old 1", "Old 2")
+        parser = news_service.FeedItemParser("test", known_head="https://example.com/2\nOld 1")
+
+        assert parser.feed(body) is True
+        assert parser.reached_known
+        assert [i["title"] for i in parser.items] == ["New 1", "New 2"]
+
+    def test_stops_at_max_items(self):
+        parser = news_service.FeedItemParser("test", max_items=2)
+
+        body = rss("A", "B", "C")
+        chunks = [body[start:start + 64] for start in range(0, len(body), 64)]
+
+        results = [parser.feed(chunk) for chunk in chunks]
+
+        assert results[-1] is True
+        assert [i["title"] for i in parser.items] == ["A", "B"]
+
+
+class TestCleanup:
+    """clean_html / parse_rss_date"""
+
+    def test_clean_html(self):
+        assert news_service.clean_html("  Düz   metin ") == "Düz metin"
+        assert news_service.clean_html("<p>Endeks &amp; kur</p>\n<br/>") == "Endeks & kur"
+        assert news_service.clean_html("") == ""
+
+    @pytest.mark.parametrize("text", [
+        "Mon, 02 Mar 2026 09:30:00 +0300",
+        "Mon, 02 Mar 2026 06:30:00 GMT",
+        "2026-03-02T09:30:00+03:00",
+        "2026-03-02T06:30:00Z",
+        "02 Mar 2026 09:30:00 +0300",
+    ])
+    def test_parse_rss_date(self, text):
+        assert news_service.parse_rss_date(text).timestamp() == 1772433000
+
+    def test_parse_rss_date_invalid(self):
+        assert news_service.parse_rss_date("dün") is None
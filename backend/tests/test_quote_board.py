@@ -0,0 +1,102 @@
+"""
+Quote Board Tests
+One batched poll feeds top movers, the market overview and alert checks
+"""
+import asyncio
+
+import pandas as pd
+import pytest
+
+from app.services import quote_board as quote_board_module
+from app.services.market_data import MarketDataService
+from app.services.quote_board import QuoteBoard, build_quote
+from app.services.stock_screener import StockScreener
+from tests.conftest import make_bars
+
+
+def daily_bars(closes, volume=1_000.0) -> pd.DataFrame:
+    return make_bars(closes=closes, open_noise=0, wicks=False, spread=2, volume=volume)
+
+
+class FakeFetcher:
+    bist30_tickers = ["THYAO.IS", "GARAN.IS", "SISE.IS"]
+
+    def __init__(self):
+        self.frames = {
+            "THYAO.IS": daily_bars([100, 110]),
+            "GARAN.IS": daily_bars([50, 45]),
+            "SISE.IS": daily_bars([20, 20]),
+            "XU100.IS": daily_bars([9_000, 9_090]),
+            "TRY=X": daily_bars([32, 32.32]),
+        }
+        self.batches = []
+
+    def fetch_realtime_data_batch(self, tickers, interval, period):
+        self.batches.append((list(tickers), interval, period))
+        return {t: self.frames[t] for t in tickers if t in self.frames}
+
+
+@pytest.fixture
+def board(monkeypatch):
+    board = QuoteBoard(FakeFetcher())
+    monkeypatch.setattr(quote_board_module, "quote_board", board)
+    return board
+
+
+class TestQuoteBoard:
+    def test_build_quote(self):
+        quote = build_quote("THYAO.IS", daily_bars([100, 110]).rename(columns=str.capitalize))
+
+        assert quote["price"] == 110
+        assert quote["prev_close"] == 100
+        assert quote["change_percent"] == pytest.approx(10)
+        assert (quote["high"], quote["low"]) == (112, 108)
+
+    def test_one_batch_for_the_whole_universe(self, board):
+        board.refresh()
+
+        assert len(board.data_fetcher.batches) == 1
+        tickers, interval, period = board.data_fetcher.batches[0]
+        assert tickers[:3] == FakeFetcher.bist30_tickers
+        assert set(MarketDataService.TICKERS.values()) <= set(tickers)
+        assert (interval, period) == ("1d", "5d")
+        assert len(board) == 5
+
+    def test_reads_do_not_fetch_while_fresh(self, board):
+        board.ensure_fresh()
+        board.ensure_fresh()
+        board.snapshot()
+
+        assert len(board.data_fetcher.batches) == 1
+
+    def test_missed_symbol_keeps_last_quote(self, board):
+        board.refresh()
+        del board.data_fetcher.frames["GARAN.IS"]
+        board.data_fetcher.frames["THYAO.IS"] = daily_bars([110, 121])
+
+        board.refresh()
+
+        assert board.get("GARAN.IS")["price"] == 45
+        assert board.get("THYAO.IS")["price"] == 121
+
+
+class TestConsumers:
+    def test_top_movers_from_board(self, board):
+        screener = StockScreener()
+
+        result = screener.get_top_movers(top_n=5)
+
+        assert [m["ticker"] for m in result["gainers"]] == ["THYAO.IS"]
+        assert [m["ticker"] for m in result["losers"]] == ["GARAN.IS"]
+        assert result["stats"]["unchanged"] == 1
+        assert len(board.data_fetcher.batches) == 1
+
+    def test_market_overview_from_board(self, board):
+        service = MarketDataService(board=board)
+
+        result = asyncio.run(service.get_all_market_data())
+
+        assert result["data"]["bist100"]["change_percent"] == pytest.approx(1.0)
+        assert result["data"]["usd_try"]["price"] == 32.32
+        assert result["data"]["gold"]["error"] is True  # not on the board
+        assert len(board.data_fetcher.batches) == 1
@@ -0,0 +1,162 @@
+"""
+Rate Limiter Tests
+Sliding window counters, idle eviction and the optional Redis backend
+"""
+import pytest
+from starlette.requests import Request
+
+from app.config import settings
+from app.middleware.rate_limiter import RateLimiter, RedisSlidingWindowCounter, SlidingWindowCounter
+
+
+def make_request(path: str = "/api/stocks/THYAO.IS/data", ip: str = "10.0.0.1") -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [(b"x-forwarded-for", ip.encode())],
+        "client": (ip, 1234),
+        "server": ("testserver", 80),
+        "scheme": "http",
+    })
+
+
+class TestSlidingWindowCounter:
+    """In-memory counters"""
+
+    def test_limit_within_window(self):
+        """Exactly `limit` requests pass in one window"""
+        counter = SlidingWindowCounter()
+        now = 1_000_020.0  # start of a minute window
+
+        results = [counter.hit("ip", [(5, 60)], now=now)[0] for _ in range(6)]
+
+        assert results == [True] * 5 + [False]
+
+    def test_previous_window_is_weighted(self):
+        """Previous window counts decay linearly over the current one"""
+        counter = SlidingWindowCounter()
+        start = 1_000_020.0
+        for _ in range(10):
+            counter.hit("ip", [(10, 60)], now=start)
+
+        # 30s into the next window: estimate = 10 * 0.5 + 0 -> 5 slots left
+        later = start + 90
+        allowed = [counter.hit("ip", [(10, 60)], now=later)[0] for _ in range(6)]
+        assert allowed == [True] * 5 + [False]
+
+    def test_blocked_request_is_not_counted(self):
+        """A request rejected by one window doesn't consume the others"""
+        counter = SlidingWindowCounter()
+        now = 1_000_020.0
+        windows = [(2, 1), (100, 60)]
+
+        for _ in range(5):
+            counter.hit("ip", windows, now=now)
+
+        assert counter.remaining("ip", 100, 60, now=now) == 98
+
+    def test_retry_after(self):
+        """Retry-After points at the end of the window when the current window is full"""
+        counter = SlidingWindowCounter()
+        now = 1_000_020.0  # 1_000_020 % 60 == 0 -> start of window
+        for _ in range(3):
+            counter.hit("ip", [(3, 60)], now=now)
+
+        allowed, blocked, retry_after, _ = counter.hit("ip", [(3, 60)], now=now + 15)
+        assert (allowed, blocked) == (False, 0)
+        assert retry_after == 45
+
+    def test_idle_clients_are_evicted(self):
+        """Memory is bounded by active clients, not by every IP ever seen"""
+        counter = SlidingWindowCounter(eviction_interval=60)
+        now = 1_000_020.0
+        for i in range(1000):
+            counter.hit(f"ip-{i}", [(10, 60)], now=now)
+        assert len(counter) == 1000
+
+        counter.hit("active", [(10, 60)], now=now + 180)
+        assert len(counter) == 1
+
+
+class TestRateLimiter:
+    """Burst / minute / auth limits"""
+
+    def test_burst_limit(self):
+        limiter = RateLimiter(requests_per_minute=100, requests_per_hour=1000, burst_limit=3)
+        results = [limiter.is_allowed(make_request())[0] for _ in range(4)]
+
+        assert results == [True, True, True, False]
+        assert limiter.is_allowed(make_request(ip="10.0.0.2"))[0] is True
+
+    def test_auth_paths_are_stricter(self):
+        limiter = RateLimiter(requests_per_minute=100, requests_per_hour=1000, burst_limit=100)
+        results = [limiter.is_allowed(make_request("/api/auth/login"))[0] for _ in range(6)]
+
+        assert results == [True] * 5 + [False]
+
+    def test_whitelist(self):
+        limiter = RateLimiter(requests_per_minute=1, requests_per_hour=1, burst_limit=1)
+
+        assert all(limiter.is_allowed(make_request("/health"))[0] for _ in range(5))
+        assert all(limiter.is_allowed(make_request(ip="127.0.0.1"))[0] for _ in range(5))
+
+    def test_remaining(self):
+        limiter = RateLimiter(requests_per_minute=10, requests_per_hour=100, burst_limit=10)
+        for _ in range(3):
+            limiter.is_allowed(make_request())
+
+        remaining = limiter.get_remaining(make_request())
+        assert remaining["minute_limit"] == 10
+        assert 7 <= remaining["minute_remaining"] <= 8
+
+    def test_check_returns_remaining_from_the_same_hit(self):
+        limiter = RateLimiter(requests_per_minute=10, requests_per_hour=100, burst_limit=10)
+        results = [limiter.check(make_request()) for _ in range(3)]
+
+        assert [r[0] for r in results] == [True] * 3
+        assert [r[3] for r in results] == [9, 8, 7]
+
+
+@pytest.fixture
+def redis_counter():
+    """Redis-backed counter; falls back to fakeredis (with Lua) when no server is reachable"""
+    redis = pytest.importorskip("redis")
+    client = redis.Redis.from_url(settings.redis_url, decode_responses=True, socket_connect_timeout=1)
+    try:
+        client.ping()
+    except Exception:
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeRedis(decode_responses=True)
+
+    counter = RedisSlidingWindowCounter(client, prefix="investia:test:ratelimit")
+    yield counter
+    for key in client.scan_iter("investia:test:ratelimit:*"):
+        client.delete(key)
+
+
+class TestRedisSlidingWindowCounter:
+    """Shared counters via the Lua script"""
+
+    def test_limit_and_remaining(self, redis_counter):
+        now = 1_000_020.0
+        results = [redis_counter.hit("ip", [(3, 60)], now=now)[0] for _ in range(4)]
+
+        assert results == [True, True, True, False]
+        assert redis_counter.remaining("ip", 3, 60, now=now) == 0
+
+    def test_blocked_request_is_not_counted(self, redis_counter):
+        now = 1_000_020.0
+        for _ in range(5):
+            redis_counter.hit("ip2", [(2, 1), (100, 60)], now=now)
+
+        assert redis_counter.remaining("ip2", 100, 60, now=now) == 98
+
+    def test_hit_returns_remaining(self, redis_counter):
+        now = 1_000_020.0
+        results = [redis_counter.hit("ip3", [(2, 1), (5, 60)], now=now) for _ in range(3)]
+
+        assert [r[3] for r in results] == [[1, 4], [0, 3], [0, 0]]
+        assert redis_counter.remaining("ip3", 5, 60, now=now) == 3
@@ -0,0 +1,134 @@
+"""
+Signal Hub Tests
+One producer per (ticker, strategy): evaluation per new bar, snapshots, change-only broadcasts
+"""
+import asyncio
+
+import pandas as pd
+import pytest
+
+from app.services import signal_generator
+from app.services.signal_hub import SignalHub
+
+
+class FakeFetcher:
+    """Serves a bar frame the test can advance"""
+
+    def __init__(self):
+        self.calls = 0
+        self.bars = 1
+
+    def fetch_realtime_data(self, ticker, interval, period):
+        self.calls += 1
+        index = pd.date_range("2026-03-02 10:00", periods=self.bars, freq="5min")
+        return pd.DataFrame({"close": [100.0 + i for i in range(self.bars)], "volume": 1000.0}, index=index)
+
+
+class FakeFeatures:
+    def frame(self, ticker, interval, period, df):
+        return df
+
+
+class FakeAnalysis:
+    def get_latest_indicators(self, df):
+        return {"close": float(df["close"].iloc[-1])}
+
+
+class FakeGenerator:
+    """BUY on an odd number of bars, HOLD otherwise"""
+
+    def __init__(self, strategy_type="moderate"):
+        self.strategy_type = strategy_type
+
+    def generate_signal(self, df, indicators):
+        return {"signal": "BUY" if len(df) % 2 else "HOLD", "strength": len(df), "entry_price": indicators["close"]}
+
+
+class FakeManager:
+    def __init__(self):
+        self.broadcasts = []
+        self.sent = []
+
+    async def broadcast_signal(self, ticker, payload):
+        self.broadcasts.append((ticker, payload["signal"]))
+
+    async def send_to_client(self, websocket, message):
+        self.sent.append((websocket, message.event, message.data["signal"]))
+        return True
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    monkeypatch.setattr(signal_generator, "SignalGenerator", FakeGenerator)
+    return SignalHub(FakeFetcher(), FakeAnalysis(), FakeManager(), poll_interval=0.01, features=FakeFeatures())
+
+
+async def wait_for(condition, timeout=1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met")
+        await asyncio.sleep(0.005)
+
+
+class TestSignalHub:
+    def test_viewers_share_one_producer(self, hub):
+        async def run():
+            producers = [await hub.subscribe(f"ws{i}", "THYAO.IS") for i in range(50)]
+            await wait_for(lambda: hub.manager.broadcasts)
+            await asyncio.sleep(0.05)
+            await hub.stop()
+            return producers
+
+        producers = asyncio.run(run())
+
+        assert all(p is producers[0] for p in producers)
+        assert producers[0].evaluations == 1  # same bar on every poll
+        assert hub.data_fetcher.calls > 1
+        assert hub.manager.broadcasts == [("THYAO.IS", "BUY")]
+
+    def test_broadcasts_only_on_change(self, hub):
+        async def run():
+            producer = await hub.subscribe("ws", "THYAO.IS")
+            await wait_for(lambda: producer.evaluations == 1)
+            for bars in (3, 4, 5):  # BUY, HOLD, BUY
+                hub.data_fetcher.bars = bars
+                await wait_for(lambda: producer.evaluations == bars - 1)
+            await hub.stop()
+
+        asyncio.run(run())
+
+        assert [signal for _, signal in hub.manager.broadcasts] == ["BUY", "HOLD", "BUY"]
+
+    def test_late_subscriber_gets_snapshot(self, hub):
+        async def run():
+            await hub.subscribe("first", "GARAN.IS")
+            await wait_for(lambda: hub.manager.broadcasts)
+            await hub.subscribe("late", "GARAN.IS")
+            await hub.stop()
+
+        asyncio.run(run())
+
+        assert hub.manager.sent == [("late", "signal_snapshot", "BUY")]
+
+    def test_producer_stops_with_last_subscriber(self, hub):
+        async def run():
+            producer = await hub.subscribe("a", "SISE.IS")
+            await hub.subscribe("b", "SISE.IS")
+            other = await hub.subscribe("a", "SISE.IS", strategy="aggressive")
+
+            hub.unsubscribe("a", "SISE.IS")
+            assert not producer.task.cancelled()
+
+            hub.unsubscribe("b", "SISE.IS")
+            await asyncio.sleep(0)
+            assert producer.task.cancelled()
+            assert list(hub.get_stats()) == ["SISE.IS:aggressive"]
+
+            await hub.stop()
+            return other
+
+        other = asyncio.run(run())
+
+        assert other.task.cancelled()
+        assert hub.get_stats() == {}
@@ -0,0 +1,26 @@
+"""
+Startup Tests
+Importing the app stays light: the data stack loads on first use, not at import
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def imported_after_app_main(*modules: str) -> list:
+    """Which of `modules` a fresh interpreter has loaded after `import app.main`"""
+    code = (
+        "import sys, app.main; "
+        f"print('LOADED:' + ','.join(m for m in {list(modules)!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    line = next(line for line in result.stdout.splitlines() if line.startswith("LOADED:"))
+    return [m for m in line[len("LOADED:"):].split(",") if m]
+
+
+def test_app_import_does_not_load_the_data_stack():
+    assert imported_after_app_main("pandas", "numpy", "app.services.hybrid_strategy") == []
@@ -0,0 +1,270 @@
+"""
+Stock Screener Tests
+Staged pipeline: vectorized pre-filters, then scoring and levels on survivors only
+Streaming scan: one event per ticker, closing ranking event
+"""
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from app.services import websocket_manager
+from app.services.stock_screener import StockScreener
+from tests.conftest import make_bars
+
+
+def hourly_bars(rows: int = 120, drift: float = 0.3, volume: int = 50_000, seed: int = 5) -> pd.DataFrame:
+    return make_bars(
+        rows, seed=seed, drift=drift, noise=0.5, open_noise=0.2, wicks=False,
+        volume=(volume, volume * 2), freq="h", end="2026-03-02 17:00",
+    )
+
+
+UNIVERSE = {
+    "THYAO.IS": hourly_bars(),
+    "GARAN.IS": hourly_bars(rows=200, seed=8),
+    "ASELS.IS": hourly_bars(rows=30),               # too short
+    "SISE.IS": hourly_bars(volume=10),              # illiquid
+    "TUPRS.IS": hourly_bars(drift=-0.3, seed=9),    # downtrend
+}
+
+
+class FakeFetcher:
+    def __init__(self):
+        self.frames = dict(UNIVERSE)
+
+    def fetch_realtime_data_batch(self, tickers, interval, period):
+        return {t: self.frames[t] for t in tickers if t in self.frames}
+
+
+def next_bar(df: pd.DataFrame, close: float) -> pd.DataFrame:
+    row = df.iloc[[-1]].assign(close=close, high=close + 1, low=close - 1)
+    return pd.concat([df.iloc[1:], row.set_axis([df.index[-1] + pd.Timedelta(hours=1)])])
+
+
+@pytest.fixture
+def screener(monkeypatch):
+    screener = StockScreener()
+    screener.data_fetcher = FakeFetcher()
+    screener.bist30_tickers = list(UNIVERSE)
+    monkeypatch.setattr(screener, "is_market_uptrend", lambda: True)
+    return screener
+
+
+@pytest.fixture
+def scored(screener, monkeypatch):
+    """Tickers passed to calculate_hybrid_score"""
+    calls = []
+    score = screener.calculate_hybrid_score
+
+    def counting(ticker, df, indicators):
+        calls.append(ticker)
+        return score(ticker, df, indicators)
+
+    monkeypatch.setattr(screener, "calculate_hybrid_score", counting)
+    return calls
+
+
+class TestPrefilter:
+    def test_rejections_by_gate(self, screener):
+        result = screener.prefilter(UNIVERSE)
+
+        assert result["survivors"] == ["THYAO.IS", "GARAN.IS"]
+        assert result["rejected"] == {"bars": 1, "liquidity": 1, "trend": 1}
+
+    def test_trend_gate_matches_per_ticker_emas(self, screener):
+        frames = {f"T{i}.IS": hourly_bars(rows=60 + i * 17, drift=0.05 * (i - 3), seed=i) for i in range(8)}
+
+        survivors = screener.prefilter(frames)["survivors"]
+
+        expected = [
+            t for t, df in frames.items()
+            if df["close"].ewm(span=21, adjust=False).mean().iloc[-1] > df["close"].ewm(span=50, adjust=False).mean().iloc[-1]
+        ]
+        assert survivors == expected
+
+
+class TestScreen:
+    def test_scores_only_survivors(self, screener, scored):
+        results, stats = screener.screen("1h", "1mo")
+
+        assert sorted(scored) == ["GARAN.IS", "THYAO.IS"]
+        assert sorted(r["ticker"] for r in results) == ["GARAN.IS", "THYAO.IS"]
+        assert all("levels" in r for r in results)
+        assert stats["universe"] == 5
+        assert [(s["stage"], s["survivors"]) for s in stats["stages"]] == [
+            ("fetch", 5), ("prefilter", 2), ("score", 2), ("levels", 2),
+        ]
+
+    def test_screen_all_stocks_sorted_by_score(self, screener):
+        results = screener.screen_all_stocks("1h", "1mo")
+
+        assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+
+class TestIncrementalRescreen:
+    def test_unchanged_bars_are_not_rescored(self, screener, scored):
+        first, _ = screener.screen("1h", "1mo")
+        second, stats = screener.screen("1h", "1mo")
+
+        assert sorted(scored) == ["GARAN.IS", "THYAO.IS"]
+        assert second == first
+        assert stats["stages"][0]["changed"] == 0
+
+    def test_only_changed_ticker_rescored_and_reranked(self, screener, scored):
+        screener.screen("1h", "1mo")
+        scored.clear()
+        frames = screener.data_fetcher.frames
+        frames["THYAO.IS"] = next_bar(frames["THYAO.IS"], frames["THYAO.IS"]["close"].iloc[-1] * 1.01)
+
+        results, stats = screener.screen("1h", "1mo")
+
+        assert scored == ["THYAO.IS"]
+        assert stats["stages"][0]["changed"] == 1
+        assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+        assert [r for r in results if r["ticker"] == "THYAO.IS"][0]["timestamp"] == str(frames["THYAO.IS"].index[-1])
+
+    def test_filter_change_rescores_everything(self, screener, scored, monkeypatch):
+        screener.screen("1h", "1mo")
+        monkeypatch.setattr(screener, "is_market_uptrend", lambda: False)
+
+        screener.screen("1h", "1mo")
+
+        assert sorted(scored) == ["GARAN.IS", "GARAN.IS", "THYAO.IS", "THYAO.IS"]
+
+    def test_session_gate_applied_on_read(self, screener, scored, monkeypatch):
+        """The end of the opening window updates recommendations without rescoring"""
+        score = screener.calculate_hybrid_score
+        monkeypatch.setattr(screener, "calculate_hybrid_score", lambda *args: {**score(*args), "score": 75})
+        monkeypatch.setattr(screener, "is_trading_time_safe", lambda: False)
+        early, _ = screener.screen("1h", "1mo")
+        monkeypatch.setattr(screener, "is_trading_time_safe", lambda: True)
+
+        later, stats = screener.screen("1h", "1mo")
+
+        assert sorted(scored) == ["GARAN.IS", "THYAO.IS"]
+        assert stats["stages"][0]["changed"] == 0
+        assert [r["recommendation"] for r in early] == ["WAIT", "WAIT"]
+        assert [r["recommendation"] for r in later] == ["BUY", "BUY"]
+        assert all(r["details"]["trading_time_safe"] for r in later)
+
+    def test_views_read_copies_of_the_table(self, screener):
+        results, _ = screener.screen("1h", "1mo", min_score=0)
+        results[0]["sector"] = "changed"
+
+        again, _ = screener.screen("1h", "1mo", min_score=0)
+
+        assert again[0]["sector"] != "changed"
+        assert all(r["score"] >= 30 for r in screener.screen("1h", "1mo", min_score=30)[0])
+
+    def test_missing_ticker_dropped(self, screener):
+        screener.screen("1h", "1mo")
+        del screener.data_fetcher.frames["GARAN.IS"]
+
+        results, _ = screener.screen("1h", "1mo")
+
+        assert [r["ticker"] for r in results] == ["THYAO.IS"]
+
+
+class FakeManager:
+    def __init__(self):
+        self.updates = []
+
+    async def broadcast_screener_update(self, screener_data):
+        self.updates.append(screener_data)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = FakeManager()
+    monkeypatch.setattr(websocket_manager, "ws_manager", manager)
+    return manager
+
+
+def collect(screener, publish=False):
+    async def run():
+        return [event async for event in screener.stream_screen("1h", "1mo", publish=publish)]
+
+    return asyncio.run(run())
+
+
+class TestStreamScreen:
+    def test_results_then_ranking(self, screener):
+        events = collect(screener)
+
+        assert [e["type"] for e in events] == ["result", "result", "ranking"]
+        assert [e["stock"]["ticker"] for e in events[:-1]] == ["THYAO.IS", "GARAN.IS"]
+        assert all(e["rescored"] for e in events[:-1])
+        ranking = events[-1]
+        assert ranking["total_stocks"] == 2
+        assert ranking["stocks"] == screener.screen("1h", "1mo")[0]
+        assert [s["stage"] for s in ranking["pipeline"]["stages"]] == ["fetch", "prefilter", "score", "levels"]
+
+    def test_cached_rows_first_then_rescored(self, screener):
+        collect(screener)
+        frames = screener.data_fetcher.frames
+        frames["GARAN.IS"] = next_bar(frames["GARAN.IS"], frames["GARAN.IS"]["close"].iloc[-1] * 1.01)
+
+        events = collect(screener)
+
+        assert [(e["stock"]["ticker"], e["rescored"]) for e in events[:-1]] == [("THYAO.IS", False), ("GARAN.IS", True)]
+
+    def test_publish_pushes_rescored_and_ranking(self, screener, manager):
+        collect(screener, publish=True)
+        collect(screener, publish=True)
+
+        assert [u["type"] for u in manager.updates] == ["result", "result", "ranking", "ranking"]
+
+    def test_closing_early_still_completes_refresh(self, screener):
+        async def first_event():
+            stream = screener.stream_screen("1h", "1mo")
+            event = await stream.__anext__()
+            await stream.aclose()
+            return event
+
+        assert asyncio.run(first_event())["type"] == "result"
+        assert screener.screen("1h", "1mo")[1]["stages"][0]["changed"] == 0  # GARAN.IS scored in the worker
+
+    def test_paused_consumer_does_not_hold_table(self, screener):
+        """A slow client between events must not block screen() for everyone else"""
+        async def run():
+            stream = screener.stream_screen("1h", "1mo")
+            await stream.__anext__()
+            loop = asyncio.get_running_loop()
+            results, _ = await asyncio.wait_for(loop.run_in_executor(None, screener.screen, "1h", "1mo"), 2)
+            await stream.aclose()
+            return results
+
+        assert {r["ticker"] for r in asyncio.run(run())} == {"THYAO.IS", "GARAN.IS"}
+
+
+class TestScanEndpoint:
+    @pytest.fixture
+    def client(self, screener, manager):
+        from fastapi.testclient import TestClient
+        from app.api.dependencies import get_stock_screener
+        from app.main import app
+
+        app.dependency_overrides[get_stock_screener] = lambda: screener
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_stock_screener, None)
+
+    def test_streams_server_sent_events(self, client):
+        response = client.get("/api/screener/scan", params={"interval": "1h", "period": "1mo", "stream": True})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [json.loads(chunk[len("data: "):]) for chunk in response.text.split("\n\n") if chunk]
+        assert [e["type"] for e in events] == ["result", "result", "ranking"]
+
+    def test_streams_ndjson(self, client):
+        response = client.get(
+            "/api/screener/scan",
+            params={"interval": "1h", "period": "1mo", "stream": True},
+            headers={"Accept": "application/x-ndjson"},
+        )
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert events[-1]["type"] == "ranking"
+        assert events[-1]["total_stocks"] == 2
@@ -0,0 +1,103 @@
+"""
+Pre-market Warm-up Tests
+Every morning artifact is built before the open; a failing stage does not stop the rest
+"""
+import pytest
+
+from app.constants import daily_picks_cache_key
+from app.services.cache_service import cache_service
+from app.services.quote_board import QuoteBoard
+from app.services.stock_screener import StockScreener
+from app.services.warmup import WARMUP_FEEDS, WARMUP_SCREEN_FEEDS, run_premarket_warmup
+from tests.conftest import make_bars
+
+
+# Hourly uptrend bars, liquid enough for the screener
+HOURLY_BARS = dict(
+    drift=0.3, noise=0.5, open_noise=0, wicks=False, volume=(50_000, 100_000), freq="h", end="2026-03-02 17:00"
+)
+
+
+class FakeFetcher:
+    bist30_tickers = ["THYAO.IS", "GARAN.IS"]
+
+    def __init__(self):
+        self.frames = {
+            "THYAO.IS": make_bars(seed=5, **HOURLY_BARS),
+            "GARAN.IS": make_bars(seed=8, **HOURLY_BARS),
+            "XU100.IS": make_bars(seed=9, **HOURLY_BARS),
+        }
+        self.prefetched = []
+
+    def prefetch(self, tickers, feeds):
+        self.prefetched.append((list(tickers), list(feeds)))
+        return len(feeds)
+
+    def fetch_realtime_data_batch(self, tickers, interval, period):
+        return {t: self.frames[t] for t in tickers if t in self.frames}
+
+
+class FakeHybrid:
+    SECTOR_MAP = {"THYAO": "Ulaştırma"}
+
+    def __init__(self):
+        self.scans = 0
+
+    def check_market_filter(self):
+        return True, "BIST100 yükseliş trendinde"
+
+    def scan_all_stocks(self, tickers, period, apply_booster, force_run):
+        self.scans += 1
+        return {"signals": [{"ticker": "THYAO.IS", "strength": 80, "entry_price": 100.0,
+                             "stop_loss": 95.0, "take_profit_1": 110.0, "take_profit_2": 120.0}]}
+
+
+@pytest.fixture
+def parts(monkeypatch):
+    fetcher = FakeFetcher()
+    screener = StockScreener()
+    screener.data_fetcher = fetcher
+    screener.bist30_tickers = list(FakeFetcher.bist30_tickers)
+    monkeypatch.setattr(screener, "is_market_uptrend", lambda: True)
+    cache_service.delete(daily_picks_cache_key(5))
+    yield fetcher, screener, FakeHybrid(), QuoteBoard(fetcher)
+    cache_service.delete(daily_picks_cache_key(5))
+
+
+def warmup(parts):
+    fetcher, screener, hybrid, board = parts
+    return run_premarket_warmup(data_fetcher=fetcher, screener=screener, hybrid_generator=hybrid, board=board)
+
+
+class TestPremarketWarmup:
+    def test_builds_every_artifact(self, parts):
+        fetcher, screener, hybrid, board = parts
+
+        stats = warmup(parts)
+
+        assert [s["stage"] for s in stats["stages"]] == [
+            "fetch", "features", "market_filter", "screener", "quote_board", "daily_picks"
+        ]
+        assert all(s["ok"] for s in stats["stages"])
+        assert fetcher.prefetched[0][1] == WARMUP_FEEDS
+        assert "XU100.IS" in fetcher.prefetched[0][0]
+        assert all(screener._table(i, p).tickers() == {"THYAO.IS", "GARAN.IS"} for i, p in WARMUP_SCREEN_FEEDS)
+        assert board.get("THYAO.IS") is not None
+        assert cache_service.get(daily_picks_cache_key(5))["picks"][0]["ticker"] == "THYAO.IS"
+
+    def test_failing_stage_does_not_stop_the_rest(self, parts, monkeypatch):
+        fetcher, screener, hybrid, board = parts
+
+        def broken():
+            raise RuntimeError("XU100 verisi yok")
+
+        monkeypatch.setattr(hybrid, "check_market_filter", broken)
+
+        stats = warmup(parts)
+
+        by_stage = {s["stage"]: s for s in stats["stages"]}
+        assert not by_stage["market_filter"]["ok"]
+        assert "XU100" in by_stage["market_filter"]["error"]
+        assert by_stage["screener"]["ok"] and by_stage["quote_board"]["ok"]
+        assert not by_stage["daily_picks"]["ok"]  # needs the market filter too
+        assert cache_service.get(daily_picks_cache_key(5)) is None
@@ -182,12 +182,13 @@ def find_support_level(lows: pd.Series, tolerance: float = 0.015, min_touches: i
     if len(lows) < 10:
         return None, 0
     
-    # Swing low'ları bul
+    # Swing low'ları bul (iloc yerine numpy dizisi - aynı değerler, çok daha hızlı)
+    values = lows.to_numpy()
     swing_lows = []
-    for i in range(2, len(lows)-2):
-        if lows.iloc[i] <= lows.iloc[i-1] and lows.iloc[i] <= lows.iloc[i+1]:
-            if lows.iloc[i] <= lows.iloc[i-2] and lows.iloc[i] <= lows.iloc[i+2]:
-                swing_lows.append((i, lows.iloc[i]))
+    for i in range(2, len(values)-2):
+        if values[i] <= values[i-1] and values[i] <= values[i+1]:
+            if values[i] <= values[i-2] and values[i] <= values[i+2]:
+                swing_lows.append((i, values[i]))
     
     if len(swing_lows) < min_touches:
         return None, 0
@@ -223,11 +224,12 @@ def find_resistance_level(highs: pd.Series, tolerance: float = 0.015, min_touche
         return None, 0
     
     # Swing high'ları bul
+    values = highs.to_numpy()
     swing_highs = []
-    for i in range(2, len(highs)-2):
-        if highs.iloc[i] >= highs.iloc[i-1] and highs.iloc[i] >= highs.iloc[i+1]:
-            if highs.iloc[i] >= highs.iloc[i-2] and highs.iloc[i] >= highs.iloc[i+2]:
-                swing_highs.append((i, highs.iloc[i]))
+    for i in range(2, len(values)-2):
+        if values[i] >= values[i-1] and values[i] >= values[i+1]:
+            if values[i] >= values[i-2] and values[i] >= values[i+2]:
+                swing_highs.append((i, values[i]))
     
     if len(swing_highs) < min_touches:
         return None, 0
@@ -270,8 +272,10 @@ def check_momentum_alignment(df: pd.DataFrame, idx: int) -> Tuple[bool, int, Lis
     close = df['Close'][:idx+1]
     
     # 1. RSI Momentum (14 ve 28 period)
-    rsi_14 = calculate_rsi(close, 14).iloc[-1]
-    rsi_14_prev = calculate_rsi(close, 14).iloc[-2]
+    # Ortak feature frame'den gelen df'te rsi / macd_histogram hazır (aynı tanımlar)
+    rsi = df['rsi'][:idx+1] if 'rsi' in df.columns else calculate_rsi(close, 14)
+    rsi_14 = rsi.iloc[-1]
+    rsi_14_prev = rsi.iloc[-2]
     
     rsi_momentum_up = rsi_14 > rsi_14_prev and 35 <= rsi_14 <= 65
     
@@ -284,9 +288,12 @@ def check_momentum_alignment(df: pd.DataFrame, idx: int) -> Tuple[bool, int, Lis
     
     # 2. MACD Histogram
     try:
-        macd_line = calculate_ema(close, 12) - calculate_ema(close, 26)
-        signal_line = calculate_ema(macd_line, 9)
-        histogram = macd_line - signal_line
+        if 'macd_histogram' in df.columns:
+            histogram = df['macd_histogram'][:idx+1]
+        else:
+            macd_line = calculate_ema(close, 12) - calculate_ema(close, 26)
+            signal_line = calculate_ema(macd_line, 9)
+            histogram = macd_line - signal_line
         
         hist_current = histogram.iloc[-1]
         hist_prev = histogram.iloc[-2]